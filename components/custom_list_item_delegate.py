@@ -1,9 +1,18 @@
+import re
 from PyQt5.QtWidgets import QStyledItemDelegate, QStyle, QStyleOptionViewItem, QToolTip
-from PyQt5.QtGui import QPainter, QColor, QPalette, QBrush, QPen, QFontMetrics, QFont, QIcon
+from PyQt5.QtGui import QPainter, QColor, QPalette, QBrush, QPen, QFontMetrics, QFont, QIcon, QPixmap
 from PyQt5.QtCore import QRect, Qt, QPoint, QSize, QModelIndex, QEvent
+from core.data_store import ProblemStore
 from utils.logging_utils import log_debug
 from utils.constants import LT_PREVIEW_SELECTED_LINE_COLOR, DT_PREVIEW_SELECTED_LINE_COLOR
 
+SEARCH_MATCH_ITEM_COLOR = QColor(255, 165, 0, 60)
+# LAST occurrence of metadata in brackets or parentheses
+# Using [\[({\] to satisfy nested set check
+ITEM_METADATA_RE = re.compile(r'(\s*[\[({].*[\]})]\s*)$')
+# Paint caches are dropped wholesale once they reach this many entries
+PAINT_CACHE_LIMIT = 4096
+
 class CustomListItemDelegate(QStyledItemDelegate):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -31,6 +40,142 @@ class CustomListItemDelegate(QStyledItemDelegate):
             "blue": QColor(Qt.blue),
         }
 
+        # Per-item paint caches. Problem-derived entries are keyed by the block's
+        # problem revision and the theme, so edits and rescans invalidate only the
+        # blocks they touch; font and rule changes replace the delegate altogether.
+        self._indicator_pixmap_cache = {}
+        self._tooltip_cache = {}
+        self._text_layout_cache = {}
+        self._standard_icon_cache = {}
+
+    @staticmethod
+    def _cache_put(cache: dict, key, value):
+        if len(cache) >= PAINT_CACHE_LIMIT:
+            cache.clear()
+        cache[key] = value
+        return value
+
+    def _problem_signature(self, main_window, block_idx, category_name):
+        """Identifies the problem counts an item shows; None when they can't be tracked."""
+        data_store = getattr(main_window, 'data_store', None)
+        problems_store = getattr(data_store, 'problems_per_subline', None)
+        if not isinstance(problems_store, ProblemStore):
+            return None
+        detection_config = getattr(main_window, 'detection_enabled', None) or {}
+        disabled_ids = frozenset(p_id for p_id, enabled in detection_config.items() if not enabled)
+        game_rules = getattr(main_window, 'current_game_rules', None)
+        membership = self._category_membership(main_window, block_idx, category_name) if category_name else None
+        return (block_idx, category_name, membership, problems_store.block_revision(block_idx), disabled_ids, id(game_rules))
+
+    @staticmethod
+    def _category_membership(main_window, block_idx, category_name):
+        """Hash of the category's lines; moving lines between categories doesn't touch problems."""
+        project_manager = getattr(main_window, 'project_manager', None)
+        project = getattr(project_manager, 'project', None)
+        if not project or block_idx is None:
+            return None
+        block_map = getattr(main_window, 'block_to_project_file_map', {})
+        proj_b_idx = block_map.get(block_idx, block_idx)
+        if not 0 <= proj_b_idx < len(project.blocks):
+            return None
+        category = next((c for c in project.blocks[proj_b_idx].categories if c.name == category_name), None)
+        return hash(tuple(category.line_indices)) if category else None
+
+    def _get_problem_indicator_colors(self, main_window, block_idx, category_name, theme) -> list:
+        problem_definitions = {}
+        block_problem_counts = {}
+        if hasattr(main_window, 'current_game_rules') and main_window.current_game_rules:
+            problem_definitions = main_window.current_game_rules.get_problem_definitions()
+
+        if hasattr(main_window, 'ui_updater') and hasattr(main_window.ui_updater, '_get_aggregated_problems_for_block'):
+            block_problem_counts = main_window.ui_updater._get_aggregated_problems_for_block(block_idx, category_name=category_name)
+
+        problem_indicator_colors_to_draw = []
+        if problem_definitions and block_problem_counts:
+            sorted_block_problem_ids = sorted(
+                block_problem_counts.keys(),
+                key=lambda pid: problem_definitions.get(pid, {}).get("priority", 99)
+            )
+            for problem_id in sorted_block_problem_ids:
+                if block_problem_counts[problem_id] > 0:
+                    if len(problem_indicator_colors_to_draw) >= self.max_problem_indicators: break
+                    problem_def = problem_definitions.get(problem_id)
+                    if problem_def and "color" in problem_def:
+                        indicator_color = QColor(problem_def["color"])
+                        if indicator_color.alpha() < 120 and theme == 'dark':
+                            indicator_color.setAlpha(180)
+                        if indicator_color not in problem_indicator_colors_to_draw:
+                            problem_indicator_colors_to_draw.append(indicator_color)
+        return problem_indicator_colors_to_draw
+
+    def _render_indicator_pixmap(self, colors: list, height: int, device_pixel_ratio: float):
+        if not colors:
+            return None
+        width = len(colors) * (self.problem_indicator_strip_width + 1)
+        pixmap = QPixmap(max(1, round(width * device_pixel_ratio)), max(1, round(height * device_pixel_ratio)))
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        pixmap.fill(Qt.transparent)
+        strip_painter = QPainter(pixmap)
+        v_offset = self.indicator_v_offset + 1
+        strip_x = 0
+        for color in colors:
+            strip_painter.fillRect(QRect(strip_x, v_offset, self.problem_indicator_strip_width, height - 2 * v_offset), color)
+            strip_x += self.problem_indicator_strip_width + 1
+        strip_painter.end()
+        return pixmap
+
+    def _get_indicator_pixmap(self, main_window, block_idx, category_name, theme, height: int, device_pixel_ratio: float):
+        """Pre-rendered warning strips for an item, or None when it has no problems."""
+        signature = self._problem_signature(main_window, block_idx, category_name)
+        key = (signature, theme, height, device_pixel_ratio)
+        if signature is not None and key in self._indicator_pixmap_cache:
+            return self._indicator_pixmap_cache[key]
+        colors = self._get_problem_indicator_colors(main_window, block_idx, category_name, theme)
+        pixmap = self._render_indicator_pixmap(colors, height, device_pixel_ratio)
+        if signature is not None:
+            self._cache_put(self._indicator_pixmap_cache, key, pixmap)
+        return pixmap
+
+    def _standard_icon(self, style, standard_pixmap, theme) -> QIcon:
+        key = (id(style), standard_pixmap, theme)
+        icon = self._standard_icon_cache.get(key)
+        if icon is None:
+            icon = self._cache_put(self._standard_icon_cache, key, style.standardIcon(standard_pixmap))
+        return icon
+
+    def _get_text_layout(self, full_text: str, metrics: QFontMetrics, font_key: str, total_w: int):
+        """Splits the item text into name and metadata and elides them to total_w; cached per text, width and font."""
+        key = (full_text, total_w, font_key)
+        layout = self._text_layout_cache.get(key)
+        if layout is not None:
+            return layout
+
+        metadata_match = ITEM_METADATA_RE.search(full_text)
+        if metadata_match:
+            meta_str = metadata_match.group(1)
+            name_str = full_text[:metadata_match.start()]
+            
+            meta_w = metrics.horizontalAdvance(meta_str)
+            name_w = metrics.horizontalAdvance(name_str)
+
+            # Since we have horizontal scrolling, we should be less aggressive with elision.
+            if total_w > name_w + meta_w:
+                layout = (name_str, name_w, meta_str)
+            else:
+                # Still prioritize name. If we have some space, show more of the name
+                elided_name = metrics.elidedText(name_str, Qt.ElideRight, max(total_w - 5, 20))
+                
+                # Metadata only if we have extra space (rare if total_w < name_w + meta_w)
+                name_disp_w = metrics.horizontalAdvance(elided_name)
+                elided_meta = None
+                if total_w - name_disp_w > 20:
+                    elided_meta = metrics.elidedText(meta_str, Qt.ElideRight, total_w - name_disp_w)
+                layout = (elided_name, name_disp_w, elided_meta)
+        else:
+            # No metadata; less aggressive elision
+            layout = (metrics.elidedText(full_text, Qt.ElideRight, max(total_w, 20)), 0, None)
+        return self._cache_put(self._text_layout_cache, key, layout)
+
     def _get_current_number_area_width(self, option: QStyleOptionViewItem) -> int:
         font_to_use = option.font
         if not font_to_use.family():
@@ -103,6 +248,12 @@ class CustomListItemDelegate(QStyledItemDelegate):
         if main_window and hasattr(main_window, 'theme'):
             theme = main_window.theme
 
+        # Tint blocks that contain hits of the current search
+        if not (is_selected or is_drag_hover) and main_window:
+            search_match_blocks = getattr(main_window, 'search_match_block_indices', None)
+            if search_match_blocks and index.data(Qt.UserRole) in search_match_blocks:
+                painter.fillRect(option.rect, SEARCH_MATCH_ITEM_COLOR)
+
         item_rect = option.rect
         current_number_area_width = self._get_current_number_area_width(option)
 
@@ -126,8 +277,6 @@ class CustomListItemDelegate(QStyledItemDelegate):
         category_name = index.data(Qt.UserRole + 10)
         merged_folder_ids = index.data(Qt.UserRole + 2) # For compacted folders
         
-        problem_definitions = {}
-        block_problem_counts = {}
         has_unsaved_changes_in_item = False
 
         if main_window:
@@ -176,31 +325,6 @@ class CustomListItemDelegate(QStyledItemDelegate):
                 if hasattr(main_window, 'block_handler') and hasattr(main_window.block_handler, 'get_block_color_markers'):
                     active_color_markers_for_block = main_window.block_handler.get_block_color_markers(block_idx_data)
 
-                if hasattr(main_window, 'current_game_rules') and main_window.current_game_rules:
-                    problem_definitions = main_window.current_game_rules.get_problem_definitions()
-
-                if hasattr(main_window, 'ui_updater') and hasattr(main_window.ui_updater, '_get_aggregated_problems_for_block'):
-                    block_problem_counts = main_window.ui_updater._get_aggregated_problems_for_block(block_idx_data, category_name=category_name)
-
-
-        # 1. Calculate Problem Colors Early
-        problem_indicator_colors_to_draw = []
-        if problem_definitions and block_problem_counts:
-            sorted_block_problem_ids = sorted(
-                block_problem_counts.keys(),
-                key=lambda pid: problem_definitions.get(pid, {}).get("priority", 99)
-            )
-            for problem_id in sorted_block_problem_ids:
-                if block_problem_counts[problem_id] > 0:
-                    if len(problem_indicator_colors_to_draw) >= self.max_problem_indicators: break
-                    problem_def = problem_definitions.get(problem_id)
-                    if problem_def and "color" in problem_def:
-                        indicator_color = QColor(problem_def["color"])
-                        if indicator_color.alpha() < 120 and theme == 'dark':
-                            indicator_color.setAlpha(180)
-                        if indicator_color not in problem_indicator_colors_to_draw:
-                            problem_indicator_colors_to_draw.append(indicator_color)
-
         # 2. Draw Number Gutter
         number_rect = QRect(item_rect.left(), item_rect.top(), current_number_area_width, item_rect.height())
         painter.fillRect(number_rect, number_area_bg)
@@ -211,6 +335,14 @@ class CustomListItemDelegate(QStyledItemDelegate):
         number_label_rect = number_rect.adjusted(0, 0, -indicator_zone_w, 0)
         status_rect_in_gutter = number_rect.adjusted(number_rect.width() - indicator_zone_w, 0, 0, 0)
 
+        # 1. Problem strips, pre-rendered per item until its block's problems change
+        indicator_pixmap = None
+        if main_window and block_idx_data is not None:
+            indicator_pixmap = self._get_indicator_pixmap(
+                main_window, block_idx_data, category_name, theme,
+                status_rect_in_gutter.height(), painter.device().devicePixelRatioF()
+            )
+
         # Draw Number Text
         painter.setPen(number_text_color)
         current_font = option.font
@@ -238,14 +370,14 @@ class CustomListItemDelegate(QStyledItemDelegate):
             
             # 1. Add folder icons for the merged chain
             for f_id in subset:
-                icons_to_draw.append(style.standardIcon(QStyle.SP_DirIcon))
+                icons_to_draw.append(self._standard_icon(style, QStyle.SP_DirIcon, theme))
             
             # 2. If it's a folder-block compaction, add the file icon as the top layer
             if compaction_type == 2 and len(icons_to_draw) < max_icons:
-                icons_to_draw.append(style.standardIcon(QStyle.SP_FileIcon))
+                icons_to_draw.append(self._standard_icon(style, QStyle.SP_FileIcon, theme))
             elif compaction_type == 2 and len(icons_to_draw) == max_icons:
                 # Replace the last folder icon with a file icon if we reached the limit
-                icons_to_draw[-1] = style.standardIcon(QStyle.SP_FileIcon)
+                icons_to_draw[-1] = self._standard_icon(style, QStyle.SP_FileIcon, theme)
             
             base_x = status_rect_in_gutter.left() + 2
             # Total shift is (num_icons - 1) * 3
@@ -291,16 +423,9 @@ class CustomListItemDelegate(QStyledItemDelegate):
                     painter.restore()
 
         # Draw Warning Strips (at the far right of the status zone)
-        if problem_indicator_colors_to_draw:
-            strip_x = status_rect_in_gutter.right() - (len(problem_indicator_colors_to_draw) * (self.problem_indicator_strip_width + 1)) - 1
-            v_offset = self.indicator_v_offset + 1
-            for color in problem_indicator_colors_to_draw:
-                strip_rect = QRect(strip_x,
-                                   status_rect_in_gutter.top() + v_offset,
-                                   self.problem_indicator_strip_width,
-                                   status_rect_in_gutter.height() - 2 * v_offset)
-                painter.fillRect(strip_rect, color)
-                strip_x += self.problem_indicator_strip_width + 1
+        if indicator_pixmap is not None:
+            strips_w = round(indicator_pixmap.width() / indicator_pixmap.devicePixelRatio())
+            painter.drawPixmap(status_rect_in_gutter.right() - strips_w - 1, status_rect_in_gutter.top(), indicator_pixmap)
 
         # 4. Draw Main Text
         text_start_x = number_rect.right() + self.padding_after_number_area
@@ -341,52 +466,18 @@ class CustomListItemDelegate(QStyledItemDelegate):
         full_text = str(index.data(Qt.DisplayRole) or "")
         metrics = QFontMetrics(current_font)
         
-        # 1. Split text into "Name" and "Metadata"
-        import re
-        # Find LAST occurrence of metadata in brackets or parentheses
-        # Using [\[({\] to satisfy nested set check
-        metadata_match = re.search(r'(\s*[\[({].*[\]})]\s*)$', full_text)
+        # 1. Split text into "Name" and "Metadata"; elision is cached per text, width and font
+        name_text, name_w, meta_text = self._get_text_layout(full_text, metrics, current_font.key(), text_rect.width())
         
         painter.save()
-        if metadata_match:
-            meta_str = metadata_match.group(1)
-            name_str = full_text[:metadata_match.start()]
-            
-            meta_w = metrics.horizontalAdvance(meta_str)
-            name_w = metrics.horizontalAdvance(name_str)
-            total_w = text_rect.width()
-
-            # Priority: NAME is black, METADATA is gray
-            # Since we have horizontal scrolling, we should be less aggressive with elision.
-            if total_w > name_w + meta_w:
-                painter.setPen(option.palette.color(QPalette.HighlightedText if (is_selected or is_drag_hover) else QPalette.Text))
-                painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, name_str)
-                name_actual_w = metrics.horizontalAdvance(name_str)
-                meta_rect = text_rect.adjusted(name_actual_w, 0, 0, 0)
-                if not (is_selected or is_drag_hover):
-                    painter.setPen(QColor(140, 140, 140) if theme == 'light' else QColor(160, 160, 160))
-                painter.drawText(meta_rect, Qt.AlignLeft | Qt.AlignVCenter, meta_str)
-            else:
-                # Still prioritize name. 
-                painter.setPen(option.palette.color(QPalette.HighlightedText if (is_selected or is_drag_hover) else QPalette.Text))
-                # If we have some space, show more of the name
-                elided_name = metrics.elidedText(name_str, Qt.ElideRight, max(total_w - 5, 20))
-                painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, elided_name)
-                
-                # Metadata only if we have extra space (rare if total_w < name_w + meta_w)
-                name_disp_w = metrics.horizontalAdvance(elided_name)
-                if total_w - name_disp_w > 20:
-                    meta_rect = text_rect.adjusted(name_disp_w, 0, 0, 0)
-                    elided_meta = metrics.elidedText(meta_str, Qt.ElideRight, total_w - name_disp_w)
-                    if not (is_selected or is_drag_hover):
-                        painter.setPen(QColor(140, 140, 140) if theme == 'light' else QColor(160, 160, 160))
-                    painter.drawText(meta_rect, Qt.AlignLeft | Qt.AlignVCenter, elided_meta)
-        else:
-            # No metadata
-            painter.setPen(option.palette.color(QPalette.HighlightedText if (is_selected or is_drag_hover) else QPalette.Text))
-            # Less aggressive elision
-            elided_all = metrics.elidedText(full_text, Qt.ElideRight, max(text_rect.width(), 20))
-            painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, elided_all)
+        # Priority: NAME is black, METADATA is gray
+        painter.setPen(option.palette.color(QPalette.HighlightedText if (is_selected or is_drag_hover) else QPalette.Text))
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, name_text)
+        if meta_text is not None:
+            meta_rect = text_rect.adjusted(name_w, 0, 0, 0)
+            if not (is_selected or is_drag_hover):
+                painter.setPen(QColor(140, 140, 140) if theme == 'light' else QColor(160, 160, 160))
+            painter.drawText(meta_rect, Qt.AlignLeft | Qt.AlignVCenter, meta_text)
         painter.restore()
 
         painter.restore()
@@ -412,6 +503,15 @@ class CustomListItemDelegate(QStyledItemDelegate):
         QToolTip.hideText()
 
     def _get_problems_tooltip_text(self, main_window, block_idx, category_name=None) -> str:
+        signature = self._problem_signature(main_window, block_idx, category_name)
+        if signature is not None and signature in self._tooltip_cache:
+            return self._tooltip_cache[signature]
+        tooltip_text = self._build_problems_tooltip_text(main_window, block_idx, category_name)
+        if signature is not None:
+            self._cache_put(self._tooltip_cache, signature, tooltip_text)
+        return tooltip_text
+
+    def _build_problems_tooltip_text(self, main_window, block_idx, category_name=None) -> str:
         problem_definitions = {}
         if hasattr(main_window, 'current_game_rules') and main_window.current_game_rules:
             problem_definitions = main_window.current_game_rules.get_problem_definitions()
@@ -251,6 +251,7 @@ class CustomListWidget(QListWidget):
 
                 # Apply corrections back to edited_data
                 log_debug("CustomListWidget: Applying corrections to edited_data")
+                any_corrected = False
                 for i, corrected_line in enumerate(corrected_lines):
                     if i < len(line_numbers):
                         string_idx = line_numbers[i]
@@ -259,8 +260,13 @@ class CustomListWidget(QListWidget):
                             edited_data[key] = corrected_line
                             main_window.data_store.unsaved_changes = True
                             main_window.data_store.unsaved_block_indices.add(block_idx)
+                            any_corrected = True
                             log_debug(f"CustomListWidget: Updated line {string_idx} in edited_data")
 
+                # These writes bypass update_edited_data, so re-index the block for find next/previous
+                if any_corrected and hasattr(main_window, 'search_handler'):
+                    main_window.search_handler.refresh_index_block(block_idx)
+
                 # Refresh UI if this is the current block
                 current_block_idx = getattr(main_window, 'current_block_index', -1)
                 if current_block_idx == block_idx and hasattr(main_window, 'ui_updater'):
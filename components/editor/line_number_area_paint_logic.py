@@ -1,10 +1,24 @@
 # --- START OF FILE components/editor/line_number_area_paint_logic.py ---
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
 from PyQt5.QtGui import QPainter, QColor
 from PyQt5.QtCore import Qt, QRect
 from PyQt5.QtWidgets import QMainWindow, QTextEdit
 from utils.logging_utils import log_debug
 from utils.utils import calculate_string_width, remove_all_tags, convert_dots_to_spaces_from_editor, ALL_TAGS_PATTERN
 
+
+@dataclass
+class LineRenderState:
+    """Everything the line-number area draws for one line that comes from data lookups."""
+    number_text: str
+    subline_text: str
+    is_unsaved: bool
+    marker_color: Optional[QColor]  # editors: background of the width column
+    stripe_colors: Tuple[QColor, ...]  # preview: warning stripes, highest priority first
+    width_text: str
+
+
 class LNETLineNumberAreaPaintLogic:
 
     def __init__(self, editor, helpers, main_window):
@@ -12,6 +26,151 @@ class LNETLineNumberAreaPaintLogic:
         self.helpers = helpers
         self.mw = main_window
         self.metadata_indicator_color = QColor(148, 0, 211, 180) # DarkViolet
+        # Per-line render state, valid while _render_cache_key matches the paint context
+        self._render_cache: Dict[int, LineRenderState] = {}
+        self._render_cache_key = None
+        self._preview_problem_index: Dict[int, Set[str]] = {}
+        self._string_color_map: Dict[int, int] = {}
+        self._max_custom_line_number = 1
+
+    def invalidate_render_cache(self) -> None:
+        self._render_cache.clear()
+        self._render_cache_key = None
+
+    def _render_context_key(self, main_window_ref, problem_definitions, detection_config, is_editor, is_preview):
+        """
+        Inputs of the cached line state. The problem store bumps its revision on
+        every write and the document revision covers edits, so scrolling reuses it.
+        """
+        data_store = getattr(main_window_ref, 'data_store', None) if isinstance(main_window_ref, QMainWindow) else None
+        probs_dict = getattr(data_store, 'problems_per_subline', None)
+        problems_revision = getattr(probs_dict, 'revision', None)
+        if data_store is not None and problems_revision is None:
+            return None  # plain dict: no way to tell when it changed
+
+        unsaved_signature = None
+        font_map = None
+        if is_editor:
+            unsaved_signature = frozenset(getattr(main_window_ref, 'edited_sublines', set()) or ())
+            font_map = getattr(main_window_ref, 'font_map', None)
+        elif is_preview and data_store is not None:
+            unsaved_signature = len(data_store.edited_data)
+
+        displayed = getattr(data_store, 'displayed_string_indices', None)
+        return (
+            getattr(data_store, 'current_block_idx', -1),
+            getattr(data_store, 'current_string_idx', -1),
+            problems_revision,
+            id(problem_definitions),
+            frozenset(p_id for p_id, enabled in detection_config.items() if not enabled),
+            self.editor.document().revision(),
+            id(getattr(self.editor, 'custom_line_numbers', None)),
+            id(getattr(self.editor, 'custom_subline_numbers', None)),
+            id(displayed), len(displayed) if displayed else 0,
+            unsaved_signature,
+            id(font_map),
+            id(getattr(main_window_ref, 'icon_sequences', None)),
+        )
+
+    def _prepare_render_cache(self, key, main_window_ref, is_preview, is_dual_column, current_block_idx) -> None:
+        if key is not None and key == self._render_cache_key:
+            return
+        self._render_cache.clear()
+        self._render_cache_key = key
+
+        # Preview lines show every problem of their string; index them once instead of per line
+        self._preview_problem_index = {}
+        if is_preview and isinstance(main_window_ref, QMainWindow) and hasattr(main_window_ref, 'data_store') and hasattr(main_window_ref.data_store, 'problems_per_subline'):
+            for problem_key, p_set in main_window_ref.data_store.problems_per_subline.items():
+                if problem_key[0] == current_block_idx:
+                    self._preview_problem_index.setdefault(problem_key[1], set()).update(p_set)
+
+        # Mapping for string-level zebra striping if in Review Dialog
+        self._string_color_map = {}
+        self._max_custom_line_number = 1
+        if is_dual_column and hasattr(self.editor, 'custom_line_numbers') and self.editor.custom_line_numbers:
+            unique_strings = []
+            seen = set()
+            for snum in self.editor.custom_line_numbers:
+                if snum is not None and snum not in seen:
+                    unique_strings.append(snum)
+                    seen.add(snum)
+            self._string_color_map = {snum: i % 2 for i, snum in enumerate(unique_strings)}
+            if unique_strings:
+                self._max_custom_line_number = max(unique_strings)
+
+    def _build_line_state(self, q_block, block_number, real_idx, main_window_ref, problem_definitions,
+                          detection_config, is_editor, is_preview, is_dual_column, extra_part_width,
+                          current_block_idx, current_string_idx, font_map_getter) -> LineRenderState:
+        # Display numbers
+        display_number_for_line_area = ""
+        subline_number_text = ""
+
+        if hasattr(self.editor, 'custom_line_numbers') and self.editor.custom_line_numbers:
+            if block_number < len(self.editor.custom_line_numbers):
+                custom_num = self.editor.custom_line_numbers[block_number]
+                display_number_for_line_area = str(custom_num) if custom_num is not None else ""
+        else:
+            display_number_for_line_area = str(block_number + 1)
+
+        if is_dual_column:
+            if block_number < len(self.editor.custom_subline_numbers):
+                sub_num = self.editor.custom_subline_numbers[block_number]
+                subline_number_text = str(sub_num) if sub_num is not None else ""
+
+        # Unsaved status
+        is_unsaved = False
+        if is_preview:
+            if hasattr(main_window_ref, 'data_store') and (current_block_idx, real_idx) in main_window_ref.data_store.edited_data:
+                is_unsaved = True
+        elif is_editor and current_string_idx != -1:
+            edited_sublines = getattr(main_window_ref, 'edited_sublines', set())
+            if block_number in edited_sublines:
+                is_unsaved = True
+
+        if is_unsaved and display_number_for_line_area:
+            display_number_for_line_area = f"* {display_number_for_line_area}"
+
+        # Problem markers
+        problem_ids = set()
+        if isinstance(main_window_ref, QMainWindow) and hasattr(main_window_ref, 'data_store') and hasattr(main_window_ref.data_store, 'problems_per_subline'):
+            if is_editor:
+                problem_key = (current_block_idx, current_string_idx, block_number)
+                problem_ids = main_window_ref.data_store.problems_per_subline.get(problem_key, set())
+            elif is_preview:
+                problem_ids = self._preview_problem_index.get(real_idx, set())
+
+        filtered_problems = {p_id for p_id in problem_ids if detection_config.get(p_id, True)}
+        sorted_probs = sorted(filtered_problems, key=lambda pid: problem_definitions.get(pid, {}).get("priority", 99))
+
+        marker_color = None
+        if is_editor and sorted_probs:
+            marker_color = QColor(problem_definitions.get(sorted_probs[0], {}).get("color", Qt.transparent))
+            marker_color.setAlpha(160)
+
+        stripe_colors = []
+        if is_preview:
+            for p_id in sorted_probs:
+                s_color = QColor(problem_definitions.get(p_id, {}).get("color", Qt.transparent))
+                if s_color.isValid():
+                    s_color.setAlpha(220)
+                    stripe_colors.append(s_color)
+
+        # Pixel width of the line
+        width_text = ""
+        if extra_part_width > 0 and is_editor and hasattr(main_window_ref, 'font_map') and main_window_ref.font_map:
+            font_map = font_map_getter()
+            pixel_width = calculate_string_width(convert_dots_to_spaces_from_editor(q_block.text()).rstrip(), font_map, icon_sequences=getattr(main_window_ref, 'icon_sequences', []))
+            width_text = str(pixel_width)
+
+        return LineRenderState(
+            number_text=display_number_for_line_area,
+            subline_text=subline_number_text,
+            is_unsaved=is_unsaved,
+            marker_color=marker_color,
+            stripe_colors=tuple(stripe_colors),
+            width_text=width_text,
+        )
 
     def execute_paint_event(self, event, painter_device):
         painter = QPainter(painter_device)
@@ -33,12 +192,17 @@ class LNETLineNumberAreaPaintLogic:
                     theme = main_window_ref.theme
                 if hasattr(main_window_ref, 'detection_enabled'):
                     detection_config = main_window_ref.detection_enabled
+            if not isinstance(detection_config, dict):
+                detection_config = {}
+
+            is_preview = self.editor.objectName() == "preview_text_edit"
+            is_editor = self.editor.objectName() in ["original_text_edit", "edited_text_edit"]
 
             total_area_width = self.editor.lineNumberAreaWidth()
             extra_part_width = 0
-            if self.editor.objectName() in["original_text_edit", "edited_text_edit"] and hasattr(main_window_ref, 'font_map') and main_window_ref.font_map:
+            if is_editor and hasattr(main_window_ref, 'font_map') and main_window_ref.font_map:
                 extra_part_width = self.editor.pixel_width_display_area_width
-            elif self.editor.objectName() == "preview_text_edit":
+            elif is_preview:
                 extra_part_width = self.editor.preview_indicator_area_width
 
             number_part_width = total_area_width - extra_part_width
@@ -54,6 +218,7 @@ class LNETLineNumberAreaPaintLogic:
             odd_bg_color_const = self.editor.lineNumberArea.odd_line_background
             even_bg_color_const = self.editor.lineNumberArea.even_line_background
             number_text_color_const = self.editor.lineNumberArea.number_color
+            width_text_color = QColor(Qt.darkGray) if theme == 'light' else QColor(Qt.darkGray).darker(120)
 
             current_block_idx_data_mw = -1
             current_string_idx_data_mw = -1
@@ -61,45 +226,57 @@ class LNETLineNumberAreaPaintLogic:
                 current_block_idx_data_mw = main_window_ref.data_store.current_block_idx
                 current_string_idx_data_mw = main_window_ref.data_store.current_string_idx
 
-            # Prepare mapping for string-level zebra striping if in Review Dialog
-            string_color_map = {}
             is_dual_column = hasattr(self.editor, 'custom_subline_numbers') and self.editor.custom_subline_numbers is not None
-            if is_dual_column and hasattr(self.editor, 'custom_line_numbers') and self.editor.custom_line_numbers:
-                unique_strings = []
-                seen = set()
-                for snum in self.editor.custom_line_numbers:
-                    if snum is not None and snum not in seen:
-                        unique_strings.append(snum)
-                        seen.add(snum)
-                string_color_map = {snum: i % 2 for i, snum in enumerate(unique_strings)}
+
+            cache_key = self._render_context_key(main_window_ref, problem_definitions, detection_config, is_editor, is_preview)
+            self._prepare_render_cache(cache_key, main_window_ref, is_preview, is_dual_column, current_block_idx_data_mw)
+
+            # The string's font map is the same for every line; look it up on the first miss only
+            font_map_holder = []
+            def font_map_getter():
+                if not font_map_holder:
+                    font_map_holder.append(main_window_ref.helper.get_font_map_for_string(current_block_idx_data_mw, current_string_idx_data_mw))
+                return font_map_holder[0]
+
+            displayed_indices = None
+            if is_preview and hasattr(main_window_ref, 'data_store'):
+                displayed_indices = main_window_ref.data_store.displayed_string_indices
 
             while current_q_block.isValid() and top <= event.rect().bottom():
                 if current_q_block.isVisible() and bottom >= event.rect().top():
                     line_height = int(self.editor.blockBoundingRect(current_q_block).height())
-                    
-                    is_preview = self.editor.objectName() == "preview_text_edit"
-                    is_editor = self.editor.objectName() in["original_text_edit", "edited_text_edit"]
-                    
-                    real_idx = current_q_block_number_in_editor_doc
-                    if is_preview and hasattr(main_window_ref, 'data_store') and main_window_ref.data_store.displayed_string_indices:
-                        if 0 <= current_q_block_number_in_editor_doc < len(main_window_ref.data_store.displayed_string_indices):
-                            real_idx = main_window_ref.data_store.displayed_string_indices[current_q_block_number_in_editor_doc]
+                    block_number = current_q_block_number_in_editor_doc
+
+                    real_idx = block_number
+                    if displayed_indices:
+                        if 0 <= block_number < len(displayed_indices):
+                            real_idx = displayed_indices[block_number]
                         else:
                             real_idx = -1
 
+                    state = self._render_cache.get(block_number) if cache_key is not None else None
+                    if state is None:
+                        state = self._build_line_state(
+                            current_q_block, block_number, real_idx, main_window_ref, problem_definitions,
+                            detection_config, is_editor, is_preview, is_dual_column, extra_part_width,
+                            current_block_idx_data_mw, current_string_idx_data_mw, font_map_getter,
+                        )
+                        if cache_key is not None:
+                            self._render_cache[block_number] = state
+
                     # 1. Determine background colors
                     # Subline-level zebra (right column)
                     bg_color_subline_zebra = even_bg_color_const
-                    if (current_q_block_number_in_editor_doc + 1) % 2 != 0:
+                    if (block_number + 1) % 2 != 0:
                         bg_color_subline_zebra = odd_bg_color_const
-                    
+
                     # String-level zebra (left column in review mode)
                     bg_color_string_zebra = bg_color_subline_zebra
                     if is_dual_column:
-                        if current_q_block_number_in_editor_doc < len(self.editor.custom_line_numbers):
-                            snum = self.editor.custom_line_numbers[current_q_block_number_in_editor_doc]
+                        if block_number < len(self.editor.custom_line_numbers):
+                            snum = self.editor.custom_line_numbers[block_number]
                             if snum is not None:
-                                color_idx = string_color_map.get(snum, 0)
+                                color_idx = self._string_color_map.get(snum, 0)
                                 bg_color_string_zebra = odd_bg_color_const if color_idx != 0 else even_bg_color_const
                             else:
                                 bg_color_string_zebra = even_bg_color_const # Spacer lines white
@@ -107,104 +284,51 @@ class LNETLineNumberAreaPaintLogic:
                     bg_color_number_area = bg_color_subline_zebra
                     bg_color_extra_info_area = bg_color_number_area
 
-                    # 2. Determine display numbers
-                    display_number_for_line_area = ""
-                    subline_number_text = ""
-                    
-                    if hasattr(self.editor, 'custom_line_numbers') and self.editor.custom_line_numbers:
-                        if current_q_block_number_in_editor_doc < len(self.editor.custom_line_numbers):
-                            custom_num = self.editor.custom_line_numbers[current_q_block_number_in_editor_doc]
-                            display_number_for_line_area = str(custom_num) if custom_num is not None else ""
-                    else:
-                        display_number_for_line_area = str(current_q_block_number_in_editor_doc + 1)
-
-                    if is_dual_column:
-                        if current_q_block_number_in_editor_doc < len(self.editor.custom_subline_numbers):
-                            sub_num = self.editor.custom_subline_numbers[current_q_block_number_in_editor_doc]
-                            subline_number_text = str(sub_num) if sub_num is not None else ""
-
-                    # 3. Handle unsaved status
-                    is_unsaved = False
-                    if is_preview:
-                        if hasattr(main_window_ref, 'data_store') and (current_block_idx_data_mw, real_idx) in main_window_ref.data_store.edited_data:
-                            is_unsaved = True
-                    elif is_editor and current_string_idx_data_mw != -1:
-                        edited_sublines = getattr(main_window_ref, 'edited_sublines', set())
-                        if current_q_block_number_in_editor_doc in edited_sublines:
-                            is_unsaved = True
-
-                    if is_unsaved and display_number_for_line_area:
-                        display_number_for_line_area = f"* {display_number_for_line_area}"
-
-                    # 4. Painting
+                    # 2. Painting
                     number_part_rect = QRect(0, top, number_part_width, line_height)
                     extra_info_part_rect = QRect(number_part_width, top, extra_part_width, line_height)
 
                     if is_dual_column:
                         # Dynamic split based on font metrics
                         fm = painter.fontMetrics()
-                        max_str_idx = 1
-                        if hasattr(self.editor, 'custom_line_numbers') and self.editor.custom_line_numbers:
-                            vals = [v for v in self.editor.custom_line_numbers if v is not None]
-                            if vals: max_str_idx = max(vals)
-                        
-                        str_digits = len(str(max_str_idx))
+                        str_digits = len(str(self._max_custom_line_number))
                         # Room for asterisk if needed
-                        asterisk_room = fm.horizontalAdvance('* ') if is_unsaved else 0
+                        asterisk_room = fm.horizontalAdvance('* ') if state.is_unsaved else 0
                         left_col_w = asterisk_room + fm.horizontalAdvance('9') * str_digits + 12
                         right_col_w = number_part_width - left_col_w
-                        
+
                         painter.fillRect(0, top, left_col_w, line_height, bg_color_string_zebra)
                         painter.fillRect(left_col_w, top, right_col_w, line_height, bg_color_subline_zebra)
-                        
+
                         painter.setPen(number_text_color_const)
-                        painter.drawText(QRect(0, top, left_col_w - 5, line_height), Qt.AlignRight | Qt.AlignVCenter, display_number_for_line_area)
-                        
+                        painter.drawText(QRect(0, top, left_col_w - 5, line_height), Qt.AlignRight | Qt.AlignVCenter, state.number_text)
+
                         subline_pen = QColor(number_text_color_const)
                         subline_pen.setAlpha(150)
                         painter.setPen(subline_pen)
-                        painter.drawText(QRect(left_col_w, top, right_col_w - 3, line_height), Qt.AlignRight | Qt.AlignVCenter, subline_number_text)
+                        painter.drawText(QRect(left_col_w, top, right_col_w - 3, line_height), Qt.AlignRight | Qt.AlignVCenter, state.subline_text)
                     else:
                         painter.fillRect(number_part_rect, bg_color_number_area)
                         painter.setPen(number_text_color_const)
-                        painter.drawText(QRect(0, top, number_part_width - 3, line_height), Qt.AlignRight | Qt.AlignVCenter, display_number_for_line_area)
+                        painter.drawText(QRect(0, top, number_part_width - 3, line_height), Qt.AlignRight | Qt.AlignVCenter, state.number_text)
 
                     # Problem markers
-                    problem_ids = set()
-                    if isinstance(main_window_ref, QMainWindow) and hasattr(main_window_ref, 'data_store') and hasattr(main_window_ref.data_store, 'problems_per_subline'):
-                        probs_dict = main_window_ref.data_store.problems_per_subline
-                        if is_editor:
-                            problem_key = (current_block_idx_data_mw, current_string_idx_data_mw, current_q_block_number_in_editor_doc)
-                            problem_ids = probs_dict.get(problem_key, set())
-                        elif is_preview:
-                            for key, p_set in probs_dict.items():
-                                if key[0] == current_block_idx_data_mw and key[1] == real_idx:
-                                    problem_ids.update(p_set)
-
-                    filtered_problems = {p_id for p_id in problem_ids if detection_config.get(p_id, True)}
-                    if is_editor and filtered_problems:
-                        sorted_probs = sorted(list(filtered_problems), key=lambda pid: problem_definitions.get(pid, {}).get("priority", 99))
-                        bg_color = QColor(problem_definitions.get(sorted_probs[0], {}).get("color", Qt.transparent))
-                        bg_color.setAlpha(160)
-                        painter.fillRect(extra_info_part_rect, bg_color)
-                        
-                        # Handle additional problem stripes if needed (omitted for brevity, can be restored if user wants)
+                    if state.marker_color is not None:
+                        painter.fillRect(extra_info_part_rect, state.marker_color)
                     else:
                         painter.fillRect(extra_info_part_rect, bg_color_extra_info_area)
 
                     # Extra display: pixel width or indicators
                     if extra_part_width > 0:
-                        if is_editor and hasattr(main_window_ref, 'font_map') and main_window_ref.font_map:
-                            font_map = main_window_ref.helper.get_font_map_for_string(current_block_idx_data_mw, current_string_idx_data_mw)
-                            pixel_width = calculate_string_width(convert_dots_to_spaces_from_editor(current_q_block.text()).rstrip(), font_map, icon_sequences=getattr(main_window_ref, 'icon_sequences', []))
-                            painter.setPen(QColor(Qt.darkGray) if theme == 'light' else QColor(Qt.darkGray).darker(120))
-                            painter.drawText(QRect(number_part_width, top, extra_part_width - 3, line_height), Qt.AlignRight | Qt.AlignVCenter, str(pixel_width))
+                        if state.width_text:
+                            painter.setPen(width_text_color)
+                            painter.drawText(QRect(number_part_width, top, extra_part_width - 3, line_height), Qt.AlignRight | Qt.AlignVCenter, state.width_text)
                         elif is_preview:
                             # Draw metadata indicators in preview area
                             string_meta = {}
                             if hasattr(main_window_ref, 'data_store') and hasattr(main_window_ref.data_store, 'string_metadata'):
                                 string_meta = main_window_ref.data_store.string_metadata.get((current_block_idx_data_mw, real_idx), {})
-                            
+
                             indicator_x_start = number_part_width + 2
                             has_custom_font = "font_file" in string_meta
                             has_custom_width = "width" in string_meta
@@ -222,18 +346,13 @@ class LNETLineNumberAreaPaintLogic:
                                 indicator_x_start += self.editor.lineNumberArea.preview_indicator_width + self.editor.lineNumberArea.preview_indicator_spacing
 
                             # Preview area warning stripes
-                            if filtered_problems:
-                                s_x = indicator_x_start
-                                s_w = 4
-                                for p_id in sorted(list(filtered_problems), key=lambda pid: problem_definitions.get(pid, {}).get("priority", 99)):
-                                    p_def = problem_definitions.get(p_id, {})
-                                    s_color = QColor(p_def.get("color", Qt.transparent))
-                                    if s_color.isValid():
-                                        s_color.setAlpha(220)
-                                        painter.fillRect(s_x, top + 2, s_w, line_height - 4, s_color)
-                                        s_x += s_w + 1
-                                        if s_x + s_w > indicator_x_start + 15:
-                                            break
+                            s_x = indicator_x_start
+                            s_w = 4
+                            for s_color in state.stripe_colors:
+                                painter.fillRect(s_x, top + 2, s_w, line_height - 4, s_color)
+                                s_x += s_w + 1
+                                if s_x + s_w > indicator_x_start + 15:
+                                    break
 
                 current_q_block = current_q_block.next()
                 top = bottom
@@ -244,4 +363,4 @@ class LNETLineNumberAreaPaintLogic:
             from utils.logging_utils import log_error
             log_error(f"Error in LineNumberAreaPaintLogic: {e}", exc_info=True)
         finally:
-            painter.end()
\ No newline at end of file
+            painter.end()
@@ -208,15 +208,23 @@ class LineNumberedTextEdit(QPlainTextEdit):
         self._last_clicked_line = -1
         if hasattr(self, 'highlightManager'):
             self.highlightManager.clearAllHighlights()
-        super().setPlainText(text)
-        # If we have an active glossary, we must re-trigger highlighting
-        # because set_glossary_manager ran while the editor was empty,
-        # so rehighlight() did nothing at that time.
-        if text and hasattr(self, 'highlighter') and self.highlighter:
-            highlighter = self.highlighter
-            if getattr(highlighter, '_glossary_enabled', False):
+        highlighter = getattr(self, 'highlighter', None)
+        if highlighter is None:
+            super().setPlainText(text)
+            return
+        with highlighter.deferred_offscreen():
+            super().setPlainText(text)
+            # If we have an active glossary, we must re-trigger highlighting
+            # because set_glossary_manager ran while the editor was empty,
+            # so rehighlight() did nothing at that time.
+            if text and getattr(highlighter, '_glossary_enabled', False):
                 highlighter.rehighlight()
 
+    def enable_viewport_highlighting(self) -> None:
+        """For long read-only views: syntax-highlight only the rows around the viewport."""
+        if hasattr(self, 'highlighter') and self.highlighter:
+            self.highlighter.set_viewport_editor(self)
+
     def reset_selection_state(self):
         """Explicitly reset all selection tracking and visual highlights."""
         self._selected_lines.clear()
@@ -373,12 +381,16 @@ class LineNumberedTextEdit(QPlainTextEdit):
         if hasattr(self, 'lineNumberArea'): 
             if dy: self.lineNumberArea.scroll(0, dy)
             else: self.lineNumberArea.update(0, 0, self.lineNumberArea.width(), self.lineNumberArea.height())
+        if hasattr(self, 'highlightManager'):
+            self.highlightManager.refresh_zebra_window()
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
         cr = self.contentsRect()
         if hasattr(self, 'lineNumberArea'): 
             self.lineNumberArea.setGeometry(QRect(cr.left(), cr.top(), self.lineNumberAreaWidth(), cr.height()))
+        if hasattr(self, 'highlightManager'):
+            self.highlightManager.refresh_zebra_window()
         if self.isVisible():
             self.viewport().update()
 
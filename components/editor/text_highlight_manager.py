@@ -9,6 +9,9 @@ import re
 from utils.logging_utils import log_debug
 
 class TextHighlightManager:
+    # Zebra stripes cover the viewport plus this many pages either side
+    ZEBRA_WINDOW_PAGES = 2
+
     def __init__(self, editor):
         self.editor = editor
         
@@ -27,6 +30,7 @@ class TextHighlightManager:
         self._empty_odd_subline_selections = []
         self._zebra_selections = []
         self._categorized_line_selections = []
+        self._zebra_window: Optional[Tuple[int, int]] = None
         
         self._tag_highlight_timer = QTimer()
         self._tag_highlight_timer.setSingleShot(True)
@@ -387,9 +391,15 @@ class TextHighlightManager:
         self._width_exceed_char_selections = [] 
         self._empty_odd_subline_selections = []
         self._zebra_selections = [] # Added _zebra_selections
+        self._zebra_window = None
         self._categorized_line_selections = []
         self.applyHighlights()
 
+    def _visible_block_range(self) -> Tuple[int, int]:
+        first = self.editor.cursorForPosition(QPoint(0, 0)).blockNumber()
+        last = self.editor.cursorForPosition(QPoint(0, self.editor.viewport().height())).blockNumber()
+        return first, last
+
     def update_zebra_stripes(self):
         new_selections = []
         doc = self.editor.document()
@@ -398,20 +408,40 @@ class TextHighlightManager:
         
         if not odd_color or not even_color:
             self._zebra_selections = [] # Clear if colors are not set
+            self._zebra_window = None
             self.applyHighlights()
             return
 
-        for i in range(doc.blockCount()):
-            block = doc.findBlockByNumber(i)
+        # Only rows around the viewport get a selection; refresh_zebra_window()
+        # moves the window on scroll, so long previews don't carry one per row
+        first, last = self._visible_block_range()
+        margin = max(1, last - first + 1) * self.ZEBRA_WINDOW_PAGES
+        start = max(0, first - margin)
+        end = min(doc.blockCount() - 1, last + margin)
+        selected_lines = set(self._current_selected_lines)
+
+        block = doc.findBlockByNumber(start)
+        while block.isValid() and block.blockNumber() <= end:
+            i = block.blockNumber()
             is_odd = i % 2 != 0
             color = odd_color if is_odd else even_color
             
             # Only add if the line is not currently selected by preview_selected_line_highlight
             # and if the color is valid (not transparent or fully opaque alpha 0)
-            if color and color != Qt.transparent and color.alpha() != 0 and i not in self._current_selected_lines:
+            if color and color != Qt.transparent and color.alpha() != 0 and i not in selected_lines:
                 selection = self._create_block_background_selection(block, color, use_full_width=True)
                 if selection:
                     new_selections.append(selection)
+            block = block.next()
 
         self._zebra_selections = new_selections
-        self.applyHighlights()
\ No newline at end of file
+        self._zebra_window = (start, end)
+        self.applyHighlights()
+
+    def refresh_zebra_window(self):
+        """Rebuild the zebra stripes once the viewport leaves the rows they cover."""
+        if self._zebra_window is None:
+            return
+        first, last = self._visible_block_range()
+        if first < self._zebra_window[0] or last > self._zebra_window[1]:
+            self.update_zebra_stripes()
@@ -0,0 +1,182 @@
+# --- START OF FILE components/glossary_analytics_dialog.py ---
+"""Dialog showing glossary term frequency, coverage and candidate terms."""
+from __future__ import annotations
+
+from typing import List, Optional
+
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QProgressBar,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QTabWidget,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.glossary_analytics import CandidateTerm, GlossaryAnalyticsReport
+
+
+class GlossaryAnalyticsDialog(QDialog):
+    """Shows the latest analytics report; candidates can be sent to the AI glossary builder."""
+
+    cancel_requested = pyqtSignal()
+    build_requested = pyqtSignal(list)  # [CandidateTerm, ...]
+
+    TERM_COLUMNS = ("Term", "Translation", "Occurrences", "Strings", "Translated", "Consistent", "Coverage %")
+    CANDIDATE_COLUMNS = ("Candidate", "Words", "Occurrences", "Strings", "Example")
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        # Handle mocking in tests
+        if parent is not None and (not isinstance(parent, QWidget) or "Mock" in str(type(parent))):
+            parent = None
+        super().__init__(parent)
+        self.setWindowTitle("Glossary Analytics")
+        self.resize(960, 600)
+        self._candidates: List[CandidateTerm] = []
+        self._running = False
+
+        layout = QVBoxLayout(self)
+        self._status_label = QLabel("", self)
+        layout.addWidget(self._status_label)
+        self._progress_bar = QProgressBar(self)
+        layout.addWidget(self._progress_bar)
+
+        self._tabs = QTabWidget(self)
+        self.terms_table = self._create_table(self.TERM_COLUMNS)
+        self.candidates_table = self._create_table(self.CANDIDATE_COLUMNS)
+        self.candidates_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.candidates_table.itemSelectionChanged.connect(self._update_build_button)
+        self._tabs.addTab(self.terms_table, "Glossary Terms")
+        self._tabs.addTab(self.candidates_table, "Candidate Terms")
+        layout.addWidget(self._tabs, 1)
+
+        buttons = QHBoxLayout()
+        self._build_button = QPushButton("Build Glossary from Selected...", self)
+        self._build_button.setToolTip("Send the selected candidates with an example line to the AI glossary builder")
+        self._build_button.setEnabled(False)
+        self._build_button.clicked.connect(self._on_build_clicked)
+        buttons.addWidget(self._build_button)
+        buttons.addStretch(1)
+        self._stop_button = QPushButton("Stop", self)
+        self._stop_button.clicked.connect(self.cancel_requested)
+        buttons.addWidget(self._stop_button)
+        close_button = QPushButton("Close", self)
+        close_button.clicked.connect(self.reject)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+    def _create_table(self, columns) -> QTableWidget:
+        table = QTableWidget(0, len(columns), self)
+        table.setHorizontalHeaderLabels(columns)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setSortingEnabled(True)
+        table.verticalHeader().setVisible(False)
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setStretchLastSection(True)
+        return table
+
+    def begin(self, total_blocks: int) -> None:
+        self._running = True
+        self._progress_bar.setRange(0, max(1, total_blocks))
+        self._progress_bar.setValue(0)
+        self._stop_button.setEnabled(True)
+        self._status_label.setText(f"Analyzing {total_blocks} blocks...")
+
+    def set_progress(self, processed: int, total: int) -> None:
+        self._progress_bar.setRange(0, max(1, total))
+        self._progress_bar.setValue(processed)
+
+    def show_report(self, report: GlossaryAnalyticsReport) -> None:
+        rows = []
+        for stats in report.terms:
+            coverage = stats.coverage
+            rows.append((
+                stats.entry.original,
+                stats.entry.translation,
+                stats.occurrences,
+                stats.strings,
+                stats.translated_strings,
+                stats.consistent_strings,
+                round(coverage * 100, 1) if coverage is not None else "",
+            ))
+        self._fill_table(self.terms_table, rows)
+
+        self._candidates = list(report.candidates)
+        self._fill_table(self.candidates_table, [
+            (c.text, c.word_count, c.occurrences, c.strings, c.example) for c in self._candidates
+        ])
+        self._update_build_button()
+        if self._running:
+            self._status_label.setText(f"{report.strings_analyzed} strings analyzed so far...")
+
+    def _fill_table(self, table: QTableWidget, rows) -> None:
+        # Sorting is suspended while rows are filled so indices stay valid;
+        # column 0 keeps the row's index into the report in UserRole
+        header = table.horizontalHeader()
+        sort_column, sort_order = header.sortIndicatorSection(), header.sortIndicatorOrder()
+        table.setSortingEnabled(False)
+        table.setUpdatesEnabled(False)
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for col, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                if col == 0:
+                    item.setData(Qt.UserRole, row)
+                table.setItem(row, col, item)
+        table.setUpdatesEnabled(True)
+        table.setSortingEnabled(True)
+        if sort_column >= 0:
+            table.sortItems(sort_column, sort_order)
+
+    def finish(self, report: Optional[GlossaryAnalyticsReport], cancelled: bool = False, error: Optional[str] = None) -> None:
+        self._running = False
+        self._stop_button.setEnabled(False)
+        if error:
+            self._status_label.setText(f"Analysis failed: {error}")
+        elif report is not None:
+            self.show_report(report)
+            prefix = "Stopped" if cancelled else "Done"
+            self._status_label.setText(
+                f"{prefix}: {report.strings_analyzed} strings, "
+                f"{len(report.candidates)} candidate terms"
+            )
+        elif cancelled:
+            self._status_label.setText("Stopped")
+        self.terms_table.resizeColumnsToContents()
+        self.candidates_table.resizeColumnsToContents()
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def selected_candidates(self) -> List[CandidateTerm]:
+        rows = sorted({index.row() for index in self.candidates_table.selectedIndexes()})
+        selected = []
+        for row in rows:
+            item = self.candidates_table.item(row, 0)
+            index = item.data(Qt.UserRole) if item is not None else None
+            if index is not None and 0 <= index < len(self._candidates):
+                selected.append(self._candidates[index])
+        return selected
+
+    def _update_build_button(self) -> None:
+        self._build_button.setEnabled(bool(self.candidates_table.selectedIndexes()))
+
+    def _on_build_clicked(self) -> None:
+        selected = self.selected_candidates()
+        if selected:
+            self.build_requested.emit(selected)
+
+    def reject(self) -> None:
+        if self._running:
+            self.cancel_requested.emit()
+        super().reject()
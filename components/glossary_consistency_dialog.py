@@ -0,0 +1,148 @@
+# --- START OF FILE components/glossary_consistency_dialog.py ---
+"""Dialog listing strings whose translation ignores the glossary."""
+from __future__ import annotations
+
+from typing import Callable, Optional, Sequence
+
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QProgressBar,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.glossary_consistency import GlossaryViolation
+
+
+class GlossaryConsistencyDialog(QDialog):
+    """Streams violations from the consistency worker into a sortable table."""
+
+    cancel_requested = pyqtSignal()
+
+    COLUMNS = ("Block", "String", "Term", "Expected", "Original", "Translation")
+
+    def __init__(
+        self,
+        parent: Optional[QWidget] = None,
+        jump_callback: Optional[Callable[[GlossaryViolation], None]] = None,
+    ) -> None:
+        # Handle mocking in tests
+        if parent is not None and (not isinstance(parent, QWidget) or "Mock" in str(type(parent))):
+            parent = None
+        super().__init__(parent)
+        self.setWindowTitle("Glossary Consistency")
+        self.resize(960, 560)
+        self._jump_callback = jump_callback
+        self._violations: list[GlossaryViolation] = []
+        self._running = False
+
+        layout = QVBoxLayout(self)
+        self._status_label = QLabel("", self)
+        layout.addWidget(self._status_label)
+        self._progress_bar = QProgressBar(self)
+        layout.addWidget(self._progress_bar)
+
+        self.table = QTableWidget(0, len(self.COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSortingEnabled(True)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setStretchLastSection(True)
+        self.table.itemDoubleClicked.connect(self._on_item_activated)
+        layout.addWidget(self.table, 1)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch(1)
+        self._stop_button = QPushButton("Stop", self)
+        self._stop_button.clicked.connect(self.cancel_requested)
+        buttons.addWidget(self._stop_button)
+        close_button = QPushButton("Close", self)
+        close_button.clicked.connect(self.reject)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+    def begin(self, total: int) -> None:
+        self._running = True
+        self._violations = []
+        self.table.setRowCount(0)
+        self._progress_bar.setRange(0, max(1, total))
+        self._progress_bar.setValue(0)
+        self._stop_button.setEnabled(True)
+        self._status_label.setText(f"Checking {total} translated strings...")
+
+    def add_violations(self, violations: Sequence[GlossaryViolation]) -> None:
+        # Sorting is suspended while rows are appended so indices stay valid
+        self.table.setSortingEnabled(False)
+        self.table.setUpdatesEnabled(False)
+        row = self.table.rowCount()
+        self.table.setRowCount(row + len(violations))
+        for violation in violations:
+            index = len(self._violations)
+            self._violations.append(violation)
+            values = (
+                violation.block_idx + 1,
+                violation.string_idx + 1,
+                violation.entry.original,
+                violation.entry.translation,
+                violation.original_line,
+                violation.translation_text.replace('\n', ' '),
+            )
+            for col, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                if col == 0:
+                    item.setData(Qt.UserRole, index)
+                self.table.setItem(row, col, item)
+            row += 1
+        self.table.setUpdatesEnabled(True)
+        self.table.setSortingEnabled(True)
+        self._status_label.setText(f"{len(self._violations)} violations so far...")
+
+    def set_progress(self, processed: int, total: int) -> None:
+        self._progress_bar.setRange(0, max(1, total))
+        self._progress_bar.setValue(processed)
+
+    def finish(self, cancelled: bool = False, error: Optional[str] = None) -> None:
+        self._running = False
+        self._stop_button.setEnabled(False)
+        count = len(self._violations)
+        if error:
+            self._status_label.setText(f"Check failed: {error} ({count} violations found)")
+        elif cancelled:
+            self._status_label.setText(f"Stopped: {count} violations found")
+        elif count:
+            self._status_label.setText(f"{count} violations")
+        else:
+            self._status_label.setText("All glossary terms are translated consistently")
+        self.table.resizeColumnsToContents()
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def violation_for_row(self, row: int) -> Optional[GlossaryViolation]:
+        item = self.table.item(row, 0)
+        if item is None:
+            return None
+        index = item.data(Qt.UserRole)
+        return self._violations[index] if index is not None else None
+
+    def _on_item_activated(self, item: QTableWidgetItem) -> None:
+        violation = self.violation_for_row(item.row())
+        if violation is not None and self._jump_callback:
+            self._jump_callback(violation)
+
+    def reject(self) -> None:
+        if self._running:
+            self.cancel_requested.emit()
+        super().reject()
@@ -5,8 +5,9 @@ import json
 from html import escape
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
-from PyQt5.QtCore import Qt, QRect, QSize, QTimer
+from PyQt5.QtCore import Qt, QRect, QSize, QStringListModel, QTimer
 from PyQt5.QtWidgets import (
+    QCompleter,
     QDialog,
     QDialogButtonBox,
     QHBoxLayout,
@@ -98,6 +99,7 @@ class GlossaryDialog(QDialog):
             Callable[[str], Optional[Tuple[Sequence[GlossaryEntry], Dict[str, List[GlossaryOccurrence]]]]]
         ] = None,
         ai_variation_callback: Optional[Callable[[GlossaryEntry], None]] = None,
+        completion_callback: Optional[Callable[[str], Sequence[str]]] = None,
         initial_term: Optional[str] = None,
     ) -> None:
         super().__init__(parent)
@@ -124,6 +126,7 @@ class GlossaryDialog(QDialog):
         self._update_callback = update_callback
         self._delete_callback = delete_callback
         self._ai_variation_callback = ai_variation_callback
+        self._completion_callback = completion_callback
         self._initial_term = initial_term
         self._pending_select_term: Optional[str] = None
         self._is_populating = False
@@ -139,6 +142,13 @@ class GlossaryDialog(QDialog):
         self._search_field = QLineEdit(self)
         self._search_field.setPlaceholderText("Type a term or translation...")
         self._search_field.textChanged.connect(self._apply_filter)
+        self._completion_model = QStringListModel(self)
+        if completion_callback:
+            # Suggestions come pre-filtered from the glossary's prefix index
+            completer = QCompleter(self._completion_model, self)
+            completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+            self._search_field.setCompleter(completer)
+            self._search_field.textEdited.connect(self._update_completions)
         search_layout.addWidget(self._search_field, 1)
         layout.addLayout(search_layout)
 
@@ -547,6 +557,16 @@ class GlossaryDialog(QDialog):
             self._notes_variation_button.setEnabled(False)
         self._mark_editor_dirty(False)
         self._update_editor_enabled_state()
+    def _update_completions(self, text: str) -> None:
+        suggestions = list(self._completion_callback(text)) if text.strip() else []
+        if suggestions == [text]:
+            suggestions = []
+        self._completion_model.setStringList(suggestions)
+        completer = self._search_field.completer()
+        if suggestions:
+            completer.complete()
+        else:
+            completer.popup().hide()
     def _apply_filter(self, text: str) -> None:
         pattern = text.strip().lower()
         if not pattern:
@@ -1,17 +1,22 @@
 # --- START OF FILE components/search_panel.py ---
 from PyQt5.QtWidgets import (
-    QWidget, QHBoxLayout, QVBoxLayout, QComboBox, QPushButton,
-    QCheckBox, QLabel, QSpacerItem, QSizePolicy
+    QWidget, QHBoxLayout, QVBoxLayout, QComboBox, QPushButton, QLineEdit,
+    QCheckBox, QLabel, QSpacerItem, QSizePolicy, QListWidget, QListWidgetItem
 )
 from PyQt5.QtCore import Qt, pyqtSignal
 import collections
 
 class SearchPanelWidget(QWidget):
-    find_next_requested = pyqtSignal(str, bool, bool, bool, bool) # + is_fuzzy
-    find_previous_requested = pyqtSignal(str, bool, bool, bool, bool) # + is_fuzzy
+    find_next_requested = pyqtSignal(str, bool, bool, bool, bool, bool) # + is_fuzzy, is_regex
+    find_previous_requested = pyqtSignal(str, bool, bool, bool, bool, bool) # + is_fuzzy, is_regex
+    find_all_requested = pyqtSignal(str, bool, bool, bool, bool, bool)
+    replace_all_requested = pyqtSignal(str, str, bool, bool) # query, replacement, case_sensitive, is_regex
+    find_all_cancel_requested = pyqtSignal()
+    result_activated = pyqtSignal(int) # index into SearchHandler.search_results
     close_requested = pyqtSignal()
 
     MAX_HISTORY_ITEMS = 20
+    RESULTS_LIST_HEIGHT = 160
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -20,9 +25,13 @@ class SearchPanelWidget(QWidget):
         self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
 
         self.search_history = collections.deque(maxlen=self.MAX_HISTORY_ITEMS)
+        self._find_all_running = False
 
-        main_layout = QHBoxLayout(self)
-        main_layout.setContentsMargins(5, 5, 5, 5)
+        outer_layout = QVBoxLayout(self)
+        outer_layout.setContentsMargins(5, 5, 5, 5)
+        outer_layout.setSpacing(5)
+
+        main_layout = QHBoxLayout()
         main_layout.setSpacing(10)
 
         self.search_query_edit = QComboBox(self)
@@ -32,10 +41,13 @@ class SearchPanelWidget(QWidget):
         
         self.find_next_button = QPushButton("Next", self)
         self.find_previous_button = QPushButton("Prev", self)
+        self.find_all_button = QPushButton("All", self)
+        self.find_all_button.setToolTip("Find all matches in the project")
         
         button_width = 75 
         self.find_next_button.setFixedWidth(button_width)
         self.find_previous_button.setFixedWidth(button_width)
+        self.find_all_button.setFixedWidth(button_width)
         
         self.case_sensitive_checkbox = QCheckBox("Aa", self)
         self.case_sensitive_checkbox.setToolTip("Case sensitive")
@@ -50,6 +62,15 @@ class SearchPanelWidget(QWidget):
         self.fuzzy_search_checkbox = QCheckBox("Fuzzy", self)
         self.fuzzy_search_checkbox.setToolTip("Search for similar words (ignores endings)")
 
+        self.regex_checkbox = QCheckBox("Regex", self)
+        self.regex_checkbox.setToolTip("Treat the query as a regular expression")
+
+        self.replace_query_edit = QLineEdit(self)
+        self.replace_query_edit.setPlaceholderText("Replace with...")
+        self.replace_query_edit.setToolTip("Replacement text; in regex mode \\1 or \\g<name> insert groups")
+        self.replace_all_button = QPushButton("Replace All", self)
+        self.replace_all_button.setToolTip("Replace every match in the translation (raw text, tags included)")
+
         self.status_label = QLabel("", self)
         self.status_label.setMinimumWidth(100) 
         self.status_label.setAlignment(Qt.AlignCenter)
@@ -62,11 +83,13 @@ class SearchPanelWidget(QWidget):
         left_layout.addWidget(self.search_query_edit)
         left_layout.addWidget(self.find_previous_button)
         left_layout.addWidget(self.find_next_button)
+        left_layout.addWidget(self.find_all_button)
         
         options_layout = QHBoxLayout()
         options_layout.setSpacing(8)
         options_layout.addWidget(self.case_sensitive_checkbox)
         options_layout.addWidget(self.fuzzy_search_checkbox)
+        options_layout.addWidget(self.regex_checkbox)
         options_layout.addWidget(self.search_in_original_checkbox)
         options_layout.addWidget(self.ignore_tags_newlines_checkbox)
         options_layout.addSpacerItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
@@ -76,8 +99,28 @@ class SearchPanelWidget(QWidget):
         main_layout.addWidget(self.status_label, 2) 
         main_layout.addWidget(self.close_search_panel_button) 
 
+        replace_layout = QHBoxLayout()
+        replace_layout.addWidget(self.replace_query_edit)
+        replace_layout.addWidget(self.replace_all_button)
+        replace_layout.addSpacerItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
+
+        self.results_list = QListWidget(self)
+        self.results_list.setFixedHeight(self.RESULTS_LIST_HEIGHT)
+        self.results_list.setUniformItemSizes(True)
+        self.results_list.setVisible(False)
+
+        outer_layout.addLayout(main_layout)
+        outer_layout.addLayout(replace_layout)
+        outer_layout.addWidget(self.results_list)
+
         self.find_next_button.clicked.connect(self._on_find_next)
         self.find_previous_button.clicked.connect(self._on_find_previous)
+        self.find_all_button.clicked.connect(self._on_find_all)
+        self.replace_all_button.clicked.connect(self._on_replace_all)
+        self.fuzzy_search_checkbox.toggled.connect(lambda checked: checked and self.regex_checkbox.setChecked(False))
+        self.regex_checkbox.toggled.connect(lambda checked: checked and self.fuzzy_search_checkbox.setChecked(False))
+        self.results_list.itemActivated.connect(self._on_result_item_activated)
+        self.results_list.itemClicked.connect(self._on_result_item_activated)
         self.search_query_edit.lineEdit().returnPressed.connect(self._on_find_next)
         self.search_query_edit.activated[str].connect(self._on_find_next_from_combobox_activation)
         self.close_search_panel_button.clicked.connect(self.close_requested)
@@ -116,11 +159,7 @@ class SearchPanelWidget(QWidget):
         return list(self.search_history)
 
     def _on_find_next(self):
-        query = self.search_query_edit.currentText()
-        case_sensitive = self.case_sensitive_checkbox.isChecked()
-        search_in_original = self.search_in_original_checkbox.isChecked()
-        ignore_tags = self.ignore_tags_newlines_checkbox.isChecked()
-        is_fuzzy = self.fuzzy_search_checkbox.isChecked()
+        query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex = self.get_search_parameters()
         if query:
             self._add_to_history(query)
             # Emitting is_fuzzy via signal might require signal change, 
@@ -130,31 +169,83 @@ class SearchPanelWidget(QWidget):
             # Since we are changing the signal class, it's better to update the definition.
             # BUT, to not break compatibility with ui_setup.py where connection is via connect,
             # we update the signal definition at the top of the file (see above).
-            self.find_next_requested.emit(query, case_sensitive, search_in_original, ignore_tags, is_fuzzy)
+            self.find_next_requested.emit(query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex)
 
     def _on_find_previous(self):
-        query = self.search_query_edit.currentText()
-        case_sensitive = self.case_sensitive_checkbox.isChecked()
-        search_in_original = self.search_in_original_checkbox.isChecked()
-        ignore_tags = self.ignore_tags_newlines_checkbox.isChecked()
-        is_fuzzy = self.fuzzy_search_checkbox.isChecked()
+        query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex = self.get_search_parameters()
+        if query:
+            self._add_to_history(query)
+            self.find_previous_requested.emit(query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex)
+
+    def _on_find_all(self):
+        if self._find_all_running:
+            self.find_all_cancel_requested.emit()
+            return
+        query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex = self.get_search_parameters()
         if query:
             self._add_to_history(query)
-            self.find_previous_requested.emit(query, case_sensitive, search_in_original, ignore_tags, is_fuzzy)
+            self.find_all_requested.emit(query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex)
+
+    def _on_replace_all(self):
+        query, case_sensitive, _search_in_original, _ignore_tags, is_fuzzy, is_regex = self.get_search_parameters()
+        if not query:
+            self.set_status_message("Enter query", is_error=True)
+            return
+        if is_fuzzy:
+            self.set_status_message("Replace is not available in fuzzy mode", is_error=True)
+            return
+        self._add_to_history(query)
+        self.replace_all_requested.emit(query, self.replace_query_edit.text(), case_sensitive, is_regex)
+
+    def _on_result_item_activated(self, item: QListWidgetItem):
+        result_index = item.data(Qt.UserRole)
+        if result_index is not None:
+            self.result_activated.emit(result_index)
+
+    def begin_find_all(self):
+        self._find_all_running = True
+        self.find_all_button.setText("Stop")
+        self.results_list.clear()
+        self.results_list.setVisible(True)
+        self.set_status_message("Searching...")
+
+    def add_find_all_results(self, results: list, first_index: int):
+        self.results_list.setUpdatesEnabled(False)
+        for offset, (block_idx, string_idx, _pos, _length, snippet) in enumerate(results):
+            item = QListWidgetItem(f"B{block_idx+1}, S{string_idx+1}:  {snippet}")
+            item.setData(Qt.UserRole, first_index + offset)
+            self.results_list.addItem(item)
+        self.results_list.setUpdatesEnabled(True)
+
+    def end_find_all(self, count: int, cancelled: bool = False):
+        self._find_all_running = False
+        self.find_all_button.setText("All")
+        if cancelled:
+            self.set_status_message(f"Stopped: {count} found")
+        elif count:
+            self.set_status_message(f"{count} matches")
+        else:
+            self.set_status_message("Not found")
+
+    def clear_results(self):
+        self.results_list.clear()
+        self.results_list.setVisible(False)
 
-    def get_search_parameters(self) -> tuple[str, bool, bool, bool, bool]:
+    def get_search_parameters(self) -> tuple[str, bool, bool, bool, bool, bool]:
         query = self.search_query_edit.currentText()
         case_sensitive = self.case_sensitive_checkbox.isChecked()
         search_in_original = self.search_in_original_checkbox.isChecked()
         ignore_tags = self.ignore_tags_newlines_checkbox.isChecked()
         is_fuzzy = self.fuzzy_search_checkbox.isChecked()
-        return query, case_sensitive, search_in_original, ignore_tags, is_fuzzy
+        is_regex = self.regex_checkbox.isChecked()
+        return query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex
 
-    def set_search_options(self, case_sensitive: bool, search_in_original: bool, ignore_tags: bool, is_fuzzy: bool = False):
+    def set_search_options(self, case_sensitive: bool, search_in_original: bool, ignore_tags: bool, is_fuzzy: bool = False, is_regex: bool = False):
         self.case_sensitive_checkbox.setChecked(case_sensitive)
         self.search_in_original_checkbox.setChecked(search_in_original)
         self.ignore_tags_newlines_checkbox.setChecked(ignore_tags)
         self.fuzzy_search_checkbox.setChecked(is_fuzzy)
+        self.regex_checkbox.setChecked(is_regex)
 
     def set_status_message(self, message: str, is_error: bool = False):
         self.status_label.setText(message)
@@ -137,6 +137,7 @@ class TreeSpellcheckMixin:
             corrected_text = dialog.get_corrected_text()
             corrected_lines = corrected_text.split('\n')
             edited_data = getattr(main_window, 'edited_data', {})
+            any_corrected = False
 
             for i, corrected_line in enumerate(corrected_lines):
                 if i < len(line_numbers) and corrected_line != text_parts[i]:
@@ -144,6 +145,11 @@ class TreeSpellcheckMixin:
                     edited_data[(block_idx, string_idx)] = corrected_line
                     ds.unsaved_changes = True
                     ds.unsaved_block_indices.add(block_idx)
+                    any_corrected = True
+
+            # These writes bypass update_edited_data, so re-index the block for find next/previous
+            if any_corrected and hasattr(main_window, 'search_handler'):
+                main_window.search_handler.refresh_index_block(block_idx)
 
             current_block_idx = getattr(main_window.data_store, 'current_block_idx', -1)
             if current_block_idx == block_idx:
@@ -53,7 +53,7 @@ class DataStateProcessor:
         num_strings = len(self.mw.data_store.data[block_idx])
         return [self.get_current_string_text(block_idx, i)[0] for i in range(num_strings)]
 
-    def update_edited_data(self, block_idx: int, string_idx: int, new_text: str, action_type: str = "TEXT_EDIT") -> bool:
+    def update_edited_data(self, block_idx: int, string_idx: int, new_text: str, action_type: str = "TEXT_EDIT", refresh_block_item: bool = True) -> bool:
         edit_key = (block_idx, string_idx)
         
         # Get old text for undo
@@ -86,6 +86,10 @@ class DataStateProcessor:
         if hasattr(self.mw, 'undo_manager') and old_text != new_text:
             self.mw.undo_manager.record_action(action_type, block_idx, string_idx, old_text, new_text)
 
+        # Keep the project-wide search index in sync with the new translation
+        if hasattr(self.mw, 'search_handler') and old_text != new_text:
+            self.mw.search_handler.on_string_edited(block_idx, string_idx, new_text)
+
         self.mw.data_store.unsaved_changes = bool(self.mw.data_store.edited_data)
         
         unsaved_status_actually_changed = self.mw.data_store.unsaved_changes != old_unsaved_changes
@@ -93,7 +97,8 @@ class DataStateProcessor:
             log_debug(f"DSP.update_edited_data: Unsaved changes status changed to {self.mw.data_store.unsaved_changes}")
         
         # Explicitly trigger tree item refresh to show/hide asterisk
-        if hasattr(self.mw, 'ui_updater'):
+        # (batch callers pass refresh_block_item=False and refresh each block once at the end)
+        if refresh_block_item and hasattr(self.mw, 'ui_updater'):
             self.mw.ui_updater.update_block_item_text_with_problem_count(block_idx)
 
         return unsaved_status_actually_changed
@@ -386,6 +391,8 @@ class DataStateProcessor:
                         self.mw.current_game_rules.original_keys = plugin_keys_backup
                         
                     self.mw.data_store.edited_file_data = reverted_data_list
+                    if hasattr(self.mw, 'search_handler'):
+                        self.mw.search_handler.rebuild_index()
     
                     QMessageBox.information(self.mw, "Reverted", f"Changes file '{Path(self.mw.data_store.edited_json_path).name}' has been reverted to match the original.")
                     self.mw.ui_updater.update_title(); 
@@ -1,7 +1,108 @@
+import itertools
 from typing import List, Dict, Set, Optional, Any
 from dataclasses import dataclass, field
 from utils.logging_utils import log_debug
 
+class ProblemStore(dict):
+    """
+    problems_per_subline: (block_idx, string_idx, subline_idx) -> problem ids.
+    revision changes on every write so painters can cache what they derive from it;
+    revisions are unique across stores, so a replaced store never matches an old one.
+    Keys are also indexed per block, and per-block counts are cached until that block
+    is written, so badge updates don't scan every problem in the project;
+    block_revision(block_idx) changes only when that block's problems do.
+    Problem sets are replaced, never mutated in place.
+    """
+    _revisions = itertools.count(1)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._block_keys: Dict[int, Set[tuple]] = {}
+        self._block_counts: Dict[int, Dict[str, int]] = {}
+        self._block_revisions: Dict[int, int] = {}
+        for key in self:
+            self._index_add(key)
+        self._touch()
+        self._base_revision = self.revision
+
+    def _touch(self):
+        self.revision = next(ProblemStore._revisions)
+
+    def _index_add(self, key):
+        self._block_keys.setdefault(key[0], set()).add(key)
+        self._block_counts.pop(key[0], None)
+        self._block_revisions[key[0]] = next(ProblemStore._revisions)
+
+    def _index_discard(self, key):
+        keys = self._block_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._block_keys[key[0]]
+        self._block_counts.pop(key[0], None)
+        self._block_revisions[key[0]] = next(ProblemStore._revisions)
+
+    def block_revision(self, block_idx: int) -> int:
+        return self._block_revisions.get(block_idx, self._base_revision)
+
+    def keys_for_block(self, block_idx: int) -> Set[tuple]:
+        return set(self._block_keys.get(block_idx, ()))
+
+    def block_problem_counts(self, block_idx: int) -> Dict[str, int]:
+        """Problem id -> number of sublines in the block that have it."""
+        counts = self._block_counts.get(block_idx)
+        if counts is None:
+            counts = {}
+            for key in self._block_keys.get(block_idx, ()):
+                for p_id in self[key]:
+                    counts[p_id] = counts.get(p_id, 0) + 1
+            self._block_counts[block_idx] = counts
+        return dict(counts)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._index_add(key)
+        self._touch()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._index_discard(key)
+        self._touch()
+
+    def clear(self):
+        super().clear()
+        self._block_keys.clear()
+        self._block_counts.clear()
+        self._block_revisions.clear()
+        self._touch()
+        self._base_revision = self.revision
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            super().__setitem__(key, value)
+            self._index_add(key)
+        self._touch()
+
+    def pop(self, key, *default):
+        self._touch()
+        if key in self:
+            self._index_discard(key)
+        return super().pop(key, *default)
+
+    def popitem(self):
+        self._touch()
+        key, value = super().popitem()
+        self._index_discard(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._touch()
+            super().__setitem__(key, default)
+            self._index_add(key)
+        return super().setdefault(key, default)
+
+
 @dataclass
 class AppDataStore:
     """
@@ -17,6 +118,10 @@ class AppDataStore:
     edited_data: Dict[int, List[str]] = field(default_factory=dict)  # Unsaved changes per block
     edited_file_data: List[Any] = field(default_factory=list)  # Currently loaded file data
     
+    # Bumped whenever the original data is (re)loaded, so derived indexes can tell
+    # a refilled list from the one they were built on
+    data_revision: int = 0
+
     # Metadata
     block_names: Dict[int, str] = field(default_factory=dict)
     unsaved_changes: bool = False
@@ -34,7 +139,7 @@ class AppDataStore:
     hide_categorized: bool = False
     
     # Analysis & Problems
-    problems_per_subline: Dict[int, Set[str]] = field(default_factory=dict)
+    problems_per_subline: Dict[tuple, Set[str]] = field(default_factory=ProblemStore)
     
     # Editor subline modification tracking (QTextBlock numbers that were changed)
     edited_sublines: Set[int] = field(default_factory=set)
@@ -55,10 +160,15 @@ class AppDataStore:
         self.unsaved_block_indices = set()
         self.current_block_idx = -1
         self.current_string_idx = -1
-        self.problems_per_subline = {}
+        self.problems_per_subline = ProblemStore()
         self.edited_sublines = set()
+        self.mark_data_changed()
         log_debug("AppDataStore: Data cleared")
 
+    def mark_data_changed(self):
+        """Call after replacing or refilling the original data."""
+        self.data_revision += 1
+
     def mark_dirty(self, block_idx: int):
         """Mark a block as having unsaved changes."""
         self.unsaved_changes = True
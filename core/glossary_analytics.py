@@ -0,0 +1,190 @@
+# --- START OF FILE core/glossary_analytics.py ---
+"""
+Project-wide glossary analytics: how often each term occurs in the originals,
+how much of it is already translated consistently, and which frequent phrases
+are not in the glossary yet.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Set, Tuple
+
+from core.glossary_consistency import is_untranslated
+from core.glossary_manager import GlossaryEntry, GlossaryManager
+from utils.utils import ALL_TAGS_PATTERN
+
+# Candidates may not start or end with these; "the Master Sword" is "Master Sword"
+STOPWORDS = frozenset(
+    "a an and are as at be but by can do for from has have he her his i if in is it its "
+    "me my no not of on or our she so that the their them then there they this to up us "
+    "was we what when where which who will with you your".split()
+)
+
+_WORD = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+# Phrases never continue across punctuation, line breaks or stripped tags
+_SEGMENT_BREAK = re.compile(r"[^\w\s'’]+|\n")
+
+
+@dataclass
+class TermStats:
+    """Frequency and translation coverage of one glossary entry."""
+
+    entry: GlossaryEntry
+    occurrences: int = 0
+    strings: int = 0
+    translated_strings: int = 0
+    consistent_strings: int = 0
+
+    @property
+    def coverage(self) -> Optional[float]:
+        """Share of translated strings containing the term that use a glossary variant."""
+        if not self.translated_strings:
+            return None
+        return self.consistent_strings / self.translated_strings
+
+
+@dataclass
+class CandidateTerm:
+    """A frequent phrase from the originals that is not covered by the glossary."""
+
+    text: str
+    word_count: int
+    occurrences: int = 0
+    strings: int = 0
+    example: str = ""
+
+
+@dataclass(frozen=True)
+class GlossaryAnalyticsReport:
+    """Snapshot of GlossaryAnalytics safe to hand to another thread."""
+
+    terms: List[TermStats]
+    candidates: List[CandidateTerm]
+    strings_analyzed: int
+
+
+class GlossaryAnalytics:
+    """
+    Streaming accumulator: feed strings with add_string() in any order, read the
+    report at any time. Term matching goes through the manager's automaton.
+    """
+
+    def __init__(self, manager: GlossaryManager, max_ngram: int = 3) -> None:
+        self.manager = manager
+        self.max_ngram = max(1, max_ngram)
+        self.strings_seen = 0
+        self._terms: Dict[str, TermStats] = {
+            entry.original: TermStats(entry=entry) for entry in manager.get_entries()
+        }
+        self._candidates: Dict[str, CandidateTerm] = {}
+
+    def add_string(self, original: Optional[str], translation: Optional[str]) -> None:
+        original = '' if original is None else str(original)
+        if not original:
+            return
+        translation = '' if translation is None else str(translation)
+        translated = bool(translation) and not is_untranslated(original, translation)
+        self.strings_seen += 1
+
+        counts: Dict[str, int] = {}
+        entries: Dict[str, GlossaryEntry] = {}
+        string_ngrams: Set[str] = set()
+        for line in original.split('\n'):
+            if not line:
+                continue
+            matches = self.manager.find_matches(line)
+            for match in matches:
+                counts[match.entry.original] = counts.get(match.entry.original, 0) + 1
+                entries[match.entry.original] = match.entry
+            self._count_ngrams(line, [(m.start, m.end) for m in matches], string_ngrams)
+
+        for key in string_ngrams:
+            self._candidates[key].strings += 1
+
+        for term, count in counts.items():
+            stats = self._terms.get(term)
+            if stats is None:
+                stats = self._terms[term] = TermStats(entry=entries[term])
+            stats.occurrences += count
+            stats.strings += 1
+            if not translated:
+                continue
+            stats.translated_strings += 1
+            matcher = self.manager.get_translation_matcher(stats.entry.translation)
+            if matcher is not None and matcher.search(translation):
+                stats.consistent_strings += 1
+
+    def _count_ngrams(self, line: str, glossary_spans: List[Tuple[int, int]], seen: Set[str]) -> None:
+        # Text already covered by glossary terms breaks phrases, so candidates
+        # never repeat or overlap an existing entry
+        chars = list(line)
+        for start, end in glossary_spans:
+            chars[start:end] = '\n' * (end - start)
+        text = ALL_TAGS_PATTERN.sub('\n', ''.join(chars))
+        for segment in _SEGMENT_BREAK.split(text):
+            words = _WORD.findall(segment)
+            for size in range(1, min(self.max_ngram, len(words)) + 1):
+                for i in range(len(words) - size + 1):
+                    gram = words[i:i + size]
+                    if gram[0].lower() in STOPWORDS or gram[-1].lower() in STOPWORDS:
+                        continue
+                    if size == 1 and len(gram[0]) < 3:
+                        continue
+                    phrase = ' '.join(gram)
+                    key = phrase.lower()
+                    candidate = self._candidates.get(key)
+                    if candidate is None:
+                        candidate = self._candidates[key] = CandidateTerm(
+                            text=phrase, word_count=size, example=line.strip()
+                        )
+                    candidate.occurrences += 1
+                    seen.add(key)
+
+    def term_stats(self) -> List[TermStats]:
+        """Every glossary entry, most frequent first."""
+        return sorted(self._terms.values(), key=lambda s: (-s.occurrences, s.entry.original.lower()))
+
+    def candidates(self, min_occurrences: int = 3, limit: int = 200) -> List[CandidateTerm]:
+        """
+        Frequent phrases not in the glossary. A phrase that always occurs inside
+        a longer frequent candidate is dropped in favour of the longer one.
+        """
+        frequent = [c for c in self._candidates.values() if c.occurrences >= min_occurrences]
+        # Highest count of a one-word-longer candidate containing each phrase
+        longer_counts: Dict[str, int] = {}
+        for candidate in frequent:
+            words = candidate.text.lower().split(' ')
+            if len(words) < 2:
+                continue
+            for sub in (' '.join(words[:-1]), ' '.join(words[1:])):
+                longer_counts[sub] = max(longer_counts.get(sub, 0), candidate.occurrences)
+        result = [
+            candidate for candidate in frequent
+            if longer_counts.get(candidate.text.lower(), 0) < candidate.occurrences
+            and self.manager.get_entry(candidate.text) is None
+        ]
+        result.sort(key=lambda c: (-c.occurrences, -c.word_count, c.text.lower()))
+        return result[:limit]
+
+    def report(self, min_occurrences: int = 3, limit: int = 200) -> GlossaryAnalyticsReport:
+        return GlossaryAnalyticsReport(
+            terms=[replace(stats) for stats in self.term_stats()],
+            candidates=[replace(candidate) for candidate in self.candidates(min_occurrences, limit)],
+            strings_analyzed=self.strings_seen,
+        )
+
+
+def collect_analytics_blocks(data, get_translation) -> List[Tuple[int, List[Tuple[str, Optional[str]]]]]:
+    """Snapshot (block_idx, [(original, translation), ...]) so the worker never touches live data."""
+    blocks = []
+    for block_idx, block in enumerate(data or []):
+        if not isinstance(block, list):
+            continue
+        rows = []
+        for string_idx, original in enumerate(block):
+            original_text = '' if original is None else str(original)
+            if original_text:
+                rows.append((original_text, get_translation(block_idx, string_idx)))
+        blocks.append((block_idx, rows))
+    return blocks
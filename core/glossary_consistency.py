@@ -0,0 +1,86 @@
+# --- START OF FILE core/glossary_consistency.py ---
+"""Project-wide check that glossary terms in originals are translated as the glossary says."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from core.glossary_manager import GlossaryEntry, GlossaryManager
+
+
+@dataclass(frozen=True)
+class GlossaryViolation:
+    """A glossary term found in an original string whose translation uses none of its variants."""
+
+    entry: GlossaryEntry
+    block_idx: int
+    string_idx: int
+    line_idx: int
+    original_line: str
+    translation_text: str
+
+    def sort_key(self) -> Tuple[int, int, int]:
+        return self.block_idx, self.string_idx, self.line_idx
+
+
+def check_string_consistency(
+    manager: GlossaryManager,
+    block_idx: int,
+    string_idx: int,
+    original_text: Optional[str],
+    translation_text: Optional[str],
+) -> List[GlossaryViolation]:
+    """
+    One violation per term per string: a term repeated in the original only needs
+    one accepted variant in the translation.
+    """
+    original_text = '' if original_text is None else str(original_text)
+    translation_text = '' if translation_text is None else str(translation_text)
+    if not original_text or not translation_text:
+        return []
+
+    violations: List[GlossaryViolation] = []
+    seen: set[str] = set()
+    for line_idx, line in enumerate(original_text.split('\n')):
+        if not line:
+            continue
+        for match in manager.find_matches(line):
+            entry = match.entry
+            if entry.original in seen:
+                continue
+            seen.add(entry.original)
+            matcher = manager.get_translation_matcher(entry.translation)
+            if matcher is None or matcher.search(translation_text):
+                continue
+            violations.append(GlossaryViolation(
+                entry=entry,
+                block_idx=block_idx,
+                string_idx=string_idx,
+                line_idx=line_idx,
+                original_line=line,
+                translation_text=translation_text,
+            ))
+    return violations
+
+
+def is_untranslated(original_text: Optional[str], translation_text: Optional[str]) -> bool:
+    """Strings still equal to their original are not reviewed; every term would be flagged."""
+    return (original_text or '') == (translation_text or '')
+
+
+def collect_consistency_entries(data: Sequence, get_translation) -> List[Tuple[int, int, str, str]]:
+    """Snapshot (block_idx, string_idx, original, translation) for every translated string."""
+    entries: List[Tuple[int, int, str, str]] = []
+    for block_idx, block in enumerate(data or []):
+        if not isinstance(block, list):
+            continue
+        for string_idx, original in enumerate(block):
+            original_text = '' if original is None else str(original)
+            if not original_text:
+                continue
+            translation_text = get_translation(block_idx, string_idx)
+            translation_text = '' if translation_text is None else str(translation_text)
+            if is_untranslated(original_text, translation_text):
+                continue
+            entries.append((block_idx, string_idx, original_text, translation_text))
+    return entries
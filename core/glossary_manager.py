@@ -2,14 +2,17 @@
 """Glossary management helpers: loading, caching, and pattern matching."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
 import re
+import threading
 import unicodedata
 import ahocorasick
 
 from utils.logging_utils import log_debug
+from core import glossary_occurrence_store as occurrence_store
 
 
 @dataclass(frozen=True)
@@ -47,9 +50,84 @@ class GlossaryOccurrence:
     line_text: str
 
 
+_TRANSLATION_WORD = re.compile(r"[a-zA-Zа-яА-ЯіїІїЄєґҐ']+")
+
+
+@dataclass(frozen=True)
+class GlossarySnapshot:
+    """
+    Derived glossary data for one revision, built once and shared by the
+    highlighters, the spellchecker and the prompt composer. Matching goes
+    through the manager's automaton and cached stem matchers.
+    """
+
+    revision: Optional[int]
+    entries: Tuple[GlossaryEntry, ...]
+    translation_words: FrozenSet[str]
+    max_term_words: int
+    manager: "GlossaryManager" = field(repr=False, compare=False)
+
+    @classmethod
+    def build(cls, manager, revision: Optional[int] = None) -> "GlossarySnapshot":
+        entries = tuple(manager.get_entries())
+        words: Set[str] = set()
+        max_term_words = 1
+        for entry in entries:
+            for word in _TRANSLATION_WORD.findall(str(getattr(entry, 'translation', '') or '')):
+                cleaned = word.strip("'").lower()
+                if cleaned:
+                    words.add(cleaned)
+            max_term_words = max(max_term_words, len(str(getattr(entry, 'original', '') or '').split()))
+        return cls(
+            revision=revision,
+            entries=entries,
+            translation_words=frozenset(words),
+            max_term_words=max_term_words,
+            manager=manager,
+        )
+
+    @classmethod
+    def of(cls, manager) -> Optional["GlossarySnapshot"]:
+        """Snapshot of any manager-like object; stand-ins without snapshot() get an unversioned one."""
+        if manager is None:
+            return None
+        if isinstance(manager, GlossaryManager):
+            return manager.snapshot()
+        return cls.build(manager)
+
+    @property
+    def automaton(self) -> Optional[ahocorasick.Automaton]:
+        return self.manager.get_automaton()
+
+    def find_matches(self, text: str) -> List[GlossaryMatch]:
+        return self.manager.find_matches(text)
+
+    def get_relevant_terms(self, text: str) -> List[GlossaryEntry]:
+        return self.manager.get_relevant_terms(text)
+
+    def get_translation_matcher(self, translation: str) -> Optional[re.Pattern[str]]:
+        return self.manager.get_translation_matcher(translation)
+
+    def find_translation_matches(self, text: str, entries: Iterable[GlossaryEntry]) -> List[GlossaryMatch]:
+        return self.manager.find_translation_matches(text, entries)
+
+
+def _string_key(occurrence: GlossaryOccurrence) -> Tuple[int, int]:
+    return occurrence.block_idx, occurrence.string_idx
+
+
+def _occurrence_order(occurrence: GlossaryOccurrence) -> Tuple[int, int, int, int]:
+    return occurrence.block_idx, occurrence.string_idx, occurrence.line_idx, occurrence.start
+
+
 class GlossaryManager:
     """Load and cache glossary entries for a plugin with search utilities."""
 
+    # Above this many new entries a reload rescans the dataset instead of applying deltas
+    OCCURRENCE_REBUILD_THRESHOLD = 64
+    # Entry edits kept outside the automaton before it is rebuilt without waiting for flush()
+    AUTOMATON_PENDING_LIMIT = 64
+
     def __init__(self) -> None:
         self._entries: List[GlossaryEntry] = []
         self._raw_text: str = ""
@@ -61,12 +139,52 @@ class GlossaryManager:
         self._section_order: List[str] = []
         self._session_changes: Dict[str, Optional[GlossaryEntry]] = {}
 
-        # Optimization structures for fast pattern matching
+        # Exact lookups: normalized original -> entry (first entry wins, as in the file).
+        # Rebuilt whenever _entries is replaced by a list the index was not built from.
+        self._entries_by_term: Dict[str, GlossaryEntry] = {}
+        self._term_index_source: Optional[List[GlossaryEntry]] = None
+        # Autocomplete: sorted normalized originals/translation variants, rebuilt lazily
+        self._prefix_keys: List[str] = []
+        self._prefix_labels: List[str] = []
+        self._prefix_index_stale = True
+
+        # Entry edits patch the in-memory caches; markdown is regenerated lazily
+        # and the disk write is handed to the scheduler (a debounce timer in the UI)
+        self._raw_text_stale = False
+        self._write_pending = False
+        self._write_scheduler: Optional[Callable[[], None]] = None
+        # Bumped on every reload or entry edit so callers can key their own caches
+        self._revision = 0
+        self._snapshot: Optional[GlossarySnapshot] = None
+
+        # Incremental occurrence index: _occurrence_index holds entry -> postings
+        # sorted by position, _string_occurrences is the per-string match cache.
+        self._indexed_dataset: Optional[Sequence] = None
+        self._indexed_revision: Optional[int] = None
+        self._indexed_texts: Dict[Tuple[int, int], str] = {}
+        self._string_occurrences: Dict[Tuple[int, int], List[GlossaryOccurrence]] = {}
+
+        # Optimization structures for fast pattern matching.
+        # The automaton is copy-on-write and rebuilt in batches: entry edits patch
+        # _automaton_words and record the changed keys in _automaton_pending, which
+        # find_matches overlays on the published automaton. flush() (the debounced
+        # write) builds a fresh automaton and swaps it in, so worker threads
+        # iterating a published automaton never see it mutate.
         self._automaton: Optional[ahocorasick.Automaton] = None
+        self._automaton_words: Dict[str, Tuple[GlossaryEntry, int]] = {}
+        self._automaton_pending: Dict[str, Optional[Tuple[GlossaryEntry, int]]] = {}
+        self._automaton_lock = threading.Lock()
         self._first_word_index: Dict[str, List[Tuple[GlossaryEntry, re.Pattern[str]]]] = {}
         self._non_word_patterns: List[Tuple[GlossaryEntry, re.Pattern[str]]] = []
         self._word_finder = re.compile(r'\w+')
 
+        # Translation-side matchers: compiled once per translation string and
+        # prefiltered by an automaton over the stems of each variation's first word
+        self._translation_matchers: Dict[str, Optional[re.Pattern[str]]] = {}
+        self._translation_stems: Dict[str, Tuple[str, ...]] = {}
+        self._translation_automaton: Optional[ahocorasick.Automaton] = None
+        self._translation_cache_stale = False
+
     @staticmethod
     def normalize_term(value: str) -> str:
         if value is None:
@@ -85,18 +203,30 @@ class GlossaryManager:
         raw_text: str,
     ) -> None:
         """Populate glossary from text buffer."""
+        sanitized_text = (raw_text or "").replace('\uFEFF', '')
+        same_source = plugin_name == self._plugin_name and glossary_path == self._glossary_path
+        if same_source and sanitized_text == self.get_raw_text():
+            # Callers re-feed the text they got from get_raw_text(); nothing to reparse
+            return
+        if not same_source:
+            self.flush()
+            self._reset_occurrence_index()
+        previous_entries = self._entries
         self._plugin_name = plugin_name
         self._glossary_path = glossary_path
-        sanitized_text = (raw_text or "").replace('\uFEFF', '')
         self._raw_text = sanitized_text
+        self._raw_text_stale = False
+        self._write_pending = False
         self._entries = self._parse_markdown(self._raw_text)
         self._build_pattern_cache()
+        self._sync_occurrence_index(previous_entries)
         log_debug(
             f"GlossaryManager: loaded {len(self._entries)} entries for plugin "
             f"{plugin_name or '<global>'} from {str(glossary_path) if glossary_path else '<memory>'}"
         )
 
     def refresh_from_disk(self) -> None:
+        self.flush()
         if self._glossary_path and self._glossary_path.exists():
             text = self._glossary_path.read_text(encoding='utf-8')
             self.load_from_text(
@@ -112,9 +242,72 @@ class GlossaryManager:
                 raw_text="",
             )
 
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    def snapshot(self) -> GlossarySnapshot:
+        """Shared derived data for the current revision; rebuilt only after a change."""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.revision != self._revision:
+            snapshot = self._snapshot = GlossarySnapshot.build(self, self._revision)
+        return snapshot
+
+    def frozen_copy(self) -> "GlossaryManager":
+        """
+        Read-only matcher for a worker thread, taken on the GUI thread. It has
+        its own entries, indexes and caches, so later edits or reloads of this
+        manager never reach it. Compiled patterns and the published automaton
+        are never mutated, so they are shared rather than rebuilt.
+        """
+        if self._translation_cache_stale:
+            self._build_translation_cache()
+        self._finalize_automaton()
+        copy = GlossaryManager()
+        copy._entries = list(self._entries)
+        copy._revision = self._revision
+        copy._compiled_patterns = dict(self._compiled_patterns)
+        copy._first_word_index = {word: list(bucket) for word, bucket in self._first_word_index.items()}
+        copy._non_word_patterns = list(self._non_word_patterns)
+        automaton = self.get_automaton()
+        with self._automaton_lock:
+            copy._automaton_words = dict(self._automaton_words)
+        copy._automaton = automaton
+        copy._translation_matchers = dict(self._translation_matchers)
+        copy._translation_stems = dict(self._translation_stems)
+        copy._translation_automaton = self._translation_automaton
+        copy._rebuild_term_index()
+        return copy
+
+    def get_automaton(self) -> Optional[ahocorasick.Automaton]:
+        """The published automaton; entry edits since the last flush() are not in it yet."""
+        return self._automaton
+
     def get_raw_text(self) -> str:
+        if self._raw_text_stale:
+            self._raw_text = self._generate_markdown()
+            self._raw_text_stale = False
         return self._raw_text
 
+    def set_write_scheduler(self, scheduler: Optional[Callable[[], None]]) -> None:
+        """
+        Defer disk writes: after each edit `scheduler` is called instead of writing,
+        and is expected to call flush() later. Without one every edit writes at once.
+        """
+        self._write_scheduler = scheduler
+
+    def has_pending_write(self) -> bool:
+        return self._write_pending
+
+    def flush(self) -> None:
+        """Fold pending edits into the automaton and write them to the glossary file."""
+        self._finalize_automaton()
+        if not self._write_pending:
+            return
+        self._write_pending = False
+        if self._glossary_path:
+            self._glossary_path.write_text(self.get_raw_text(), encoding='utf-8')
+
     def get_entries(self) -> Sequence[GlossaryEntry]:
         return list(self._entries)
 
@@ -122,11 +315,53 @@ class GlossaryManager:
         """Find a glossary entry by its original term, ignoring case and spacing."""
         if not term:
             return None
-        normalized_term = self.normalize_term(term)
+        self._ensure_term_index()
+        return self._entries_by_term.get(self.normalize_term(term))
+
+    def get_completions(self, prefix: str, limit: int = 20) -> List[str]:
+        """Originals and translation variants starting with `prefix` (normalized), sorted."""
+        normalized_prefix = self.normalize_term(prefix)
+        if not normalized_prefix or limit <= 0:
+            return []
+        self._ensure_term_index()
+        if self._prefix_index_stale:
+            self._build_prefix_index()
+        completions: List[str] = []
+        seen: Set[str] = set()
+        idx = bisect_left(self._prefix_keys, normalized_prefix)
+        while idx < len(self._prefix_keys) and len(completions) < limit:
+            if not self._prefix_keys[idx].startswith(normalized_prefix):
+                break
+            label = self._prefix_labels[idx]
+            if label not in seen:
+                seen.add(label)
+                completions.append(label)
+            idx += 1
+        return completions
+
+    def _build_prefix_index(self) -> None:
+        pairs: Set[Tuple[str, str]] = set()
         for entry in self._entries:
-            if self.normalize_term(entry.original) == normalized_term:
-                return entry
-        return None
+            labels = [entry.original] + [v.strip() for v in (entry.translation or '').split(';')]
+            for label in labels:
+                key = self.normalize_term(label)
+                if key:
+                    pairs.add((key, label))
+        ordered = sorted(pairs)
+        self._prefix_keys = [key for key, _label in ordered]
+        self._prefix_labels = [label for _key, label in ordered]
+        self._prefix_index_stale = False
+
+    def _ensure_term_index(self) -> None:
+        if self._term_index_source is not self._entries:
+            self._rebuild_term_index()
+
+    def _rebuild_term_index(self) -> None:
+        self._entries_by_term = {}
+        for entry in self._entries:
+            self._entries_by_term.setdefault(self.normalize_term(entry.original), entry)
+        self._term_index_source = self._entries
+        self._prefix_index_stale = True
 
     def get_entries_sorted_by_length(self) -> Sequence[GlossaryEntry]:
         return sorted(self._entries, key=lambda item: len(item.original or ""), reverse=True)
@@ -149,21 +384,37 @@ class GlossaryManager:
         matches: List[GlossaryMatch] = []
         seen_ranges: set[Tuple[int, int, str]] = set()
 
+        def add_exact(entry: GlossaryEntry, start_pos: int, end_pos: int) -> None:
+            # Verify word boundaries for exact matches
+            is_start_boundary = (start_pos == 0 or not text[start_pos-1].isalnum())
+            is_end_boundary = (end_pos == len(text)-1 or not text[end_pos+1].isalnum())
+            if is_start_boundary and is_end_boundary:
+                matches.append(GlossaryMatch(entry=entry, start=start_pos, end=end_pos + 1))
+                seen_ranges.add((start_pos, end_pos + 1, entry.original))
+
         # Phase 1: Aho-Corasick for exact matches (extremely fast)
-        if self._automaton:
-            # We search in lowercase for case-insensitivity
-            # Note: The automaton was built using normalize_term(original)
-            search_text = text.lower()
-            for end_pos, (entry, length) in self._automaton.iter(search_text):
+        # Hold one reference: a concurrent edit swaps in a new automaton, never mutates this one
+        with self._automaton_lock:
+            automaton = self._automaton
+            pending = dict(self._automaton_pending)
+        # We search in lowercase for case-insensitivity
+        search_text = text.lower()
+        if automaton:
+            for end_pos, (entry, length) in automaton.iter(search_text):
                 start_pos = end_pos - length + 1
-                
-                # Verify word boundaries for exact matches
-                is_start_boundary = (start_pos == 0 or not text[start_pos-1].isalnum())
-                is_end_boundary = (end_pos == len(text)-1 or not text[end_pos+1].isalnum())
-                
-                if is_start_boundary and is_end_boundary:
-                    matches.append(GlossaryMatch(entry=entry, start=start_pos, end=end_pos + 1))
-                    seen_ranges.add((start_pos, end_pos + 1, entry.original))
+                # Keys edited since the automaton was built are answered from `pending`
+                if pending and search_text[start_pos:end_pos + 1] in pending:
+                    continue
+                add_exact(entry, start_pos, end_pos)
+        # Edits not yet folded into the automaton: a plain scan per changed key
+        for normalized, value in pending.items():
+            if value is None:
+                continue
+            entry, length = value
+            start_pos = search_text.find(normalized)
+            while start_pos != -1:
+                add_exact(entry, start_pos, start_pos + length - 1)
+                start_pos = search_text.find(normalized, start_pos + 1)
 
         # Phase 2: Regex fallback for matches with tags/spaces (the current strategy)
         # We only check patterns that haven't been fully satisfied by AC 
@@ -172,8 +423,9 @@ class GlossaryManager:
         
         patterns_to_check = list(self._non_word_patterns)
         for word in text_words:
-            if word in self._first_word_index:
-                patterns_to_check.extend(self._first_word_index[word])
+            bucket = self._first_word_index.get(word)
+            if bucket:
+                patterns_to_check.extend(bucket)
                 
         for entry, pattern in patterns_to_check:
             for match in pattern.finditer(text):
@@ -183,15 +435,54 @@ class GlossaryManager:
                 
         return sorted(matches, key=lambda m: m.start)
 
-    def build_occurrence_index(self, dataset: Sequence) -> Dict[str, List[GlossaryOccurrence]]:
-        occurrences: Dict[str, List[GlossaryOccurrence]] = {entry.original: [] for entry in self._entries}
-        if not dataset:
-            self._occurrence_index = occurrences
-            return occurrences
+    def get_translation_matcher(self, translation: str) -> Optional[re.Pattern[str]]:
+        """Cached build_translation_regex; identical translations share one compiled pattern."""
+        if translation in self._translation_matchers:
+            return self._translation_matchers[translation]
+        matcher = self.build_translation_regex(translation)
+        self._translation_matchers[translation] = matcher
+        return matcher
+
+    def find_translation_matches(self, text: str, entries: Iterable[GlossaryEntry]) -> List[GlossaryMatch]:
+        """Find translations of `entries` in `text`, running only regexes whose stems occur in it."""
+        if not text:
+            return []
+        if self._translation_cache_stale:
+            self._build_translation_cache()
+        present_stems: set[str] = set()
+        if self._translation_automaton is not None:
+            present_stems = {stem for _end, stem in self._translation_automaton.iter(text.lower())}
+
+        matches: List[GlossaryMatch] = []
+        for entry in entries:
+            translation = entry.translation
+            stems = self._translation_stems.get(translation)
+            if stems is None:
+                # Entry not in the glossary (e.g. a stale reference): no prefilter
+                stems = self._variation_first_stems(translation)
+            elif not any(stem in present_stems for stem in stems):
+                continue
+            matcher = self.get_translation_matcher(translation)
+            if matcher is None:
+                continue
+            for match in matcher.finditer(text):
+                if match.end() > match.start():
+                    matches.append(GlossaryMatch(entry=entry, start=match.start(), end=match.end()))
+        return sorted(matches, key=lambda m: m.start)
 
-        compiled_entries = list(self.iter_compiled())
-        if not compiled_entries:
-            self._occurrence_index = occurrences
+    def build_occurrence_index(self, dataset: Sequence, revision: Optional[int] = None) -> Dict[str, List[GlossaryOccurrence]]:
+        """
+        Scan the whole dataset and (re)build the occurrence index. The returned
+        map is the live index: update_string and entry edits patch it in place.
+        """
+        occurrences = self._occurrence_index
+        occurrences.clear()
+        occurrences.update({entry.original: [] for entry in self._entries})
+        self._indexed_dataset = dataset
+        self._indexed_revision = revision
+        self._indexed_texts = {}
+        self._string_occurrences = {}
+        if not dataset:
             return occurrences
 
         for block_idx, block in enumerate(dataset):
@@ -199,29 +490,209 @@ class GlossaryManager:
                 continue
             for string_idx, value in enumerate(block):
                 text = '' if value is None else str(value)
-                if not text:
+                if text:
+                    self._indexed_texts[(block_idx, string_idx)] = text
+
+        if not any(True for _ in self.iter_compiled()):
+            return occurrences
+
+        entry_by_original = {entry.original: entry for entry in self._entries}
+        block_rows = self._collect_block_rows(dataset)
+        for block_idx in sorted(block_rows):
+            block = dataset[block_idx]
+            split_lines: Dict[int, List[str]] = {}
+            for original, string_idx, line_idx, start, end in block_rows[block_idx]:
+                entry = entry_by_original.get(original)
+                if entry is None:
+                    continue
+                lines = split_lines.get(string_idx)
+                if lines is None:
+                    lines = split_lines[string_idx] = str(block[string_idx]).split('\n')
+                occ = GlossaryOccurrence(
+                    entry=entry,
+                    start=start,
+                    end=end,
+                    block_idx=block_idx,
+                    string_idx=string_idx,
+                    line_idx=line_idx,
+                    line_text=lines[line_idx],
+                )
+                occurrences.setdefault(original, []).append(occ)
+                self._string_occurrences.setdefault((block_idx, string_idx), []).append(occ)
+
+        return occurrences
+
+    def _collect_block_rows(self, dataset: Sequence) -> Dict[int, List[occurrence_store.OccurrenceRow]]:
+        """Per-block occurrence rows, reusing the on-disk cache for unchanged blocks."""
+        originals = [entry.original for entry in self._entries if entry.original]
+        signature = occurrence_store.glossary_signature(originals)
+        cache_path = occurrence_store.occurrence_cache_path(self._glossary_path)
+        cached = occurrence_store.load_occurrence_cache(cache_path, signature)
+
+        block_rows: Dict[int, List[occurrence_store.OccurrenceRow]] = {}
+        block_hashes: Dict[int, str] = {}
+        pending: List[Tuple[int, list]] = []
+        for block_idx, block in enumerate(dataset):
+            if not isinstance(block, list):
+                continue
+            if cache_path:
+                block_hash = occurrence_store.block_signature(block)
+                block_hashes[block_idx] = block_hash
+                if block_hash in cached:
+                    block_rows[block_idx] = cached[block_hash]
                     continue
-                lines = text.split('\n')
-                for line_idx, line in enumerate(lines):
-                    if not line:
-                        continue
-                        
-                    # Use the AC-optimized find_matches
-                    for match in self.find_matches(line):
-                        occ = GlossaryOccurrence(
-                            entry=match.entry,
-                            start=match.start,
-                            end=match.end,
-                            block_idx=block_idx,
-                            string_idx=string_idx,
-                            line_idx=line_idx,
-                            line_text=line,
-                        )
-                        occurrences.setdefault(match.entry.original, []).append(occ)
-
-        self._occurrence_index = occurrences
+            pending.append((block_idx, block))
+
+        if pending:
+            block_rows.update(self._scan_blocks(originals, pending))
+        log_debug(f"GlossaryManager: occurrence index {len(block_rows) - len(pending)} cached / {len(pending)} scanned blocks")
+
+        if cache_path and (pending or len(cached) != len(set(block_hashes.values()))):
+            occurrence_store.save_occurrence_cache(
+                cache_path, signature, {block_hashes[idx]: block_rows[idx] for idx in block_hashes}
+            )
+        return block_rows
+
+    def _scan_blocks(self, originals: List[str], blocks: List[Tuple[int, list]]) -> Dict[int, List[occurrence_store.OccurrenceRow]]:
+        workers = occurrence_store.default_worker_count()
+        total_strings = sum(len(block) for _, block in blocks)
+        if workers > 1 and total_strings >= occurrence_store.PARALLEL_MIN_STRINGS:
+            try:
+                return occurrence_store.scan_blocks_parallel(originals, blocks, workers)
+            except Exception as exc:
+                log_debug(f"GlossaryManager: parallel occurrence scan failed, scanning in-process: {exc}")
+        return {block_idx: occurrence_store.scan_block_rows(self, block) for block_idx, block in blocks}
+
+    def ensure_occurrence_index(self, dataset: Sequence, revision: Optional[int] = None) -> Dict[str, List[GlossaryOccurrence]]:
+        """
+        Return the live occurrence index, rebuilding it when `dataset` is not the
+        indexed one or its data `revision` moved on (a list refilled in place keeps its id).
+        """
+        if self._indexed_dataset is None or self._indexed_dataset is not dataset or self._indexed_revision != revision:
+            return self.build_occurrence_index(dataset, revision)
+        return self._occurrence_index
+
+    def update_string(self, block_idx: int, string_idx: int, text: Optional[str]) -> Set[str]:
+        """
+        Re-match a single string and patch the postings of every entry whose
+        occurrences changed. Returns the originals of the affected entries.
+        """
+        if self._indexed_dataset is None:
+            return set()
+        key = (block_idx, string_idx)
+        text = '' if text is None else str(text)
+        if self._indexed_texts.get(key, '') == text:
+            return set()
+        old_occurrences = self._string_occurrences.pop(key, [])
+        if text:
+            self._indexed_texts[key] = text
+        else:
+            self._indexed_texts.pop(key, None)
+
+        new_occurrences = self._scan_string(block_idx, string_idx, text) if text and self._entries else []
+        if new_occurrences:
+            self._string_occurrences[key] = new_occurrences
+
+        grouped: Dict[str, List[GlossaryOccurrence]] = {}
+        for occ in new_occurrences:
+            grouped.setdefault(occ.entry.original, []).append(occ)
+        affected = {occ.entry.original for occ in old_occurrences} | set(grouped)
+        for original in affected:
+            posting = self._occurrence_index.setdefault(original, [])
+            lo = bisect_left(posting, key, key=_string_key)
+            hi = bisect_right(posting, key, lo=lo, key=_string_key)
+            posting[lo:hi] = grouped.get(original, [])
+        return affected
+
+    def _scan_string(self, block_idx: int, string_idx: int, text: str) -> List[GlossaryOccurrence]:
+        occurrences: List[GlossaryOccurrence] = []
+        for line_idx, line in enumerate(text.split('\n')):
+            if not line:
+                continue
+            # Use the AC-optimized find_matches
+            for match in self.find_matches(line):
+                occurrences.append(GlossaryOccurrence(
+                    entry=match.entry,
+                    start=match.start,
+                    end=match.end,
+                    block_idx=block_idx,
+                    string_idx=string_idx,
+                    line_idx=line_idx,
+                    line_text=line,
+                ))
         return occurrences
 
+    def _reset_occurrence_index(self) -> None:
+        self._occurrence_index.clear()
+        self._indexed_dataset = None
+        self._indexed_revision = None
+        self._indexed_texts = {}
+        self._string_occurrences = {}
+
+    def _index_add_entry(self, entry: GlossaryEntry) -> None:
+        """Find occurrences of a newly added entry; the pattern cache must already include it."""
+        if self._indexed_dataset is None or not entry.original:
+            return
+        original = entry.original
+        # Every exact or tag-tolerant match contains the first word of the term
+        parts = re.split(r'\s+', original.strip())
+        needle = parts[0].lower() if parts else ''
+        posting: List[GlossaryOccurrence] = []
+        for key, text in self._indexed_texts.items():
+            if needle and needle not in text.lower():
+                continue
+            found = [occ for occ in self._scan_string(key[0], key[1], text) if occ.entry.original == original]
+            if not found:
+                continue
+            cached = [occ for occ in self._string_occurrences.get(key, []) if occ.entry.original != original]
+            self._string_occurrences[key] = sorted(cached + found, key=lambda occ: (occ.line_idx, occ.start))
+            posting.extend(found)
+        posting.sort(key=_occurrence_order)
+        self._occurrence_index[original] = posting
+
+    def _index_remove_entry(self, original: str) -> None:
+        posting = self._occurrence_index.pop(original, None)
+        if not posting:
+            return
+        for key in {_string_key(occ) for occ in posting}:
+            remaining = [occ for occ in self._string_occurrences.get(key, []) if occ.entry.original != original]
+            if remaining:
+                self._string_occurrences[key] = remaining
+            else:
+                self._string_occurrences.pop(key, None)
+
+    def _index_replace_entry(self, entry: GlossaryEntry) -> None:
+        """Point existing occurrences at an edited entry (same original, new translation/notes)."""
+        posting = self._occurrence_index.get(entry.original)
+        if posting is None:
+            if self._indexed_dataset is not None:
+                self._index_add_entry(entry)
+            return
+        replaced = {id(occ): replace(occ, entry=entry) for occ in posting}
+        posting[:] = [replaced[id(occ)] for occ in posting]
+        for key in {_string_key(occ) for occ in posting}:
+            cached = self._string_occurrences.get(key, [])
+            cached[:] = [replaced.get(id(occ), occ) for occ in cached]
+
+    def _sync_occurrence_index(self, previous_entries: Sequence[GlossaryEntry]) -> None:
+        """Apply the difference between two entry lists to the occurrence index."""
+        if self._indexed_dataset is None:
+            return
+        previous = {entry.original: entry for entry in previous_entries}
+        current = {entry.original: entry for entry in self._entries}
+        added = [entry for original, entry in current.items() if original not in previous]
+        if len(added) > self.OCCURRENCE_REBUILD_THRESHOLD:
+            self.build_occurrence_index(self._indexed_dataset, self._indexed_revision)
+            return
+        for original in previous:
+            if original not in current:
+                self._index_remove_entry(original)
+        for original, entry in current.items():
+            if original in previous and previous[original] != entry:
+                self._index_replace_entry(entry)
+        for entry in added:
+            self._index_add_entry(entry)
+
     def get_occurrences_for(self, entry: GlossaryEntry) -> List[GlossaryOccurrence]:
         if entry is None or not entry.original:
             return []
@@ -256,7 +727,11 @@ class GlossaryManager:
         original_key = (original or '').strip()
         if not original_key:
             return None
-        existing = next((entry for entry in self._entries if entry.original == original_key), None)
+        self._ensure_term_index()
+        existing = self._entries_by_term.get(self.normalize_term(original_key))
+        if existing and existing.original != original_key:
+            # Same term in another case/spacing; only an exact original is an update
+            existing = next((entry for entry in self._entries if entry.original == original_key), None)
         if existing:
             return self.update_entry(original_key, translation, notes)
         new_entry = GlossaryEntry(
@@ -269,8 +744,11 @@ class GlossaryManager:
         new_entries = list(self._entries)
         new_entries.append(new_entry)
         self._entries = new_entries
-        self._occurrence_index = {}
+        if section and section not in self._section_order:
+            self._section_order.append(section)
+        self._pattern_add_entry(new_entry)
         self._persist()
+        self._index_add_entry(new_entry)
         return new_entry
 
     def update_entry(self, original: str, translation: str, notes: str) -> Optional[GlossaryEntry]:
@@ -279,6 +757,7 @@ class GlossaryManager:
         updated_notes = notes.strip()
         if not original_key:
             return None
+        self._ensure_term_index()
 
         for idx, entry in enumerate(self._entries):
             if entry.original == original_key:
@@ -291,9 +770,10 @@ class GlossaryManager:
                 new_entries = list(self._entries)
                 new_entries[idx] = updated_entry
                 self._entries = new_entries
-                self._occurrence_index = {}
                 self._session_changes[original_key] = updated_entry
+                self._pattern_replace_entry(updated_entry)
                 self._persist()
+                self._index_replace_entry(updated_entry)
                 return updated_entry
         return None
 
@@ -301,19 +781,24 @@ class GlossaryManager:
         original_key = (original or '').strip()
         if not original_key:
             return False
+        self._ensure_term_index()
         index = next((idx for idx, entry in enumerate(self._entries) if entry.original == original_key), None)
         if index is None:
             return False
         new_entries = list(self._entries)
-        del new_entries[index]
+        removed = new_entries.pop(index)
         self._entries = new_entries
-        self._occurrence_index = {}
         self._session_changes[original_key] = None
+        self._pattern_remove_entry(removed)
         self._persist()
+        self._index_remove_entry(original_key)
         return True
 
     def save_to_disk(self) -> None:
-        self._persist(write_only=True)
+        self._raw_text = self._generate_markdown()
+        self._raw_text_stale = False
+        self._write_pending = True
+        self.flush()
 
     def _parse_markdown(self, text: str) -> List[GlossaryEntry]:
         self._header_lines = []
@@ -413,28 +898,26 @@ class GlossaryManager:
         markdown = "\n".join(markdown_lines).strip("\n") + "\n"
         return markdown
 
-    def _persist(self, write_only: bool = False) -> None:
-        markdown = self._generate_markdown()
-        self._raw_text = markdown
+    def _persist(self) -> None:
+        """Mark the markdown stale after an entry edit and write it now or via the scheduler."""
+        self._revision += 1
+        self._raw_text_stale = True
+        # Scheduled even without a file: the same flush folds edits into the automaton
         if self._glossary_path:
-            self._glossary_path.write_text(markdown, encoding='utf-8')
-            if not write_only:
-                self.load_from_text(
-                    plugin_name=self._plugin_name,
-                    glossary_path=self._glossary_path,
-                    raw_text=markdown,
-                )
+            self._write_pending = True
+        if self._write_scheduler is not None:
+            self._write_scheduler()
         else:
-            self._build_pattern_cache()
+            self.flush()
 
     def _build_pattern_cache(self) -> None:
+        self._revision += 1
+        self._rebuild_term_index()
         self._compiled_patterns.clear()
-        self._first_word_index.clear()
-        self._non_word_patterns.clear()
-        
-        # Use a fresh automaton
-        self._automaton = ahocorasick.Automaton()
-        
+        # Built aside and swapped in whole, so concurrent find_matches never sees a half-built index
+        first_word_index: Dict[str, List[Tuple[GlossaryEntry, re.Pattern[str]]]] = {}
+        non_word_patterns: List[Tuple[GlossaryEntry, re.Pattern[str]]] = []
+        automaton_words: Dict[str, Tuple[GlossaryEntry, int]] = {}
         for entry in self._entries:
             if not entry.original:
                 continue
@@ -447,17 +930,164 @@ class GlossaryManager:
             normalized = entry.original.lower()
             if normalized:
                 # Store (entry, length) so find_matches can reconstruct the match
-                self._automaton.add_word(normalized, (entry, len(normalized)))
+                automaton_words[normalized] = (entry, len(normalized))
 
             # 2. Index optimization for regex (case with tags/extra spaces)
             words = self._word_finder.findall(entry.original)
             if words:
                 first_word = words[0].lower()
-                self._first_word_index.setdefault(first_word, []).append((entry, pattern))
+                first_word_index.setdefault(first_word, []).append((entry, pattern))
             else:
-                self._non_word_patterns.append((entry, pattern))
+                non_word_patterns.append((entry, pattern))
         
-        self._automaton.make_automaton()
+        self._first_word_index = first_word_index
+        self._non_word_patterns = non_word_patterns
+        with self._automaton_lock:
+            self._automaton_words = automaton_words
+            self._automaton = self._build_automaton(automaton_words)
+            self._automaton_pending = {}
+        self._build_translation_cache()
+
+    @staticmethod
+    def _build_automaton(words: Dict[str, Tuple[GlossaryEntry, int]]) -> Optional[ahocorasick.Automaton]:
+        if not words:
+            return None
+        automaton = ahocorasick.Automaton()
+        for normalized, value in words.items():
+            automaton.add_word(normalized, value)
+        automaton.make_automaton()
+        return automaton
+
+    def _finalize_automaton(self) -> None:
+        # Build a new automaton and swap the reference; the published one stays intact
+        with self._automaton_lock:
+            if not self._automaton_pending:
+                return
+            self._automaton = self._build_automaton(self._automaton_words)
+            self._automaton_pending = {}
+
+    def _set_automaton_word(self, normalized: str, value: Optional[Tuple[GlossaryEntry, int]]) -> None:
+        with self._automaton_lock:
+            if value is None:
+                self._automaton_words.pop(normalized, None)
+            else:
+                self._automaton_words[normalized] = value
+            # Replaced, not updated: find_matches may be copying the current one
+            pending = dict(self._automaton_pending)
+            pending[normalized] = value
+            self._automaton_pending = pending
+        if len(pending) > self.AUTOMATON_PENDING_LIMIT:
+            # Each pending key costs find_matches a scan; past this a rebuild is cheaper
+            self._finalize_automaton()
+
+    def _pattern_add_entry(self, entry: GlossaryEntry) -> None:
+        """Add one entry to the pattern caches without recompiling the others."""
+        if not entry.original:
+            return
+        self._entries_by_term.setdefault(self.normalize_term(entry.original), entry)
+        self._term_index_source = self._entries
+        self._prefix_index_stale = True
+        pattern = self._build_regex(entry.original)
+        self._compiled_patterns[entry.original] = pattern
+        normalized = entry.original.lower()
+        self._set_automaton_word(normalized, (entry, len(normalized)))
+        # Buckets are replaced rather than appended to; find_matches may be copying them
+        words = self._word_finder.findall(entry.original)
+        if words:
+            first_word = words[0].lower()
+            self._first_word_index[first_word] = self._first_word_index.get(first_word, []) + [(entry, pattern)]
+        else:
+            self._non_word_patterns = self._non_word_patterns + [(entry, pattern)]
+        self._translation_cache_stale = True
+
+    def _pattern_remove_entry(self, entry: GlossaryEntry) -> None:
+        original = entry.original
+        term = self.normalize_term(original)
+        owner = self._entries_by_term.get(term)
+        if owner is not None and owner.original == original:
+            survivor = next((e for e in self._entries if self.normalize_term(e.original) == term), None)
+            if survivor is not None:
+                self._entries_by_term[term] = survivor
+            else:
+                del self._entries_by_term[term]
+        self._term_index_source = self._entries
+        self._prefix_index_stale = True
+        self._compiled_patterns.pop(original, None)
+        normalized = original.lower()
+        if normalized in self._automaton_words:
+            # Another entry may differ only by case; it owned the key before
+            survivor = next((e for e in reversed(self._entries) if e.original.lower() == normalized), None)
+            self._set_automaton_word(normalized, (survivor, len(normalized)) if survivor is not None else None)
+        words = self._word_finder.findall(original)
+        if words:
+            first_word = words[0].lower()
+            remaining = [item for item in self._first_word_index.get(first_word, []) if item[0].original != original]
+            if remaining:
+                self._first_word_index[first_word] = remaining
+            else:
+                self._first_word_index.pop(first_word, None)
+        else:
+            self._non_word_patterns = [item for item in self._non_word_patterns if item[0].original != original]
+        self._translation_cache_stale = True
+
+    def _pattern_replace_entry(self, entry: GlossaryEntry) -> None:
+        """Swap in an edited entry (same original); its regex is unchanged."""
+        pattern = self._compiled_patterns.get(entry.original)
+        if pattern is None:
+            self._pattern_add_entry(entry)
+            return
+        term = self.normalize_term(entry.original)
+        owner = self._entries_by_term.get(term)
+        if owner is not None and owner.original == entry.original:
+            self._entries_by_term[term] = entry
+        self._term_index_source = self._entries
+        self._prefix_index_stale = True
+        normalized = entry.original.lower()
+        current = self._automaton_words.get(normalized)
+        if current is not None and current[0].original == entry.original:
+            self._set_automaton_word(normalized, (entry, current[1]))
+        words = self._word_finder.findall(entry.original)
+        swap = lambda bucket: [(entry, pat) if item.original == entry.original else (item, pat) for item, pat in bucket]
+        if words:
+            first_word = words[0].lower()
+            if first_word in self._first_word_index:
+                self._first_word_index[first_word] = swap(self._first_word_index[first_word])
+        else:
+            self._non_word_patterns = swap(self._non_word_patterns)
+        self._translation_cache_stale = True
+
+    def _build_translation_cache(self) -> None:
+        self._translation_cache_stale = False
+        translations = {entry.translation for entry in self._entries if entry.translation}
+        # Compiled matchers are keyed by text, so only drop ones no longer used
+        self._translation_matchers = {
+            translation: matcher
+            for translation, matcher in self._translation_matchers.items()
+            if translation in translations
+        }
+        self._translation_stems = {}
+        automaton = ahocorasick.Automaton()
+        for translation in translations:
+            stems = self._variation_first_stems(translation)
+            self._translation_stems[translation] = stems
+            for stem in stems:
+                if stem not in automaton:
+                    automaton.add_word(stem, stem)
+        if len(automaton):
+            automaton.make_automaton()
+            self._translation_automaton = automaton
+        else:
+            self._translation_automaton = None
+
+    @staticmethod
+    def _variation_first_stems(translation: str) -> Tuple[str, ...]:
+        """Lower-cased literal every build_translation_regex match must contain, one per variation."""
+        stems = []
+        for var in (translation or '').split(';'):
+            words = var.split()
+            if words:
+                stems.append(GlossaryManager._get_word_stem(words[0]).lower())
+        return tuple(dict.fromkeys(stems))
 
     @staticmethod
     def _build_regex(term: str) -> re.Pattern[str]:
@@ -515,10 +1145,10 @@ class GlossaryManager:
         return re.compile(combined_pattern, re.IGNORECASE)
 
     @staticmethod
-    def _get_word_stem_pattern(word: str) -> str:
-        """Internal helper to get a stem pattern for a single word."""
+    def _get_word_stem(word: str) -> str:
+        """Literal prefix kept by _get_word_stem_pattern."""
         if len(word) <= 2:
-            return re.escape(word)
+            return word
 
         # Common Slavic endings to strip to get a 'soft' stem
         # This is a heuristic, not a full linguistic stemmer
@@ -533,7 +1163,15 @@ class GlossaryManager:
         # If stem is too short, fall back to a safer N-character prefix
         if len(stem) < 2:
              stem = word[:3] if len(word) > 3 else word
-             
+        return stem
+
+    @staticmethod
+    def _get_word_stem_pattern(word: str) -> str:
+        """Internal helper to get a stem pattern for a single word."""
+        stem = GlossaryManager._get_word_stem(word)
+        if len(word) <= 2:
+            return re.escape(stem)
+
         # Pattern: Stem + any trailing Cyrillic characters (optional)
         # We use [а-яА-ЯіїІїЄєґҐ']* to match optional endings
         return rf"{re.escape(stem)}[а-яА-ЯіїІїЄєґҐ']*"
\ No newline at end of file
@@ -0,0 +1,153 @@
+# --- START OF FILE core/glossary_occurrence_store.py ---
+"""
+Sharded scanning and on-disk caching for the glossary occurrence index.
+
+Occurrences travel as plain rows (original, string_idx, line_idx, start, end)
+grouped per block, so they can cross process boundaries and be stored as JSON.
+GlossaryManager turns them back into GlossaryOccurrence objects.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.logging_utils import log_debug
+
+CACHE_FORMAT_VERSION = 1
+# Spawning worker processes only pays off on big projects
+PARALLEL_MIN_STRINGS = 20000
+MAX_SCAN_WORKERS = 4
+SHARDS_PER_WORKER = 4
+
+OccurrenceRow = Tuple[str, int, int, int, int]
+
+
+def glossary_signature(originals: Sequence[str]) -> str:
+    """Hash of the matched terms; translations and notes do not affect occurrences."""
+    digest = hashlib.sha1(f"v{CACHE_FORMAT_VERSION}".encode('utf-8'))
+    for original in originals:
+        digest.update(original.encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def block_signature(block: list) -> str:
+    payload = json.dumps(block, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def scan_block_rows(manager, block: list) -> List[OccurrenceRow]:
+    rows: List[OccurrenceRow] = []
+    for string_idx, value in enumerate(block):
+        text = '' if value is None else str(value)
+        if not text:
+            continue
+        for line_idx, line in enumerate(text.split('\n')):
+            if not line:
+                continue
+            for match in manager.find_matches(line):
+                rows.append((match.entry.original, string_idx, line_idx, match.start, match.end))
+    return rows
+
+
+_worker_manager = None
+
+
+def _init_scan_worker(originals: Sequence[str]) -> None:
+    # Each process builds its own Aho-Corasick automaton once
+    global _worker_manager
+    from core.glossary_manager import GlossaryEntry, GlossaryManager
+    manager = GlossaryManager()
+    manager._entries = [GlossaryEntry(original=original, translation=original) for original in originals]
+    manager._build_pattern_cache()
+    _worker_manager = manager
+
+
+def _scan_shard(shard: Sequence[Tuple[int, list]]) -> List[Tuple[int, List[OccurrenceRow]]]:
+    return [(block_idx, scan_block_rows(_worker_manager, block)) for block_idx, block in shard]
+
+
+def _split_shards(blocks: Sequence[Tuple[int, list]], shard_count: int) -> List[List[Tuple[int, list]]]:
+    """Greedy split into contiguous shards of roughly equal string counts."""
+    total = sum(len(block) for _, block in blocks)
+    target = max(1, total // max(1, shard_count))
+    shards: List[List[Tuple[int, list]]] = []
+    current: List[Tuple[int, list]] = []
+    size = 0
+    for item in blocks:
+        current.append(item)
+        size += len(item[1])
+        if size >= target:
+            shards.append(current)
+            current, size = [], 0
+    if current:
+        shards.append(current)
+    return shards
+
+
+def default_worker_count() -> int:
+    return max(1, min(MAX_SCAN_WORKERS, os.cpu_count() or 1))
+
+
+def scan_blocks_parallel(
+    originals: Sequence[str],
+    blocks: Sequence[Tuple[int, list]],
+    workers: int,
+) -> Dict[int, List[OccurrenceRow]]:
+    shards = _split_shards(blocks, workers * SHARDS_PER_WORKER)
+    result: Dict[int, List[OccurrenceRow]] = {}
+    # 'spawn' keeps Qt state of the parent out of the workers on every platform
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_scan_worker,
+        initargs=(list(originals),),
+    ) as executor:
+        for shard_result in executor.map(_scan_shard, shards):
+            for block_idx, rows in shard_result:
+                result[block_idx] = rows
+    log_debug(f"Glossary occurrence scan: {len(blocks)} blocks in {len(shards)} shards on {workers} processes")
+    return result
+
+
+def occurrence_cache_path(glossary_path: Optional[Path]) -> Optional[Path]:
+    if not glossary_path:
+        return None
+    return glossary_path.with_suffix('.occurrences.json')
+
+
+def load_occurrence_cache(path: Optional[Path], signature: str) -> Dict[str, List[OccurrenceRow]]:
+    """Return block hash -> rows, or {} when the file is missing or was built for other terms."""
+    if not path or not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as exc:
+        log_debug(f"Glossary occurrence cache unreadable ({path}): {exc}")
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    if payload.get('version') != CACHE_FORMAT_VERSION or payload.get('glossary') != signature:
+        return {}
+    blocks = payload.get('blocks')
+    if not isinstance(blocks, dict):
+        return {}
+    return {block_hash: [tuple(row) for row in rows] for block_hash, rows in blocks.items()}
+
+
+def save_occurrence_cache(path: Optional[Path], signature: str, blocks: Dict[str, List[OccurrenceRow]]) -> None:
+    if not path:
+        return
+    payload = {'version': CACHE_FORMAT_VERSION, 'glossary': signature, 'blocks': blocks}
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        log_debug(f"Glossary occurrence cache not saved ({path}): {exc}")
@@ -0,0 +1,130 @@
+# --- START OF FILE core/regex_scan.py ---
+"""
+Regex matching in a child process.
+
+Python's re engine can't be interrupted: one string with catastrophic
+backtracking holds the GIL until it is done, so a QThread alone neither
+keeps the UI responsive nor lets a time budget fire. Search workers send
+their regex work here instead; the calling thread only waits, and when the
+budget is spent (or the search is cancelled) the process is killed.
+
+The scan functions are module-level so they pickle into the child; texts
+travel in chunks, and results come back as plain (pos, length) tuples.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import re
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from utils.logging_utils import log_debug
+
+# Strings per task: big enough to amortize the round trip, small enough to stream results
+REGEX_CHUNK_STRINGS = 2000
+POLL_INTERVAL_SEC = 0.05
+
+
+class RegexScanAborted(Exception):
+    """The scan was stopped; timed_out tells a spent budget from a cancel."""
+
+    def __init__(self, timed_out: bool):
+        super().__init__("Time limit exceeded" if timed_out else "Cancelled")
+        self.timed_out = timed_out
+
+
+def regex_find_in_text(pattern: re.Pattern, text: str, start_offset: int, find_reverse: bool = False) -> Tuple[int, int]:
+    """First (or, reversed, last) non-empty match starting at/before start_offset; (-1, 0) if none."""
+    if find_reverse:
+        last_match = None
+        for match in pattern.finditer(text):
+            if match.start() > start_offset: break
+            if match.end() > match.start(): last_match = match
+        return (last_match.start(), last_match.end() - last_match.start()) if last_match else (-1, 0)
+    for match in pattern.finditer(text, max(0, start_offset)):
+        if match.end() > match.start():
+            return match.start(), match.end() - match.start()
+    return -1, 0
+
+
+def find_regex_matches(pattern: re.Pattern, texts: Sequence[str]) -> List[List[Tuple[int, int]]]:
+    """Every non-empty, non-overlapping match per text, as (pos, length)."""
+    return [[(m.start(), m.end() - m.start()) for m in pattern.finditer(text) if m.end() > m.start()]
+            for text in texts]
+
+
+def find_first_regex_match(pattern: re.Pattern, items: Sequence[Tuple[str, int]],
+                           find_reverse: bool) -> Optional[Tuple[int, int, int]]:
+    """(item index, pos, length) of the first item in `items` order with a match from its offset."""
+    for i, (text, offset) in enumerate(items):
+        pos, length = regex_find_in_text(pattern, text, offset, find_reverse)
+        if pos != -1:
+            return i, pos, length
+    return None
+
+
+def substitute_regex(pattern: re.Pattern, replacement: str, expand_template: bool,
+                     texts: Sequence[str]) -> List[Tuple[str, int]]:
+    """pattern.subn over every text; raises re.error/IndexError on a bad template."""
+    # Literal replacements must not interpret backslashes or group references
+    repl = replacement if expand_template else (lambda match: replacement)
+    return [pattern.subn(repl, text) for text in texts]
+
+
+def iter_chunks(items: Sequence, size: int = REGEX_CHUNK_STRINGS):
+    for start in range(0, len(items), size):
+        yield start, items[start:start + size]
+
+
+class RegexScanProcess:
+    """
+    One reusable child process for regex scans. Calls are serialized; a call
+    that runs past its deadline or is cancelled kills the process, and the
+    next call starts a fresh one.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def run(self, func: Callable, args: tuple, deadline: Optional[float] = None,
+            should_stop: Callable[[], bool] = lambda: False):
+        """Run func(*args) in the child and return its result; raises RegexScanAborted when stopped."""
+        while not self._lock.acquire(timeout=POLL_INTERVAL_SEC):
+            self._check_abort(deadline, should_stop)
+        try:
+            if self._pool is None:
+                # 'spawn' keeps Qt state of the parent out of the child on every platform
+                self._pool = multiprocessing.get_context('spawn').Pool(processes=1)
+            pending = self._pool.apply_async(func, args)
+            while True:
+                try:
+                    self._check_abort(deadline, should_stop)
+                except RegexScanAborted:
+                    self._kill()
+                    raise
+                wait = POLL_INTERVAL_SEC if deadline is None else max(0.0, min(POLL_INTERVAL_SEC, deadline - time.monotonic()))
+                try:
+                    return pending.get(wait)
+                except multiprocessing.TimeoutError:
+                    continue
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _check_abort(deadline: Optional[float], should_stop: Callable[[], bool]) -> None:
+        if should_stop():
+            raise RegexScanAborted(timed_out=False)
+        if deadline is not None and time.monotonic() >= deadline:
+            raise RegexScanAborted(timed_out=True)
+
+    def _kill(self) -> None:
+        if self._pool is not None:
+            log_debug("RegexScanProcess: stopping a running regex scan")
+            self._pool.terminate()
+            self._pool = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._kill()
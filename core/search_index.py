@@ -0,0 +1,347 @@
+# --- START OF FILE core/search_index.py ---
+"""
+Trigram full-text index used by the project-wide search.
+
+Every string is indexed in four views: original/translation text, each in raw
+and tagless (``prepare_text_for_tagless_search``) form. A query is resolved to
+the intersection of the posting lists of its trigrams, which yields a small set
+of candidate strings that the search handler then verifies with its regular
+matching logic. Queries shorter than ``NGRAM_SIZE`` return ``None`` so the
+caller falls back to a linear scan.
+
+``TaglessTextCache`` keeps the tagless form of each string together with its
+offset map back to the raw text, so repeated searches don't re-normalize every
+string and tagless hits can be mapped to exact raw positions for highlighting.
+
+Fuzzy queries go through a word vocabulary: every view keeps word -> posting
+lists, and all indexed words live in one ``BKTree`` so that the words within
+edit distance of the query are found without comparing it against every word
+of every string.
+"""
+import re
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from utils.logging_utils import log_debug
+from utils.utils import build_tagless_search_text, prepare_text_for_tagless_search, is_fuzzy_match
+
+NGRAM_SIZE = 3
+FUZZY_THRESHOLD = 0.75  # Same threshold SearchHandler._find_in_text passes to is_fuzzy_match
+WORD_PATTERN = re.compile(r'\w+')
+
+StringKey = Tuple[int, int]
+ViewKey = Tuple[bool, bool]  # (search_in_original, ignore_tags)
+
+ALL_VIEWS: Tuple[ViewKey, ...] = (
+    (True, False), (True, True),
+    (False, False), (False, True),
+)
+
+
+def extract_ngrams(text: str, n: int = NGRAM_SIZE) -> FrozenSet[str]:
+    """Returns the set of case-folded n-grams of ``text``."""
+    if not text or len(text) < n:
+        return frozenset()
+    folded = text.casefold()
+    return frozenset(folded[i:i + n] for i in range(len(folded) - n + 1))
+
+
+def extract_words(text: str) -> FrozenSet[str]:
+    """Returns the set of lower-cased words of ``text``, as matched by fuzzy search."""
+    if not text:
+        return frozenset()
+    return frozenset(match.group(0).lower() for match in WORD_PATTERN.finditer(text))
+
+
+def levenshtein_distance(a: str, b: str) -> int:
+    """Edit distance using Myers' bit-parallel algorithm (one machine word per column set)."""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    length = len(b)
+    if not length:
+        return len(a)
+
+    char_masks: Dict[str, int] = {}
+    for i, char in enumerate(b):
+        char_masks[char] = char_masks.get(char, 0) | (1 << i)
+
+    full_mask = (1 << length) - 1
+    last_bit = 1 << (length - 1)
+    positive, negative, score = full_mask, 0, length
+    for char in a:
+        eq = char_masks.get(char, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        horizontal_pos = negative | ~(xh | positive)
+        horizontal_neg = positive & xh
+        if horizontal_pos & last_bit:
+            score += 1
+        elif horizontal_neg & last_bit:
+            score -= 1
+        horizontal_pos = (horizontal_pos << 1) | 1
+        horizontal_neg <<= 1
+        positive = (horizontal_neg | ~(xv | horizontal_pos)) & full_mask
+        negative = horizontal_pos & xv
+    return score
+
+
+def fuzzy_search_radius(query: str) -> int:
+    """
+    Largest edit distance at which ``is_fuzzy_match(query, word, FUZZY_THRESHOLD)``
+    can still hold. The ratio is 2*M/T (M matched chars, T total length), so
+    T - 2*M <= (1 - FUZZY_THRESHOLD) * T, and T is at most 2*len(query) + 3.
+    """
+    return int((1 - FUZZY_THRESHOLD) * (2 * len(query) + 3))
+
+
+class BKTree:
+    """Burkhard-Keller tree over words under the Levenshtein metric. Insert-only."""
+
+    def __init__(self):
+        self._root: Optional[list] = None  # [word, {distance: child}]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, word: str) -> bool:
+        if self._root is None:
+            self._root = [word, {}]
+            self._size = 1
+            return True
+        node = self._root
+        while True:
+            distance = levenshtein_distance(word, node[0])
+            if distance == 0:
+                return False
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [word, {}]
+                self._size += 1
+                return True
+            node = child
+
+    def search(self, word: str, radius: int) -> List[str]:
+        """Returns every stored word within ``radius`` edits of ``word``."""
+        if self._root is None:
+            return []
+        found = []
+        stack = [self._root]
+        while stack:
+            node_word, children = stack.pop()
+            distance = levenshtein_distance(word, node_word)
+            if distance <= radius:
+                found.append(node_word)
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+class SearchIndex:
+    def __init__(self):
+        self._postings: Dict[ViewKey, Dict[str, Set[StringKey]]] = {view: {} for view in ALL_VIEWS}
+        self._grams: Dict[ViewKey, Dict[StringKey, FrozenSet[str]]] = {view: {} for view in ALL_VIEWS}
+        self._word_postings: Dict[ViewKey, Dict[str, Set[StringKey]]] = {view: {} for view in ALL_VIEWS}
+        self._words: Dict[ViewKey, Dict[StringKey, FrozenSet[str]]] = {view: {} for view in ALL_VIEWS}
+        self._vocabulary = BKTree()
+
+    def __len__(self) -> int:
+        return len(self._grams[(True, False)])
+
+    def clear(self) -> None:
+        for view in ALL_VIEWS:
+            self._postings[view].clear()
+            self._grams[view].clear()
+            self._word_postings[view].clear()
+            self._words[view].clear()
+        self._vocabulary = BKTree()
+
+    @staticmethod
+    def _update_postings(postings: Dict[str, Set[StringKey]], key: StringKey,
+                         old_terms: FrozenSet[str], new_terms: FrozenSet[str]) -> None:
+        for term in old_terms - new_terms:
+            bucket = postings.get(term)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del postings[term]
+        for term in new_terms - old_terms:
+            bucket = postings.get(term)
+            if bucket is None:
+                bucket = postings[term] = set()
+            bucket.add(key)
+
+    def _index_view(self, view: ViewKey, key: StringKey, text: str) -> None:
+        old_grams = self._grams[view].get(key, frozenset())
+        new_grams = extract_ngrams(text)
+        if old_grams != new_grams:
+            self._update_postings(self._postings[view], key, old_grams, new_grams)
+            self._grams[view][key] = new_grams
+
+        old_words = self._words[view].get(key, frozenset())
+        new_words = extract_words(text)
+        if old_words != new_words:
+            self._update_postings(self._word_postings[view], key, old_words, new_words)
+            self._words[view][key] = new_words
+            for word in new_words - old_words:
+                self._vocabulary.add(word)
+
+    def _index_text(self, is_original: bool, key: StringKey, text: Optional[str]) -> None:
+        raw_text = str(text) if text is not None else ""
+        self._index_view((is_original, False), key, raw_text)
+        self._index_view((is_original, True), key, prepare_text_for_tagless_search(raw_text))
+
+    def add_string(self, block_idx: int, string_idx: int, original_text: Optional[str], translation_text: Optional[str]) -> None:
+        key = (block_idx, string_idx)
+        self._index_text(True, key, original_text)
+        self._index_text(False, key, translation_text)
+
+    def update_string(self, block_idx: int, string_idx: int, translation_text: Optional[str]) -> None:
+        """Re-indexes the translation side of a single string after an edit."""
+        self._index_text(False, (block_idx, string_idx), translation_text)
+
+    def remove_string(self, block_idx: int, string_idx: int) -> None:
+        key = (block_idx, string_idx)
+        for view in ALL_VIEWS:
+            self._index_view(view, key, "")
+            self._grams[view].pop(key, None)
+            self._words[view].pop(key, None)
+
+    def refresh_block(self, block_idx: int, original_texts: List[Any], translation_texts: List[Any]) -> None:
+        """Re-indexes every string of one block, dropping strings that no longer exist."""
+        stale_keys = [k for k in self._grams[(True, False)] if k[0] == block_idx and k[1] >= len(original_texts)]
+        for key in stale_keys:
+            self.remove_string(*key)
+        for s_idx, original_text in enumerate(original_texts):
+            translation_text = translation_texts[s_idx] if s_idx < len(translation_texts) else None
+            self.add_string(block_idx, s_idx, original_text, translation_text)
+
+    def candidates(self, query: str, search_in_original: bool, ignore_tags: bool) -> Optional[List[StringKey]]:
+        """
+        Returns the sorted (block, string) keys whose text may contain ``query``,
+        or ``None`` if the query is too short to be resolved through the index.
+        ``query`` must already be normalized the same way as the searched text.
+        """
+        query_grams = extract_ngrams(query)
+        if not query_grams:
+            return None
+
+        postings = self._postings[(search_in_original, ignore_tags)]
+        buckets = []
+        for gram in query_grams:
+            bucket = postings.get(gram)
+            if not bucket:
+                return []
+            buckets.append(bucket)
+
+        buckets.sort(key=len)
+        result = set(buckets[0])
+        for bucket in buckets[1:]:
+            result &= bucket
+            if not result:
+                return []
+        return sorted(result)
+
+    def fuzzy_candidates(self, query: str, search_in_original: bool, ignore_tags: bool) -> List[StringKey]:
+        """
+        Returns the sorted (block, string) keys containing a word that fuzzy-matches
+        ``query``. Words are looked up in the BK-tree within ``fuzzy_search_radius``
+        and then confirmed with ``is_fuzzy_match``.
+        """
+        folded_query = query.lower()
+        if not folded_query:
+            return []
+        word_postings = self._word_postings[(search_in_original, ignore_tags)]
+        result: Set[StringKey] = set()
+        for word in self._vocabulary.search(folded_query, fuzzy_search_radius(folded_query)):
+            bucket = word_postings.get(word)
+            if bucket and is_fuzzy_match(folded_query, word, threshold=FUZZY_THRESHOLD):
+                result |= bucket
+        return sorted(result)
+
+    @classmethod
+    def build(cls, original_blocks: List[Any], translation_blocks: List[Any], is_cancelled=None) -> Optional['SearchIndex']:
+        """Builds a full index from snapshots of original and translation blocks."""
+        index = cls()
+        for b_idx, block in enumerate(original_blocks):
+            if is_cancelled is not None and is_cancelled():
+                return None
+            if not isinstance(block, list):
+                continue
+            translations = translation_blocks[b_idx] if b_idx < len(translation_blocks) else []
+            for s_idx, original_text in enumerate(block):
+                translation_text = translations[s_idx] if s_idx < len(translations) else None
+                index.add_string(b_idx, s_idx, original_text, translation_text)
+        return index
+
+
+class TaglessText:
+    __slots__ = ('raw', 'text', 'offsets')
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.text, self.offsets = build_tagless_search_text(raw)
+
+    def to_raw_span(self, pos: int, length: int) -> Tuple[int, int]:
+        """Maps a [pos, pos + length) span of the tagless text to a raw (start, end) span."""
+        if not self.offsets or length <= 0:
+            return -1, -1
+        pos = max(0, min(pos, len(self.offsets) - 1))
+        last = max(pos, min(pos + length, len(self.offsets)) - 1)
+        return self.offsets[pos], self.offsets[last] + 1
+
+
+class TaglessTextCache:
+    """Per-string cache of TaglessText, keyed by (is_original, block_idx, string_idx)."""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[bool, int, int], TaglessText] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, is_original: bool, block_idx: int, string_idx: int, raw_text: str) -> TaglessText:
+        key = (is_original, block_idx, string_idx)
+        entry = self._entries.get(key)
+        if entry is None or entry.raw != raw_text:
+            entry = self._entries[key] = TaglessText(raw_text)
+        return entry
+
+    def invalidate(self, block_idx: int, string_idx: int) -> None:
+        self._entries.pop((False, block_idx, string_idx), None)
+
+    def invalidate_block(self, block_idx: int) -> None:
+        for key in [k for k in self._entries if k[1] == block_idx]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SearchIndexBuildWorker(QThread):
+    index_built = pyqtSignal(object, int)  # SearchIndex, generation
+
+    def __init__(self, original_blocks: List[Any], translation_blocks: List[Any], generation: int, parent=None):
+        # Handle mocking in tests: MagicMock doesn't pass isinstance(QObject) but causes TypeError in super().__init__
+        if parent is not None and (not isinstance(parent, QObject) or "Mock" in str(type(parent))):
+            parent = None
+        super().__init__(parent)
+        self.original_blocks = original_blocks
+        self.translation_blocks = translation_blocks
+        self.generation = generation
+        self.is_cancelled = False
+
+    def cancel(self):
+        self.is_cancelled = True
+
+    def run(self):
+        index = SearchIndex.build(self.original_blocks, self.translation_blocks, lambda: self.is_cancelled)
+        if index is None:
+            log_debug(f"SearchIndexBuildWorker: build #{self.generation} cancelled.")
+            return
+        log_debug(f"SearchIndexBuildWorker: build #{self.generation} indexed {len(index)} strings.")
+        self.index_built.emit(index, self.generation)
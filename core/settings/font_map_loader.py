@@ -118,6 +118,14 @@ class FontMapLoader:
             if hasattr(highlighter, '_invalidate_icon_cache'):
                 highlighter._invalidate_icon_cache()
             highlighter.rehighlight()
+        # Font maps are updated in place, so cached line widths in the number areas are stale
+        for attr in ('original_text_edit', 'edited_text_edit'):
+            editor = getattr(self.mw, attr, None)
+            area = getattr(editor, 'lineNumberArea', None) if editor else None
+            paint_logic = getattr(area, 'paint_logic', None)
+            if paint_logic is not None and hasattr(paint_logic, 'invalidate_render_cache'):
+                paint_logic.invalidate_render_cache()
+                area.update()
 
     def update_icon_sequences_cache(self) -> None:
         sequences = set()
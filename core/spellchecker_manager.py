@@ -2,9 +2,11 @@
 # /home/runner/work/RAG_project/RAG_project/core/spellchecker_manager.py
 import re
 import time
+from collections import deque
 from pathlib import Path
 from typing import List, Optional, Dict
 from utils.logging_utils import log_debug, log_warning, log_error
+from core.glossary_manager import GlossarySnapshot
 from spylls.hunspell import Dictionary
 from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
 
@@ -21,7 +23,7 @@ class SpellcheckWorker(QObject):
     def __init__(self, spellchecker_manager):
         super().__init__()
         self.sm = spellchecker_manager
-        self._queue = []
+        self._queue = deque()
         self._queue_set = set() # For O(1) checks
         self._is_running = True
 
@@ -34,27 +36,34 @@ class SpellcheckWorker(QObject):
                 results_sugg = {}
                 
                 for _ in range(batch_size):
-                    word = self._queue.pop(0)
+                    try:
+                        word = self._queue.popleft()
+                    except IndexError:
+                        break
                     self._queue_set.discard(word)
                     
                     if not self.sm.hunspell:
                         continue
+
+                    # Cache keys are lowercase; the lookup keeps the case so proper nouns pass
+                    key = word.lower()
                         
                     # 1. Check spelling
                     is_misspelled = False
-                    if word not in self.sm._spell_cache:
+                    if key not in self.sm._spell_cache:
                         try:
                             is_correct = self.sm.hunspell.lookup(word)
                             is_misspelled = not is_correct
-                            results_spell[word] = is_misspelled
                         except Exception as e:
                             log_debug(f"SpellcheckWorker: Error checking '{word}': {e}")
                             continue
                     else:
-                        is_misspelled = self.sm._spell_cache.get(word, False)
+                        is_misspelled = self.sm._spell_cache.get(key, False)
+                    # Always reported, so highlighters waiting on the word get an answer
+                    results_spell[key] = is_misspelled
                     
                     # 2. Fetch suggestions if misspelled
-                    if is_misspelled and word not in self.sm._suggestions_cache:
+                    if is_misspelled and key not in self.sm._suggestions_cache:
                         try:
                             suggestions = []
                             res = self.sm.hunspell.suggest(word)
@@ -67,7 +76,7 @@ class SpellcheckWorker(QObject):
                                         break
                             else:
                                 suggestions = list(res)[:SUGGESTION_LIMIT]
-                            results_sugg[word] = suggestions
+                            results_sugg[key] = suggestions
                         except Exception as e:
                             log_debug(f"SpellcheckWorker: Error suggesting for '{word}': {e}")
                             
@@ -80,10 +89,20 @@ class SpellcheckWorker(QObject):
     def stop(self):
         self._is_running = False
 
-    def enqueue(self, word):
-        if word not in self._queue_set:
+    def enqueue(self, word, priority=False):
+        if word in self._queue_set:
+            if not priority:
+                return
+            # Already waiting: move it to the front for a block that is on screen
+            try:
+                self._queue.remove(word)
+            except ValueError:
+                pass
+        self._queue_set.add(word)
+        if priority:
+            self._queue.appendleft(word)
+        else:
             self._queue.append(word)
-            self._queue_set.add(word)
 
 class SpellcheckerManager:
     def __init__(self, main_window, language='uk', custom_dict_path=None):
@@ -93,6 +112,8 @@ class SpellcheckerManager:
         self.hunspell: Optional['Dictionary'] = None
         self.enabled = False
         self.custom_words = set()
+        # Glossary revision whose translation words are in custom_words
+        self._glossary_words_revision: Optional[int] = None
         self._spell_cache: Dict[str, bool] = {}
         self._suggestions_cache: Dict[str, List[str]] = {}
         self._cache_file = LOCAL_DICT_PATH / "spell_cache.json"
@@ -127,34 +148,34 @@ class SpellcheckerManager:
         self.thread.start()
 
     def _on_spellcheck_results_ready(self, spell_results: dict, sugg_results: dict):
-        cache_updated = False
+        misspelled = set()
         for word, is_misspelled in spell_results.items():
             if word not in self._spell_cache:
                 self._spell_cache[word] = is_misspelled
-                if is_misspelled:
-                    cache_updated = True
+            if self._spell_cache[word]:
+                misspelled.add(word)
                 
         for word, suggestions in sugg_results.items():
             if word not in self._suggestions_cache:
                 self._suggestions_cache[word] = suggestions
                 
-        if cache_updated:
-            # Do NOT call rehighlight() here. It processes every block in the
-            # document and freezes the UI for large files. Instead, misspelled
-            # words will be underlined naturally on the next highlightBlock pass
-            # (next keystroke, scroll, or focus change).
-            pass
-
-    def enqueue_word(self, word):
+        # Do NOT call rehighlight() here: it processes every block in the document
+        # and freezes the UI for large files. The highlighter re-formats only the
+        # blocks that were waiting on these words.
+        highlighter = getattr(getattr(self.mw, 'edited_text_edit', None), 'highlighter', None)
+        if highlighter is not None and hasattr(highlighter, 'on_spellcheck_results'):
+            highlighter.on_spellcheck_results(set(spell_results), misspelled)
+
+    def enqueue_word(self, word, priority: bool = False):
         if not self.enabled or not self.hunspell:
             return
         
-        cleaned_word = word.strip("'·").lower()
+        cleaned_word = word.strip("'·")
         if len(cleaned_word) < MIN_WORD_LENGTH:
             return
             
         if hasattr(self, 'worker'):
-            self.worker.enqueue(cleaned_word)
+            self.worker.enqueue(cleaned_word, priority)
 
     def _initialize_spellchecker(self):
         log_debug("Attempting to initialize spellchecker...")
@@ -178,6 +199,7 @@ class SpellcheckerManager:
             self._spell_cache.clear()
             self._suggestions_cache.clear()
             self._load_user_dictionary()
+            self._glossary_words_revision = None
             self._load_glossary_words()
 
         except Exception as e:
@@ -236,9 +258,10 @@ class SpellcheckerManager:
         except Exception as e:
             log_error(f"Failed to load user dictionary: {e}", exc_info=True)
 
-    def reload_glossary_words(self):
+    def reload_glossary_words(self, rehighlight: bool = True):
         """Public method to reload glossary words. Called after glossary is initialized."""
-        self._load_glossary_words()
+        if not self._load_glossary_words() or not rehighlight:
+            return
 
         # Trigger rehighlight in edited_text_edit if spellchecker is enabled
         if self.enabled and hasattr(self.mw, 'edited_text_edit') and self.mw.edited_text_edit:
@@ -280,47 +303,43 @@ class SpellcheckerManager:
         except Exception as e:
             log_error(f"Failed to save persistent spell cache: {e}")
 
-    def _load_glossary_words(self):
-        """Load all words from glossary translations into custom dictionary."""
+    def _load_glossary_words(self) -> bool:
+        """Load all words from glossary translations into custom dictionary; True if any were added."""
         if not hasattr(self.mw, 'translation_handler') or not self.mw.translation_handler:
             log_debug("_load_glossary_words: translation_handler not available yet")
-            return
+            return False
 
         # Access glossary_manager through glossary_handler
         glossary_handler = getattr(self.mw.translation_handler, 'glossary_handler', None)
         if not glossary_handler:
             log_debug("_load_glossary_words: glossary_handler not available yet")
-            return
+            return False
 
         glossary_manager = getattr(glossary_handler, 'glossary_manager', None)
         if not glossary_manager:
             log_debug("_load_glossary_words: glossary_manager not available yet")
-            return
+            return False
 
-        # Get all glossary entries
-        entries = glossary_manager.get_entries()
-        if not entries:
+        # Words are extracted once per glossary revision by the shared snapshot
+        snapshot = GlossarySnapshot.of(glossary_manager)
+        if not snapshot.entries:
             log_debug("_load_glossary_words: no glossary entries found")
-            return
+            return False
+        if snapshot.revision is not None and snapshot.revision == self._glossary_words_revision:
+            return False
 
-        # Extract all words from translations and add them to custom_words
-        word_pattern = re.compile(r"[a-zA-Zа-яА-ЯіїІїЄєґҐ']+")
         glossary_words_count = 0
-
-        for entry in entries:
-            # Extract words from translation
-            translation_words = word_pattern.findall(entry.translation)
-            for word in translation_words:
-                # Strip apostrophes and normalize
-                cleaned_word = word.strip("'").lower()
-                if len(cleaned_word) >= MIN_WORD_LENGTH and cleaned_word not in self.custom_words:
-                    self.custom_words.add(cleaned_word)
-                    self._spell_cache[cleaned_word] = False
-                    if cleaned_word in self._suggestions_cache:
-                        del self._suggestions_cache[cleaned_word]
-                    glossary_words_count += 1
+        for cleaned_word in snapshot.translation_words:
+            if len(cleaned_word) >= MIN_WORD_LENGTH and cleaned_word not in self.custom_words:
+                self.custom_words.add(cleaned_word)
+                self._spell_cache[cleaned_word] = False
+                if cleaned_word in self._suggestions_cache:
+                    del self._suggestions_cache[cleaned_word]
+                glossary_words_count += 1
+        self._glossary_words_revision = snapshot.revision
 
         log_debug(f"Loaded {glossary_words_count} words from glossary into spellchecker dictionary.")
+        return glossary_words_count > 0
 
     def add_to_custom_dictionary(self, word: str):
         if not self.hunspell:
@@ -348,24 +367,42 @@ class SpellcheckerManager:
         
         self._save_persistent_cache()
 
-    def is_misspelled(self, word: str) -> bool:
-        if not self.enabled:
-            return False
-        if not self.hunspell:
-            return False
-
+    def _lookup_key(self, word: str) -> Optional[str]:
+        """Lowercase cache key for a word worth checking, or None if it is skipped."""
         # Strip apostrophes and middle dot (·) which represents spaces in editor
         cleaned_word = word.strip("'·")
 
         if len(cleaned_word) < MIN_WORD_LENGTH:
-            return False
+            return None
         if cleaned_word.isdigit():
-            return False
+            return None
         if not WORD_PATTERN.match(cleaned_word):
+            return None
+        return cleaned_word.lower()
+
+    def cached_misspelling(self, word: str) -> Optional[bool]:
+        """
+        Like is_misspelled, but never touches the dictionary: None means the word
+        is not cached yet and should be queued with enqueue_word.
+        """
+        if not self.enabled or not self.hunspell:
             return False
+        lower_word = self._lookup_key(word)
+        if lower_word is None:
+            return False
+        if lower_word in self.custom_words:
+            return False
+        return self._spell_cache.get(lower_word)
 
-        # Check memory cache first
-        lower_word = cleaned_word.lower()
+    def is_misspelled(self, word: str) -> bool:
+        if not self.enabled:
+            return False
+        if not self.hunspell:
+            return False
+
+        lower_word = self._lookup_key(word)
+        if lower_word is None:
+            return False
 
         # Check if word is in custom dictionary (includes glossary words)
         if lower_word in self.custom_words:
@@ -375,8 +412,9 @@ class SpellcheckerManager:
         if lower_word in self._spell_cache:
             return self._spell_cache[lower_word]
 
-        # Use synchronous lookup for immediate results in highlighter.
-        # This was fast enough in v0.2.17 and avoids complex async UI updates.
+        # Synchronous lookup for callers that need an answer now (context menu,
+        # spellcheck dialog); the highlighter uses cached_misspelling instead.
+        cleaned_word = word.strip("'·")
         try:
             is_correct = self.hunspell.lookup(cleaned_word)
             is_misspelled = not is_correct
@@ -397,7 +397,7 @@ class UndoManager:
                     self.mw.editor_operation_handler._rescan_issues_for_current_string(block_idx, string_idx, text)
 
                 # Perform necessary UI refreshes
-                self.mw.editor_operation_handler.preview_update_timer.start(50)
+                self.mw.editor_operation_handler.schedule_preview_update(50, block_idx, string_idx)
                 self.mw.ui_updater.update_title()
                 self.mw.ui_updater.update_status_bar()
                 self.mw.ui_updater.update_block_item_text_with_problem_count(block_idx)
@@ -208,6 +208,7 @@ class AppActionHandler(BaseHandler):
 
             self.mw.data_store.json_path = str(original_file_path)
             self.mw.data_store.data = data
+            self.mw.data_store.mark_data_changed()
             if block_names_from_plugin:
                 self.mw.data_store.block_names.update(block_names_from_plugin)
             
@@ -388,4 +389,6 @@ class AppActionHandler(BaseHandler):
     def _perform_initial_silent_scan_all_issues(self) -> None:
         if hasattr(self.mw, 'issue_scan_handler'):
             self.mw.issue_scan_handler._perform_initial_silent_scan_all_issues()
+        if hasattr(self.mw, 'search_handler'):
+            self.mw.search_handler.rebuild_index()
 
@@ -0,0 +1,260 @@
+# handlers/find_all_worker.py
+import re
+import time
+from typing import Any, Callable, List, Optional, Tuple
+from PyQt5.QtCore import QThread, pyqtSignal, QObject
+from core.regex_scan import (RegexScanAborted, RegexScanProcess, find_first_regex_match, find_regex_matches,
+                             iter_chunks, substitute_regex)
+from utils.logging_utils import log_error
+from utils.utils import prepare_text_for_tagless_search
+
+SNIPPET_CONTEXT_CHARS = 25
+# Regex scans stop once this budget is spent. With a RegexScanProcess the budget
+# also interrupts a single runaway match: the child process is killed.
+REGEX_TIME_BUDGET_SEC = 5.0
+
+
+def _regex_deadline(time_budget: Optional[float]) -> Optional[float]:
+    return time.monotonic() + time_budget if time_budget is not None else None
+
+class FindAllWorker(QThread):
+    results_found = pyqtSignal(list)  # [(block_idx, string_idx, offset, length, snippet), ...]
+    progress_updated = pyqtSignal(int, int)  # processed strings, total strings
+    search_finished = pyqtSignal(int)  # total number of hits
+    cancelled = pyqtSignal()
+
+    EMIT_INTERVAL_SEC = 0.05
+
+    def __init__(self, entries: List[Tuple[int, int, str]], query: str, case_sensitive: bool,
+                 ignore_tags: bool, is_fuzzy: bool, matcher: Callable[..., Tuple[int, int]], parent=None,
+                 time_budget: Optional[float] = None, is_regex: bool = False,
+                 pattern: Optional['re.Pattern'] = None, regex_process: Optional[RegexScanProcess] = None):
+        # Handle mocking in tests: MagicMock doesn't pass isinstance(QObject) but causes TypeError in super().__init__
+        if parent is not None and (not isinstance(parent, QObject) or "Mock" in str(type(parent))):
+            parent = None
+        super().__init__(parent)
+        self.entries = entries
+        self.query = query
+        self.case_sensitive = case_sensitive
+        self.ignore_tags = ignore_tags
+        self.is_fuzzy = is_fuzzy
+        self.matcher = matcher
+        self.time_budget = time_budget
+        self.is_regex = is_regex or pattern is not None
+        self.pattern = pattern
+        self.regex_process = regex_process
+        self.is_cancelled = False
+        self.timed_out = False
+
+    def cancel(self):
+        self.is_cancelled = True
+
+    def _prepare_text(self, text) -> str:
+        text = str(text) if text is not None else ""
+        return prepare_text_for_tagless_search(text) if self.ignore_tags else text
+
+    @staticmethod
+    def _make_snippet(text: str, pos: int, length: int) -> str:
+        start = max(0, pos - SNIPPET_CONTEXT_CHARS)
+        end = min(len(text), pos + length + SNIPPET_CONTEXT_CHARS)
+        snippet = text[start:end].replace('\n', ' ')
+        if start > 0: snippet = "…" + snippet
+        if end < len(text): snippet = snippet + "…"
+        return snippet
+
+    def run(self):
+        if self.pattern is not None and self.regex_process is not None:
+            self._run_regex()
+            return
+        total = len(self.entries)
+        total_hits = 0
+        batch: List[Tuple[int, int, int, int, str]] = []
+        started = last_emit = time.monotonic()
+
+        for i, (block_idx, string_idx, text) in enumerate(self.entries):
+            if self.time_budget is not None and time.monotonic() - started > self.time_budget:
+                self.timed_out = True
+                self.is_cancelled = True
+            if self.is_cancelled:
+                if batch: self.results_found.emit(batch)
+                self.cancelled.emit()
+                return
+
+            text = self._prepare_text(text)
+
+            offset = 0
+            while offset <= len(text):
+                pos, length = self.matcher(text, self.query, offset, self.case_sensitive, False, self.is_fuzzy)
+                if pos == -1: break
+                batch.append((block_idx, string_idx, pos, length, self._make_snippet(text, pos, length)))
+                # Regex matches don't overlap; plain matches keep reporting overlapping hits
+                offset = pos + max(length, 1) if self.is_regex else pos + 1
+
+            now = time.monotonic()
+            if now - last_emit >= self.EMIT_INTERVAL_SEC:
+                if batch:
+                    total_hits += len(batch)
+                    self.results_found.emit(batch)
+                    batch = []
+                self.progress_updated.emit(i + 1, total)
+                last_emit = now
+
+        if batch:
+            total_hits += len(batch)
+            self.results_found.emit(batch)
+        self.progress_updated.emit(total, total)
+        self.search_finished.emit(total_hits)
+
+    def _run_regex(self):
+        total = len(self.entries)
+        total_hits = 0
+        deadline = _regex_deadline(self.time_budget)
+        for start, chunk in iter_chunks(self.entries):
+            texts = [self._prepare_text(text) for _, _, text in chunk]
+            try:
+                matches = self.regex_process.run(find_regex_matches, (self.pattern, texts), deadline, lambda: self.is_cancelled)
+            except RegexScanAborted as e:
+                self.timed_out = e.timed_out
+                self.is_cancelled = True
+                self.cancelled.emit()
+                return
+            except Exception as e:
+                log_error(f"FindAllWorker: regex scan failed: {e}", exc_info=True)
+                self.is_cancelled = True
+                self.cancelled.emit()
+                return
+            batch = [(block_idx, string_idx, pos, length, self._make_snippet(text, pos, length))
+                     for (block_idx, string_idx, _), text, hits in zip(chunk, texts, matches)
+                     for pos, length in hits]
+            if batch:
+                total_hits += len(batch)
+                self.results_found.emit(batch)
+            self.progress_updated.emit(start + len(chunk), total)
+        self.progress_updated.emit(total, total)
+        self.search_finished.emit(total_hits)
+
+
+class RegexFindWorker(QThread):
+    """Regex Find Next/Previous: the first match in `entries` order, found in a RegexScanProcess."""
+    match_found = pyqtSignal(object)  # (block_idx, string_idx, offset, length), or None when there is none
+    search_failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, entries: List[Tuple[int, int, str, int]], pattern: 're.Pattern', find_reverse: bool,
+                 regex_process: RegexScanProcess, parent=None, time_budget: Optional[float] = None):
+        # Handle mocking in tests: MagicMock doesn't pass isinstance(QObject) but causes TypeError in super().__init__
+        if parent is not None and (not isinstance(parent, QObject) or "Mock" in str(type(parent))):
+            parent = None
+        super().__init__(parent)
+        self.entries = entries  # (block_idx, string_idx, search_text, start_offset) in search order
+        self.pattern = pattern
+        self.find_reverse = find_reverse
+        self.regex_process = regex_process
+        self.time_budget = time_budget
+        self.is_cancelled = False
+        self.timed_out = False
+
+    def cancel(self):
+        self.is_cancelled = True
+
+    def run(self):
+        deadline = _regex_deadline(self.time_budget)
+        for _start, chunk in iter_chunks(self.entries):
+            items = [(text, offset) for _, _, text, offset in chunk]
+            try:
+                hit = self.regex_process.run(find_first_regex_match, (self.pattern, items, self.find_reverse),
+                                             deadline, lambda: self.is_cancelled)
+            except RegexScanAborted as e:
+                self.timed_out = e.timed_out
+                self.cancelled.emit()
+                return
+            except Exception as e:
+                log_error(f"RegexFindWorker: regex scan failed: {e}", exc_info=True)
+                self.search_failed.emit(str(e))
+                return
+            if hit is not None:
+                i, pos, length = hit
+                self.match_found.emit((chunk[i][0], chunk[i][1], pos, length))
+                return
+        self.match_found.emit(None)
+
+
+class ReplaceAllWorker(QThread):
+    replacements_ready = pyqtSignal(list)  # [(block_idx, string_idx, new_text, replacement_count, source_text), ...]
+    replace_failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, entries: List[Tuple[int, int, str]], pattern: 're.Pattern', replacement: str,
+                 expand_template: bool, parent=None, time_budget: Optional[float] = None,
+                 regex_process: Optional[RegexScanProcess] = None):
+        # Handle mocking in tests: MagicMock doesn't pass isinstance(QObject) but causes TypeError in super().__init__
+        if parent is not None and (not isinstance(parent, QObject) or "Mock" in str(type(parent))):
+            parent = None
+        super().__init__(parent)
+        self.entries = entries
+        self.pattern = pattern
+        self.replacement_text = replacement
+        self.expand_template = expand_template
+        # Literal replacements must not interpret backslashes or group references
+        self.replacement = replacement if expand_template else (lambda match, text=replacement: text)
+        self.time_budget = time_budget
+        self.regex_process = regex_process
+        self.is_cancelled = False
+        self.timed_out = False
+
+    def cancel(self):
+        self.is_cancelled = True
+
+    def replace_in(self, text: str) -> Tuple[str, int]:
+        """Returns (new_text, replacement_count); raises re.error/IndexError on a bad template."""
+        return self.pattern.subn(self.replacement, text)
+
+    def run(self):
+        if self.regex_process is not None:
+            self._run_in_process()
+            return
+        changes: List[Tuple[int, int, str, int, str]] = []
+        started = time.monotonic()
+        for block_idx, string_idx, text in self.entries:
+            if self.time_budget is not None and time.monotonic() - started > self.time_budget:
+                self.timed_out = True
+                self.is_cancelled = True
+            if self.is_cancelled:
+                self.cancelled.emit()
+                return
+            text = str(text) if text is not None else ""
+            try:
+                new_text, count = self.replace_in(text)
+            except (re.error, IndexError) as e:
+                self.replace_failed.emit(str(e))
+                return
+            if count and new_text != text:
+                # The source text travels along so stale snapshots can be detected before applying
+                changes.append((block_idx, string_idx, new_text, count, text))
+        self.replacements_ready.emit(changes)
+
+    def _run_in_process(self):
+        changes: List[Tuple[int, int, str, int, str]] = []
+        deadline = _regex_deadline(self.time_budget)
+        for _start, chunk in iter_chunks(self.entries):
+            texts = [str(text) if text is not None else "" for _, _, text in chunk]
+            try:
+                results = self.regex_process.run(
+                    substitute_regex, (self.pattern, self.replacement_text, self.expand_template, texts),
+                    deadline, lambda: self.is_cancelled)
+            except RegexScanAborted as e:
+                self.timed_out = e.timed_out
+                self.is_cancelled = True
+                self.cancelled.emit()
+                return
+            except (re.error, IndexError) as e:
+                self.replace_failed.emit(str(e))
+                return
+            except Exception as e:
+                log_error(f"ReplaceAllWorker: regex replace failed: {e}", exc_info=True)
+                self.replace_failed.emit(str(e))
+                return
+            for (block_idx, string_idx, _), text, (new_text, count) in zip(chunk, texts, results):
+                if count and new_text != text:
+                    changes.append((block_idx, string_idx, new_text, count, text))
+        self.replacements_ready.emit(changes)
@@ -28,36 +28,58 @@ class IssueScanHandler(BaseHandler):
         analyzer = getattr(self.mw.current_game_rules, 'problem_analyzer', self.mw.current_game_rules)
         
         for string_idx, _ in enumerate(block_data):
-            text, _ = self.data_processor.get_current_string_text(block_idx, string_idx)
-            if text is None: continue
-            
-            text = str(text)
-            
-            font_map_for_string = self.mw.helper.get_font_map_for_string(block_idx, string_idx)
-            
-            string_meta = self.mw.string_metadata.get((block_idx, string_idx), {})
-            width_threshold_for_string = string_meta.get("width", self.mw.line_width_warning_threshold_pixels)
-            
-            all_problems_for_string = [] # List of sets, one per subline
-            
-            if hasattr(analyzer, 'analyze_data_string'):
-                all_problems_for_string = analyzer.analyze_data_string(text, font_map_for_string, width_threshold_for_string)
-            elif hasattr(analyzer, 'analyze_subline'):
-                sublines = text.split('\n')
-                for i, subline in enumerate(sublines):
-                    next_subline = sublines[i+1] if i + 1 < len(sublines) else None
-                    problems = analyzer.analyze_subline(
-                        text=subline, next_text=next_subline, subline_number_in_data_string=i, qtextblock_number_in_editor=i,
-                        is_last_subline_in_data_string=(i == len(sublines) - 1), editor_font_map=font_map_for_string,
-                        editor_line_width_threshold=width_threshold_for_string,
-                        full_data_string_text_for_logical_check=text
-                    )
-                    all_problems_for_string.append(problems)
-            
-            for i, problem_set in enumerate(all_problems_for_string):
-                if problem_set:
-                    self.mw.data_store.problems_per_subline[(block_idx, string_idx, i)] = problem_set
-                    log_debug(f"  Found problems in block {block_idx}, string {string_idx}, subline {i}: {problem_set}")
+            self._scan_string_issues(analyzer, block_idx, string_idx)
+
+    def _scan_string_issues(self, analyzer, block_idx: int, string_idx: int):
+        text, _ = self.data_processor.get_current_string_text(block_idx, string_idx)
+        if text is None: return
+        
+        text = str(text)
+        
+        font_map_for_string = self.mw.helper.get_font_map_for_string(block_idx, string_idx)
+        
+        string_meta = self.mw.string_metadata.get((block_idx, string_idx), {})
+        width_threshold_for_string = string_meta.get("width", self.mw.line_width_warning_threshold_pixels)
+        
+        all_problems_for_string = [] # List of sets, one per subline
+        
+        if hasattr(analyzer, 'analyze_data_string'):
+            all_problems_for_string = analyzer.analyze_data_string(text, font_map_for_string, width_threshold_for_string)
+        elif hasattr(analyzer, 'analyze_subline'):
+            sublines = text.split('\n')
+            for i, subline in enumerate(sublines):
+                next_subline = sublines[i+1] if i + 1 < len(sublines) else None
+                problems = analyzer.analyze_subline(
+                    text=subline, next_text=next_subline, subline_number_in_data_string=i, qtextblock_number_in_editor=i,
+                    is_last_subline_in_data_string=(i == len(sublines) - 1), editor_font_map=font_map_for_string,
+                    editor_line_width_threshold=width_threshold_for_string,
+                    full_data_string_text_for_logical_check=text
+                )
+                all_problems_for_string.append(problems)
+        
+        for i, problem_set in enumerate(all_problems_for_string):
+            if problem_set:
+                self.mw.data_store.problems_per_subline[(block_idx, string_idx, i)] = problem_set
+                log_debug(f"  Found problems in block {block_idx}, string {string_idx}, subline {i}: {problem_set}")
+
+    def rescan_issues_for_strings(self, string_keys):
+        """Rescans only the given (block_idx, string_idx) strings, refreshing each affected block item once."""
+        if not self.mw.current_game_rules:
+            return
+        keys = set(string_keys)
+        if not keys:
+            return
+        stale = [k for k in self.mw.data_store.problems_per_subline if (k[0], k[1]) in keys]
+        for key in stale:
+            del self.mw.data_store.problems_per_subline[key]
+
+        analyzer = getattr(self.mw.current_game_rules, 'problem_analyzer', self.mw.current_game_rules)
+        for block_idx, string_idx in sorted(keys):
+            self._scan_string_issues(analyzer, block_idx, string_idx)
+
+        for block_idx in sorted({b for b, _ in keys}):
+            self.ui_updater.update_block_item_text_with_problem_count(block_idx)
+        log_debug(f"Rescanned {len(keys)} strings for issues.")
 
     # -----------------------------------------------------------------------
     # Async batched initial scan – runs in chunks so the UI never freezes
@@ -94,10 +116,10 @@ class IssueScanHandler(BaseHandler):
             if block_idx < len(self.mw.data_store.data):
                 self._perform_issues_scan_for_block(block_idx)
 
-        # Refresh problem counts in the tree for processed blocks
+        # Mark tree badges dirty; the updater applies them together at most once per frame
         if hasattr(self.mw, 'ui_updater'):
             for block_idx in batch:
-                self.mw.ui_updater.update_block_item_text_with_problem_count(block_idx)
+                self.mw.ui_updater.schedule_block_badge_update(block_idx)
 
         if self._scan_pending_indices:
             # Schedule next batch
@@ -629,6 +629,7 @@ class ProjectActionHandler(BaseHandler):
                 self.mw.data_store.data.append([])
                 self.mw.block_to_project_file_map[data_block_idx] = project_block_idx
                 self.mw.data_store.block_names[str(data_block_idx)] = block.name
+        self.mw.data_store.mark_data_changed()
 
         # Backup authoritative original keys from source files
         plugin_keys_backup = None
@@ -679,6 +680,8 @@ class ProjectActionHandler(BaseHandler):
         # Perform initial scan
         if hasattr(self.mw, 'app_action_handler'):
             self.mw.issue_scan_handler._perform_initial_silent_scan_all_issues()
+        if hasattr(self.mw, 'search_handler'):
+            self.mw.search_handler.rebuild_index()
 
         # Update UI
         self.ui_updater.populate_blocks()
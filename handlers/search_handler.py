@@ -1,12 +1,67 @@
 # handlers/search_handler.py
 import re
-from typing import Any, Optional, List, Dict, Tuple, Set
+from functools import partial
+from bisect import bisect_left, bisect_right
+from typing import Any, Optional, List, Dict, Tuple, Set, Iterable, Callable
 from PyQt5.QtCore import Qt, QPoint
 from PyQt5.QtGui import QColor, QTextCursor
 from PyQt5.QtWidgets import QApplication, QTreeWidgetItem, QTreeWidgetItemIterator
 from .base_handler import BaseHandler
+from .find_all_worker import FindAllWorker, RegexFindWorker, ReplaceAllWorker, REGEX_TIME_BUDGET_SEC
+from core.regex_scan import RegexScanProcess, regex_find_in_text
+from core.search_index import SearchIndex, SearchIndexBuildWorker, TaglessTextCache
 from utils.logging_utils import log_debug
-from utils.utils import convert_spaces_to_dots_for_display, remove_curly_tags, convert_raw_to_display_text, prepare_text_for_tagless_search, is_fuzzy_match
+from utils.utils import convert_spaces_to_dots_for_display, convert_raw_to_display_text, prepare_text_for_tagless_search, is_fuzzy_match
+
+
+def find_in_text(text_to_search_in: str, query_to_find: str, start_offset: int, case_sensitive: bool, find_reverse: bool = False, is_fuzzy: bool = False, pattern: Optional[re.Pattern] = None) -> Tuple[int, int]:
+    """
+    Returns (match_position, matched_length) or (-1, 0) if not found. A compiled pattern
+    switches to regex matching; no handler state is touched, so workers can call it.
+    """
+    if not query_to_find: return -1, 0
+
+    # 0. Regex search (empty matches are skipped, they can't be highlighted)
+    if pattern is not None:
+        return regex_find_in_text(pattern, text_to_search_in, start_offset, find_reverse)
+
+    # 1. Standard search (exact)
+    if not is_fuzzy:
+        compare_text = text_to_search_in
+        compare_query = query_to_find
+        if not case_sensitive:
+            compare_text = text_to_search_in.lower()
+            compare_query = query_to_find.lower()
+
+        if find_reverse:
+            pos = compare_text.rfind(compare_query, 0, start_offset + 1)
+        else:
+            pos = compare_text.find(compare_query, start_offset)
+        return (pos, len(query_to_find)) if pos != -1 else (-1, 0)
+
+    # 2. Fuzzy search
+    else:
+        word_iter = re.finditer(r'\w+', text_to_search_in)
+        matches = []  # (start, length)
+
+        for match in word_iter:
+            if not find_reverse:
+                if match.start() < start_offset: continue
+            else:
+                if match.start() > start_offset: break
+
+            if is_fuzzy_match(query_to_find, match.group(0), threshold=0.75):
+                matches.append((match.start(), len(match.group(0))))
+
+        if not matches:
+            return -1, 0
+
+        if find_reverse:
+            valid_matches = [(pos, ln) for pos, ln in matches if pos <= start_offset]
+            return valid_matches[-1] if valid_matches else (-1, 0)
+        else:
+            return matches[0]
+
 
 class SearchHandler(BaseHandler):
     def __init__(self, main_window: Any, data_processor: Any, ui_updater: Any):
@@ -16,14 +71,137 @@ class SearchHandler(BaseHandler):
         self.search_in_original: bool = False
         self.ignore_tags_newlines: bool = True
         self.is_fuzzy: bool = False # New state
+        self.is_regex: bool = False
+        self._compiled_regex_key: Optional[Tuple[str, bool]] = None
+        self._compiled_regex: Optional[re.Pattern] = None
         self.last_found_block: int = -1
         self.last_found_string: int = -1
         self.last_found_char_pos_raw: int = -1
         self.search_results: List[Any] = []
         self.current_search_index: int = -1
-        
-    def get_current_search_params(self) -> Tuple[str, bool, bool, bool, bool]:
-        return self.current_query, self.is_case_sensitive, self.search_in_original, self.ignore_tags_newlines, self.is_fuzzy
+
+        self.index: SearchIndex = SearchIndex()
+        self.index_ready: bool = False
+        self._index_generation: int = 0
+        self._index_workers: Set[SearchIndexBuildWorker] = set()
+        self._pending_index_updates: Dict[Tuple[int, int], str] = {}
+        self.tagless_cache: TaglessTextCache = TaglessTextCache()
+        self._find_all_worker: Optional[FindAllWorker] = None
+        self._find_all_workers: Set[FindAllWorker] = set()
+        self._replace_all_worker: Optional[ReplaceAllWorker] = None
+        self._replace_all_workers: Set[ReplaceAllWorker] = set()
+        # Regex Next/Previous runs like Find All: off the GUI thread, in a killable process
+        self._regex_find_worker: Optional[RegexFindWorker] = None
+        self._regex_find_workers: Set[RegexFindWorker] = set()
+        self._regex_process: RegexScanProcess = RegexScanProcess()
+
+    def rebuild_index(self) -> None:
+        """Rebuilds the trigram index in a background thread from the current project data."""
+        self._index_generation += 1
+        self.index_ready = False
+        self._pending_index_updates.clear()
+        self.tagless_cache.clear()
+        for worker in self._index_workers:
+            worker.cancel()
+
+        data = self.mw.data_store.data
+        if not data:
+            self.index = SearchIndex()
+            self.index_ready = True
+            return
+
+        original_blocks = [list(block) if isinstance(block, list) else None for block in data]
+        translation_blocks = [self.data_processor.get_block_texts(b_idx) if isinstance(block, list) else []
+                              for b_idx, block in enumerate(data)]
+
+        worker = SearchIndexBuildWorker(original_blocks, translation_blocks, self._index_generation, self.mw)
+        worker.index_built.connect(self._on_index_built)
+        worker.finished.connect(lambda w=worker: self._index_workers.discard(w))
+        self._index_workers.add(worker)
+        log_debug(f"SearchHandler: Building search index #{self._index_generation} for {len(data)} blocks.")
+        worker.start()
+
+    def _on_index_built(self, index: SearchIndex, generation: int) -> None:
+        if generation != self._index_generation:
+            return
+        for (b_idx, s_idx), text in self._pending_index_updates.items():
+            index.update_string(b_idx, s_idx, text)
+        self._pending_index_updates.clear()
+        self.index = index
+        self.index_ready = True
+        log_debug(f"SearchHandler: Search index #{generation} ready ({len(index)} strings).")
+
+    def on_string_edited(self, block_idx: int, string_idx: int, new_text: str) -> None:
+        """Keeps the index in sync with a single translation edit."""
+        self.tagless_cache.invalidate(block_idx, string_idx)
+        if self.index_ready:
+            self.index.update_string(block_idx, string_idx, new_text)
+        else:
+            self._pending_index_updates[(block_idx, string_idx)] = new_text
+
+    def refresh_index_block(self, block_idx: int) -> None:
+        """Re-indexes a whole block after its strings were replaced outside of update_edited_data."""
+        data = self.mw.data_store.data
+        if not (0 <= block_idx < len(data)) or not isinstance(data[block_idx], list):
+            return
+        self.tagless_cache.invalidate_block(block_idx)
+        translation_texts = self.data_processor.get_block_texts(block_idx)
+        if self.index_ready:
+            self.index.refresh_block(block_idx, data[block_idx], translation_texts)
+        else:
+            for s_idx, text in enumerate(translation_texts):
+                self._pending_index_updates[(block_idx, s_idx)] = text
+
+    def _get_index_candidates(self, effective_query: str) -> Optional[List[Tuple[int, int]]]:
+        """Returns candidate (block, string) keys from the index, or None when a full scan is needed."""
+        if not self.index_ready or self.is_regex:
+            return None
+        if self.is_fuzzy:
+            return self.index.fuzzy_candidates(effective_query, self.search_in_original, self.ignore_tags_newlines)
+        return self.index.candidates(effective_query, self.search_in_original, self.ignore_tags_newlines)
+
+    def _iter_positions_forward(self, start_block: int, start_string: int) -> Iterable[Tuple[int, int]]:
+        for b_idx in range(start_block, len(self.mw.data_store.data)):
+            if not isinstance(self.mw.data_store.data[b_idx], list): continue
+            s_start = start_string if b_idx == start_block else 0
+            for s_idx in range(s_start, len(self.mw.data_store.data[b_idx])):
+                yield b_idx, s_idx
+
+    def _iter_positions_backward(self, start_block: int, start_string: int) -> Iterable[Tuple[int, int]]:
+        for b_idx in range(start_block, -1, -1):
+            if not isinstance(self.mw.data_store.data[b_idx], list): continue
+            s_start = (start_string if b_idx == start_block and start_string != -1
+                       else len(self.mw.data_store.data[b_idx]) - 1)
+            for s_idx in range(s_start, -1, -1):
+                yield b_idx, s_idx
+
+    def get_current_search_params(self) -> Tuple[str, bool, bool, bool, bool, bool]:
+        return self.current_query, self.is_case_sensitive, self.search_in_original, self.ignore_tags_newlines, self.is_fuzzy, self.is_regex
+
+    def _compile_regex(self, pattern: str, case_sensitive: bool) -> re.Pattern:
+        """Compiles the regex once per (pattern, case) pair; raises re.error for invalid patterns."""
+        key = (pattern, case_sensitive)
+        if self._compiled_regex_key != key:
+            self._compiled_regex = re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+            self._compiled_regex_key = key
+        return self._compiled_regex
+
+    def _get_effective_query(self, query: str, case_sensitive: bool, ignore_tags: bool, is_regex: bool) -> Optional[str]:
+        """Returns the query to match against search texts, or None (with a status message) if it is unusable."""
+        panel = self._get_visible_search_panel()
+        if is_regex:
+            try:
+                if query: self._compile_regex(query, case_sensitive)
+            except re.error as e:
+                if panel: panel.set_status_message(f"Invalid regex: {e}", is_error=True)
+                return None
+            effective_query = query
+        else:
+            effective_query = prepare_text_for_tagless_search(query) if ignore_tags else query
+        if not effective_query:
+            if panel: panel.set_status_message("Enter query", is_error=True)
+            return None
+        return effective_query
 
     def _get_text_for_search(self, block_idx: int, string_idx: int, search_in_original_flag: bool, ignore_tags_flag: bool) -> str:
         text_to_process = ""
@@ -38,7 +216,7 @@ class SearchHandler(BaseHandler):
         text_to_process = str(text_to_process) if text_to_process is not None else ""
 
         if ignore_tags_flag:
-            return prepare_text_for_tagless_search(text_to_process)
+            return self.tagless_cache.get(search_in_original_flag, block_idx, string_idx, text_to_process).text
         return text_to_process
 
     def reset_search(self, new_query: str = "", new_case_sensitive: bool = False, new_search_in_original: bool = False, new_ignore_tags: bool = True) -> None:
@@ -52,6 +230,8 @@ class SearchHandler(BaseHandler):
         self.last_found_block = -1
         self.last_found_string = -1
         self.last_found_char_pos_raw = -1
+        self.cancel_find_all()
+        self.cancel_regex_find()
         self.search_results = [] # Corrected variable name from current_search_results to search_results
         self.current_search_index = -1
         self.clear_all_search_highlights()
@@ -61,61 +241,25 @@ class SearchHandler(BaseHandler):
         if hasattr(self.mw, 'search_panel_widget') and self.mw.search_panel_widget.isVisible():
             self.mw.search_panel_widget.clear_status()
 
-    def _find_in_text(self, text_to_search_in: str, query_to_find: str, start_offset: int, case_sensitive: bool, find_reverse: bool = False, is_fuzzy: bool = False) -> Tuple[int, int]:
+    def _find_in_text(self, text_to_search_in: str, query_to_find: str, start_offset: int, case_sensitive: bool, find_reverse: bool = False, is_fuzzy: bool = False, is_regex: bool = False) -> Tuple[int, int]:
         """Returns (match_position, matched_length) or (-1, 0) if not found."""
-        if not query_to_find: return -1, 0
-        
-        # 1. Standard search (exact)
-        if not is_fuzzy:
-            compare_text = text_to_search_in
-            compare_query = query_to_find
-            if not case_sensitive:
-                compare_text = text_to_search_in.lower()
-                compare_query = query_to_find.lower()
-
-            if find_reverse:
-                pos = compare_text.rfind(compare_query, 0, start_offset + 1)
-            else:
-                pos = compare_text.find(compare_query, start_offset)
-            return (pos, len(query_to_find)) if pos != -1 else (-1, 0)
-        
-        # 2. Fuzzy search
-        else:
-            word_iter = re.finditer(r'\w+', text_to_search_in)
-            matches = []  # (start, length)
-            
-            for match in word_iter:
-                if not find_reverse:
-                    if match.start() < start_offset: continue
-                else:
-                    if match.start() > start_offset: break
-                
-                if is_fuzzy_match(query_to_find, match.group(0), threshold=0.75):
-                    matches.append((match.start(), len(match.group(0))))
-            
-            if not matches:
-                return -1, 0
-            
-            if find_reverse:
-                valid_matches = [(pos, ln) for pos, ln in matches if pos <= start_offset]
-                return valid_matches[-1] if valid_matches else (-1, 0)
-            else:
-                return matches[0]
+        pattern = self._compile_regex(query_to_find, case_sensitive) if is_regex and query_to_find else None
+        return find_in_text(text_to_search_in, query_to_find, start_offset, case_sensitive, find_reverse, is_fuzzy, pattern)
 
-    def find_next(self, query: str, case_sensitive: bool, search_in_original: bool, ignore_tags: bool, is_fuzzy: bool = False) -> bool:
-        log_debug(f"SearchHandler: find_next. Q: '{query}', Case: {case_sensitive}, Orig: {search_in_original}, IgnoreTags: {ignore_tags}, Fuzzy: {is_fuzzy}")
+    def find_next(self, query: str, case_sensitive: bool, search_in_original: bool, ignore_tags: bool, is_fuzzy: bool = False, is_regex: bool = False) -> bool:
+        log_debug(f"SearchHandler: find_next. Q: '{query}', Case: {case_sensitive}, Orig: {search_in_original}, IgnoreTags: {ignore_tags}, Fuzzy: {is_fuzzy}, Regex: {is_regex}")
+        self.cancel_regex_find()
         
-        effective_query = prepare_text_for_tagless_search(query) if ignore_tags else query
-        if not effective_query:
-            if hasattr(self.mw, 'search_panel_widget') and self.mw.search_panel_widget.isVisible():
-                self.mw.search_panel_widget.set_status_message("Enter query", is_error=True)
+        effective_query = self._get_effective_query(query, case_sensitive, ignore_tags, is_regex)
+        if effective_query is None:
             return False
 
         if (self.current_query != query or
             self.is_case_sensitive != case_sensitive or
             self.search_in_original != search_in_original or
             self.ignore_tags_newlines != ignore_tags or
-            self.is_fuzzy != is_fuzzy):
+            self.is_fuzzy != is_fuzzy or
+            self.is_regex != is_regex):
             self.last_found_block = -1; self.last_found_string = -1; self.last_found_char_pos_raw = -1
         
         self.current_query = query
@@ -123,6 +267,7 @@ class SearchHandler(BaseHandler):
         self.search_in_original = search_in_original
         self.ignore_tags_newlines = ignore_tags
         self.is_fuzzy = is_fuzzy
+        self.is_regex = is_regex
 
         if not self.mw.data_store.data: return False
         
@@ -130,57 +275,55 @@ class SearchHandler(BaseHandler):
         start_string_data_idx = self.last_found_string if self.last_found_string != -1 else 0
         start_char_offset = self.last_found_char_pos_raw + 1 if self.last_found_char_pos_raw != -1 else 0
         
-        for b_idx in range(start_block_data_idx, len(self.mw.data_store.data)):
-            if not isinstance(self.mw.data_store.data[b_idx], list): continue
+        candidates = self._get_index_candidates(effective_query)
+        if candidates is not None:
+            positions = candidates[bisect_left(candidates, (start_block_data_idx, start_string_data_idx)):]
+        else:
+            positions = self._iter_positions_forward(start_block_data_idx, start_string_data_idx)
+
+        if self.is_regex:
+            entries = [(b_idx, s_idx, self._get_text_for_search(b_idx, s_idx, self.search_in_original, self.ignore_tags_newlines),
+                        start_char_offset if b_idx == start_block_data_idx and s_idx == start_string_data_idx else 0)
+                       for b_idx, s_idx in positions]
+            return self._start_regex_find(entries, effective_query, find_reverse=False, not_found_message="Not found (end)")
+
+        for b_idx, s_idx in positions:
+            current_char_search_offset = start_char_offset if b_idx == start_block_data_idx and s_idx == start_string_data_idx else 0
             
-            s_idx_start_loop_offset = start_string_data_idx if b_idx == start_block_data_idx else 0
-            for s_idx in range(s_idx_start_loop_offset, len(self.mw.data_store.data[b_idx])):
-                current_char_search_offset = start_char_offset if b_idx == start_block_data_idx and s_idx == start_string_data_idx else 0
-                
-                text_for_search = self._get_text_for_search(b_idx, s_idx, self.search_in_original, self.ignore_tags_newlines)
-                
-                match_pos_in_search_text, match_len_in_search_text = self._find_in_text(
-                    text_for_search, 
-                    effective_query, 
-                    current_char_search_offset, 
-                    self.is_case_sensitive, 
-                    find_reverse=False,
-                    is_fuzzy=self.is_fuzzy
-                )
-                
-                if match_pos_in_search_text != -1:
-                    log_debug(f"Found match in {'processed' if ignore_tags else 'raw'} text at DataB {b_idx}, DataS {s_idx}, SearchTextPos {match_pos_in_search_text}, Len {match_len_in_search_text}")
-                    self.last_found_block = b_idx
-                    self.last_found_string = s_idx
-                    self.last_found_char_pos_raw = match_pos_in_search_text
-                    
-                    self._navigate_to_match(b_idx, s_idx, match_pos_in_search_text, match_len_in_search_text, self.ignore_tags_newlines)
-                    if hasattr(self.mw, 'search_panel_widget') and self.mw.search_panel_widget.isVisible():
-                        self.mw.search_panel_widget.set_status_message(f"Found: B{b_idx+1}, S{s_idx+1}")
-                    return True
+            text_for_search = self._get_text_for_search(b_idx, s_idx, self.search_in_original, self.ignore_tags_newlines)
+            
+            match_pos_in_search_text, match_len_in_search_text = self._find_in_text(
+                text_for_search, 
+                effective_query, 
+                current_char_search_offset, 
+                self.is_case_sensitive, 
+                find_reverse=False,
+                is_fuzzy=self.is_fuzzy,
+                is_regex=self.is_regex
+            )
             
-            start_string_data_idx = 0
-            start_char_offset = 0   
+            if match_pos_in_search_text != -1:
+                log_debug(f"Found match in {'processed' if ignore_tags else 'raw'} text at DataB {b_idx}, DataS {s_idx}, SearchTextPos {match_pos_in_search_text}, Len {match_len_in_search_text}")
+                self._select_match(b_idx, s_idx, match_pos_in_search_text, match_len_in_search_text)
+                return True
 
-        if hasattr(self.mw, 'search_panel_widget') and self.mw.search_panel_widget.isVisible():
-            self.mw.search_panel_widget.set_status_message("Not found (end)")
-        self.last_found_block = -1; self.last_found_string = -1; self.last_found_char_pos_raw = -1
+        self._report_not_found("Not found (end)")
         return False
 
-    def find_previous(self, query: str, case_sensitive: bool, search_in_original: bool, ignore_tags: bool, is_fuzzy: bool = False) -> bool:
-        log_debug(f"SearchHandler: find_previous. Q: '{query}', Case: {case_sensitive}, Orig: {search_in_original}, IgnoreTags: {ignore_tags}, Fuzzy: {is_fuzzy}")
+    def find_previous(self, query: str, case_sensitive: bool, search_in_original: bool, ignore_tags: bool, is_fuzzy: bool = False, is_regex: bool = False) -> bool:
+        log_debug(f"SearchHandler: find_previous. Q: '{query}', Case: {case_sensitive}, Orig: {search_in_original}, IgnoreTags: {ignore_tags}, Fuzzy: {is_fuzzy}, Regex: {is_regex}")
+        self.cancel_regex_find()
 
-        effective_query: str = prepare_text_for_tagless_search(query) if ignore_tags else query
-        if not effective_query:
-            if hasattr(self.mw, 'search_panel_widget') and self.mw.search_panel_widget.isVisible():
-                self.mw.search_panel_widget.set_status_message("Enter query", is_error=True)
+        effective_query = self._get_effective_query(query, case_sensitive, ignore_tags, is_regex)
+        if effective_query is None:
             return False
 
         if (self.current_query != query or
             self.is_case_sensitive != case_sensitive or
             self.search_in_original != search_in_original or
             self.ignore_tags_newlines != ignore_tags or
-            self.is_fuzzy != is_fuzzy):
+            self.is_fuzzy != is_fuzzy or
+            self.is_regex != is_regex):
             self.last_found_block = -1; self.last_found_string = -1; self.last_found_char_pos_raw = -1
 
         self.current_query = query
@@ -188,6 +331,7 @@ class SearchHandler(BaseHandler):
         self.search_in_original = search_in_original
         self.ignore_tags_newlines = ignore_tags
         self.is_fuzzy = is_fuzzy
+        self.is_regex = is_regex
             
         if not self.mw.data_store.data: return False
 
@@ -195,46 +339,310 @@ class SearchHandler(BaseHandler):
         start_string_data_idx: int = self.last_found_string if self.last_found_string != -1 else -1
         start_char_search_from: int = self.last_found_char_pos_raw -1 if self.last_found_char_pos_raw != -1 else -1
         
-        for b_idx in range(start_block_data_idx, -1, -1):
-            if not isinstance(self.mw.data_store.data[b_idx], list): continue
+        candidates = self._get_index_candidates(effective_query)
+        if candidates is not None:
+            upper_string_idx = start_string_data_idx if start_string_data_idx != -1 else float('inf')
+            positions = reversed(candidates[:bisect_right(candidates, (start_block_data_idx, upper_string_idx))])
+        else:
+            positions = self._iter_positions_backward(start_block_data_idx, start_string_data_idx)
+
+        if self.is_regex:
+            entries = []
+            for b_idx, s_idx in positions:
+                text_for_search = self._get_text_for_search(b_idx, s_idx, self.search_in_original, self.ignore_tags_newlines)
+                is_start = b_idx == start_block_data_idx and s_idx == start_string_data_idx and start_char_search_from != -1
+                entries.append((b_idx, s_idx, text_for_search, start_char_search_from if is_start else len(text_for_search) - 1))
+            return self._start_regex_find(entries, effective_query, find_reverse=True, not_found_message="Not found (start)")
+
+        for b_idx, s_idx in positions:
+            text_for_search: str = self._get_text_for_search(b_idx, s_idx, self.search_in_original, self.ignore_tags_newlines)
             
-            s_idx_start_loop_offset: int = (start_string_data_idx if b_idx == start_block_data_idx and start_string_data_idx != -1
-                                   else len(self.mw.data_store.data[b_idx]) - 1)
+            current_char_search_from: int = (start_char_search_from
+                                       if b_idx == start_block_data_idx and s_idx == start_string_data_idx and start_char_search_from != -1
+                                       else len(text_for_search) -1 )
             
-            for s_idx in range(s_idx_start_loop_offset, -1, -1):
-                text_for_search: str = self._get_text_for_search(b_idx, s_idx, self.search_in_original, self.ignore_tags_newlines)
-                
-                current_char_search_from: int = (start_char_search_from
-                                           if b_idx == start_block_data_idx and s_idx == start_string_data_idx and start_char_search_from != -1
-                                           else len(text_for_search) -1 )
-                
-                match_pos_in_search_text, match_len_in_search_text = self._find_in_text(
-                    text_for_search, 
-                    effective_query, 
-                    current_char_search_from, 
-                    self.is_case_sensitive, 
-                    find_reverse=True,
-                    is_fuzzy=self.is_fuzzy
-                )
-                
-                if match_pos_in_search_text != -1:
-                    log_debug(f"Found (prev) match in {'processed' if ignore_tags else 'raw'} text at DataB {b_idx}, DataS {s_idx}, SearchTextPos {match_pos_in_search_text}, Len {match_len_in_search_text}")
-                    self.last_found_block = b_idx
-                    self.last_found_string = s_idx
-                    self.last_found_char_pos_raw = match_pos_in_search_text
-                    
-                    self._navigate_to_match(b_idx, s_idx, match_pos_in_search_text, match_len_in_search_text, self.ignore_tags_newlines)
-                    if hasattr(self.mw, 'search_panel_widget') and self.mw.search_panel_widget.isVisible():
-                        self.mw.search_panel_widget.set_status_message(f"Found: B{b_idx+1}, S{s_idx+1}")
-                    return True
+            match_pos_in_search_text, match_len_in_search_text = self._find_in_text(
+                text_for_search, 
+                effective_query, 
+                current_char_search_from, 
+                self.is_case_sensitive, 
+                find_reverse=True,
+                is_fuzzy=self.is_fuzzy,
+                is_regex=self.is_regex
+            )
             
-            start_string_data_idx = -1
-            start_char_search_from = -1   
+            if match_pos_in_search_text != -1:
+                log_debug(f"Found (prev) match in {'processed' if ignore_tags else 'raw'} text at DataB {b_idx}, DataS {s_idx}, SearchTextPos {match_pos_in_search_text}, Len {match_len_in_search_text}")
+                self._select_match(b_idx, s_idx, match_pos_in_search_text, match_len_in_search_text)
+                return True
+
+        self._report_not_found("Not found (start)")
+        return False
+
+    def _select_match(self, b_idx: int, s_idx: int, pos: int, length: int) -> None:
+        self.last_found_block = b_idx
+        self.last_found_string = s_idx
+        self.last_found_char_pos_raw = pos
+        self._navigate_to_match(b_idx, s_idx, pos, length, self.ignore_tags_newlines)
+        if hasattr(self.mw, 'search_panel_widget') and self.mw.search_panel_widget.isVisible():
+            self.mw.search_panel_widget.set_status_message(f"Found: B{b_idx+1}, S{s_idx+1}")
 
+    def _report_not_found(self, message: str) -> None:
         if hasattr(self.mw, 'search_panel_widget') and self.mw.search_panel_widget.isVisible():
-             self.mw.search_panel_widget.set_status_message("Not found (start)")
+            self.mw.search_panel_widget.set_status_message(message)
         self.last_found_block = -1; self.last_found_string = -1; self.last_found_char_pos_raw = -1
-        return False
+
+    def _start_regex_find(self, entries: List[Tuple[int, int, str, int]], effective_query: str, find_reverse: bool, not_found_message: str) -> bool:
+        """Starts a regex Next/Previous on a worker; the hit is navigated to when it arrives."""
+        self.cancel_regex_find()
+        # Compiled here on the GUI thread; the pattern pickles into the scan process
+        pattern = self._compile_regex(effective_query, self.is_case_sensitive)
+        worker = RegexFindWorker(entries, pattern, find_reverse, self._regex_process, self.mw, time_budget=REGEX_TIME_BUDGET_SEC)
+        worker.match_found.connect(lambda hit, w=worker: self._on_regex_find_done(w, hit, not_found_message))
+        worker.search_failed.connect(lambda message, w=worker: self._on_regex_find_failed(w, message))
+        worker.cancelled.connect(lambda w=worker: self._on_regex_find_failed(w, "Time limit exceeded" if w.timed_out else None))
+        worker.finished.connect(lambda w=worker: self._regex_find_workers.discard(w))
+        self._regex_find_worker = worker
+        self._regex_find_workers.add(worker)
+        panel = self._get_visible_search_panel()
+        if panel: panel.set_status_message("Searching...")
+        worker.start()
+        return True
+
+    def cancel_regex_find(self) -> None:
+        if self._regex_find_worker is not None:
+            self._regex_find_worker.cancel()
+            self._regex_find_worker = None
+
+    def is_regex_find_running(self) -> bool:
+        return self._regex_find_worker is not None
+
+    def _on_regex_find_done(self, worker: RegexFindWorker, hit: Optional[Tuple[int, int, int, int]], not_found_message: str) -> None:
+        if worker is not self._regex_find_worker: return
+        self._regex_find_worker = None
+        if hit is None:
+            self._report_not_found(not_found_message)
+            if not self._get_visible_search_panel() and getattr(self.mw, 'statusBar', None):
+                self.mw.statusBar.showMessage(f"Not found: \"{self.current_query}\"", 4000)
+            return
+        b_idx, s_idx, pos, length = hit
+        log_debug(f"Found regex match at DataB {b_idx}, DataS {s_idx}, SearchTextPos {pos}, Len {length}")
+        self._select_match(b_idx, s_idx, pos, length)
+
+    def _on_regex_find_failed(self, worker: RegexFindWorker, message: Optional[str]) -> None:
+        if worker is not self._regex_find_worker: return
+        self._regex_find_worker = None
+        log_debug(f"SearchHandler: regex find stopped: {message or 'cancelled'}")
+        panel = self._get_visible_search_panel()
+        if panel and message: panel.set_status_message(f"Search failed: {message}", is_error=True)
+
+    def _get_visible_search_panel(self) -> Optional[Any]:
+        if hasattr(self.mw, 'search_panel_widget') and self.mw.search_panel_widget.isVisible():
+            return self.mw.search_panel_widget
+        return None
+
+    def find_all(self, query: str, case_sensitive: bool, search_in_original: bool, ignore_tags: bool, is_fuzzy: bool = False, is_regex: bool = False) -> bool:
+        """Starts a background search over the whole project and streams hits into the search panel."""
+        log_debug(f"SearchHandler: find_all. Q: '{query}', Case: {case_sensitive}, Orig: {search_in_original}, IgnoreTags: {ignore_tags}, Fuzzy: {is_fuzzy}, Regex: {is_regex}")
+        self.cancel_find_all()
+
+        effective_query = self._get_effective_query(query, case_sensitive, ignore_tags, is_regex)
+        if effective_query is None:
+            return False
+        panel = self._get_visible_search_panel()
+
+        self.reset_search(query, case_sensitive, search_in_original, ignore_tags)
+        self.is_fuzzy = is_fuzzy
+        self.is_regex = is_regex
+        if not self.mw.data_store.data: return False
+
+        candidates = self._get_index_candidates(effective_query)
+        positions = candidates if candidates is not None else self._iter_positions_forward(0, 0)
+        entries = [(b_idx, s_idx, self._get_text_for_search(b_idx, s_idx, search_in_original, False)) for b_idx, s_idx in positions]
+
+        # Compiled here on the GUI thread; the worker only gets a pure matcher bound to this pattern,
+        # and regex scans run in the killable scan process so the budget can stop a runaway match
+        pattern = self._compile_regex(effective_query, case_sensitive) if is_regex else None
+        matcher = partial(find_in_text, pattern=pattern)
+        worker = FindAllWorker(entries, effective_query, case_sensitive, ignore_tags, is_fuzzy, matcher, self.mw,
+                               time_budget=REGEX_TIME_BUDGET_SEC if is_regex else None, is_regex=is_regex,
+                               pattern=pattern, regex_process=self._regex_process if is_regex else None)
+        worker.results_found.connect(lambda batch, w=worker: self._on_find_all_results(w, batch))
+        worker.progress_updated.connect(lambda done, total, w=worker: self._on_find_all_progress(w, done, total))
+        worker.search_finished.connect(lambda total_hits, w=worker: self._on_find_all_finished(w, cancelled=False))
+        worker.cancelled.connect(lambda w=worker: self._on_find_all_finished(w, cancelled=True))
+        worker.finished.connect(lambda w=worker: self._find_all_workers.discard(w))
+        self._find_all_worker = worker
+        self._find_all_workers.add(worker)
+
+        if panel: panel.begin_find_all()
+        worker.start()
+        return True
+
+    def cancel_find_all(self) -> None:
+        if self._find_all_worker is not None:
+            self._find_all_worker.cancel()
+
+    def is_find_all_running(self) -> bool:
+        return self._find_all_worker is not None
+
+    def _on_find_all_results(self, worker: FindAllWorker, batch: List[Tuple[int, int, int, int, str]]) -> None:
+        if worker is not self._find_all_worker: return
+        first_index = len(self.search_results)
+        self.search_results.extend(batch)
+        self.mw.search_match_block_indices.update(result[0] for result in batch)
+        if hasattr(self.mw, 'block_list_widget'):
+            self.mw.block_list_widget.viewport().update()
+        panel = self._get_visible_search_panel()
+        if panel: panel.add_find_all_results(batch, first_index)
+
+    def _on_find_all_progress(self, worker: FindAllWorker, processed: int, total: int) -> None:
+        if worker is not self._find_all_worker: return
+        panel = self._get_visible_search_panel()
+        if panel: panel.set_status_message(f"Searching... {len(self.search_results)} found ({processed}/{total})")
+
+    def _on_find_all_finished(self, worker: FindAllWorker, cancelled: bool) -> None:
+        if worker is not self._find_all_worker: return
+        self._find_all_worker = None
+        count = len(self.search_results)
+        log_debug(f"SearchHandler: find_all {'cancelled' if cancelled else 'finished'} with {count} hits.")
+        panel = self._get_visible_search_panel()
+        if panel:
+            panel.end_find_all(count, cancelled)
+            if worker.timed_out: panel.set_status_message(f"Time limit: {count} found", is_error=True)
+
+    def navigate_to_result(self, result_index: int) -> None:
+        """Jumps to a hit collected by find_all; subsequent Next/Prev continue from there."""
+        if not (0 <= result_index < len(self.search_results)): return
+        b_idx, s_idx, pos, length, _ = self.search_results[result_index]
+        self.current_search_index = result_index
+        self.last_found_block = b_idx
+        self.last_found_string = s_idx
+        self.last_found_char_pos_raw = pos
+        self._navigate_to_match(b_idx, s_idx, pos, length, self.ignore_tags_newlines)
+        panel = self._get_visible_search_panel()
+        if panel: panel.set_status_message(f"{result_index + 1}/{len(self.search_results)}: B{b_idx+1}, S{s_idx+1}")
+
+    def replace_all(self, query: str, replacement: str, case_sensitive: bool, is_regex: bool = False) -> bool:
+        """
+        Replaces every match in the translation text. Matching runs on a worker thread;
+        the results are applied on the GUI thread as a single undo group.
+        """
+        log_debug(f"SearchHandler: replace_all. Q: '{query}', Repl: '{replacement}', Case: {case_sensitive}, Regex: {is_regex}")
+        panel = self._get_visible_search_panel()
+        if self._replace_all_worker is not None:
+            if panel: panel.set_status_message("Replace is already running", is_error=True)
+            return False
+        if not query:
+            if panel: panel.set_status_message("Enter query", is_error=True)
+            return False
+        try:
+            if is_regex:
+                pattern = self._compile_regex(query, case_sensitive)
+            else:
+                pattern = re.compile(re.escape(query), 0 if case_sensitive else re.IGNORECASE)
+        except re.error as e:
+            if panel: panel.set_status_message(f"Invalid regex: {e}", is_error=True)
+            return False
+        if not self.mw.data_store.data: return False
+
+        self.cancel_find_all()
+        candidates = self.index.candidates(query, False, False) if self.index_ready and not is_regex else None
+        positions = candidates if candidates is not None else self._iter_positions_forward(0, 0)
+        entries = [(b_idx, s_idx, self._get_text_for_search(b_idx, s_idx, False, False)) for b_idx, s_idx in positions]
+
+        worker = ReplaceAllWorker(entries, pattern, replacement, is_regex, self.mw,
+                                  time_budget=REGEX_TIME_BUDGET_SEC if is_regex else None,
+                                  regex_process=self._regex_process if is_regex else None)
+        worker.replacements_ready.connect(lambda changes, w=worker: self._on_replacements_ready(w, changes))
+        worker.replace_failed.connect(lambda message, w=worker: self._on_replace_all_failed(w, message))
+        worker.cancelled.connect(lambda w=worker: self._on_replace_all_failed(w, "Time limit exceeded" if w.timed_out else "Cancelled"))
+        worker.finished.connect(lambda w=worker: self._replace_all_workers.discard(w))
+        self._replace_all_worker = worker
+        self._replace_all_workers.add(worker)
+
+        if panel: panel.set_status_message("Replacing...")
+        worker.start()
+        return True
+
+    def _on_replace_all_failed(self, worker: ReplaceAllWorker, message: str) -> None:
+        if worker is not self._replace_all_worker: return
+        self._replace_all_worker = None
+        log_debug(f"SearchHandler: replace_all failed: {message}")
+        panel = self._get_visible_search_panel()
+        if panel: panel.set_status_message(f"Replace failed: {message}", is_error=True)
+
+    def _on_replacements_ready(self, worker: ReplaceAllWorker, changes: List[Tuple[int, int, str, int, str]]) -> None:
+        if worker is not self._replace_all_worker: return
+        self._replace_all_worker = None
+        # Stale strings are recomputed on this thread, which is only safe for literal patterns
+        self.apply_replacements(changes, recompute=None if worker.expand_template else worker.replace_in)
+
+    def _revalidate_replacements(self, changes: List[Tuple[int, int, str, int, str]],
+                                 recompute: Optional[Callable[[str], Tuple[str, int]]]) -> List[Tuple[int, int, str, int, str]]:
+        """
+        Drops or recomputes changes whose string was edited after the worker took its snapshot,
+        so a stale new_text never overwrites a newer edit.
+        """
+        fresh = []
+        for b_idx, s_idx, new_text, count, source_text in changes:
+            current_text, _ = self.data_processor.get_current_string_text(b_idx, s_idx)
+            current_text = str(current_text) if current_text is not None else ""
+            if current_text != source_text:
+                if recompute is None:
+                    log_debug(f"SearchHandler: replace_all skips ({b_idx}, {s_idx}), text changed since the scan.")
+                    continue
+                try:
+                    new_text, count = recompute(current_text)
+                except (re.error, IndexError) as e:
+                    log_debug(f"SearchHandler: replace_all skips ({b_idx}, {s_idx}): {e}")
+                    continue
+                if not count or new_text == current_text: continue
+            fresh.append((b_idx, s_idx, new_text, count, current_text))
+        return fresh
+
+    def apply_replacements(self, changes: List[Tuple[int, int, str, int, str]],
+                           recompute: Optional[Callable[[str], Tuple[str, int]]] = None) -> int:
+        """
+        Applies (block, string, new_text, count, source_text) changes as one REPLACE_ALL undo group
+        and rescans them once. Strings edited since the scan are recomputed with `recompute`, or skipped.
+        """
+        panel = self._get_visible_search_panel()
+        changes = self._revalidate_replacements(changes, recompute)
+        if not changes:
+            if panel: panel.set_status_message("Not found")
+            return 0
+
+        if hasattr(self.mw, 'undo_manager'):
+            self.mw.undo_manager.begin_group()
+        try:
+            for b_idx, s_idx, new_text, _, _ in changes:
+                self.data_processor.update_edited_data(b_idx, s_idx, new_text, action_type="REPLACE_ALL", refresh_block_item=False)
+        finally:
+            if hasattr(self.mw, 'undo_manager'):
+                self.mw.undo_manager.end_group("REPLACE_ALL")
+
+        changed_keys = [(b_idx, s_idx) for b_idx, s_idx, _, _, _ in changes]
+        if hasattr(self.mw, 'issue_scan_handler'):
+            self.mw.issue_scan_handler.rescan_issues_for_strings(changed_keys)
+        else:
+            for b_idx in sorted({b for b, _ in changed_keys}):
+                self.ui_updater.update_block_item_text_with_problem_count(b_idx)
+
+        # Previous hits point into the old texts
+        self.reset_search(self.current_query, self.is_case_sensitive, self.search_in_original, self.ignore_tags_newlines)
+        if panel: panel.clear_results()
+
+        current_block = self.mw.data_store.current_block_idx
+        if any(b_idx == current_block for b_idx, _ in changed_keys):
+            self.ui_updater.populate_strings_for_block(current_block, self.mw.data_store.current_category_name, force=True)
+        self.ui_updater.update_text_views()
+        self.ui_updater.update_title()
+
+        total = sum(count for _, _, _, count, _ in changes)
+        log_debug(f"SearchHandler: replace_all replaced {total} matches in {len(changes)} strings.")
+        if panel: panel.set_status_message(f"Replaced {total} in {len(changes)} strings")
+        return total
 
     def _find_nth_occurrence_in_display_text(self, display_text: str, display_query: str, target_occurrence: int, case_sensitive: bool) -> Tuple[int, int]:
         current_occurrence: int = 0; search_start_pos: int = 0
@@ -261,6 +669,60 @@ class SearchHandler(BaseHandler):
         if last_newline_pos != -1: pos_in_qtextblock = char_pos_in_raw_string_with_newlines - (last_newline_pos + 1)
         return qtextblock_idx, pos_in_qtextblock
 
+    def _to_editor_text(self, raw_text: str) -> str:
+        rules = getattr(self.mw, 'current_game_rules', None)
+        if rules and hasattr(rules, 'get_text_representation_for_editor'):
+            return str(rules.get_text_representation_for_editor(raw_text))
+        return raw_text
+
+    def _to_preview_text(self, raw_text: str) -> str:
+        rules = getattr(self.mw, 'current_game_rules', None)
+        if rules and hasattr(rules, 'get_text_representation_for_preview'):
+            return str(rules.get_text_representation_for_preview(raw_text))
+        return raw_text.replace('\n', getattr(self.mw, 'newline_display_symbol', '↵'))
+
+    def _get_preview_line_for_string(self, string_idx: int) -> int:
+        displayed_indices = getattr(self.mw.data_store, 'displayed_string_indices', None)
+        if isinstance(displayed_indices, list) and string_idx in displayed_indices:
+            return displayed_indices.index(string_idx)
+        return string_idx
+
+    def _highlight_raw_span(self, string_idx: int, raw_text: str, raw_start: int, raw_end: int) -> None:
+        """Highlights raw_text[raw_start:raw_end] in the editor that shows the searched text and in the preview."""
+        editor = self.mw.original_text_edit if self.search_in_original else self.mw.edited_text_edit
+        if editor and hasattr(editor, 'highlightManager') and string_idx == self.mw.data_store.current_string_idx:
+            # Display conversions (space dots) are 1:1, so the length of the converted prefix is the document position.
+            doc_start = len(self._to_editor_text(raw_text[:raw_start]))
+            doc_end = len(self._to_editor_text(raw_text[:raw_end]))
+            display_text = self._to_editor_text(raw_text)
+            start_block, start_col = self._calculate_qtextblock_and_pos_in_block(display_text, doc_start)
+            end_block, end_col = self._calculate_qtextblock_and_pos_in_block(display_text, doc_end)
+            display_lines = display_text.split('\n')
+            for q_block in range(start_block, min(end_block, len(display_lines) - 1) + 1):
+                block_start = start_col if q_block == start_block else 0
+                block_end = end_col if q_block == end_block else len(display_lines[q_block])
+                if block_end > block_start:
+                    editor.highlightManager.add_search_match_highlight(q_block, block_start, block_end - block_start)
+            cursor = editor.textCursor()
+            cursor.setPosition(doc_start)
+            cursor.setPosition(doc_end, QTextCursor.KeepAnchor)
+            editor.setTextCursor(cursor); editor.ensureCursorVisible()
+
+        preview = self.mw.preview_text_edit
+        if self.search_in_original or not preview or not hasattr(preview, 'highlightManager'):
+            return
+        preview_line = self._get_preview_line_for_string(string_idx)
+        preview_block = preview.document().findBlockByNumber(preview_line)
+        if not preview_block.isValid(): return
+        preview_start = len(self._to_preview_text(raw_text[:raw_start]))
+        preview_end = len(self._to_preview_text(raw_text[:raw_end]))
+        if preview_end > preview_start:
+            preview.highlightManager.add_search_match_highlight(preview_line, preview_start, preview_end - preview_start)
+            cursor = QTextCursor(preview_block)
+            cursor.setPosition(preview_block.position() + preview_start)
+            cursor.setPosition(preview_block.position() + preview_end, QTextCursor.KeepAnchor)
+            preview.setTextCursor(cursor); preview.ensureCursorVisible()
+
     def _navigate_to_match(self, block_idx_match_in_data: int, string_idx_match_in_data: int,
                            char_pos_in_search_text: int, match_len_in_search_text: int,
                            was_search_tagless_and_newline_agnostic: bool) -> None:
@@ -281,103 +743,15 @@ class SearchHandler(BaseHandler):
         QApplication.processEvents()
 
         if was_search_tagless_and_newline_agnostic:
-            temp_query_for_words = self.current_query
-            query_words_for_display_search = prepare_text_for_tagless_search(temp_query_for_words, keep_original_case=True).split()
-
-            if not query_words_for_display_search: return
-
-            for editor in [self.mw.preview_text_edit, self.mw.original_text_edit, self.mw.edited_text_edit]:
-                editor_name = editor.objectName() if editor.objectName() else "UnnamedEditor"
-                if not editor or not hasattr(editor, 'highlightManager'): continue
-                
-                if (editor == self.mw.original_text_edit or editor == self.mw.edited_text_edit) and \
-                   string_idx_match_in_data != self.mw.data_store.current_string_idx:
-                    log_debug(f"TaglessSearch: Skipping {editor_name}, string mismatch for original/edited.")
-                    continue
-
-                found_overall_match_in_editor = False
-                qtextblock_start_idx = string_idx_match_in_data if editor == self.mw.preview_text_edit else 0
-                qtextblock_end_idx = string_idx_match_in_data if editor == self.mw.preview_text_edit else editor.document().blockCount() - 1
-
-                for current_widget_qblock_idx in range(qtextblock_start_idx, qtextblock_end_idx + 1):
-                    widget_block = editor.document().findBlockByNumber(current_widget_qblock_idx)
-                    if not widget_block.isValid(): continue
-                    text_in_widget_qtextblock = widget_block.text()
-
-                    first_word_display = convert_raw_to_display_text(query_words_for_display_search[0], self.mw.show_multiple_spaces_as_dots, self.mw.newline_display_symbol if editor == self.mw.preview_text_edit else "")
-                    # For original_text_edit, when search_in_original is true, we want to match against text with curly tags
-                    # If search_in_original is false, then we're matching against translated text potentially,
-                    # so the original view might need its curly tags removed for display comparison.
-                    # This logic needs to be very careful.
-                    if editor == self.mw.original_text_edit and not self.search_in_original:
-                         first_word_display = remove_curly_tags(first_word_display)
-                    
-                    current_search_offset_in_qblock = 0
-                    while current_search_offset_in_qblock < len(text_in_widget_qtextblock):
-                        start_pos, matched_word_len = self._find_in_text(text_in_widget_qtextblock, first_word_display, current_search_offset_in_qblock, self.is_case_sensitive, is_fuzzy=self.is_fuzzy)
-                        if start_pos == -1: break
-
-                        highlight_start_qblock_idx = current_widget_qblock_idx
-                        highlight_start_pos_in_qblock = start_pos
-                        highlight_end_qblock_idx = current_widget_qblock_idx
-                        highlight_end_pos_in_qblock_end_of_word = start_pos + matched_word_len
-                        
-                        all_words_found_sequentially = True
-                        if len(query_words_for_display_search) > 1:
-                            temp_offset_for_next_words = highlight_end_pos_in_qblock_end_of_word
-                            temp_current_qblock_for_next_words = current_widget_qblock_idx
-
-                            for i in range(1, len(query_words_for_display_search)):
-                                next_word_orig = query_words_for_display_search[i]
-                                next_word_display = convert_raw_to_display_text(next_word_orig, self.mw.show_multiple_spaces_as_dots, self.mw.newline_display_symbol if editor == self.mw.preview_text_edit else "")
-                                if editor == self.mw.original_text_edit and not self.search_in_original:
-                                     next_word_display = remove_curly_tags(next_word_display)
-
-                                found_current_next_word = False
-                                for j in range(temp_current_qblock_for_next_words, editor.document().blockCount()):
-                                    block_to_search_next_word = editor.document().findBlockByNumber(j)
-                                    if not block_to_search_next_word.isValid(): all_words_found_sequentially=False; break
-                                    text_of_block_to_search_next = block_to_search_next_word.text()
-                                    
-                                    search_from_in_next_block = temp_offset_for_next_words if j == temp_current_qblock_for_next_words else 0
-                                    
-                                    next_pos, next_matched_len = self._find_in_text(text_of_block_to_search_next, next_word_display, search_from_in_next_block, self.is_case_sensitive, is_fuzzy=self.is_fuzzy)
-                                    if next_pos != -1:
-                                        highlight_end_qblock_idx = j
-                                        highlight_end_pos_in_qblock_end_of_word = next_pos + next_matched_len
-                                        temp_current_qblock_for_next_words = j
-                                        temp_offset_for_next_words = highlight_end_pos_in_qblock_end_of_word
-                                        found_current_next_word = True
-                                        break
-                                    elif j == temp_current_qblock_for_next_words :
-                                        all_words_found_sequentially=False; break
-                                if not found_current_next_word: all_words_found_sequentially=False
-                                if not all_words_found_sequentially: break
-                        
-                        if all_words_found_sequentially:
-                            log_debug(f"TaglessSearch Highlight Range for {editor_name}: StartBlk:{highlight_start_qblock_idx} StartPos:{highlight_start_pos_in_qblock} EndBlk:{highlight_end_qblock_idx} EndPos:{highlight_end_pos_in_qblock_end_of_word}")
-                            for i_hl in range(highlight_start_qblock_idx, highlight_end_qblock_idx + 1):
-                                start_char = highlight_start_pos_in_qblock if i_hl == highlight_start_qblock_idx else 0
-                                current_block_for_highlight_text = editor.document().findBlockByNumber(i_hl).text()
-                                end_char = highlight_end_pos_in_qblock_end_of_word if i_hl == highlight_end_qblock_idx else len(current_block_for_highlight_text)
-                                length_to_highlight = end_char - start_char
-                                if length_to_highlight > 0 :
-                                    editor.highlightManager.add_search_match_highlight(i_hl, start_char, length_to_highlight)
-                            
-                            scroll_to_block_nav = editor.document().findBlockByNumber(highlight_start_qblock_idx)
-                            cursor_nav = QTextCursor(scroll_to_block_nav)
-                            cursor_nav.setPosition(scroll_to_block_nav.position() + highlight_start_pos_in_qblock)
-                            
-                            # Select until the end of the last word found
-                            end_block_nav = editor.document().findBlockByNumber(highlight_end_qblock_idx)
-                            cursor_nav.setPosition(end_block_nav.position() + highlight_end_pos_in_qblock_end_of_word, QTextCursor.KeepAnchor)
-                            
-                            editor.setTextCursor(cursor_nav); editor.ensureCursorVisible()
-                            found_overall_match_in_editor = True; break
-                        else:
-                            current_search_offset_in_qblock = start_pos + 1
-                    
-                    if found_overall_match_in_editor: break
+            raw_full_string_data = self._get_text_for_search(block_idx_match_in_data, string_idx_match_in_data, self.search_in_original, False)
+            tagless = self.tagless_cache.get(self.search_in_original, block_idx_match_in_data, string_idx_match_in_data, raw_full_string_data)
+            raw_start, raw_end = tagless.to_raw_span(char_pos_in_search_text, match_len_in_search_text)
+            log_debug(f"TaglessSearch: SearchTextPos {char_pos_in_search_text} maps to raw span [{raw_start}, {raw_end})")
+            if raw_start != -1:
+                self._highlight_raw_span(string_idx_match_in_data, raw_full_string_data, raw_start, raw_end)
+        elif self.is_regex: # Raw regex hits are already raw offsets
+            raw_full_string_data = self._get_text_for_search(block_idx_match_in_data, string_idx_match_in_data, self.search_in_original, False)
+            self._highlight_raw_span(string_idx_match_in_data, raw_full_string_data, char_pos_in_search_text, char_pos_in_search_text + match_len_in_search_text)
         else: # Precise search
             raw_full_string_data = self._get_text_for_search(block_idx_match_in_data, string_idx_match_in_data, self.search_in_original, False)
             target_qtextblock_idx_in_editor, char_pos_in_target_qtextblock_raw = \
@@ -225,6 +225,7 @@ class TextAutofixLogic:
                 current_temp_width = 0
                 last_fit_index = -1
                 needs_space_before_next_part = False
+                space_width = calculate_string_width(" ", self.mw.font_map)
 
                 for i, part in enumerate(line_parts):
                     part_no_tags = remove_all_tags(part)
@@ -234,14 +235,16 @@ class TextAutofixLogic:
                     current_needs_space_before = needs_space_before_next_part and not part.isspace() and text_fits and not text_fits.endswith(" ")
 
                     if current_needs_space_before:
-                        width_to_check += calculate_string_width(" ", self.mw.font_map)
+                        width_to_check += space_width
                     width_to_check += part_width
 
                     if width_to_check <= self.mw.line_width_warning_threshold_pixels:
                         if current_needs_space_before:
                             text_fits += " "
                         text_fits += part
-                        current_temp_width = calculate_string_width(remove_all_tags(text_fits), self.mw.font_map) 
+                        # Parts are whole words, spaces or tags, so widths add up
+                        # without re-measuring text_fits
+                        current_temp_width = width_to_check
                         last_fit_index = i
                         if not part.isspace():
                             needs_space_before_next_part = True
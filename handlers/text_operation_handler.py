@@ -6,6 +6,7 @@ from PyQt5.QtGui import QTextCursor, QTextBlock
 from PyQt5.QtCore import QTimer, Qt
 from .base_handler import BaseHandler
 from utils.logging_utils import log_debug
+from utils.latency_profiler import KEYSTROKE, latency_span
 from utils.utils import convert_dots_to_spaces_from_editor, convert_spaces_to_dots_for_display, calculate_string_width, remove_all_tags, SPACE_DOT_SYMBOL, ALL_TAGS_PATTERN
 
 PREVIEW_UPDATE_DELAY = 250
@@ -16,6 +17,21 @@ class TextOperationHandler(BaseHandler):
         self.preview_update_timer = QTimer()
         self.preview_update_timer.setSingleShot(True)
         self.preview_update_timer.timeout.connect(self._update_preview_content)
+        # Strings edited since the last preview refresh; None forces a full rebuild
+        self._pending_preview_block: Optional[int] = None
+        self._pending_preview_rows: Optional[Set[int]] = None
+
+    def schedule_preview_update(self, delay: int, block_idx: Optional[int] = None, string_idx: Optional[int] = None) -> None:
+        """Refresh the preview after delay ms: only the given string's row, or everything when none is given."""
+        first_request = not self.preview_update_timer.isActive()
+        if block_idx is None or string_idx is None or (not first_request and self._pending_preview_block != block_idx):
+            self._pending_preview_rows = None
+        elif first_request:
+            self._pending_preview_rows = {string_idx}
+        elif self._pending_preview_rows is not None:
+            self._pending_preview_rows.add(string_idx)
+        self._pending_preview_block = block_idx
+        self.preview_update_timer.start(delay)
 
     def _rescan_issues_for_current_string(self, block_idx: int, string_idx: int, new_text: str) -> None:
         if not self.mw.current_game_rules:
@@ -57,11 +73,20 @@ class TextOperationHandler(BaseHandler):
         pass
 
     def _update_preview_content(self) -> None:
+        with latency_span("preview_update"):
+            self._refresh_preview_content()
+
+    def _refresh_preview_content(self) -> None:
+        pending_block, pending_rows = self._pending_preview_block, self._pending_preview_rows
+        self._pending_preview_block = self._pending_preview_rows = None
+
         preview_edit = getattr(self.mw, 'preview_text_edit', None)
         if not preview_edit or self.mw.data_store.current_block_idx == -1:
             return
 
         block_idx = self.mw.data_store.current_block_idx
+        if pending_rows and pending_block == block_idx and self._patch_preview_rows(preview_edit, block_idx, pending_rows):
+            return
         old_scrollbar_value = preview_edit.verticalScrollBar().value()
         
         main_window_ref = self.mw
@@ -101,6 +126,63 @@ class TextOperationHandler(BaseHandler):
             preview_edit.lineNumberArea.update()
 
         main_window_ref.is_programmatically_changing_text = was_programmatically_changing
+
+    def _patch_preview_rows(self, preview_edit, block_idx: int, string_indices: Set[int]) -> bool:
+        """
+        Rewrite just the preview lines of the edited strings in place. Returns
+        False when the preview no longer lines up with the block and needs a
+        full rebuild instead.
+        """
+        rules = self.mw.current_game_rules
+        if not rules or not isinstance(preview_edit, QPlainTextEdit):
+            return False
+        if not (0 <= block_idx < len(self.mw.data_store.data)) or not isinstance(self.mw.data_store.data[block_idx], list):
+            return False
+        doc = preview_edit.document()
+        target_indices = getattr(self.mw.data_store, 'displayed_string_indices', None) or []
+        row_count = len(target_indices) if target_indices else len(self.mw.data_store.data[block_idx])
+        if doc.blockCount() != row_count:
+            return False
+
+        rows: Dict[int, Tuple[int, str]] = {}
+        for string_idx in string_indices:
+            if target_indices:
+                if string_idx not in target_indices:
+                    continue
+                preview_idx = target_indices.index(string_idx)
+            elif 0 <= string_idx < row_count:
+                preview_idx = string_idx
+            else:
+                continue
+            text_for_preview_raw, _ = self.data_processor.get_current_string_text(block_idx, string_idx)
+            line = rules.get_text_representation_for_preview(str(text_for_preview_raw))
+            if '\n' in line or '\u2029' in line:
+                return False
+            rows[preview_idx] = (string_idx, line)
+
+        was_programmatically_changing = self.mw.is_programmatically_changing_text
+        self.mw.is_programmatically_changing_text = True
+        undo_enabled = doc.isUndoRedoEnabled()
+        doc.setUndoRedoEnabled(False)
+        try:
+            for preview_idx, (_, line) in rows.items():
+                block = doc.findBlockByNumber(preview_idx)
+                if block.text() == line:
+                    continue
+                cursor = QTextCursor(block)
+                cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+                cursor.insertText(line)
+        finally:
+            doc.setUndoRedoEnabled(undo_enabled)
+            self.mw.is_programmatically_changing_text = was_programmatically_changing
+
+        if hasattr(preview_edit, 'highlightManager'):
+            self.ui_updater._apply_highlights_for_rows(
+                block_idx, {preview_idx: string_idx for preview_idx, (string_idx, _) in rows.items()}
+            )
+        if hasattr(preview_edit, 'lineNumberArea'):
+            preview_edit.lineNumberArea.update()
+        return True
         
     def text_edited(self) -> None:
         if self.mw.is_programmatically_changing_text:
@@ -117,45 +199,52 @@ class TextOperationHandler(BaseHandler):
         if not edited_edit or not self.mw.current_game_rules:
             return
             
-        text_from_editor = edited_edit.toPlainText()
-        actual_text = self.mw.current_game_rules.convert_editor_text_to_data(text_from_editor)
-        actual_text_with_spaces = convert_dots_to_spaces_from_editor(actual_text)
-
-        # Determine which sublines differ from the saved baseline
-        text_from_saved_file = self.data_processor._get_string_from_source(block_idx, string_idx_in_block, self.mw.data_store.edited_file_data, "edited_file_data")
-        if text_from_saved_file is None:
-            text_from_saved_file = self.data_processor._get_string_from_source(block_idx, string_idx_in_block, self.mw.data_store.data, "original_data")
-        if text_from_saved_file is None:
-            text_from_saved_file = ""
+        with latency_span(KEYSTROKE):
+            text_from_editor = edited_edit.toPlainText()
+            actual_text = self.mw.current_game_rules.convert_editor_text_to_data(text_from_editor)
+            actual_text_with_spaces = convert_dots_to_spaces_from_editor(actual_text)
+
+            # Determine which sublines differ from the saved baseline
+            text_from_saved_file = self.data_processor._get_string_from_source(block_idx, string_idx_in_block, self.mw.data_store.edited_file_data, "edited_file_data")
+            if text_from_saved_file is None:
+                text_from_saved_file = self.data_processor._get_string_from_source(block_idx, string_idx_in_block, self.mw.data_store.data, "original_data")
+            if text_from_saved_file is None:
+                text_from_saved_file = ""
+                
+            saved_lines = str(text_from_saved_file).split('\n')
+            curr_lines = actual_text_with_spaces.split('\n')
             
-        saved_lines = str(text_from_saved_file).split('\n')
-        curr_lines = actual_text_with_spaces.split('\n')
-        
-        self.mw.data_store.edited_sublines.clear()
-        for i, curr_line in enumerate(curr_lines):
-            if i >= len(saved_lines) or curr_line != saved_lines[i]:
-                self.mw.data_store.edited_sublines.add(i)
-        
-        self._rescan_issues_for_current_string(block_idx, string_idx_in_block, actual_text_with_spaces)
-
-        needs_title_update = self.data_processor.update_edited_data(block_idx, string_idx_in_block, actual_text_with_spaces)
-        
-        if needs_title_update: 
-            self.mw.ui_updater.update_title()
+            self.mw.data_store.edited_sublines.clear()
+            for i, curr_line in enumerate(curr_lines):
+                if i >= len(saved_lines) or curr_line != saved_lines[i]:
+                    self.mw.data_store.edited_sublines.add(i)
+            
+            with latency_span("problem_scan"):
+                self._rescan_issues_for_current_string(block_idx, string_idx_in_block, actual_text_with_spaces)
 
-        self.mw.ui_updater.update_block_item_text_with_problem_count(block_idx)
-        self.preview_update_timer.start(PREVIEW_UPDATE_DELAY) 
-        self.mw.ui_updater.update_status_bar()
-        self.mw.ui_updater.synchronize_original_cursor()
-        
-        # Re-apply highlights to editor
-        self.mw.ui_updater._apply_highlights_to_editor(edited_edit, block_idx, string_idx_in_block)
-        
-        # Dynamically update the visual representation of spaces (dots)
-        self.mw.ui_updater.update_text_views()
-        
-        if edited_edit and hasattr(edited_edit, 'lineNumberArea'):
-            edited_edit.lineNumberArea.update()
+            with latency_span("update_edited_data"):
+                needs_title_update = self.data_processor.update_edited_data(block_idx, string_idx_in_block, actual_text_with_spaces)
+            
+            if needs_title_update: 
+                self.mw.ui_updater.update_title()
+
+            with latency_span("tree_badges"):
+                self.mw.ui_updater.schedule_block_badge_update(block_idx)
+            self.schedule_preview_update(PREVIEW_UPDATE_DELAY, block_idx, string_idx_in_block)
+            with latency_span("status_bar"):
+                self.mw.ui_updater.update_status_bar()
+                self.mw.ui_updater.synchronize_original_cursor()
+            
+            # Re-apply highlights to editor
+            with latency_span("editor_highlights"):
+                self.mw.ui_updater._apply_highlights_to_editor(edited_edit, block_idx, string_idx_in_block)
+            
+            # Dynamically update the visual representation of spaces (dots)
+            with latency_span("update_text_views"):
+                self.mw.ui_updater.update_text_views()
+            
+            if edited_edit and hasattr(edited_edit, 'lineNumberArea'):
+                edited_edit.lineNumberArea.update()
 
     def sync_subline_asterisks(self, block_idx: int, string_idx: int, current_text: str) -> None:
         """
@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 import json
-from typing import Dict, List, Optional, Sequence, Tuple
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from .base_translation_handler import BaseTranslationHandler
-from core.glossary_manager import GlossaryEntry
+from core.glossary_manager import GlossaryEntry, GlossarySnapshot
 from core.translation.session_manager import TranslationSessionState
 from utils.utils import ALL_TAGS_PATTERN
 from utils.logging_utils import log_debug
@@ -14,6 +15,14 @@ from utils.logging_utils import log_debug
 class AIPromptComposer(BaseTranslationHandler):
     """Compose prompts for AI translation/variation tasks and manage placeholders."""
 
+    def __init__(self, main_handler):
+        super().__init__(main_handler)
+        # Per-block precomputation reused by every chunk of the same batch:
+        # (all_source_items, glossary snapshot, _BatchContext)
+        self._batch_context_cache: Optional[Tuple[Any, Any, _BatchContext]] = None
+        # (glossary snapshot, full glossary table for the system prompt)
+        self._glossary_text_cache: Optional[Tuple[GlossarySnapshot, str]] = None
+
     # ------------------------------------------------------------------
     # Public API used by translation handler
     # ------------------------------------------------------------------
@@ -49,33 +58,30 @@ class AIPromptComposer(BaseTranslationHandler):
         retry_reason: str = '',
     ) -> Tuple[str, str, Dict]:
         placeholder_map: Dict = {}
-        
-        # Create a map for quick lookup of items by id
-        all_items_map = {item['id']: item for item in all_source_items}
-        all_item_ids = [item['id'] for item in all_source_items]
 
         items_with_context = []
         glossary_manager = self.main_handler._glossary_manager
+        batch_context = self._get_batch_context(all_source_items, GlossarySnapshot.of(glossary_manager))
+        texts = batch_context.texts
 
         for item in source_items:
             item_id = item['id']
             current_text = item.get('text', '')
-            
-            try:
-                current_idx = all_item_ids.index(item_id)
-                prev_idx = current_idx - 1
-                next_idx = current_idx + 1
-
-                context_before = all_source_items[prev_idx]['text'] if prev_idx >= 0 else ''
-                context_after = all_source_items[next_idx]['text'] if next_idx < len(all_source_items) else ''
-            except ValueError:
+
+            current_idx = batch_context.positions.get(item_id)
+            if current_idx is not None:
+                context_before = texts[current_idx - 1] if current_idx > 0 else ''
+                context_after = texts[current_idx + 1] if current_idx + 1 < len(texts) else ''
+            else:
                 context_before, context_after = '', ''
 
             # Find relevant glossary terms
             relevant_glossary_entries = []
             if glossary_manager:
-                combined_text = '\n'.join([context_before, current_text, context_after])
-                relevant_glossary_entries = glossary_manager.get_relevant_terms(combined_text)
+                if current_idx is not None:
+                    relevant_glossary_entries = batch_context.window_terms(current_idx)
+                else:
+                    relevant_glossary_entries = glossary_manager.get_relevant_terms(current_text)
 
             item_for_ai = {
                 'id': item_id,
@@ -146,6 +152,26 @@ class AIPromptComposer(BaseTranslationHandler):
         )
         return combined_system, user_content, placeholder_map
 
+    def _get_batch_context(self, all_source_items: List[Dict], snapshot: Optional[GlossarySnapshot]) -> _BatchContext:
+        """
+        Id -> position map and glossary matches for a whole block. AIWorker composes
+        every chunk against the same all_source_items list, so it is scanned once
+        per glossary snapshot.
+        """
+        cached = self._batch_context_cache
+        if (
+            cached is not None
+            and cached[0] is all_source_items
+            and cached[1] is not None and snapshot is not None
+            and cached[1].revision is not None
+            and cached[1].manager is snapshot.manager
+            and cached[1].revision == snapshot.revision
+        ):
+            return cached[2]
+        context = _BatchContext(all_source_items, snapshot)
+        self._batch_context_cache = (all_source_items, snapshot, context)
+        return context
+
     def compose_variation_request(
         self,
         system_prompt: str,
@@ -333,6 +359,19 @@ class AIPromptComposer(BaseTranslationHandler):
         return "\n".join(lines)
 
 
+    def _full_glossary_text(self, snapshot: GlossarySnapshot) -> str:
+        cached = self._glossary_text_cache
+        if (
+            cached is not None
+            and snapshot.revision is not None
+            and cached[0].manager is snapshot.manager
+            and cached[0].revision == snapshot.revision
+        ):
+            return cached[1]
+        text = self._glossary_entries_to_text(snapshot.entries)
+        self._glossary_text_cache = (snapshot, text)
+        return text
+
     def _prepare_glossary_for_prompt(
         self,
         system_prompt: str,
@@ -375,7 +414,7 @@ class AIPromptComposer(BaseTranslationHandler):
             return system_prompt
 
         # Case 2: First time sending in a session, or no session. Send full glossary.
-        full_glossary_text = self._glossary_entries_to_text(glossary_manager.get_entries())
+        full_glossary_text = self._full_glossary_text(GlossarySnapshot.of(glossary_manager))
         if not full_glossary_text:
             return system_prompt  # Nothing to send
 
@@ -386,4 +425,45 @@ class AIPromptComposer(BaseTranslationHandler):
         return (
             f"{system_prompt}\n\n"
             f"GLOSSARY (use with absolute priority):\n{full_glossary_text}"
-        )
\ No newline at end of file
+        )
+
+class _BatchContext:
+    """
+    Glossary matches of a block bucketed by the string they start and end in,
+    so the terms relevant to any (previous, current, next) window are found
+    without rescanning.
+    """
+
+    def __init__(self, all_source_items: List[Dict], glossary: Optional[GlossarySnapshot]) -> None:
+        self.texts: List[str] = [item.get('text', '') or '' for item in all_source_items]
+        self.positions: Dict[Any, int] = {}
+        for idx, item in enumerate(all_source_items):
+            self.positions.setdefault(item['id'], idx)
+        # start string idx -> [(end string idx, entry)] in match order
+        self._matches_by_start: Dict[int, List[Tuple[int, GlossaryEntry]]] = {}
+        if glossary and self.texts:
+            self._scan(glossary)
+
+    def _scan(self, glossary: GlossarySnapshot) -> None:
+        # Strings joined with newlines exactly as the old per-window text was,
+        # so terms spanning two neighbouring strings are still found
+        offsets: List[int] = []
+        cursor = 0
+        for text in self.texts:
+            offsets.append(cursor)
+            cursor += len(text) + 1
+        for match in glossary.find_matches('\n'.join(self.texts)):
+            first = bisect_right(offsets, match.start) - 1
+            last = bisect_right(offsets, max(match.start, match.end - 1)) - 1
+            self._matches_by_start.setdefault(first, []).append((last, match.entry))
+
+    def window_terms(self, idx: int) -> List[GlossaryEntry]:
+        """Entries found in strings idx-1..idx+1, ordered by first occurrence."""
+        seen = set()
+        entries: List[GlossaryEntry] = []
+        for start in (idx - 1, idx, idx + 1):
+            for last, entry in self._matches_by_start.get(start, ()):
+                if last <= idx + 1 and entry.original not in seen:
+                    seen.add(entry.original)
+                    entries.append(entry)
+        return entries
@@ -0,0 +1,67 @@
+# handlers/translation/glossary_analytics_worker.py
+import time
+from typing import List, Optional, Tuple
+
+from PyQt5.QtCore import QThread, pyqtSignal, QObject
+
+from core.glossary_analytics import GlossaryAnalytics
+from core.glossary_manager import GlossaryManager
+from utils.logging_utils import log_error
+
+
+class GlossaryAnalyticsWorker(QThread):
+    report_updated = pyqtSignal(object)  # GlossaryAnalyticsReport so far
+    progress_updated = pyqtSignal(int, int)  # processed blocks, total blocks
+    analysis_finished = pyqtSignal(object)  # final GlossaryAnalyticsReport
+    analysis_failed = pyqtSignal(str)  # error message
+    cancelled = pyqtSignal()
+
+    REPORT_INTERVAL_SEC = 1.0
+
+    def __init__(
+        self,
+        manager: GlossaryManager,
+        blocks: List[Tuple[int, List[Tuple[str, Optional[str]]]]],
+        min_occurrences: int = 3,
+        parent=None,
+    ):
+        # Handle mocking in tests: MagicMock doesn't pass isinstance(QObject) but causes TypeError in super().__init__
+        if parent is not None and (not isinstance(parent, QObject) or "Mock" in str(type(parent))):
+            parent = None
+        super().__init__(parent)
+        self.manager = manager
+        self.blocks = blocks
+        self.min_occurrences = min_occurrences
+        self.is_cancelled = False
+
+    def cancel(self):
+        self.is_cancelled = True
+
+    def run(self):
+        # Always end with a terminal signal, or the handler keeps waiting on this worker
+        try:
+            self._analyze()
+        except Exception as e:
+            log_error(f"GlossaryAnalyticsWorker: analysis failed: {e}", exc_info=True)
+            self.analysis_failed.emit(str(e))
+
+    def _analyze(self):
+        analytics = GlossaryAnalytics(self.manager)
+        total = len(self.blocks)
+        last_report = time.monotonic()
+
+        for i, (_block_idx, rows) in enumerate(self.blocks):
+            for original, translation in rows:
+                if self.is_cancelled:
+                    self.report_updated.emit(analytics.report(self.min_occurrences))
+                    self.cancelled.emit()
+                    return
+                analytics.add_string(original, translation)
+
+            self.progress_updated.emit(i + 1, total)
+            now = time.monotonic()
+            if now - last_report >= self.REPORT_INTERVAL_SEC:
+                self.report_updated.emit(analytics.report(self.min_occurrences))
+                last_report = now
+
+        self.analysis_finished.emit(analytics.report(self.min_occurrences))
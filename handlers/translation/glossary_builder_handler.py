@@ -114,6 +114,24 @@ class GlossaryBuilderHandler:
             QMessageBox.information(self.mw, "Info", "The selected block/category is empty. Nothing to process.")
             return
 
+        self._build_glossary_from_text(full_text, block_id)
+
+    def build_glossary_for_candidates(self, candidates) -> None:
+        """Send candidate terms from glossary analytics, one example line each, instead of whole blocks."""
+        if not self.prompt_data:
+            return
+        lines = []
+        for candidate in candidates:
+            example = (candidate.example or '').strip()
+            lines.append(f"{candidate.text}: {example}" if example and example != candidate.text else candidate.text)
+        full_text = "\n".join(lines)
+        if not full_text.strip():
+            QMessageBox.information(self.mw, "Info", "No candidate terms selected. Nothing to process.")
+            return
+        log_debug(f"Building glossary for {len(lines)} candidate terms from analytics.")
+        self._build_glossary_from_text(full_text, None)
+
+    def _build_glossary_from_text(self, full_text: str, block_id: Optional[int]) -> None:
         # 2. Get AI settings
         glossary_ai_config = dict(getattr(self.mw, 'glossary_ai', {}) or {})
         chunk_size = glossary_ai_config.get('chunk_size', 8000)
@@ -152,11 +170,14 @@ class GlossaryBuilderHandler:
 
         self._start_async_glossary_task(block_id, provider, glossary_ai_config, chunks)
 
-    def _start_async_glossary_task(self, block_id: int, provider, glossary_ai_config: dict, chunks: list[str]) -> None:
+    def _start_async_glossary_task(self, block_id: Optional[int], provider, glossary_ai_config: dict, chunks: list[str]) -> None:
         status_bar = getattr(self.mw, 'statusBar', None)
 
         block_names = getattr(self.mw, 'block_names', {}) or {}
-        block_label = block_names.get(str(block_id)) or f"Block {block_id + 1}"
+        if block_id is None:
+            block_label = "Candidate Terms"
+        else:
+            block_label = block_names.get(str(block_id)) or f"Block {block_id + 1}"
         model_display = glossary_ai_config.get('model') or glossary_ai_config.get('provider') or 'Unknown model'
 
         self._cleanup_worker()
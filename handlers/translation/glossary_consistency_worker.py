@@ -0,0 +1,68 @@
+# handlers/translation/glossary_consistency_worker.py
+import time
+from typing import List, Tuple
+
+from PyQt5.QtCore import QThread, pyqtSignal, QObject
+
+from core.glossary_consistency import GlossaryViolation, check_string_consistency
+from core.glossary_manager import GlossaryManager
+from utils.logging_utils import log_error
+
+
+class GlossaryConsistencyWorker(QThread):
+    violations_found = pyqtSignal(list)  # [GlossaryViolation, ...]
+    progress_updated = pyqtSignal(int, int)  # processed strings, total strings
+    check_finished = pyqtSignal(int)  # total number of violations
+    check_failed = pyqtSignal(str)  # error message
+    cancelled = pyqtSignal()
+
+    EMIT_INTERVAL_SEC = 0.1
+
+    def __init__(self, manager: GlossaryManager, entries: List[Tuple[int, int, str, str]], parent=None):
+        # Handle mocking in tests: MagicMock doesn't pass isinstance(QObject) but causes TypeError in super().__init__
+        if parent is not None and (not isinstance(parent, QObject) or "Mock" in str(type(parent))):
+            parent = None
+        super().__init__(parent)
+        self.manager = manager
+        self.entries = entries
+        self.is_cancelled = False
+
+    def cancel(self):
+        self.is_cancelled = True
+
+    def run(self):
+        # Always end with a terminal signal, or the handler keeps waiting on this worker
+        try:
+            self._check()
+        except Exception as e:
+            log_error(f"GlossaryConsistencyWorker: check failed: {e}", exc_info=True)
+            self.check_failed.emit(str(e))
+
+    def _check(self):
+        total = len(self.entries)
+        total_violations = 0
+        batch: List[GlossaryViolation] = []
+        last_emit = time.monotonic()
+
+        for i, (block_idx, string_idx, original_text, translation_text) in enumerate(self.entries):
+            if self.is_cancelled:
+                if batch: self.violations_found.emit(batch)
+                self.cancelled.emit()
+                return
+
+            batch.extend(check_string_consistency(self.manager, block_idx, string_idx, original_text, translation_text))
+
+            now = time.monotonic()
+            if now - last_emit >= self.EMIT_INTERVAL_SEC:
+                if batch:
+                    total_violations += len(batch)
+                    self.violations_found.emit(batch)
+                    batch = []
+                self.progress_updated.emit(i + 1, total)
+                last_emit = now
+
+        if batch:
+            total_violations += len(batch)
+            self.violations_found.emit(batch)
+        self.progress_updated.emit(total, total)
+        self.check_finished.emit(total_violations)
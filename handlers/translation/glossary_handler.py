@@ -9,12 +9,18 @@ from pathlib import Path
 from typing import Dict, List, Optional, Sequence, Tuple
 
 from PyQt5.QtWidgets import QAction, QMessageBox, QDialog
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 
 from .base_translation_handler import BaseTranslationHandler
 from .glossary_prompt_manager import GlossaryPromptManager
 from .glossary_occurrence_updater import GlossaryOccurrenceUpdater
+from .glossary_consistency_worker import GlossaryConsistencyWorker
+from .glossary_analytics_worker import GlossaryAnalyticsWorker
+from core.glossary_analytics import CandidateTerm, GlossaryAnalyticsReport, collect_analytics_blocks
+from core.glossary_consistency import GlossaryViolation, collect_consistency_entries
 from core.glossary_manager import GlossaryEntry, GlossaryManager, GlossaryOccurrence
+from components.glossary_analytics_dialog import GlossaryAnalyticsDialog
+from components.glossary_consistency_dialog import GlossaryConsistencyDialog
 from components.glossary_dialog import GlossaryDialog
 from components.glossary_edit_dialog import GlossaryEditDialog
 from utils.logging_utils import log_debug
@@ -22,16 +28,37 @@ from utils.logging_utils import log_debug
 
 class GlossaryHandler(BaseTranslationHandler):
 
+    # Entry edits in quick succession (e.g. AI glossary fill) share one disk write
+    GLOSSARY_WRITE_DELAY_MS = 500
+
     def __init__(self, main_handler):
         super().__init__(main_handler)
         self.glossary_manager = GlossaryManager()
+        self._glossary_write_timer = QTimer()
+        self._glossary_write_timer.setSingleShot(True)
+        self._glossary_write_timer.setInterval(self.GLOSSARY_WRITE_DELAY_MS)
+        self._glossary_write_timer.timeout.connect(self.flush_glossary_writes)
+        self.glossary_manager.set_write_scheduler(self._glossary_write_timer.start)
         self._open_glossary_action: Optional[QAction] = None
+        self._consistency_action: Optional[QAction] = None
         self.dialog: Optional[GlossaryDialog] = None
+        self.consistency_dialog: Optional[GlossaryConsistencyDialog] = None
+        self._consistency_worker: Optional[GlossaryConsistencyWorker] = None
+        self._consistency_workers = set()  # keep references until each thread finishes
+        self._analytics_action: Optional[QAction] = None
+        self.analytics_dialog: Optional[GlossaryAnalyticsDialog] = None
+        self._analytics_worker: Optional[GlossaryAnalyticsWorker] = None
+        self._analytics_workers = set()
+        self._glossary_builder = None
 
         # Delegates
         self._prompt_manager = GlossaryPromptManager(self.mw, main_handler, self.glossary_manager)
         self._occurrence_updater = GlossaryOccurrenceUpdater(self)
 
+    def flush_glossary_writes(self) -> None:
+        self._glossary_write_timer.stop()
+        self.glossary_manager.flush()
+
     # ── Public prompt manager proxy (used by TranslationHandler) ─────────
 
     @property
@@ -101,6 +128,18 @@ class GlossaryHandler(BaseTranslationHandler):
             action.triggered.connect(self.show_glossary_dialog)
             tools_menu.addAction(action)
             self._open_glossary_action = action
+        if self._consistency_action is None:
+            action = QAction("Check Glossary Consistency...", self.mw)
+            action.setToolTip("List translations that use none of the glossary variants for a term")
+            action.triggered.connect(self.show_consistency_check)
+            tools_menu.addAction(action)
+            self._consistency_action = action
+        if self._analytics_action is None:
+            action = QAction("Glossary Analytics...", self.mw)
+            action.setToolTip("Term frequency, translation coverage and frequent phrases missing from the glossary")
+            action.triggered.connect(self.show_glossary_analytics)
+            tools_menu.addAction(action)
+            self._analytics_action = action
 
         reset_action = getattr(self.main_handler, "_reset_session_action", None)
         if reset_action is None:
@@ -138,7 +177,7 @@ class GlossaryHandler(BaseTranslationHandler):
             QMessageBox.information(self.mw, "Glossary", "No data is loaded for analysis.")
             return
 
-        occurrence_map = self.glossary_manager.build_occurrence_index(data_source)
+        occurrence_map = self.glossary_manager.ensure_occurrence_index(data_source, self.mw.data_store.data_revision)
         entries = sorted(self.glossary_manager.get_entries(), key=lambda e: e.original.lower())
         self.dialog = GlossaryDialog(
             parent=self.mw, entries=entries, occurrence_map=occurrence_map,
@@ -146,11 +185,157 @@ class GlossaryHandler(BaseTranslationHandler):
             update_callback=self._handle_glossary_entry_update,
             delete_callback=self._handle_glossary_entry_delete,
             ai_variation_callback=self._handle_notes_variation_from_dialog,
+            completion_callback=self.glossary_manager.get_completions,
             initial_term=initial_term,
         )
         self.dialog.finished.connect(self._on_glossary_dialog_closed)
         self.dialog.show()
 
+    # ── Glossary consistency check ────────────────────────────────────────
+
+    def show_consistency_check(self) -> None:
+        if self.consistency_dialog and self.consistency_dialog.isVisible():
+            self.consistency_dialog.raise_()
+            self.consistency_dialog.activateWindow()
+            return
+
+        system_prompt, _glossary_text = self.load_prompts()
+        if system_prompt is None:
+            return
+        if not self.glossary_manager.get_entries():
+            QMessageBox.information(self.mw, "Glossary", "Glossary is empty or not loaded.")
+            return
+        data_source = self.mw.data_store.data
+        if not isinstance(data_source, list) or not data_source:
+            QMessageBox.information(self.mw, "Glossary", "No data is loaded for analysis.")
+            return
+
+        entries = collect_consistency_entries(
+            data_source, lambda b, s: self.data_processor.get_current_string_text(b, s)[0]
+        )
+        dialog = GlossaryConsistencyDialog(parent=self.mw, jump_callback=self._jump_to_violation)
+        dialog.cancel_requested.connect(self.cancel_consistency_check)
+        dialog.finished.connect(self._on_consistency_dialog_closed)
+        self.consistency_dialog = dialog
+        dialog.show()
+        dialog.begin(len(entries))
+
+        worker = GlossaryConsistencyWorker(self.glossary_manager, entries, self.mw)
+        worker.violations_found.connect(lambda batch, w=worker: self._on_consistency_violations(w, batch))
+        worker.progress_updated.connect(lambda done, total, w=worker: self._on_consistency_progress(w, done, total))
+        worker.check_finished.connect(lambda _count, w=worker: self._on_consistency_done(w, cancelled=False))
+        worker.cancelled.connect(lambda w=worker: self._on_consistency_done(w, cancelled=True))
+        worker.check_failed.connect(lambda message, w=worker: self._on_consistency_done(w, cancelled=True, error=message))
+        worker.finished.connect(lambda w=worker: self._consistency_workers.discard(w))
+        self._consistency_worker = worker
+        self._consistency_workers.add(worker)
+        worker.start()
+        log_debug(f"Glossary consistency check started over {len(entries)} translated strings.")
+
+    def cancel_consistency_check(self) -> None:
+        if self._consistency_worker is not None:
+            self._consistency_worker.cancel()
+
+    def _on_consistency_violations(self, worker: GlossaryConsistencyWorker, batch: List[GlossaryViolation]) -> None:
+        if worker is self._consistency_worker and self.consistency_dialog:
+            self.consistency_dialog.add_violations(batch)
+
+    def _on_consistency_progress(self, worker: GlossaryConsistencyWorker, processed: int, total: int) -> None:
+        if worker is self._consistency_worker and self.consistency_dialog:
+            self.consistency_dialog.set_progress(processed, total)
+
+    def _on_consistency_done(self, worker: GlossaryConsistencyWorker, cancelled: bool, error: Optional[str] = None) -> None:
+        if worker is not self._consistency_worker:
+            return
+        self._consistency_worker = None
+        if self.consistency_dialog:
+            self.consistency_dialog.finish(cancelled=cancelled, error=error)
+
+    def _on_consistency_dialog_closed(self, *_args) -> None:
+        self.cancel_consistency_check()
+        self.consistency_dialog = None
+
+    # ── Glossary analytics ────────────────────────────────────────────────
+
+    def show_glossary_analytics(self) -> None:
+        if self.analytics_dialog and self.analytics_dialog.isVisible():
+            self.analytics_dialog.raise_()
+            self.analytics_dialog.activateWindow()
+            return
+
+        system_prompt, _glossary_text = self.load_prompts()
+        if system_prompt is None:
+            return
+        data_source = self.mw.data_store.data
+        if not isinstance(data_source, list) or not data_source:
+            QMessageBox.information(self.mw, "Glossary", "No data is loaded for analysis.")
+            return
+
+        blocks = collect_analytics_blocks(
+            data_source, lambda b, s: self.data_processor.get_current_string_text(b, s)[0]
+        )
+        dialog = GlossaryAnalyticsDialog(parent=self.mw)
+        dialog.cancel_requested.connect(self.cancel_glossary_analytics)
+        dialog.build_requested.connect(self._build_glossary_from_candidates)
+        dialog.finished.connect(self._on_analytics_dialog_closed)
+        self.analytics_dialog = dialog
+        dialog.show()
+        dialog.begin(len(blocks))
+
+        # The worker reads a private copy; the live manager keeps changing on this thread
+        worker = GlossaryAnalyticsWorker(self.glossary_manager.frozen_copy(), blocks, parent=self.mw)
+        worker.report_updated.connect(lambda report, w=worker: self._on_analytics_report(w, report))
+        worker.progress_updated.connect(lambda done, total, w=worker: self._on_analytics_progress(w, done, total))
+        worker.analysis_finished.connect(lambda report, w=worker: self._on_analytics_done(w, report, cancelled=False))
+        worker.cancelled.connect(lambda w=worker: self._on_analytics_done(w, None, cancelled=True))
+        worker.analysis_failed.connect(lambda message, w=worker: self._on_analytics_done(w, None, cancelled=True, error=message))
+        worker.finished.connect(lambda w=worker: self._analytics_workers.discard(w))
+        self._analytics_worker = worker
+        self._analytics_workers.add(worker)
+        worker.start()
+        log_debug(f"Glossary analytics started over {len(blocks)} blocks.")
+
+    def cancel_glossary_analytics(self) -> None:
+        if self._analytics_worker is not None:
+            self._analytics_worker.cancel()
+
+    def _on_analytics_report(self, worker: GlossaryAnalyticsWorker, report: GlossaryAnalyticsReport) -> None:
+        if worker is self._analytics_worker and self.analytics_dialog:
+            self.analytics_dialog.show_report(report)
+
+    def _on_analytics_progress(self, worker: GlossaryAnalyticsWorker, processed: int, total: int) -> None:
+        if worker is self._analytics_worker and self.analytics_dialog:
+            self.analytics_dialog.set_progress(processed, total)
+
+    def _on_analytics_done(
+        self, worker: GlossaryAnalyticsWorker, report: Optional[GlossaryAnalyticsReport], cancelled: bool,
+        error: Optional[str] = None,
+    ) -> None:
+        if worker is not self._analytics_worker:
+            return
+        self._analytics_worker = None
+        if self.analytics_dialog:
+            self.analytics_dialog.finish(report, cancelled=cancelled, error=error)
+
+    def _on_analytics_dialog_closed(self, *_args) -> None:
+        self.cancel_glossary_analytics()
+        self.analytics_dialog = None
+
+    def _build_glossary_from_candidates(self, candidates: List[CandidateTerm]) -> None:
+        from handlers.translation.glossary_builder_handler import GlossaryBuilderHandler
+
+        self._glossary_builder = GlossaryBuilderHandler(self.mw)
+        self._glossary_builder.build_glossary_for_candidates(candidates)
+
+    def _jump_to_violation(self, violation: GlossaryViolation) -> None:
+        self.main_handler.ui_handler._activate_entry({
+            "block_idx": violation.block_idx,
+            "string_idx": violation.string_idx,
+            "line_idx": violation.line_idx,
+        })
+        self.mw.activateWindow()
+        self.mw.raise_()
+
     # ── Entry CRUD ────────────────────────────────────────────────────────
 
     def add_glossary_entry(self, term: str, context: Optional[str] = None, translation: str = "") -> None:
@@ -187,9 +372,7 @@ class GlossaryHandler(BaseTranslationHandler):
         self._update_glossary_highlighting()
 
         if not is_new and updated_entry and old_translation and old_translation.strip() != new_translation.strip():
-            data_source = getattr(self.mw, "data", [])
-            occurrence_map = self.glossary_manager.build_occurrence_index(data_source)
-            occurrences = occurrence_map.get(updated_entry.original, [])
+            occurrences = self._get_occurrence_map().get(updated_entry.original, [])
             if occurrences:
                 log_debug(f"Glossary: Translation changed for '{term}'. Showing update dialog.")
                 self._occurrence_updater.show_translation_update_dialog(
@@ -340,12 +523,9 @@ class GlossaryHandler(BaseTranslationHandler):
         if not entry or not self.dialog:
             return
         context_line: Optional[str] = None
-        data_source = getattr(self.mw, "data", None)
-        if isinstance(data_source, list):
-            occurrence_map = self.glossary_manager.build_occurrence_index(data_source)
-            occ_list = occurrence_map.get(entry.original, [])
-            if occ_list:
-                context_line = getattr(occ_list[0], "line_text", None)
+        occ_list = self._get_occurrence_map().get(entry.original, [])
+        if occ_list:
+            context_line = getattr(occ_list[0], "line_text", None)
         self._start_glossary_notes_variation(
             term=entry.original, translation=entry.translation or "",
             notes=entry.notes or "", context_line=context_line, target_dialog=self.dialog,
@@ -378,6 +558,14 @@ class GlossaryHandler(BaseTranslationHandler):
 
     # ── Navigation & data helpers ─────────────────────────────────────────
 
+    def _get_occurrence_map(self) -> Dict[str, List[GlossaryOccurrence]]:
+        # The index follows the original text, which translation edits never
+        # touch: entry edits patch it, and a data load (new revision) rescans it.
+        data_source = self.mw.data_store.data
+        if not isinstance(data_source, list):
+            return {}
+        return self.glossary_manager.ensure_occurrence_index(data_source, self.mw.data_store.data_revision)
+
     def _get_original_string(self, block_idx: int, string_idx: int) -> Optional[str]:
         return self.data_processor._get_string_from_source(
             block_idx, string_idx, getattr(self.mw, "data", None), "original_for_translation"
@@ -412,8 +600,7 @@ class GlossaryHandler(BaseTranslationHandler):
         previous_translation = previous_entry.translation if previous_entry else None
 
         if self.glossary_manager.update_entry(original, translation, notes):
-            data_source = getattr(self.mw, "data", [])
-            occurrence_map = self.glossary_manager.build_occurrence_index(data_source)
+            occurrence_map = self._get_occurrence_map()
             entries = sorted(self.glossary_manager.get_entries(), key=lambda e: e.original.lower())
             self._update_glossary_highlighting()
             self.main_handler._cached_glossary = self.glossary_manager.get_raw_text()
@@ -438,8 +625,7 @@ class GlossaryHandler(BaseTranslationHandler):
 
     def _handle_glossary_entry_delete(self, original: str):
         if self.glossary_manager.delete_entry(original):
-            data_source = getattr(self.mw, "data", [])
-            occurrence_map = self.glossary_manager.build_occurrence_index(data_source)
+            occurrence_map = self._get_occurrence_map()
             entries = sorted(self.glossary_manager.get_entries(), key=lambda e: e.original.lower())
             self._update_glossary_highlighting()
             self.main_handler._cached_glossary = self.glossary_manager.get_raw_text()
@@ -87,6 +87,8 @@ class GlossaryPromptManager:
             QMessageBox.critical(self._mw, "AI Translation", "System prompt not defined in prompts.json.")
             return None, None
 
+        # Pending debounced edits must reach the file before it is read back
+        self._glossary_manager.flush()
         glossary_path = self._resolve_file("glossary.md", plugin_name)
         glossary_text = ""
         if glossary_path:
@@ -109,6 +111,7 @@ class GlossaryPromptManager:
     def initialize_highlighting(self) -> None:
         """Pre-load glossary text for syntax highlighting without a full prompts load."""
         plugin_name = getattr(self._mw, "active_game_plugin", None)
+        self._glossary_manager.flush()
         glossary_path = self._resolve_file("glossary.md", plugin_name)
         glossary_text = ""
         if glossary_path:
@@ -227,7 +230,13 @@ class GlossaryPromptManager:
 
     def _update_glossary_highlighting(self) -> None:
         manager = self._glossary_manager if self._glossary_manager.get_entries() else None
-        
+
+        # Spellchecker words come from the same glossary snapshot; the editors
+        # below rehighlight only when its revision changed
+        spellchecker = getattr(self._mw, "spellchecker_manager", None)
+        if spellchecker and hasattr(spellchecker, "reload_glossary_words"):
+            spellchecker.reload_glossary_words(rehighlight=False)
+
         # Update all three editors
         editors = [
             getattr(self._mw, "original_text_edit", None),
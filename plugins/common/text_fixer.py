@@ -1,7 +1,8 @@
 # --- START OF FILE plugins/common/text_fixer.py ---
 from typing import Tuple, List, Optional
 import re
-from utils.utils import calculate_string_width, remove_all_tags, ALL_TAGS_PATTERN
+from bisect import bisect_right
+from utils.utils import calculate_string_width, calculate_width_profile, find_width_fit, remove_all_tags, ALL_TAGS_PATTERN
 
 class GenericTextFixer:
     def __init__(self, main_window_ref, tag_manager_ref, problem_analyzer_ref):
@@ -42,12 +43,19 @@ class GenericTextFixer:
             while calculate_string_width(line, font_map) > threshold:
                 made_change = True
                 line_parts = re.findall(r'(\{[^}]*\}|\[[^\]]*\]|\S+|\s+)', line)
-                best_split_point = -1
-                for j in range(len(line_parts) - 1, 0, -1):
-                    line_part_one = "".join(line_parts[:j]).rstrip()
-                    if calculate_string_width(line_part_one, font_map) <= threshold:
-                        best_split_point = j
-                        break
+                # split_ends[j] is len("".join(line_parts[:j]).rstrip()); the last
+                # split point that fits is one binary search over the width profile
+                split_ends = []
+                content_end = offset = 0
+                for part in line_parts:
+                    split_ends.append(content_end)
+                    offset += len(part)
+                    if not part.isspace():
+                        content_end = offset
+                fit_end = find_width_fit(calculate_width_profile(line, font_map), threshold)
+                best_split_point = bisect_right(split_ends, fit_end) - 1
+                if best_split_point < 1:
+                    best_split_point = -1
                 if best_split_point == -1 and len(line_parts) > 1:
                     best_split_point = 1
 
@@ -38,7 +38,8 @@ class ProblemAnalyzer(GenericProblemAnalyzer):
             return False
         return text_no_tags_stripped[-1] in SENTENCE_END_PUNCTUATION_CHARS
 
-    def _check_short_line(self, current_subline: str, next_subline: str, font_map: dict, threshold: int) -> bool:
+    def _check_short_line(self, current_subline: str, next_subline: str, font_map: dict, threshold: int,
+                          width_current: Optional[int] = None) -> bool:
         current_subline_no_tags_stripped = remove_all_tags(current_subline).strip()
         if not current_subline_no_tags_stripped or self._ends_with_sentence_punctuation(current_subline_no_tags_stripped):
             return False
@@ -48,7 +49,8 @@ class ProblemAnalyzer(GenericProblemAnalyzer):
         first_word_next = next_subline_no_tags_stripped.split(maxsplit=1)[0]
         if not first_word_next:
             return False
-        width_current = calculate_string_width(current_subline, font_map)
+        if width_current is None:
+            width_current = calculate_string_width(current_subline, font_map)
         width_first_word_next = calculate_string_width(first_word_next, font_map)
         space_width = calculate_string_width(" ", font_map)
         return (width_current + space_width + width_first_word_next) <= threshold
@@ -71,7 +73,7 @@ class ProblemAnalyzer(GenericProblemAnalyzer):
                 problems_per_subline_idx[i].add(self.problem_ids['WIDTH'])
             if i + 1 < len(sublines_with_tags):
                 next_text_part, _ = sublines_with_tags[i+1]
-                if self._check_short_line(text_part, next_text_part, font_map, threshold):
+                if self._check_short_line(text_part, next_text_part, font_map, threshold, width_current=width):
                     problems_per_subline_idx[i].add(self.problem_ids['SHORT'])
             if not is_only_one_subline_in_total and self._check_single_word_subline_generic(text_part):
                  problems_per_subline_idx[i].add(self.problem_ids['SINGLE'])
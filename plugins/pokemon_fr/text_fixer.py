@@ -1,7 +1,7 @@
 # --- START OF FILE plugins/pokemon_fr/text_fixer.py ---
 from typing import Tuple, List
 import re
-from utils.utils import calculate_string_width, remove_all_tags
+from utils.utils import calculate_width_profile, remove_all_tags
 from plugins.common.text_fixer import GenericTextFixer
 from .config import PROBLEM_WIDTH_EXCEEDED, PROBLEM_SHORT_LINE, PROBLEM_EMPTY_SUBLINE
 
@@ -33,23 +33,24 @@ class TextFixer(GenericTextFixer):
         sublines = self._get_sublines_with_tags(text)
         new_sublines_reassembled = []
         for text_part, original_newline_tag in sublines:
-            width = calculate_string_width(text_part, font_map)
-            if width <= threshold:
+            profile = calculate_width_profile(text_part, font_map)
+            if profile[-1] <= threshold:
                 new_sublines_reassembled.append((text_part, original_newline_tag))
                 continue
-            words = text_part.split(' ')
-            current_line = ""
-            for word in words:
-                if not current_line:
-                    current_line = word
-                    continue
-                temp_line = current_line + ' ' + word
-                if calculate_string_width(temp_line, font_map) > threshold:
-                    new_sublines_reassembled.append((current_line, '\\n'))
-                    current_line = word
-                else:
-                    current_line = temp_line
-            new_sublines_reassembled.append((current_line, original_newline_tag))
+            # Lines are slices of text_part between single spaces, so the width
+            # of "current line + next word" is a difference of two profile entries
+            line_start = None  # None while the current line is still empty
+            word_start = 0
+            for word in text_part.split(' '):
+                word_end = word_start + len(word)
+                if line_start is None:
+                    if word:
+                        line_start = word_start
+                elif profile[word_end] - profile[line_start] > threshold:
+                    new_sublines_reassembled.append((text_part[line_start:word_start - 1], '\\n'))
+                    line_start = word_start if word else None
+                word_start = word_end + 1
+            new_sublines_reassembled.append((text_part[line_start:] if line_start is not None else "", original_newline_tag))
         return self._reassemble_data_string(new_sublines_reassembled)
 
     def _fix_short_lines(self, text: str, font_map: dict, threshold: int) -> str:
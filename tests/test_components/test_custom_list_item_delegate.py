@@ -0,0 +1,134 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPixmap
+from PyQt5.QtWidgets import QApplication, QStyleOptionViewItem, QTreeWidget, QTreeWidgetItem
+from core.data_store import ProblemStore
+from core.project_models import Block, Category
+from components.custom_list_item_delegate import CustomListItemDelegate
+
+
+@pytest.fixture
+def main_window():
+    game_rules = MagicMock()
+    game_rules.get_problem_definitions.return_value = {"width": {"color": "#FF0000", "priority": 1, "name": "Width"}}
+    ui_updater = MagicMock()
+    ui_updater._get_aggregated_problems_for_block.return_value = {"width": 1}
+    return SimpleNamespace(
+        theme="light",
+        style=QApplication.style,
+        data_store=SimpleNamespace(
+            problems_per_subline=ProblemStore({(0, 0, 0): {"width"}}),
+            data=[["a"], ["b"]],
+        ),
+        current_game_rules=game_rules,
+        ui_updater=ui_updater,
+        detection_enabled={},
+        project_manager=None,
+        edited_data={},
+        unsaved_block_indices=set(),
+    )
+
+
+@pytest.fixture
+def setup(qapp, main_window):
+    tree = QTreeWidget()
+    item = QTreeWidgetItem(["Block Zero (1 width)"])
+    item.setData(0, Qt.UserRole, 0)
+    tree.addTopLevelItem(item)
+    delegate = CustomListItemDelegate(None)
+    delegate.list_widget = MagicMock()
+    delegate.list_widget._custom_drop_target = None
+    delegate.list_widget.window.return_value = main_window
+    return delegate, tree, tree.indexFromItem(item)
+
+
+def _paint(delegate, index, width=300):
+    target = QPixmap(width, 20)
+    target.fill(Qt.white)
+    option = QStyleOptionViewItem()
+    option.rect = QRect(0, 0, width, 20)
+    option.font = QFont()
+    painter = QPainter(target)
+    delegate.paint(painter, option, index)
+    painter.end()
+    return target.toImage()
+
+
+def test_paint_reuses_indicator_pixmap_until_block_problems_change(setup, main_window):
+    delegate, _, index = setup
+    aggregate = main_window.ui_updater._get_aggregated_problems_for_block
+
+    image = _paint(delegate, index)
+    _paint(delegate, index)
+    assert aggregate.call_count == 1
+    red = QColor("#FF0000").rgb()
+    assert any(image.pixel(x, y) == red for x in range(80) for y in range(20))
+
+    # Another block's problems don't touch this item's cache entry
+    main_window.data_store.problems_per_subline[(1, 0, 0)] = {"width"}
+    _paint(delegate, index)
+    assert aggregate.call_count == 1
+
+    main_window.data_store.problems_per_subline[(0, 1, 0)] = {"width"}
+    _paint(delegate, index)
+    assert aggregate.call_count == 2
+
+    main_window.theme = "dark"
+    _paint(delegate, index)
+    assert aggregate.call_count == 3
+
+
+def test_paint_without_problem_index_recomputes(setup, main_window):
+    delegate, _, index = setup
+    main_window.data_store.problems_per_subline = {(0, 0, 0): {"width"}}
+    _paint(delegate, index)
+    _paint(delegate, index)
+    assert main_window.ui_updater._get_aggregated_problems_for_block.call_count == 2
+
+
+def test_tooltip_text_is_cached_per_problem_revision(setup, main_window):
+    delegate, _, _ = setup
+    text = delegate._get_problems_tooltip_text(main_window, 0)
+    assert delegate._get_problems_tooltip_text(main_window, 0) == text
+    assert "<b>Width</b>: 1 cases" in text
+    assert main_window.ui_updater._get_aggregated_problems_for_block.call_count == 1
+
+    main_window.detection_enabled = {"width": False}
+    delegate._get_problems_tooltip_text(main_window, 0)
+    assert main_window.ui_updater._get_aggregated_problems_for_block.call_count == 2
+
+
+
+def test_category_tooltip_follows_category_membership(setup, main_window):
+    delegate, _, _ = setup
+    aggregate = main_window.ui_updater._get_aggregated_problems_for_block
+    dialogue = Category(name="Dialogue", line_indices=[0, 1])
+    block = Block(categories=[dialogue, Category(name="Menu", line_indices=[2])])
+    main_window.project_manager = SimpleNamespace(project=SimpleNamespace(blocks=[block]))
+    main_window.block_to_project_file_map = {0: 0}
+
+    delegate._get_problems_tooltip_text(main_window, 0, "Dialogue")
+    delegate._get_problems_tooltip_text(main_window, 0, "Dialogue")
+    assert aggregate.call_count == 1
+
+    # Lines moved between categories leave the problem store untouched
+    dialogue.line_indices = [0, 1, 2]
+    delegate._get_problems_tooltip_text(main_window, 0, "Dialogue")
+    assert aggregate.call_count == 2
+
+def test_text_layout_is_cached_and_drops_metadata_when_narrow(setup):
+    delegate, _, _ = setup
+    font = QFont()
+    metrics = QFontMetrics(font)
+    full_text = "Block Zero (1 width)"
+
+    name, name_w, meta = delegate._get_text_layout(full_text, metrics, font.key(), 1000)
+    assert (name, meta) == ("Block Zero", " (1 width)")
+    assert name_w == metrics.horizontalAdvance("Block Zero")
+    assert delegate._get_text_layout(full_text, metrics, font.key(), 1000) is delegate._get_text_layout(full_text, metrics, font.key(), 1000)
+
+    name, _, meta = delegate._get_text_layout(full_text, metrics, font.key(), metrics.horizontalAdvance("Block") + 5)
+    assert meta is None
+    assert name != "Block Zero"
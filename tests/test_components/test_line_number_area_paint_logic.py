@@ -80,3 +80,62 @@ def test_paint_preview_warning_stripes(monkeypatch):
             print(f"Rect: {r}, Color: {color_str}")
             
     assert found_red_stripe, "Warning stripe was not drawn for preview line!"
+
+
+def _preview_paint_setup(problems):
+    from PyQt5.QtWidgets import QMainWindow
+    editor = LineNumberedTextEdit(parent=None)
+    editor.setObjectName("preview_text_edit")
+    editor.setPlainText("Line 1\nLine 2")
+    editor.preview_indicator_area_width = 15
+
+    mock_mw = MagicMock(spec=QMainWindow)
+    mock_mw.data_store = MagicMock()
+    mock_mw.data_store.current_block_idx = 0
+    mock_mw.data_store.current_string_idx = -1
+    mock_mw.data_store.displayed_string_indices = [4, 5]
+    mock_mw.data_store.edited_data = {}
+    mock_mw.data_store.string_metadata = {}
+    mock_mw.data_store.problems_per_subline = problems
+    mock_rules = MagicMock()
+    mock_rules.get_problem_definitions.return_value = {"dummy_problem_id": {"priority": 1, "color": Qt.red}}
+    mock_mw.current_game_rules = mock_rules
+    mock_mw.detection_enabled = {"dummy_problem_id": True}
+    return editor, LNETLineNumberAreaPaintLogic(editor, MagicMock(), mock_mw)
+
+def test_paint_reuses_line_state_until_problems_change(monkeypatch):
+    from core.data_store import ProblemStore
+    problems = ProblemStore({(0, 5, 0): {"dummy_problem_id"}})
+    editor, paint_logic = _preview_paint_setup(problems)
+    monkeypatch.setattr("components.editor.line_number_area_paint_logic.QPainter", lambda *a: MockPainterRecorder())
+    event = MagicMock(rect=lambda: QRect(0, 0, 100, 100))
+
+    built = []
+    original_build = paint_logic._build_line_state
+    def counting_build(*args, **kwargs):
+        built.append(args[1])
+        return original_build(*args, **kwargs)
+    paint_logic._build_line_state = counting_build
+
+    paint_logic.execute_paint_event(event, MagicMock())
+    assert sorted(built) == [0, 1]
+    assert [len(paint_logic._render_cache[n].stripe_colors) for n in (0, 1)] == [0, 1]
+
+    # Scrolling or repainting reuses the cached state
+    paint_logic.execute_paint_event(event, MagicMock())
+    assert len(built) == 2
+
+    # A write to the problem store invalidates it
+    problems[(0, 4, 0)] = {"dummy_problem_id"}
+    paint_logic.execute_paint_event(event, MagicMock())
+    assert len(built) == 4
+    assert len(paint_logic._render_cache[0].stripe_colors) == 1
+
+    paint_logic.invalidate_render_cache()
+    assert paint_logic._render_cache == {}
+
+def test_paint_without_problem_store_revision_is_not_cached(monkeypatch):
+    editor, paint_logic = _preview_paint_setup({(0, 5, 0): {"dummy_problem_id"}})
+    monkeypatch.setattr("components.editor.line_number_area_paint_logic.QPainter", lambda *a: MockPainterRecorder())
+    paint_logic.execute_paint_event(MagicMock(rect=lambda: QRect(0, 0, 100, 100)), MagicMock())
+    assert paint_logic._render_cache == {}
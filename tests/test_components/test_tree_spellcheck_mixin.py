@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from components.tree_spellcheck_mixin import TreeSpellcheckMixin
+
+
+class _Tree(TreeSpellcheckMixin):
+    def __init__(self, main_window):
+        self._main_window = main_window
+
+    def window(self):
+        return self._main_window
+
+
+def test_spellcheck_corrections_refresh_search_index():
+    texts = {(0, 0): "helo world", (0, 1): "fine"}
+    scm = MagicMock()
+    scm.is_misspelled.side_effect = lambda word: word == "helo"
+    data_processor = MagicMock()
+    data_processor.get_current_string_text.side_effect = lambda b, s: (texts[(b, s)], None)
+    main_window = SimpleNamespace(
+        spellchecker_manager=scm,
+        data_store=SimpleNamespace(data=[["a", "b"]], unsaved_changes=False, unsaved_block_indices=set(), current_block_idx=-1),
+        data_processor=data_processor,
+        project_manager=None,
+        edited_data={},
+        search_handler=MagicMock(),
+    )
+
+    with patch('dialogs.spellcheck_dialog.SpellcheckDialog') as dialog_cls:
+        dialog_cls.return_value.exec_.return_value = True
+        dialog_cls.return_value.get_corrected_text.return_value = "hello world"
+        _Tree(main_window)._open_spellcheck_for_block(0)
+
+    assert main_window.edited_data == {(0, 0): "hello world"}
+    main_window.search_handler.refresh_index_block.assert_called_once_with(0)
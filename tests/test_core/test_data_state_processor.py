@@ -108,6 +108,15 @@ def test_update_edited_data_new_edit(dsp, mock_mw):
     mock_mw.ui_updater.update_block_item_text_with_problem_count.assert_called_with(0)
 
 
+
+def test_update_edited_data_keeps_search_index_live(dsp, mock_mw):
+    dsp.update_edited_data(0, 1, "new_text")
+    mock_mw.search_handler.on_string_edited.assert_called_once_with(0, 1, "new_text")
+
+    # Unchanged text doesn't touch the index
+    dsp.update_edited_data(0, 1, "new_text")
+    assert mock_mw.search_handler.on_string_edited.call_count == 1
+
 def test_update_edited_data_revert_to_original(dsp, mock_mw):
     mock_mw.edited_data = {(0, 0): "changed"}
     mock_mw.unsaved_changes = True
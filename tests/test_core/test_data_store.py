@@ -1,5 +1,5 @@
 import pytest
-from core.data_store import AppDataStore
+from core.data_store import AppDataStore, ProblemStore
 
 
 @pytest.fixture
@@ -85,3 +85,43 @@ def test_AppDataStore_mark_clean_nonexistent_block(store):
     # Should not raise an error when block isn't in the set
     store.mark_clean(999)
     assert store.unsaved_changes is False
+
+def test_problem_store_revision_changes_on_write():
+    store = ProblemStore()
+    revisions = [store.revision]
+    store[(0, 0, 0)] = {"WIDTH"}
+    revisions.append(store.revision)
+    del store[(0, 0, 0)]
+    revisions.append(store.revision)
+    store.update({(0, 1, 0): {"TAG"}})
+    revisions.append(store.revision)
+    store.clear()
+    revisions.append(store.revision)
+    assert len(set(revisions)) == len(revisions)
+    # A fresh store never reuses a revision
+    assert ProblemStore().revision not in revisions
+
+def test_problem_store_block_index_tracks_writes():
+    store = ProblemStore({(0, 0, 0): {"WIDTH"}, (1, 0, 0): {"TAG"}})
+    store[(0, 1, 0)] = {"WIDTH", "TAG"}
+    assert store.keys_for_block(0) == {(0, 0, 0), (0, 1, 0)}
+    assert store.block_problem_counts(0) == {"WIDTH": 2, "TAG": 1}
+
+    # Cached counts are dropped when the block is written again
+    store[(0, 0, 0)] = {"TAG"}
+    assert store.block_problem_counts(0) == {"WIDTH": 1, "TAG": 2}
+    del store[(0, 1, 0)]
+    store.pop((1, 0, 0))
+    assert store.block_problem_counts(0) == {"TAG": 1}
+    assert store.keys_for_block(1) == set()
+    store.clear()
+    assert store.block_problem_counts(0) == {}
+
+def test_problem_store_block_revision_changes_only_for_written_block():
+    store = ProblemStore({(0, 0, 0): {"WIDTH"}})
+    before = (store.block_revision(0), store.block_revision(1))
+    store[(1, 0, 0)] = {"TAG"}
+    assert store.block_revision(0) == before[0]
+    assert store.block_revision(1) != before[1]
+    store.clear()
+    assert store.block_revision(0) not in before
@@ -0,0 +1,62 @@
+import pytest
+
+from core.glossary_analytics import GlossaryAnalytics, collect_analytics_blocks
+from core.glossary_manager import GlossaryManager
+
+
+@pytest.fixture
+def manager():
+    gm = GlossaryManager()
+    gm.load_from_text(plugin_name=None, glossary_path=None, raw_text="Sword\tМеч\nFairy\tФея\nKinstone\tКамінь Долі\n")
+    return gm
+
+
+def test_term_frequency_and_coverage(manager):
+    analytics = GlossaryAnalytics(manager)
+    analytics.add_string("A Sword and another Sword", "Меч і ще меча")
+    analytics.add_string("The Sword!", "Клинок!")
+    analytics.add_string("Sword\nFairy", "Sword\nFairy")  # untranslated
+    analytics.add_string("", "ignored")
+
+    stats = {s.entry.original: s for s in analytics.term_stats()}
+    sword = stats["Sword"]
+    assert (sword.occurrences, sword.strings, sword.translated_strings, sword.consistent_strings) == (4, 3, 2, 1)
+    assert sword.coverage == 0.5
+    assert stats["Fairy"].coverage is None
+    assert stats["Kinstone"].occurrences == 0
+    assert [s.entry.original for s in analytics.term_stats()][0] == "Sword"
+    assert analytics.strings_seen == 3
+
+
+def test_candidates_skip_glossary_terms_stopwords_and_subsumed_phrases(manager):
+    analytics = GlossaryAnalytics(manager)
+    for _ in range(3):
+        analytics.add_string("Talk to the Wind Tribe elder.", None)
+    analytics.add_string("The Wind Tribe lives above the clouds.", None)
+    analytics.add_string("Take the [Red]Sword[/Red] to Wind Tribe.", None)
+
+    candidates = analytics.candidates(min_occurrences=3)
+    texts = [c.text for c in candidates]
+    assert texts[0] == "Wind Tribe"
+    wind_tribe = candidates[0]
+    assert (wind_tribe.occurrences, wind_tribe.strings, wind_tribe.word_count) == (5, 5, 2)
+    # "Wind" and "Tribe" never occur on their own, so the pair subsumes them
+    assert "Wind" not in texts and "Tribe" not in texts
+    assert "Wind Tribe elder" in texts and "Tribe elder" not in texts
+    assert not any(t.lower() in ("the", "sword", "to the") for t in texts)
+    assert not any("Sword" in t for t in texts)
+
+
+def test_report_is_a_detached_snapshot(manager):
+    analytics = GlossaryAnalytics(manager)
+    analytics.add_string("Sword", "Меч")
+    report = analytics.report()
+    analytics.add_string("Sword", "Меч")
+    assert next(s for s in report.terms if s.entry.original == "Sword").occurrences == 1
+    assert report.strings_analyzed == 1
+
+
+def test_collect_analytics_blocks():
+    data = [["a", "", "b"], None, ["c"]]
+    blocks = collect_analytics_blocks(data, lambda b, s: f"t{b}{s}")
+    assert blocks == [(0, [("a", "t00"), ("b", "t02")]), (2, [("c", "t20")])]
@@ -0,0 +1,38 @@
+import pytest
+
+from core.glossary_consistency import check_string_consistency, collect_consistency_entries
+from core.glossary_manager import GlossaryManager
+
+
+@pytest.fixture
+def manager():
+    gm = GlossaryManager()
+    gm.load_from_text(
+        plugin_name=None, glossary_path=None,
+        raw_text="Sword\tМеч\nFairy\tФея; Чарівниця\nKinstone\tКамінь Долі\n",
+    )
+    return gm
+
+
+def test_check_string_consistency_accepts_any_variant_and_inflection(manager):
+    assert check_string_consistency(manager, 0, 0, "A sword", "Гострий меча") == []
+    assert check_string_consistency(manager, 0, 0, "The Fairy", "Чарівницю") == []
+    assert check_string_consistency(manager, 0, 0, "No terms", "Нічого") == []
+    assert check_string_consistency(manager, 0, 0, "A sword", "") == []
+
+
+def test_check_string_consistency_reports_each_term_once(manager):
+    violations = check_string_consistency(
+        manager, 2, 5, "Sword!\nAnother sword and a Kinstone", "Клинок\nще клинок і Камінь Долі"
+    )
+    assert [(v.entry.original, v.block_idx, v.string_idx, v.line_idx, v.original_line) for v in violations] == [
+        ("Sword", 2, 5, 0, "Sword!"),
+    ]
+    assert violations[0].sort_key() == (2, 5, 0)
+
+
+def test_collect_consistency_entries_skips_untranslated():
+    data = [["Sword", "Fairy", ""], "bad block", ["Kinstone"]]
+    translations = {(0, 0): "Меч", (0, 1): "Fairy", (2, 0): None}
+    entries = collect_consistency_entries(data, lambda b, s: translations.get((b, s)))
+    assert entries == [(0, 0, "Sword", "Меч"), (2, 0, "Kinstone", "")]
@@ -3,7 +3,7 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 import re
 
-from core.glossary_manager import GlossaryEntry, GlossaryManager, GlossaryMatch, GlossaryOccurrence
+from core.glossary_manager import GlossaryEntry, GlossaryManager, GlossaryMatch, GlossaryOccurrence, GlossarySnapshot
 
 def test_GlossaryEntry_is_valid():
     assert GlossaryEntry("term", "term").is_valid()
@@ -211,3 +211,303 @@ def test_GlossaryManager_prefilter_logic(manager):
     # 5. Multiple matches
     matches = manager.find_matches("Master Sword !!! +1 Shield")
     assert len(matches) == 3
+
+
+# --- Incremental occurrence index ---
+
+def _positions(index, original):
+    return [(o.block_idx, o.string_idx, o.line_idx, o.start) for o in index.get(original, [])]
+
+@pytest.fixture
+def indexed_manager(manager):
+    manager.add_entry("Sword", "Меч", "")
+    manager.add_entry("Master Sword", "Майстер Меч", "")
+    dataset = [
+        ["A sword.", "Nothing here", "The Master Sword\nsword again"],
+        ["", "Another sword"],
+    ]
+    manager.build_occurrence_index(dataset)
+    return manager, dataset
+
+def test_GlossaryManager_update_string_patches_postings(indexed_manager):
+    manager, dataset = indexed_manager
+    live_map = manager.ensure_occurrence_index(dataset)
+
+    affected = manager.update_string(0, 1, "Now a Master{Color:Red} Sword")
+    assert affected == {"Sword", "Master Sword"}
+    assert _positions(live_map, "Sword") == [(0, 0, 0, 2), (0, 1, 0, 24), (0, 2, 0, 11), (0, 2, 1, 0), (1, 1, 0, 8)]
+    assert _positions(live_map, "Master Sword") == [(0, 1, 0, 6), (0, 2, 0, 4)]
+
+    assert manager.update_string(0, 2, "") == {"Sword", "Master Sword"}
+    assert manager.update_string(1, 0, "sword") == {"Sword"}
+    assert _positions(live_map, "Sword") == [(0, 0, 0, 2), (0, 1, 0, 24), (1, 0, 0, 0), (1, 1, 0, 8)]
+    assert manager.update_string(0, 0, "Same sword.") == {"Sword"}
+    assert manager.update_string(0, 1, "no terms") == {"Sword", "Master Sword"}
+
+    # The patched index matches a full rescan of the same texts
+    rescanned = GlossaryManager()
+    rescanned.add_entry("Sword", "Меч", "")
+    rescanned.add_entry("Master Sword", "Майстер Меч", "")
+    expected = rescanned.build_occurrence_index([["Same sword.", "no terms", ""], ["sword", "Another sword"]])
+    for original in ("Sword", "Master Sword"):
+        assert _positions(live_map, original) == _positions(expected, original)
+
+def test_GlossaryManager_entry_deltas_keep_index_live(indexed_manager):
+    manager, dataset = indexed_manager
+    live_map = manager.ensure_occurrence_index(dataset)
+
+    manager.add_entry("Another", "Інший", "")
+    assert _positions(live_map, "Another") == [(1, 1, 0, 0)]
+
+    manager.update_entry("Sword", "Клинок", "")
+    assert {o.entry.translation for o in live_map["Sword"]} == {"Клинок"}
+    assert len(live_map["Sword"]) == 4
+
+    manager.delete_entry("Master Sword")
+    assert "Master Sword" not in live_map
+    assert all(o.entry.original != "Master Sword" for occs in manager._string_occurrences.values() for o in occs)
+
+    # Same dataset object: no rescan
+    manager._scan_string = MagicMock()
+    assert manager.ensure_occurrence_index(dataset) is live_map
+    manager._scan_string.assert_not_called()
+
+def test_GlossaryManager_occurrence_index_is_keyed_on_data_revision(indexed_manager):
+    manager, dataset = indexed_manager
+    live_map = manager.ensure_occurrence_index(dataset, revision=1)
+    assert manager.ensure_occurrence_index(dataset, revision=1) is live_map
+
+    # Refilled in place: same list object, new revision
+    dataset[1] = ["The Master Sword"]
+    manager.ensure_occurrence_index(dataset, revision=2)
+    assert _positions(live_map, "Master Sword") == [(0, 2, 0, 4), (1, 0, 0, 4)]
+
+    # Re-matching a string with its indexed text is a no-op
+    manager._scan_string = MagicMock()
+    assert manager.update_string(1, 0, "The Master Sword") == set()
+    manager._scan_string.assert_not_called()
+
+
+def test_GlossaryManager_reload_applies_entry_delta(tmp_path):
+    f = tmp_path / "glossary.md"
+    f.write_text("Sword\tМеч\nShield\tЩит\n", encoding="utf-8")
+    manager = GlossaryManager()
+    manager.load_from_text(plugin_name="p", glossary_path=f, raw_text=f.read_text(encoding="utf-8"))
+    dataset = [["Sword and shield"]]
+    live_map = manager.build_occurrence_index(dataset)
+
+    f.write_text("Sword\tКлинок\nAnd\tІ\n", encoding="utf-8")
+    manager.refresh_from_disk()
+    assert set(live_map) == {"Sword", "And"}
+    assert live_map["Sword"][0].entry.translation == "Клинок"
+    assert _positions(live_map, "And") == [(0, 0, 0, 6)]
+
+
+# --- Translation-side matchers ---
+
+def test_GlossaryManager_translation_matchers_are_cached_and_prefiltered(manager):
+    manager.load_from_text(
+        plugin_name=None, glossary_path=None,
+        raw_text="Sword\tМеч\nFairy\tФея; Чарівниця\nGreat Fairy\tВелика Фея\nShield\tЩит\n",
+    )
+    entries = manager.get_entries()
+    text = "Велику Фею і чарівницю бачив меча"
+
+    with patch.object(GlossaryManager, "build_translation_regex", wraps=GlossaryManager.build_translation_regex) as build:
+        matches = manager.find_translation_matches(text, entries)
+        manager.find_translation_matches(text, entries)
+    # Shield's stem is absent, so its regex is never compiled; the rest compile once
+    assert sorted(c.args[0] for c in build.call_args_list) == ["Велика Фея", "Меч", "Фея; Чарівниця"]
+
+    expected = []
+    for entry in entries:
+        for m in GlossaryManager.build_translation_regex(entry.translation).finditer(text):
+            expected.append((m.start(), m.end(), entry.original))
+    assert sorted(expected) == sorted((m.start, m.end, m.entry.original) for m in matches)
+
+    # Updating a translation refreshes the stems
+    manager.update_entry("Shield", "Захист", "")
+    assert [m.entry.original for m in manager.find_translation_matches("захистом", manager.get_entries())] == ["Shield"]
+    assert "Щит" not in manager._translation_stems
+
+
+def test_GlossaryManager_entry_edits_patch_pattern_caches(manager, tmp_path):
+    f = tmp_path / "glossary.md"
+    manager.load_from_text(plugin_name=None, glossary_path=f, raw_text="| Original | Translation | Notes |\n|---|---|---|\n| Sword | Меч | |\n")
+    with patch.object(manager, "_build_pattern_cache") as full_rebuild, \
+         patch.object(manager, "_parse_markdown") as reparse:
+        manager.add_entry("Master Sword", "Майстер Меч", "")
+        manager.add_entry("!!!", "Обережно", "")
+        manager.update_entry("Sword", "Клинок", "sharp")
+        manager.delete_entry("!!!")
+    full_rebuild.assert_not_called()
+    reparse.assert_not_called()
+
+    text = "The Master Sword and a Sword!!!"
+    patched = [(m.entry, m.start, m.end) for m in manager.find_matches(text)]
+    fresh = GlossaryManager()
+    fresh.load_from_text(plugin_name=None, glossary_path=None, raw_text=f.read_text(encoding="utf-8"))
+    assert patched == [(m.entry, m.start, m.end) for m in fresh.find_matches(text)]
+    assert manager.get_entry("Sword").translation == "Клинок"
+    assert [m.entry.original for m in manager.find_translation_matches("гострий клинок", manager.get_entries())] == ["Sword"]
+
+
+def test_GlossaryManager_scheduled_writes_are_coalesced(manager, tmp_path):
+    f = tmp_path / "glossary.md"
+    manager.load_from_text(plugin_name=None, glossary_path=f, raw_text="")
+    scheduled = []
+    manager.set_write_scheduler(lambda: scheduled.append(True))
+
+    for i in range(5):
+        manager.add_entry(f"Term{i}", f"Термін{i}", "")
+    assert len(scheduled) == 5
+    assert manager.has_pending_write() and not f.exists()
+    assert "| Term4 | Термін4 |" in manager.get_raw_text()
+
+    with patch.object(Path, "write_text", autospec=True, side_effect=Path.write_text) as write:
+        manager.flush()
+        manager.flush()
+    assert write.call_count == 1
+    assert not manager.has_pending_write()
+    assert f.read_text(encoding="utf-8") == manager.get_raw_text()
+
+    # Re-feeding our own text (as load_prompts does with the cached glossary) is a no-op
+    with patch.object(manager, "_parse_markdown") as reparse:
+        manager.load_from_text(plugin_name=None, glossary_path=f, raw_text=manager.get_raw_text())
+    reparse.assert_not_called()
+
+
+def test_GlossaryManager_get_entry_is_a_hash_lookup(manager):
+    manager.load_from_text(
+        plugin_name=None, glossary_path=None,
+        raw_text="Master  Sword\tМайстер Меч\nmaster sword\tДублікат\nFairy\tФея\n",
+    )
+    with patch.object(GlossaryManager, "normalize_term", wraps=GlossaryManager.normalize_term) as normalize:
+        assert manager.get_entry("MASTER sword").translation == "Майстер Меч"
+    assert normalize.call_count == 1
+
+    manager.add_entry("Kinstone", "Камінь Долі", "")
+    assert manager.get_entry("kinstone").translation == "Камінь Долі"
+    manager.update_entry("Fairy", "Чарівниця", "")
+    assert manager.get_entry("fairy").translation == "Чарівниця"
+    # Deleting the first of two equivalent terms exposes the other one
+    manager.delete_entry("Master  Sword")
+    assert manager.get_entry("Master Sword").translation == "Дублікат"
+    manager.delete_entry("master sword")
+    assert manager.get_entry("Master Sword") is None
+
+
+def test_GlossaryManager_get_completions(manager):
+    manager.load_from_text(
+        plugin_name=None, glossary_path=None,
+        raw_text="Master Sword\tМайстер Меч\nMaster Key\tМайстер-ключ; Головний ключ\nMinish\tМініш\n",
+    )
+    assert manager.get_completions("mas") == ["Master Key", "Master Sword"]
+    assert manager.get_completions("ma", limit=1) == ["Master Key"]
+    assert manager.get_completions("майстер") == ["Майстер Меч", "Майстер-ключ"]
+    assert manager.get_completions("голов") == ["Головний ключ"]
+    assert manager.get_completions("") == []
+
+    manager.add_entry("Mask", "Маска", "")
+    assert manager.get_completions("mas") == ["Mask", "Master Key", "Master Sword"]
+    manager.delete_entry("Master Key")
+    assert manager.get_completions("голов") == []
+
+
+def test_GlossaryManager_snapshot_is_shared_per_revision(manager):
+    manager.load_from_text(
+        plugin_name=None, glossary_path=None,
+        raw_text="Master Sword\tМайстер Меч\nMinish\tМініш; м'який Мініш\n",
+    )
+    snapshot = manager.snapshot()
+    assert GlossarySnapshot.of(manager) is snapshot
+    assert snapshot.max_term_words == 2
+    assert snapshot.translation_words == {"майстер", "меч", "мініш", "м'який"}
+    assert snapshot.automaton is manager.get_automaton()
+    assert [m.entry.original for m in snapshot.find_matches("Take the Master Sword")] == ["Master Sword"]
+
+    manager.add_entry("Picori Blade", "Клинок Пікорі", "")
+    updated = manager.snapshot()
+    assert updated is not snapshot
+    assert updated.revision > snapshot.revision
+    assert "пікорі" in updated.translation_words
+    assert manager.snapshot() is updated
+
+
+
+def test_GlossaryManager_edits_swap_automaton_instead_of_mutating(manager):
+    manager.load_from_text(
+        plugin_name=None, glossary_path=None,
+        raw_text="Master Sword\tМайстер Меч\nMinish\tМініш\n",
+    )
+    published = manager.get_automaton()
+    # A worker mid-iteration keeps a valid automaton while the GUI thread edits entries
+    matches = published.iter("the master sword and the minish")
+    next(matches)
+    manager.add_entry("Picori", "Пікорі", "")
+    manager.delete_entry("Minish")
+    manager.update_entry("Master Sword", "Меч Майстра", "")
+    assert [value[0].original for _end, value in matches] == ["Minish"]
+    assert set(published.keys()) == {"master sword", "minish"}
+
+    current = manager.get_automaton()
+    assert current is not published
+    assert set(current.keys()) == {"master sword", "picori"}
+    assert manager.get_automaton() is current
+    assert [(m.entry.original, m.entry.translation) for m in manager.find_matches("Picori and the Master Sword")] == [
+        ("Picori", "Пікорі"), ("Master Sword", "Меч Майстра"),
+    ]
+
+
+def test_GlossaryManager_edits_share_one_automaton_rebuild_per_flush(manager):
+    manager.load_from_text(
+        plugin_name=None, glossary_path=None,
+        raw_text="Master Sword\tМайстер Меч\nMinish\tМініш\n",
+    )
+    scheduled = []
+    manager.set_write_scheduler(lambda: scheduled.append(True))
+    published = manager.get_automaton()
+    text = "Picori, the Minish and the Master Sword"
+    with patch.object(GlossaryManager, "_build_automaton", wraps=GlossaryManager._build_automaton) as build:
+        manager.add_entry("Picori", "Пікорі", "")
+        manager.delete_entry("Minish")
+        manager.update_entry("Master Sword", "Меч Майстра", "")
+        # Lookups between edits overlay the pending keys on the old automaton
+        pending_matches = [(m.entry, m.start, m.end) for m in manager.find_matches(text)]
+        assert build.call_count == 0
+        assert manager.get_automaton() is published
+        assert len(scheduled) == 3
+
+        manager.flush()
+        assert build.call_count == 1
+    assert set(manager.get_automaton().keys()) == {"master sword", "picori"}
+    assert pending_matches == [(m.entry, m.start, m.end) for m in manager.find_matches(text)]
+    assert [(m.entry.original, m.entry.translation) for m in manager.find_matches(text)] == [
+        ("Picori", "Пікорі"), ("Master Sword", "Меч Майстра"),
+    ]
+
+
+def test_GlossarySnapshot_of_manager_stand_in_is_unversioned():
+    stand_in = MagicMock()
+    stand_in.get_entries.return_value = [GlossaryEntry("Kinstone Fusion", "Злиття Каменів", "")]
+    snapshot = GlossarySnapshot.of(stand_in)
+    assert snapshot.revision is None
+    assert snapshot.max_term_words == 2
+    assert GlossarySnapshot.of(None) is None
+
+
+def test_GlossaryManager_frozen_copy_ignores_later_edits(manager, tmp_path):
+    f = tmp_path / "glossary.md"
+    manager.load_from_text(plugin_name=None, glossary_path=f, raw_text="| Original | Translation | Notes |\n|---|---|---|\n| Sword | Меч | |\n")
+    frozen = manager.frozen_copy()
+
+    manager.add_entry("Shield", "Щит", "")
+    manager.update_entry("Sword", "Клинок", "")
+    manager.load_from_text(plugin_name=None, glossary_path=f, raw_text="| Original | Translation | Notes |\n|---|---|---|\n| Bow | Лук | |\n")
+
+    assert [e.original for e in frozen.get_entries()] == ["Sword"]
+    assert frozen.get_entry("Sword").translation == "Меч"
+    assert frozen.get_entry("Shield") is None
+    assert [m.entry.original for m in frozen.find_matches("A Sword, a Shield and a Bow")] == ["Sword"]
+    assert frozen.get_translation_matcher("Меч").search("гострий меч")
+    assert frozen.has_pending_write() is False and manager.get_entry("Bow") is not None
@@ -0,0 +1,92 @@
+import pytest
+from unittest.mock import patch
+
+from core import glossary_occurrence_store as store
+from core.glossary_manager import GlossaryManager
+
+
+def _positions(index):
+    return {
+        original: [(o.block_idx, o.string_idx, o.line_idx, o.start, o.end, o.line_text) for o in occs]
+        for original, occs in index.items()
+    }
+
+def _make_manager(glossary_path=None):
+    manager = GlossaryManager()
+    text = "Sword\tМеч\nMaster Sword\tМайстер Меч\nFairy\tФея\n"
+    manager.load_from_text(plugin_name="p", glossary_path=glossary_path, raw_text=text)
+    return manager
+
+DATASET = [
+    ["A sword.", "The Master{Color:Red} Sword\nsword"],
+    ["Great Fairy", None, ""],
+    "not a block",
+    ["fairy sword"],
+]
+
+
+def test_split_shards_balances_strings():
+    blocks = [(0, ["a"] * 5), (1, ["a"] * 5), (2, ["a"] * 1), (3, ["a"] * 9)]
+    shards = store._split_shards(blocks, 2)
+    assert [[idx for idx, _ in shard] for shard in shards] == [[0, 1], [2, 3]]
+
+
+def test_occurrence_cache_round_trip(tmp_path):
+    path = tmp_path / "glossary.occurrences.json"
+    sig = store.glossary_signature(["Sword"])
+    store.save_occurrence_cache(path, sig, {"h1": [("Sword", 0, 0, 2, 7)]})
+    assert store.load_occurrence_cache(path, sig) == {"h1": [("Sword", 0, 0, 2, 7)]}
+    assert store.load_occurrence_cache(path, store.glossary_signature(["Shield"])) == {}
+    path.write_text("{broken", encoding="utf-8")
+    assert store.load_occurrence_cache(path, sig) == {}
+    assert store.occurrence_cache_path(None) is None
+
+
+def test_build_reuses_persisted_blocks(tmp_path):
+    glossary_path = tmp_path / "glossary.md"
+    expected = _positions(_make_manager().build_occurrence_index(DATASET))
+
+    first = _make_manager(glossary_path)
+    assert _positions(first.build_occurrence_index(DATASET)) == expected
+    assert (tmp_path / "glossary.occurrences.json").exists()
+
+    # Reopening an unchanged project loads every block from disk
+    reopened = _make_manager(glossary_path)
+    with patch.object(store, "scan_block_rows", wraps=store.scan_block_rows) as scan:
+        assert _positions(reopened.build_occurrence_index(DATASET)) == expected
+    scan.assert_not_called()
+
+    # Only the edited block is rescanned
+    changed = [list(block) if isinstance(block, list) else block for block in DATASET]
+    changed[3] = ["no terms here"]
+    with patch.object(store, "scan_block_rows", wraps=store.scan_block_rows) as scan:
+        index = reopened.build_occurrence_index(changed)
+    assert scan.call_count == 1
+    assert all(o.block_idx != 3 for occs in index.values() for o in occs)
+
+    # A different term list invalidates the cache
+    reopened.load_from_text(plugin_name="p", glossary_path=glossary_path, raw_text="Sword\tМеч\n")
+    with patch.object(store, "scan_block_rows", wraps=store.scan_block_rows) as scan:
+        reopened.build_occurrence_index(DATASET)
+    assert scan.call_count == 3
+
+
+def test_parallel_scan_matches_serial(monkeypatch):
+    dataset = [[f"sword {i}", f"Master Sword {i}\nfairy"] for i in range(12)]
+    expected = _positions(_make_manager().build_occurrence_index(dataset))
+
+    monkeypatch.setattr(store, "PARALLEL_MIN_STRINGS", 1)
+    monkeypatch.setattr(store, "default_worker_count", lambda: 2)
+    manager = _make_manager()
+    with patch.object(store, "scan_blocks_parallel", wraps=store.scan_blocks_parallel) as parallel:
+        assert _positions(manager.build_occurrence_index(dataset)) == expected
+    parallel.assert_called_once()
+
+
+def test_parallel_scan_failure_falls_back(monkeypatch):
+    monkeypatch.setattr(store, "PARALLEL_MIN_STRINGS", 1)
+    monkeypatch.setattr(store, "default_worker_count", lambda: 2)
+    manager = _make_manager()
+    with patch.object(store, "scan_blocks_parallel", side_effect=OSError("no processes")):
+        index = manager.build_occurrence_index(DATASET)
+    assert len(index["Sword"]) == 4
@@ -0,0 +1,102 @@
+# tests/test_core/test_search_index.py
+import pytest
+from core.search_index import BKTree, SearchIndex, TaglessTextCache, extract_ngrams, levenshtein_distance
+
+
+@pytest.fixture
+def index():
+    originals = [["Warp to [Red]Southern Fairy Island", "Hello there"], "not a block", ["Острова+Тінгла"]]
+    translations = [["Телепорт на [Red]Південний острів", "Привіт"], [], ["Острови Тінгла"]]
+    return SearchIndex.build(originals, translations)
+
+
+def test_extract_ngrams_is_case_folded():
+    assert extract_ngrams("ABcd") == frozenset({"abc", "bcd"})
+    assert extract_ngrams("ab") == frozenset()
+
+
+def test_candidates_raw_original(index):
+    assert index.candidates("Southern", search_in_original=True, ignore_tags=False) == [(0, 0)]
+    assert index.candidates("hello", search_in_original=True, ignore_tags=False) == [(0, 1)]
+
+
+def test_candidates_short_query_falls_back(index):
+    assert index.candidates("He", search_in_original=True, ignore_tags=False) is None
+
+
+def test_candidates_tagless_view(index):
+    # "to Southern" only exists once the [Red] tag is stripped
+    assert index.candidates("to Southern", True, False) == []
+    assert index.candidates("to Southern", True, True) == [(0, 0)]
+    assert index.candidates("Острова Тінгла", True, True) == [(2, 0)]
+
+
+def test_candidates_translation_view(index):
+    assert index.candidates("острів", search_in_original=False, ignore_tags=False) == [(0, 0)]
+    assert index.candidates("острів", search_in_original=True, ignore_tags=False) == []
+
+
+def test_update_string_replaces_postings(index):
+    index.update_string(0, 1, "Бувай")
+    assert index.candidates("Привіт", False, False) == []
+    assert index.candidates("Бувай", False, False) == [(0, 1)]
+    # Original side is untouched by translation edits
+    assert index.candidates("Hello", True, False) == [(0, 1)]
+
+
+def test_refresh_block_drops_removed_strings(index):
+    index.refresh_block(0, ["Warp"], ["Телепорт"])
+    assert index.candidates("Hello", True, False) == []
+    assert index.candidates("Warp", True, False) == [(0, 0)]
+    assert index.candidates("Південний", False, False) == []
+
+
+def test_tagless_cache_maps_hits_to_raw_span():
+    cache = TaglessTextCache()
+    entry = cache.get(False, 0, 0, "Go [Red]north\nnow")
+    assert entry.text == "Go north now"
+    assert entry.to_raw_span(entry.text.index("north now"), 9) == (8, 17)
+    assert cache.get(False, 0, 0, "Go [Red]north\nnow") is entry
+
+
+def test_tagless_cache_invalidation():
+    cache = TaglessTextCache()
+    first = cache.get(False, 0, 0, "a")
+    cache.get(True, 0, 0, "b")
+    cache.get(False, 1, 0, "c")
+    cache.invalidate(0, 0)
+    assert len(cache) == 2
+    assert cache.get(False, 0, 0, "a") is not first
+    # A stale entry is rebuilt even without an explicit invalidation
+    assert cache.get(False, 0, 0, "changed").text == "changed"
+    cache.invalidate_block(0)
+    assert len(cache) == 1
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("", "", 0), ("abc", "", 3), ("kitten", "sitting", 3),
+    ("острів", "острова", 2), ("flaw", "lawn", 2),
+])
+def test_levenshtein_distance(a, b, expected):
+    assert levenshtein_distance(a, b) == expected
+    assert levenshtein_distance(b, a) == expected
+
+
+def test_bk_tree_search_within_radius():
+    tree = BKTree()
+    for word in ["book", "books", "cake", "boo", "cape", "cart"]:
+        tree.add(word)
+    assert tree.add("book") is False
+    assert len(tree) == 6
+    assert sorted(tree.search("bo", 2)) == ["boo", "book"]
+    assert sorted(tree.search("cake", 1)) == ["cake", "cape"]
+
+
+def test_fuzzy_candidates_follow_edits(index):
+    assert index.fuzzy_candidates("южный", True, True) == []
+    assert index.fuzzy_candidates("fairy", True, True) == [(0, 0)]
+    assert index.fuzzy_candidates("острів", False, True) == [(0, 0), (2, 0)]
+    assert index.fuzzy_candidates("привіти", False, True) == [(0, 1)]
+    index.update_string(0, 1, "Бувай")
+    assert index.fuzzy_candidates("привіти", False, True) == []
+    assert index.fuzzy_candidates("бувайте", False, True) == [(0, 1)]
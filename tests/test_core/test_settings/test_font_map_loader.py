@@ -82,6 +82,7 @@ def test_FontMapLoader_load_fonts(mock_mw, tmp_path):
     assert "longSeq" in mock_mw.icon_sequences
     
     assert mock_mw.original_text_edit.highlighter.rehighlight.called
+    assert mock_mw.edited_text_edit.lineNumberArea.paint_logic.invalidate_render_cache.called
 
 def test_FontMapLoader_update_icon_sequences(mock_mw):
     mock_mw.all_font_maps = {"f1": {"[Tag]": {"width": 10}, "A": {"width": 5}}}
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 from pathlib import Path
 from core.spellchecker_manager import SpellcheckerManager, LOCAL_DICT_PATH, CUSTOM_DICT_FILENAME
+from core.glossary_manager import GlossaryManager
 
 @pytest.fixture
 def mock_mw():
@@ -122,6 +123,27 @@ def test_SpellcheckerManager_reload_glossary_words(mock_mw):
     sm._load_glossary_words.assert_called_once()
     mock_mw.edited_text_edit.highlighter.rehighlight.assert_called_once()
 
+def test_SpellcheckerManager_reload_glossary_words_skips_rehighlight_without_new_words(mock_mw):
+    sm = SpellcheckerManager(mock_mw)
+    sm.enabled = True
+    manager = GlossaryManager()
+    mock_mw.translation_handler.glossary_handler.glossary_manager = manager
+    rehighlight = mock_mw.edited_text_edit.highlighter.rehighlight
+
+    # No entries yet
+    sm.reload_glossary_words()
+    rehighlight.assert_not_called()
+
+    manager.load_from_text(plugin_name=None, glossary_path=None, raw_text="Sword\tМеч\n")
+    sm.reload_glossary_words()
+    assert rehighlight.call_count == 1
+
+    # Same revision, then a new revision that brings no new words
+    sm.reload_glossary_words()
+    manager.add_entry("Blade", "меч", "")
+    sm.reload_glossary_words()
+    assert rehighlight.call_count == 1
+
 def test_SpellcheckerManagerload_glossary_words(mock_mw):
     sm = SpellcheckerManager(mock_mw)
     
@@ -191,6 +213,49 @@ def test_SpellcheckerManager_is_misspelled(mock_mw):
     sm.enabled = False
     assert sm.is_misspelled("WrongWord") is False
 
+def test_SpellcheckerManager_cached_misspelling(mock_mw):
+    sm = SpellcheckerManager(mock_mw)
+    sm.enabled = True
+    sm.hunspell = MagicMock()
+    sm._spell_cache.clear()  # ignore the persistent cache on disk
+
+    assert sm.cached_misspelling("no") is False
+    sm.custom_words.add("customword")
+    assert sm.cached_misspelling("CustomWord") is False
+
+    # A miss never falls back to the dictionary
+    assert sm.cached_misspelling("WrongWord") is None
+    sm.hunspell.lookup.assert_not_called()
+
+    sm._spell_cache["wrongword"] = True
+    assert sm.cached_misspelling("'WrongWord") is True
+
+def test_SpellcheckerManager_enqueue_priority(mock_mw):
+    from core.spellchecker_manager import SpellcheckWorker
+    sm = SpellcheckerManager(mock_mw)
+    sm.enabled = True
+    sm.hunspell = MagicMock()
+    sm.worker = SpellcheckWorker(sm)
+
+    sm.enqueue_word("Offscreen")
+    sm.enqueue_word("Visible", priority=True)
+    assert list(sm.worker._queue) == ["Visible", "Offscreen"]
+
+    # Re-requesting a queued word for a visible block moves it to the front
+    sm.enqueue_word("Offscreen", priority=True)
+    assert list(sm.worker._queue) == ["Offscreen", "Visible"]
+
+def test_SpellcheckerManager_results_notify_highlighter(mock_mw):
+    sm = SpellcheckerManager(mock_mw)
+    highlighter = mock_mw.edited_text_edit.highlighter
+
+    sm._on_spellcheck_results_ready({"wrongword": True, "fine": False}, {"wrongword": ["word"]})
+
+    assert sm._spell_cache["wrongword"] is True
+    assert sm._suggestions_cache["wrongword"] == ["word"]
+    highlighter.on_spellcheck_results.assert_called_once_with({"wrongword", "fine"}, {"wrongword"})
+    highlighter.rehighlight.assert_not_called()
+
 def test_SpellcheckerManager_get_suggestions(mock_mw):
     sm = SpellcheckerManager(mock_mw)
     sm.enabled = True
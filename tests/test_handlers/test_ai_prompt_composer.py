@@ -1,7 +1,8 @@
+import json
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from handlers.translation.ai_prompt_composer import AIPromptComposer
-from core.glossary_manager import GlossaryEntry
+from core.glossary_manager import GlossaryEntry, GlossaryManager
 
 @pytest.fixture
 def composer():
@@ -79,3 +80,35 @@ def test_AIPromptComposer_prepare_glossary_for_prompt_updates(composer):
     assert "New" in prompt
     assert "GLOSSARY DELETIONS" in prompt
     assert "Deleted" in prompt
+
+def _relevant_glossary(user, item_id):
+    payload = json.loads(user.split('JSON DATA TO PROCESS:\n', 1)[1])
+    return next(i for i in payload['strings_to_translate'] if i['id'] == item_id)
+
+def test_AIPromptComposer_batch_glossary_matches_per_window_scan(composer):
+    gm = GlossaryManager()
+    gm.load_from_text(
+        plugin_name=None, glossary_path=None,
+        raw_text="Master Sword\tМайстер Меч\nSword\tМеч\nFairy\tФея\nKinstone\tКамінь Долі\n",
+    )
+    composer.main_handler._glossary_manager = gm
+    composer.mw.current_game_rules = None
+    texts = ["A Fairy", "the Master", "Sword is here", "Kinstone!", "nothing", "Fairy and Sword"]
+    all_items = [{"id": 10 + i, "text": t} for i, t in enumerate(texts)]
+
+    with patch.object(gm, "find_matches", wraps=gm.find_matches) as find_matches:
+        _, user_a, _ = composer.compose_batch_request("S", all_items[:3], all_items, block_idx=None, mode_description="m")
+        _, user_b, _ = composer.compose_batch_request("S", all_items[3:], all_items, block_idx=None, mode_description="m")
+    assert find_matches.call_count == 1  # one scan for the whole block, shared by both chunks
+
+    for idx, item in enumerate(all_items):
+        window = '\n'.join([texts[idx - 1] if idx else '', texts[idx], texts[idx + 1] if idx + 1 < len(texts) else ''])
+        expected = composer._glossary_entries_to_text(gm.get_relevant_terms(window))
+        got = _relevant_glossary(user_a if idx < 3 else user_b, item["id"])
+        assert got['relevant_glossary'] == expected
+        assert got['context_before'] == (texts[idx - 1] if idx else '')
+
+    # A glossary edit invalidates the precomputed matches
+    gm.add_entry("nothing", "ніщо", "")
+    _, user_c, _ = composer.compose_batch_request("S", all_items[4:5], all_items, block_idx=None, mode_description="m")
+    assert "| nothing | ніщо |" in _relevant_glossary(user_c, 14)['relevant_glossary']
@@ -0,0 +1,171 @@
+# tests/test_handlers/test_find_all_worker.py
+import pytest
+from unittest.mock import MagicMock
+import re
+import time
+from functools import partial
+from core.regex_scan import RegexScanProcess
+from handlers.find_all_worker import FindAllWorker, RegexFindWorker, ReplaceAllWorker
+from handlers.search_handler import SearchHandler
+
+
+@pytest.fixture
+def matcher():
+    return SearchHandler(MagicMock(), MagicMock(), MagicMock())._find_in_text
+
+
+@pytest.fixture
+def regex_process():
+    process = RegexScanProcess()
+    yield process
+    process.close()
+
+
+def _run(worker):
+    batches, finished, cancelled = [], [], []
+    worker.results_found.connect(batches.append)
+    worker.search_finished.connect(finished.append)
+    worker.cancelled.connect(lambda: cancelled.append(True))
+    worker.run()
+    return [hit for batch in batches for hit in batch], finished, cancelled
+
+
+def test_find_all_collects_every_occurrence(matcher):
+    entries = [(0, 0, "apple pie and apple juice"), (0, 1, "banana"), (2, 3, "Apple")]
+    worker = FindAllWorker(entries, "apple", False, False, False, matcher)
+    hits, finished, cancelled = _run(worker)
+
+    assert [(b, s, pos, ln) for b, s, pos, ln, _ in hits] == [(0, 0, 0, 5), (0, 0, 14, 5), (2, 3, 0, 5)]
+    assert finished == [3]
+    assert not cancelled
+
+
+def test_find_all_tagless_positions_refer_to_tagless_text(matcher):
+    entries = [(0, 0, "[Red]Southern\nFairy")]
+    worker = FindAllWorker(entries, "Southern Fairy", False, True, False, matcher)
+    hits, _, _ = _run(worker)
+    assert [(pos, ln) for _, _, pos, ln, _ in hits] == [(0, 14)]
+    assert hits[0][4] == "Southern Fairy"
+
+
+def test_find_all_cancelled_before_start(matcher):
+    worker = FindAllWorker([(0, 0, "apple")], "apple", False, False, False, matcher)
+    worker.cancel()
+    hits, finished, cancelled = _run(worker)
+    assert hits == []
+    assert finished == []
+    assert cancelled == [True]
+
+
+def test_find_all_regex_hits_do_not_overlap():
+    handler = SearchHandler(MagicMock(), MagicMock(), MagicMock())
+    matcher = partial(handler._find_in_text, is_regex=True)
+    worker = FindAllWorker([(0, 0, "aaa b aa")], "a+", True, False, False, matcher, is_regex=True)
+    hits, _, _ = _run(worker)
+    assert [(pos, ln) for _, _, pos, ln, _ in hits] == [(0, 3), (6, 2)]
+
+
+def test_find_all_stops_when_time_budget_is_spent(matcher):
+    worker = FindAllWorker([(0, 0, "apple")], "apple", False, False, False, matcher, time_budget=-1)
+    hits, finished, cancelled = _run(worker)
+    assert worker.timed_out
+    assert cancelled == [True]
+    assert finished == []
+
+
+def _run_replace(worker):
+    ready, failed = [], []
+    worker.replacements_ready.connect(ready.append)
+    worker.replace_failed.connect(failed.append)
+    worker.run()
+    return ready, failed
+
+
+def test_replace_all_worker_literal_replacement_keeps_backslashes():
+    pattern = re.compile(re.escape("cat"), re.IGNORECASE)
+    worker = ReplaceAllWorker([(0, 0, "Cat and cat"), (0, 1, "dog")], pattern, r"\1", expand_template=False)
+    ready, failed = _run_replace(worker)
+    assert ready == [[(0, 0, r"\1 and \1", 2, "Cat and cat")]]
+    assert failed == []
+
+
+def test_replace_all_worker_regex_groups():
+    worker = ReplaceAllWorker([(1, 2, "Link-1, Zelda-22")], re.compile(r"(\w+)-(\d+)"), r"\2:\1", expand_template=True)
+    ready, _ = _run_replace(worker)
+    assert ready == [[(1, 2, "1:Link, 22:Zelda", 2, "Link-1, Zelda-22")]]
+
+
+def test_replace_all_worker_reports_bad_template():
+    worker = ReplaceAllWorker([(0, 0, "abc")], re.compile("b"), r"\3", expand_template=True)
+    ready, failed = _run_replace(worker)
+    assert ready == []
+    assert len(failed) == 1
+
+
+# --- Regex scans in the scan process ---
+
+CATASTROPHIC = re.compile(r"(a+)+$")
+CATASTROPHIC_TEXT = "a" * 40 + "!"
+
+
+def test_find_all_regex_in_process_streams_hits(regex_process):
+    pattern = re.compile(r"a+")
+    worker = FindAllWorker([(0, 0, "aaa b aa"), (1, 2, "[Red]a")], "a+", True, True, False, None,
+                           pattern=pattern, regex_process=regex_process, time_budget=10)
+    hits, finished, cancelled = _run(worker)
+    assert [(b, s, pos, ln) for b, s, pos, ln, _ in hits] == [(0, 0, 0, 3), (0, 0, 6, 2), (1, 2, 0, 1)]
+    assert finished == [3]
+    assert not cancelled
+
+
+def test_find_all_budget_stops_a_single_runaway_match(regex_process):
+    worker = FindAllWorker([(0, 0, CATASTROPHIC_TEXT)], CATASTROPHIC.pattern, True, False, False, None,
+                           pattern=CATASTROPHIC, regex_process=regex_process, time_budget=1.0)
+    started = time.monotonic()
+    hits, finished, cancelled = _run(worker)
+    assert time.monotonic() - started < 3.0
+    assert worker.timed_out
+    assert cancelled == [True]
+    assert finished == []
+
+
+def test_regex_find_worker_returns_first_hit_in_entry_order(regex_process):
+    entries = [(3, 1, "Link", 0), (0, 0, "Hyrule, Hyrule", 1), (5, 5, "Hyrule", 0)]
+    worker = RegexFindWorker(entries, re.compile("hyr", re.IGNORECASE), False, regex_process, time_budget=10)
+    found = []
+    worker.match_found.connect(found.append)
+    worker.run()
+    assert found == [(0, 0, 8, 3)]
+
+
+def test_regex_find_worker_budget_stops_a_single_runaway_match(regex_process):
+    worker = RegexFindWorker([(0, 0, CATASTROPHIC_TEXT, 0)], CATASTROPHIC, False, regex_process, time_budget=1.0)
+    found, cancelled = [], []
+    worker.match_found.connect(found.append)
+    worker.cancelled.connect(lambda: cancelled.append(True))
+    started = time.monotonic()
+    worker.run()
+    assert time.monotonic() - started < 3.0
+    assert worker.timed_out
+    assert cancelled == [True]
+    assert found == []
+
+    # The killed process is replaced on the next scan
+    worker = RegexFindWorker([(0, 0, "abc", 0)], re.compile("b"), False, regex_process, time_budget=10)
+    worker.match_found.connect(found.append)
+    worker.run()
+    assert found == [(0, 0, 1, 1)]
+
+
+def test_replace_all_worker_in_process(regex_process):
+    worker = ReplaceAllWorker([(1, 2, "Link-1, Zelda-22"), (1, 3, "none")], re.compile(r"(\w+)-(\d+)"), r"\2:\1",
+                              expand_template=True, regex_process=regex_process, time_budget=10)
+    ready, failed = _run_replace(worker)
+    assert ready == [[(1, 2, "1:Link, 22:Zelda", 2, "Link-1, Zelda-22")]]
+    assert failed == []
+
+    worker = ReplaceAllWorker([(0, 0, "abc")], re.compile("b"), r"\3", expand_template=True,
+                              regex_process=regex_process, time_budget=10)
+    ready, failed = _run_replace(worker)
+    assert ready == []
+    assert len(failed) == 1
@@ -22,7 +22,7 @@ def test_SearchHandler_init(search_handler, mock_mw):
 def test_SearchHandler_get_current_search_params(search_handler):
     search_handler.current_query = "test"
     search_handler.is_case_sensitive = True
-    assert search_handler.get_current_search_params() == ("test", True, False, True, False)
+    assert search_handler.get_current_search_params() == ("test", True, False, True, False, False)
 
 def test_SearchHandler_get_text_for_search(search_handler, mock_mw):
     mock_mw.data = [["original text"]]
@@ -105,22 +105,25 @@ def test_SearchHandler_navigate_to_match_precise(search_handler, mock_mw):
 def test_SearchHandler_navigate_to_match_tagless(search_handler, mock_mw):
     mock_mw.current_block_idx = 0
     mock_mw.current_string_idx = 0
+    mock_mw.current_game_rules = None
+    mock_mw.newline_display_symbol = "↵"
+    mock_mw.displayed_string_indices = [0]
     for ed_name in ['preview_text_edit', 'original_text_edit', 'edited_text_edit']:
         editor = MagicMock()
         editor.objectName.return_value = ed_name
-        doc = editor.document.return_value
-        doc.blockCount.return_value = 1
-        block = doc.findBlockByNumber.return_value
+        block = editor.document.return_value.findBlockByNumber.return_value
         block.isValid.return_value = True
-        block.text.return_value = "apple pie"
         block.position.return_value = 0
         setattr(mock_mw, ed_name, editor)
-    
-    with patch('handlers.search_handler.prepare_text_for_tagless_search', return_value="apple"):
-        with patch('handlers.search_handler.convert_raw_to_display_text', return_value="apple"):
-            with patch('PyQt5.QtWidgets.QApplication.processEvents'):
-                with patch('handlers.search_handler.QTextCursor'):
-                    with patch('handlers.search_handler.QTreeWidgetItemIterator'):
-                        search_handler._navigate_to_match(0, 0, 0, 5, True)
-                        
-    mock_mw.preview_text_edit.highlightManager.add_search_match_highlight.assert_called()
+    search_handler.data_processor.get_current_string_text.return_value = ("Hi [Red]big\napple{X} pie", False)
+
+    # "big apple" in the tagless text "Hi big apple pie" starts at 3
+    with patch('PyQt5.QtWidgets.QApplication.processEvents'):
+        with patch('handlers.search_handler.QTextCursor'):
+            with patch('handlers.search_handler.QTreeWidgetItemIterator'):
+                search_handler._navigate_to_match(0, 0, 3, 9, True)
+
+    edited_hm = mock_mw.edited_text_edit.highlightManager
+    assert [c.args for c in edited_hm.add_search_match_highlight.call_args_list] == [(0, 8, 3), (1, 0, 5)]
+    mock_mw.preview_text_edit.highlightManager.add_search_match_highlight.assert_called_once_with(0, 8, 9)
+    mock_mw.original_text_edit.highlightManager.add_search_match_highlight.assert_not_called()
@@ -1,8 +1,9 @@
 # tests/test_handlers/test_search_handler_logic.py
 import pytest
 from unittest.mock import MagicMock
-from handlers.search_handler import SearchHandler
+from handlers.search_handler import SearchHandler, find_in_text
 from core.data_store import AppDataStore
+from core.search_index import SearchIndex
 
 @pytest.fixture
 def mock_mw():
@@ -32,7 +33,8 @@ def mock_dsp(mock_mw):
 def search_handler(mock_mw, mock_dsp):
     ui_updater = MagicMock()
     handler = SearchHandler(mock_mw, mock_dsp, ui_updater)
-    return handler
+    yield handler
+    handler._regex_process.close()
 
 def test_search_exact_match_no_tags(search_handler, mock_mw):
     # Search for "Southern" in "Warp to [Red]Southern Fairy Island" (ignore_tags=True)
@@ -87,3 +89,176 @@ def test_find_in_text_fuzzy_returns_actual_word_not_query_length(search_handler)
     pos, length = search_handler._find_in_text("Бачу острова вдалині", "острів", 0, False, is_fuzzy=True)
     assert pos == 5  # "Бачу " = 5 chars
     assert length == 7  # len("острова") — NOT len("острів")==6
+
+
+# --- Index-backed navigation ---
+
+def test_find_next_uses_index_candidates(search_handler, mock_mw):
+    mock_mw.data_store.data = [["alpha", "beta"], ["gamma beta", "delta"]]
+    search_handler.index = SearchIndex.build(mock_mw.data_store.data, mock_mw.data_store.data)
+    search_handler.index_ready = True
+    search_handler._navigate_to_match = MagicMock()
+
+    assert search_handler.find_next("beta", False, False, False) is True
+    assert (search_handler.last_found_block, search_handler.last_found_string) == (0, 1)
+    assert search_handler.find_next("beta", False, False, False) is True
+    assert (search_handler.last_found_block, search_handler.last_found_string) == (1, 0)
+    assert search_handler.find_previous("beta", False, False, False) is True
+    assert (search_handler.last_found_block, search_handler.last_found_string) == (0, 1)
+
+    # Strings outside the candidate list are never fetched
+    fetched = {call.args[:2] for call in search_handler.data_processor.get_current_string_text.call_args_list}
+    assert (1, 1) not in fetched
+
+
+def test_fuzzy_find_next_uses_vocabulary_candidates(search_handler, mock_mw):
+    mock_mw.data_store.data = [["Бачу острова", "Нічого"], ["Тут монстрів", "Інше"]]
+    search_handler.index = SearchIndex.build(mock_mw.data_store.data, mock_mw.data_store.data)
+    search_handler.index_ready = True
+    search_handler._navigate_to_match = MagicMock()
+
+    assert search_handler.find_next("острів", False, False, True, is_fuzzy=True) is True
+    assert (search_handler.last_found_block, search_handler.last_found_string) == (0, 0)
+    assert search_handler.find_next("острів", False, False, True, is_fuzzy=True) is True
+    assert (search_handler.last_found_block, search_handler.last_found_string) == (1, 0)
+
+    fetched = {call.args[:2] for call in search_handler.data_processor.get_current_string_text.call_args_list}
+    assert fetched == {(0, 0), (1, 0)}
+
+
+def test_on_string_edited_updates_index(search_handler, mock_mw):
+    search_handler.index = SearchIndex.build(mock_mw.data_store.data, mock_mw.data_store.data)
+    search_handler.index_ready = True
+    search_handler._navigate_to_match = MagicMock()
+
+    mock_mw.data_store.edited_data[(0, 0)] = "Brand new text"
+    search_handler.on_string_edited(0, 0, "Brand new text")
+    assert search_handler.find_next("brand new", False, False, False) is True
+
+
+def test_on_string_edited_is_queued_while_building(search_handler):
+    search_handler.on_string_edited(0, 0, "queued")
+    index = SearchIndex.build([["old"]], [["old"]])
+    search_handler._on_index_built(index, search_handler._index_generation)
+    assert search_handler.index_ready
+    assert search_handler.index.candidates("queued", False, False) == [(0, 0)]
+
+
+# --- Find All ---
+
+def test_find_all_streams_results_and_marks_blocks(search_handler, mock_mw, qtbot):
+    mock_mw.data_store.data = [["beta one", "alpha"], ["two beta beta"]]
+    mock_mw.block_list_widget = MagicMock()
+
+    assert search_handler.find_all("beta", False, False, False) is True
+    qtbot.waitUntil(lambda: not search_handler.is_find_all_running(), timeout=5000)
+
+    assert [r[:4] for r in search_handler.search_results] == [(0, 0, 0, 4), (1, 0, 4, 4), (1, 0, 9, 4)]
+    assert mock_mw.search_match_block_indices == {0, 1}
+    mock_mw.search_panel_widget.end_find_all.assert_called_with(3, False)
+
+
+def test_navigate_to_result_sets_position(search_handler):
+    search_handler._navigate_to_match = MagicMock()
+    search_handler.search_results = [(0, 0, 3, 4, ""), (2, 5, 7, 4, "")]
+    search_handler.navigate_to_result(1)
+    assert (search_handler.last_found_block, search_handler.last_found_string, search_handler.last_found_char_pos_raw) == (2, 5, 7)
+    search_handler._navigate_to_match.assert_called_once_with(2, 5, 7, 4, True)
+
+
+# --- Regex & Replace All ---
+
+def test_find_in_text_regex(search_handler):
+    assert search_handler._find_in_text("Go to Hyrule, Hyrule!", r"hyr\w+", 0, False, is_regex=True) == (6, 6)
+    assert search_handler._find_in_text("Go to Hyrule, Hyrule!", r"hyr\w+", 7, False, is_regex=True) == (14, 6)
+    assert search_handler._find_in_text("Go to Hyrule, Hyrule!", r"hyr\w+", 13, False, find_reverse=True, is_regex=True) == (6, 6)
+    assert search_handler._find_in_text("Go to Hyrule", r"hyr\w+", 0, True, is_regex=True) == (-1, 0)
+    # Empty matches are never reported
+    assert search_handler._find_in_text("abc", r"x*", 0, False, is_regex=True) == (-1, 0)
+
+
+def test_find_all_regex_worker_uses_pure_matcher(search_handler, mock_mw, qtbot):
+    mock_mw.data_store.data = [["Hyrule castle", "Kakariko"], ["hyrule field"]]
+    mock_mw.block_list_widget = MagicMock()
+
+    assert search_handler.find_all(r"hyr\w+", False, False, False, is_regex=True) is True
+    matcher = search_handler._find_all_worker.matcher
+    assert matcher.func is find_in_text
+    # Handler-side regex cache churn can't leak into the running worker
+    search_handler._compile_regex(r"kak\w+", False)
+    assert matcher.keywords["pattern"].pattern == r"hyr\w+"
+    qtbot.waitUntil(lambda: not search_handler.is_find_all_running(), timeout=5000)
+
+    assert [r[:4] for r in search_handler.search_results] == [(0, 0, 0, 6), (1, 0, 0, 6)]
+
+
+def test_find_next_rejects_invalid_regex(search_handler, mock_mw):
+    assert search_handler.find_next("([", False, False, False, is_regex=True) is False
+    args = mock_mw.search_panel_widget.set_status_message.call_args
+    assert args.args[0].startswith("Invalid regex")
+    assert args.kwargs == {"is_error": True}
+
+
+def test_find_next_regex_over_tagless_text(search_handler, mock_mw, qtbot):
+    search_handler._navigate_to_match = MagicMock()
+    assert search_handler.find_next(r"southern\s+fairy", False, True, True, is_regex=True) is True
+    # Regex Next runs on a worker; the GUI thread only navigates once the hit arrives
+    assert search_handler.is_regex_find_running()
+    qtbot.waitUntil(lambda: not search_handler.is_regex_find_running(), timeout=10000)
+    search_handler._navigate_to_match.assert_called_once_with(0, 0, 8, 14, True)
+
+
+def test_find_previous_regex_runs_on_worker(search_handler, mock_mw, qtbot):
+    mock_mw.data_store.data = [["Hyrule", "Kakariko"], ["Hyrule field, Hyrule castle"]]
+    search_handler._navigate_to_match = MagicMock()
+    assert search_handler.find_previous(r"hyr\w+", False, True, False, is_regex=True) is True
+    qtbot.waitUntil(lambda: not search_handler.is_regex_find_running(), timeout=10000)
+    search_handler._navigate_to_match.assert_called_once_with(1, 0, 14, 6, False)
+
+    search_handler._navigate_to_match.reset_mock()
+    assert search_handler.find_previous(r"hyr\w+", False, True, False, is_regex=True) is True
+    qtbot.waitUntil(lambda: not search_handler.is_regex_find_running(), timeout=10000)
+    search_handler._navigate_to_match.assert_called_once_with(1, 0, 0, 6, False)
+
+
+def test_apply_replacements_is_one_undo_group_with_one_rescan(search_handler, mock_mw):
+    mock_mw.data_store.data = [["a", "b"], ["c"]]
+    changes = [(0, 0, "x", 1, "a"), (0, 1, "y", 2, "b"), (1, 0, "z", 1, "c")]
+
+    assert search_handler.apply_replacements(changes) == 4
+
+    mock_mw.undo_manager.begin_group.assert_called_once()
+    mock_mw.undo_manager.end_group.assert_called_once_with("REPLACE_ALL")
+    calls = search_handler.data_processor.update_edited_data.call_args_list
+    assert [c.args for c in calls] == [(0, 0, "x"), (0, 1, "y"), (1, 0, "z")]
+    assert all(c.kwargs == {"action_type": "REPLACE_ALL", "refresh_block_item": False} for c in calls)
+    mock_mw.issue_scan_handler.rescan_issues_for_strings.assert_called_once_with([(0, 0), (0, 1), (1, 0)])
+
+
+def test_replace_all_runs_on_worker_and_applies_changes(search_handler, mock_mw, qtbot):
+    mock_mw.data_store.data = [["Link and link", "Zelda"], ["LINK"]]
+    search_handler.apply_replacements = MagicMock()
+
+    assert search_handler.replace_all("link", "Линк", False) is True
+    qtbot.waitUntil(lambda: search_handler.apply_replacements.called, timeout=5000)
+
+    changes = search_handler.apply_replacements.call_args.args[0]
+    assert changes == [(0, 0, "Линк and Линк", 2, "Link and link"), (1, 0, "Линк", 1, "LINK")]
+
+
+def test_apply_replacements_skips_or_recomputes_strings_edited_after_scan(search_handler, mock_mw):
+    mock_mw.data_store.data = [["a cat", "cat"], ["cat cat"]]
+    changes = [(0, 0, "a dog", 1, "a cat"), (0, 1, "dog", 1, "cat"), (1, 0, "dog dog", 2, "cat cat")]
+    # Edited while the worker was running
+    mock_mw.data_store.edited_data = {(0, 1): "no pets", (1, 0): "one cat"}
+
+    assert search_handler.apply_replacements(list(changes)) == 1
+    calls = search_handler.data_processor.update_edited_data.call_args_list
+    assert [c.args for c in calls] == [(0, 0, "a dog")]
+
+    search_handler.data_processor.update_edited_data.reset_mock()
+    recompute = lambda text: (text.replace("cat", "dog"), text.count("cat"))
+    assert search_handler.apply_replacements(list(changes), recompute=recompute) == 2
+    calls = search_handler.data_processor.update_edited_data.call_args_list
+    assert [c.args for c in calls] == [(0, 0, "a dog"), (1, 0, "one dog")]
+
@@ -61,6 +61,23 @@ def test_TextOperationHandler_text_edited(mock_conv, handler, mock_mw):
     mock_mw.data_processor.update_edited_data.assert_called_with(0, 0, "new text")
     mock_mw.ui_updater.update_title.assert_called()
 
+@patch('handlers.text_operation_handler.convert_dots_to_spaces_from_editor', side_effect=lambda x: x)
+def test_TextOperationHandler_text_edited_records_stage_spans(mock_conv, handler, mock_mw):
+    from utils.latency_profiler import LatencyProfiler
+    profiler = LatencyProfiler()
+    mock_mw.edited_text_edit.toPlainText.return_value = "new text"
+
+    with patch('handlers.text_operation_handler.latency_span', side_effect=profiler.span):
+        handler.text_edited()
+        mock_mw.is_programmatically_changing_text = True
+        handler.text_edited()
+
+    names = {stats.name: stats.count for stats in profiler.all_stats()}
+    # Programmatic changes return before the keystroke span starts
+    assert names["keystroke"] == 1
+    for stage in ("problem_scan", "update_edited_data", "tree_badges", "editor_highlights", "update_text_views"):
+        assert names[stage] == 1
+
 @patch('PyQt5.QtWidgets.QApplication.clipboard')
 @patch('re.split', return_value=["line1"])
 def test_TextOperationHandler_paste_block_text(mock_split, mock_clipboard, handler, mock_mw):
@@ -122,6 +139,36 @@ def test_TextOperationHandler_update_preview_content(handler, mock_mw):
     mock_mw.preview_text_edit.highlightManager.clearAllProblemHighlights.assert_called_once()
     mock_mw.ui_updater._apply_highlights_for_block.assert_called_once_with(0)
 
+def test_TextOperationHandler_update_preview_content_patches_edited_row(qapp, handler, mock_mw):
+    from PyQt5.QtWidgets import QPlainTextEdit
+    preview = QPlainTextEdit()
+    preview.highlightManager = MagicMock()
+    preview.set_selected_lines = MagicMock()
+    preview.setPlainText("prev_a\nprev_b\nprev_c")
+    mock_mw.preview_text_edit = preview
+    mock_mw.data = [["a", "b", "c"]]
+    mock_mw.displayed_string_indices = []
+    mock_mw.current_game_rules.get_text_representation_for_preview.side_effect = lambda x: f"prev_{x}"
+    mock_mw.data_processor.get_current_string_text.return_value = ("B!", False)
+    first_block = preview.document().firstBlock()
+
+    handler.schedule_preview_update(0, 0, 1)
+    handler.preview_update_timer.stop()
+    handler._update_preview_content()
+
+    assert preview.toPlainText() == "prev_a\nprev_B!\nprev_c"
+    # Untouched rows keep their QTextBlocks; only the edited row's highlights are refreshed
+    assert preview.document().firstBlock() == first_block
+    mock_mw.ui_updater._apply_highlights_for_rows.assert_called_once_with(0, {1: 1})
+    mock_mw.ui_updater._apply_highlights_for_block.assert_not_called()
+
+    # A request without a string falls back to the full rebuild
+    handler.schedule_preview_update(0)
+    handler.preview_update_timer.stop()
+    handler._update_preview_content()
+    mock_mw.ui_updater._apply_highlights_for_block.assert_called_once_with(0)
+    assert preview.toPlainText() == "prev_B!\nprev_B!\nprev_B!"
+
 def test_TextOperationHandler_text_edited_early_returns(handler, mock_mw):
     mock_mw.is_programmatically_changing_text = True
     handler.text_edited()
@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from core.glossary_analytics import CandidateTerm
+from core.glossary_manager import GlossaryManager
+from handlers.translation.glossary_analytics_worker import GlossaryAnalyticsWorker
+from handlers.translation.glossary_builder_handler import GlossaryBuilderHandler
+
+
+@pytest.fixture
+def manager():
+    gm = GlossaryManager()
+    gm.load_from_text(plugin_name=None, glossary_path=None, raw_text="Sword\tМеч\n")
+    return gm
+
+
+def test_worker_streams_blocks_and_reports(manager, qtbot):
+    blocks = [(0, [("Sword of the Wind Tribe", "Меч племені вітру")]), (1, [("Wind Tribe", None), ("Wind Tribe", None)])]
+    worker = GlossaryAnalyticsWorker(manager, blocks, min_occurrences=2)
+    progress = []
+    worker.progress_updated.connect(lambda done, total: progress.append((done, total)))
+    with qtbot.waitSignal(worker.analysis_finished, timeout=5000) as blocker:
+        worker.start()
+    worker.wait()
+    report = blocker.args[0]
+    assert progress == [(1, 2), (2, 2)]
+    assert report.strings_analyzed == 3
+    assert report.terms[0].consistent_strings == 1
+    assert [c.text for c in report.candidates] == ["Wind Tribe"]
+
+
+def test_worker_cancel_emits_partial_report(manager, qtbot):
+    worker = GlossaryAnalyticsWorker(manager, [(0, [("Sword", None)])])
+    worker.cancel()
+    with qtbot.waitSignals([worker.report_updated, worker.cancelled], timeout=5000):
+        worker.start()
+    worker.wait()
+
+
+def test_worker_on_frozen_copy_ignores_live_edits(manager, qtbot):
+    worker = GlossaryAnalyticsWorker(manager.frozen_copy(), [(0, [("Sword and Shield", None)] * 2)], min_occurrences=2)
+    manager.add_entry("Shield", "Щит", "")
+    manager.delete_entry("Sword")
+    with qtbot.waitSignal(worker.analysis_finished, timeout=5000) as blocker:
+        worker.start()
+    worker.wait()
+    report = blocker.args[0]
+    assert [t.entry.original for t in report.terms] == ["Sword"]
+    assert "Shield" in [c.text for c in report.candidates]
+
+
+def test_worker_reports_failure(manager, qtbot):
+    worker = GlossaryAnalyticsWorker(manager, [(0, [("Sword", None)])])
+    with patch('handlers.translation.glossary_analytics_worker.GlossaryAnalytics.add_string', side_effect=ValueError("boom")), \
+         qtbot.waitSignal(worker.analysis_failed, timeout=5000) as blocker:
+        worker.start()
+        worker.wait()
+    assert blocker.args == ["boom"]
+
+def test_builder_sends_candidates_with_examples():
+    mw = MagicMock()
+    with patch.object(GlossaryBuilderHandler, '_load_prompts', return_value={"system_prompt": "s", "user_prompt_template": "u"}):
+        builder = GlossaryBuilderHandler(mw)
+    builder._build_glossary_from_text = MagicMock()
+    builder.build_glossary_for_candidates([
+        CandidateTerm(text="Wind Tribe", word_count=2, example="Talk to the Wind Tribe."),
+        CandidateTerm(text="Elder", word_count=1, example="Elder"),
+    ])
+    builder._build_glossary_from_text.assert_called_once_with("Wind Tribe: Talk to the Wind Tribe.\nElder", None)
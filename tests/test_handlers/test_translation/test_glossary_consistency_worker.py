@@ -0,0 +1,100 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from core.glossary_manager import GlossaryManager
+from handlers.translation.glossary_consistency_worker import GlossaryConsistencyWorker
+from handlers.translation.glossary_handler import GlossaryHandler
+from components.glossary_consistency_dialog import GlossaryConsistencyDialog
+
+
+@pytest.fixture
+def manager():
+    gm = GlossaryManager()
+    gm.load_from_text(plugin_name=None, glossary_path=None, raw_text="Sword\tМеч\nShield\tЩит\n")
+    return gm
+
+
+def test_worker_streams_violations_and_progress(manager, qtbot):
+    entries = [(0, 0, "Sword", "Клинок"), (0, 1, "Shield", "Щит"), (1, 0, "Sword and Shield", "Меч і захист")]
+    worker = GlossaryConsistencyWorker(manager, entries)
+    found, progress = [], []
+    worker.violations_found.connect(found.extend)
+    worker.progress_updated.connect(lambda done, total: progress.append((done, total)))
+    with qtbot.waitSignal(worker.check_finished, timeout=5000) as blocker:
+        worker.start()
+    worker.wait()
+    assert blocker.args == [2]
+    assert [(v.block_idx, v.string_idx, v.entry.original) for v in found] == [(0, 0, "Sword"), (1, 0, "Shield")]
+    assert progress[-1] == (3, 3)
+
+
+def test_worker_cancel(manager, qtbot):
+    worker = GlossaryConsistencyWorker(manager, [(0, 0, "Sword", "Клинок")] * 10)
+    worker.cancel()
+    with qtbot.waitSignal(worker.cancelled, timeout=5000):
+        worker.start()
+    worker.wait()
+
+
+
+def test_worker_reports_failure(manager, qtbot):
+    worker = GlossaryConsistencyWorker(manager, [(0, 0, "Sword", "Клинок")])
+    with patch('handlers.translation.glossary_consistency_worker.check_string_consistency', side_effect=ValueError("boom")), \
+         qtbot.waitSignal(worker.check_failed, timeout=5000) as blocker:
+        worker.start()
+        worker.wait()
+    assert blocker.args == ["boom"]
+
+def test_dialog_rows_sort_numerically(manager, qtbot):
+    from core.glossary_consistency import check_string_consistency
+    dialog = GlossaryConsistencyDialog(jump_callback=MagicMock())
+    qtbot.addWidget(dialog)
+    dialog.begin(3)
+    dialog.add_violations(check_string_consistency(manager, 9, 0, "Sword", "Клинок"))
+    dialog.add_violations(check_string_consistency(manager, 10, 1, "Shield", "Захист"))
+    dialog.table.sortItems(0)
+    assert dialog.violation_for_row(0).block_idx == 9
+    dialog.table.sortItems(0, order=1)
+    assert dialog.violation_for_row(0).block_idx == 10
+
+    dialog._on_item_activated(dialog.table.item(0, 2))
+    dialog._jump_callback.assert_called_once_with(dialog.violation_for_row(0))
+    dialog.finish()
+    assert not dialog.is_running()
+
+
+@patch('handlers.translation.glossary_handler.GlossaryConsistencyDialog')
+def test_handler_runs_consistency_check(mock_dialog_cls, manager, qtbot):
+    main_handler = MagicMock()
+    main_handler.mw.data_store.data = [["Sword", "Shield"], ["Untouched Sword"]]
+    translations = {(0, 0): "Клинок", (0, 1): "Щит", (1, 0): "Untouched Sword"}
+    with patch('handlers.translation.glossary_handler.GlossaryPromptManager'), \
+         patch('handlers.translation.glossary_handler.GlossaryOccurrenceUpdater'):
+        gh = GlossaryHandler(main_handler)
+    gh._prompt_manager = MagicMock()
+    gh._prompt_manager.load_prompts.return_value = ("system", "glossary")
+    gh.glossary_manager = manager
+    gh.data_processor = MagicMock()
+    gh.data_processor.get_current_string_text.side_effect = lambda b, s: (translations[(b, s)], "edited")
+
+    gh.show_consistency_check()
+    dialog = mock_dialog_cls.return_value
+    dialog.begin.assert_called_once_with(2)  # the untranslated string is skipped
+    qtbot.waitUntil(lambda: dialog.finish.called, timeout=5000)
+    dialog.finish.assert_called_once_with(cancelled=False, error=None)
+    reported = [v for call in dialog.add_violations.call_args_list for v in call.args[0]]
+    assert [(v.block_idx, v.string_idx) for v in reported] == [(0, 0)]
+    qtbot.waitUntil(lambda: not gh._consistency_workers, timeout=5000)
+
+
+def test_handler_clears_worker_when_check_fails(manager, qtbot):
+    with patch('handlers.translation.glossary_handler.GlossaryPromptManager'), \
+         patch('handlers.translation.glossary_handler.GlossaryOccurrenceUpdater'):
+        gh = GlossaryHandler(MagicMock())
+    gh.consistency_dialog = MagicMock()
+    worker = GlossaryConsistencyWorker(manager, [])
+    gh._consistency_worker = worker
+
+    gh._on_consistency_done(worker, cancelled=True, error="boom")
+    assert gh._consistency_worker is None
+    gh.consistency_dialog.finish.assert_called_once_with(cancelled=True, error="boom")
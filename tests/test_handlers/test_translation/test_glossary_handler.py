@@ -235,7 +235,7 @@ def test_gh_handle_notes_variation_from_dialog(gh):
     gh.mw.data_store.data = [["Block 0 String 0"]]
     
     occurrence = GlossaryOccurrence(GlossaryEntry("t", "tr", "n"), 0, 0, 0, 0, 0, "Block 0 String 0")
-    gh.glossary_manager.build_occurrence_index.return_value = {"t": [occurrence]}
+    gh.glossary_manager.ensure_occurrence_index.return_value = {"t": [occurrence]}
     
     gh._handle_notes_variation_from_dialog(GlossaryEntry("t", "tr", "n"))
     gh._occurrence_updater.request_glossary_notes_variation.assert_called_once()
@@ -275,3 +275,22 @@ def test_gh_handle_glossary_entry_delete(gh):
     gh._handle_glossary_entry_delete("term")
     gh.glossary_manager.delete_entry.assert_called_with("term")
     gh._prompt_manager._update_glossary_highlighting.assert_called()
+
+
+def test_gh_glossary_writes_are_debounced(mock_main_handler, tmp_path, qtbot):
+    with patch('handlers.translation.glossary_handler.GlossaryPromptManager'), \
+         patch('handlers.translation.glossary_handler.GlossaryOccurrenceUpdater'):
+        handler = GlossaryHandler(mock_main_handler)
+    path = tmp_path / "glossary.md"
+    handler.glossary_manager.load_from_text(plugin_name=None, glossary_path=path, raw_text="")
+
+    for i in range(3):
+        handler.glossary_manager.add_entry(f"Term{i}", f"Термін{i}", "")
+    assert not path.exists()
+    qtbot.waitUntil(path.exists, timeout=5000)
+    assert "| Term2 | Термін2 |" in path.read_text(encoding="utf-8")
+
+    handler.glossary_manager.delete_entry("Term0")
+    handler.flush_glossary_writes()
+    assert "Term0" not in path.read_text(encoding="utf-8")
+    assert not handler._glossary_write_timer.isActive()
@@ -43,3 +43,37 @@ def test_issue_scan_basic_isolation():
     assert (0, 0, 0) in ctx.data_store.problems_per_subline
     assert ctx.data_store.problems_per_subline[(0, 0, 0)] == {"Width"} # Replaced OldError
     assert (0, 1, 0) not in ctx.data_store.problems_per_subline # Cleared and not re-added because text was None
+
+
+def test_rescan_issues_for_strings_only_touches_given_strings():
+    ctx = MockContext()
+    ctx.data = [["a", "b"], ["c"]]
+    data_processor = MagicMock()
+    data_processor.get_current_string_text.side_effect = lambda b, s: (ctx.data[b][s], None)
+    ui_updater = MagicMock()
+    handler = IssueScanHandler(ctx, data_processor, ui_updater)
+    analyzer = MagicMock()
+    ctx.current_game_rules.problem_analyzer = analyzer
+    analyzer.analyze_data_string.return_value = [{"New"}]
+
+    ctx.problems_per_subline[(0, 0, 0)] = {"Old"}
+    ctx.problems_per_subline[(0, 1, 0)] = {"Untouched"}
+    handler.rescan_issues_for_strings([(0, 0), (1, 0)])
+
+    assert ctx.problems_per_subline == {(0, 0, 0): {"New"}, (0, 1, 0): {"Untouched"}, (1, 0, 0): {"New"}}
+    assert [c.args for c in ui_updater.update_block_item_text_with_problem_count.call_args_list] == [(0,), (1,)]
+
+
+
+def test_scan_next_batch_schedules_badge_updates():
+    ctx = MockContext()
+    ctx.data = [["a"], ["b"]]
+    ctx.ui_updater = MagicMock()
+    handler = IssueScanHandler(ctx, MagicMock(), MagicMock())
+    handler._perform_issues_scan_for_block = MagicMock()
+    handler._scan_pending_indices = [0, 1]
+
+    handler._scan_next_batch()
+
+    assert [c.args for c in ctx.ui_updater.schedule_block_badge_update.call_args_list] == [(0,), (1,)]
+    ctx.ui_updater.update_block_item_text_with_problem_count.assert_not_called()
@@ -117,7 +117,9 @@ def test_UIUpdater_populate_blocks(updater):
     updater.mw.project_manager = None
     updater.mw.block_list_widget.clear = MagicMock()
     updater.populate_blocks()
-    updater.mw.block_list_widget.clear.assert_called()
+    # Rows are synced in place instead of clearing the tree
+    updater.mw.block_list_widget.clear.assert_not_called()
+    assert updater.mw.block_list_widget.topLevelItem(0) is mock_item
 
 def test_UIUpdater_update_block_item_text_with_problem_count(updater):
     from PyQt5.QtWidgets import QTreeWidget, QTreeWidgetItem
@@ -168,6 +170,15 @@ def test_UIUpdater_apply_highlights_for_block(updater, mock_mw):
     mock_mw.preview_text_edit.highlightManager.clearAllProblemHighlights.assert_called_once()
     mock_mw.preview_text_edit.addProblemLineHighlight.assert_called_once_with(1)
 
+def test_UIUpdater_apply_highlights_for_rows(updater, mock_mw):
+    mock_mw.list_selection_handler._data_string_has_any_problem.side_effect = lambda b, r: r == 7
+    updater._apply_highlights_for_rows(0, {2: 7, 3: 8})
+
+    preview = mock_mw.preview_text_edit
+    preview.highlightManager.clearAllProblemHighlights.assert_not_called()
+    assert preview.removeProblemLineHighlight.call_count == 2
+    preview.addProblemLineHighlight.assert_called_once_with(2)
+
 def test_UIUpdater_apply_highlights_to_editor(updater, mock_mw):
     editor = MagicMock()
     editor.highlightManager = MagicMock()
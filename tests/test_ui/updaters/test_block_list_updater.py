@@ -89,3 +89,122 @@ def test_BlockListUpdater_clear_all_problem_block_highlights_and_text(updater):
     updater.clear_all_problem_block_highlights_and_text()
     
     assert item.text(0) == "Block Zero"
+
+@pytest.fixture
+def virtual_updater(updater):
+    from PyQt5.QtGui import QIcon
+    from core.project_models import Block, Category, VirtualFolder
+
+    mw = updater.mw
+    mw.block_list_widget.create_item = lambda text, block_idx=None, role=Qt.UserRole: _make_block_item(text, block_idx, role)
+    mw.style.return_value.standardIcon.return_value = QIcon()
+    mw.block_to_project_file_map = {}
+    mw.detection_enabled = {}
+    mw.current_game_rules.get_short_problem_name.side_effect = lambda p: "width" if p == "prob1" else "empty"
+
+    block0 = Block(id="b0", name="Block Zero", categories=[Category(name="Cat", line_indices=[0])])
+    block1 = Block(id="b1", name="Block One")
+    folder = VirtualFolder(id="f1", name="Folder", block_ids=["b0"], is_expanded=True)
+    mw.project_manager.project.blocks = [block0, block1]
+    mw.project_manager.project.virtual_folders = [folder]
+    mw.project_manager.project.metadata = {"root_block_ids": ["b1"]}
+    mw.block_list_widget.currentItem = MagicMock(return_value=None)
+    return updater
+
+def _make_block_item(text, block_idx, role):
+    item = QTreeWidgetItem([text])
+    item.setFlags(item.flags() | Qt.ItemIsEditable)
+    if block_idx is not None:
+        item.setData(0, role, block_idx)
+    return item
+
+def test_BlockListUpdater_populate_blocks_reuses_rows(virtual_updater):
+    tree = virtual_updater.mw.block_list_widget
+    virtual_updater.populate_blocks()
+
+    folder_item = tree.topLevelItem(0)
+    block0_item = folder_item.child(0)
+    block1_item = tree.topLevelItem(1)
+    assert block0_item.data(0, Qt.UserRole) == 0
+    assert block0_item.child(0).data(0, Qt.UserRole + 10) == "Cat"
+    assert block1_item.text(0) == "Block One (1 width, 1 empty)"
+    block0_item.setExpanded(True)
+
+    virtual_updater.populate_blocks()
+
+    assert tree.topLevelItem(0) is folder_item
+    assert folder_item.child(0) is block0_item
+    assert tree.topLevelItem(1) is block1_item
+    assert block0_item.isExpanded()
+    assert folder_item.isExpanded()
+
+def test_BlockListUpdater_populate_blocks_touches_only_changed_rows(virtual_updater):
+    tree = virtual_updater.mw.block_list_widget
+    virtual_updater.populate_blocks()
+    block1_item = tree.topLevelItem(1)
+
+    model = tree.model()
+    changed_rows, structural = [], []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles=(): changed_rows.append(tree.itemFromIndex(top_left)))
+    model.rowsInserted.connect(lambda *args: structural.append("inserted"))
+    model.rowsRemoved.connect(lambda *args: structural.append("removed"))
+
+    virtual_updater.mw.data_store.block_names["1"] = "Renamed"
+    virtual_updater.populate_blocks()
+
+    assert structural == []
+    assert changed_rows and all(item is block1_item for item in changed_rows)
+    assert block1_item.text(0) == "Renamed (1 width, 1 empty)"
+    assert block1_item.data(0, Qt.UserRole + 4) == "Renamed"
+
+def test_BlockListUpdater_populate_blocks_moves_and_trims_rows(virtual_updater):
+    tree = virtual_updater.mw.block_list_widget
+    project = virtual_updater.mw.project_manager.project
+    virtual_updater.populate_blocks()
+    folder_item = tree.topLevelItem(0)
+    block1_item = tree.topLevelItem(1)
+    folder_item.setExpanded(True)
+
+    # Drag block 1 into the folder and drop the category of block 0
+    project.virtual_folders[0].block_ids.append("b1")
+    project.metadata["root_block_ids"] = []
+    project.blocks[0].categories = []
+    virtual_updater.populate_blocks()
+
+    assert tree.topLevelItemCount() == 1
+    assert tree.topLevelItem(0) is folder_item
+    assert folder_item.child(1) is block1_item
+    assert folder_item.child(0).childCount() == 0
+
+def test_BlockListUpdater_badge_updates_are_coalesced(updater):
+    items = []
+    for block_idx in (0, 1):
+        item = QTreeWidgetItem([f"Block {block_idx}"])
+        item.setData(0, Qt.UserRole, block_idx)
+        updater.mw.block_list_widget.addTopLevelItem(item)
+        items.append(item)
+    updater.mw.current_game_rules.get_short_problem_name.side_effect = lambda p: "width" if p == "prob1" else "empty"
+
+    with patch.object(updater, '_update_block_badges', wraps=updater._update_block_badges) as update:
+        for _ in range(3):
+            updater.schedule_block_badge_update(0)
+            updater.schedule_block_badge_update(1)
+        assert update.call_count == 0
+        assert updater._badge_timer.isActive()
+
+        updater.flush_block_badge_updates()
+
+    update.assert_called_once_with({0, 1})
+    assert not updater._badge_timer.isActive()
+    assert items[0].text(0) == "Block Zero (1 width)"
+    assert items[1].text(0) == "Block One (1 width, 1 empty)"
+
+def test_BlockListUpdater_badge_counts_come_from_problem_index(updater):
+    from core.data_store import ProblemStore
+    updater.mw.data_store.problems_per_subline = ProblemStore({(0, 0, 0): {"prob1"}, (0, 1, 0): {"prob1", "prob2"}})
+    updater.mw.detection_enabled = {"prob2": False}
+
+    with patch.object(ProblemStore, 'items', side_effect=AssertionError("full scan")):
+        counts = updater._get_aggregated_problems_for_block(0)
+
+    assert counts == {"prob1": 2, "prob2": 0}
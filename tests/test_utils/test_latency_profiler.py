@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from utils.latency_profiler import KEYSTROKE, LatencyProfiler
+
+
+def test_span_records_duration():
+    profiler = LatencyProfiler()
+    with profiler.span("problem_scan"):
+        pass
+    stats = profiler.stats("problem_scan")
+    assert stats.count == 1
+    assert stats.p50 >= 0.0
+    assert profiler.stats("missing") is None
+
+
+def test_span_records_when_the_stage_raises():
+    profiler = LatencyProfiler()
+    with pytest.raises(ValueError):
+        with profiler.span("update_edited_data"):
+            raise ValueError
+    assert profiler.stats("update_edited_data").count == 1
+
+
+def test_percentiles_use_nearest_rank():
+    profiler = LatencyProfiler()
+    for ms in range(1, 101):
+        profiler.record("stage", float(ms))
+    stats = profiler.stats("stage")
+    assert (stats.p50, stats.p95, stats.p99, stats.max) == (50.0, 95.0, 99.0, 100.0)
+
+
+def test_window_keeps_recent_samples_but_counts_all():
+    profiler = LatencyProfiler(window=3)
+    for ms in (100.0, 1.0, 2.0, 3.0):
+        profiler.record("stage", ms)
+    stats = profiler.stats("stage")
+    assert stats.count == 4
+    assert stats.max == 3.0
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = LatencyProfiler(enabled=False)
+    with profiler.span("stage"):
+        pass
+    assert profiler.all_stats() == []
+
+
+def test_all_stats_lists_pipeline_stages_first():
+    profiler = LatencyProfiler()
+    for name in ("zzz_custom", "update_text_views", KEYSTROKE):
+        profiler.record(name, 1.0)
+    assert [s.name for s in profiler.all_stats()] == [KEYSTROKE, "update_text_views", "zzz_custom"]
+
+
+def test_export_json(tmp_path):
+    profiler = LatencyProfiler()
+    profiler.record(KEYSTROKE, 4.0)
+    path = tmp_path / "latency.json"
+    profiler.export_json(path)
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert data["spans"][KEYSTROKE]["p99"] == 4.0
+    assert data["samples"][KEYSTROKE] == [4.0]
+
+    profiler.reset()
+    assert profiler.all_stats() == []
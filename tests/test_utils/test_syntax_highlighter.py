@@ -1,9 +1,9 @@
 import pytest
 from unittest.mock import MagicMock, call, patch
-from PyQt5.QtGui import QColor, QTextDocument, QFont, QTextCharFormat, QPen
+from PyQt5.QtGui import QColor, QTextCursor, QTextDocument, QFont, QTextCharFormat, QPen
 from PyQt5.QtCore import Qt
 from utils.syntax_highlighter import JsonTagHighlighter
-from core.glossary_manager import GlossaryMatch
+from core.glossary_manager import GlossaryManager, GlossaryMatch
 
 @pytest.fixture
 def mock_mw():
@@ -19,6 +19,7 @@ def mock_mw():
     spellchecker = MagicMock()
     spellchecker.enabled = True
     spellchecker.is_misspelled.return_value = False
+    spellchecker.cached_misspelling.return_value = False
     mw.spellchecker_manager = spellchecker
     
     return mw
@@ -42,8 +43,11 @@ def test_JsonTagHighlighter_init_and_reconfigure(highlighter, mock_mw):
 
 def test_JsonTagHighlighter_on_contents_change(highlighter):
     hl, doc = highlighter
-    hl._icon_sequences_cache[0] = [(0, 5)]
+    # Icon matches are keyed by block text, so an edit only misses on the changed line
+    hl._icon_sequences_cache["[Icon1]"] = [(0, 7)]
     hl.on_contents_change(0, 0, 1)
+    assert hl._icon_sequences_cache["[Icon1]"] == [(0, 7)]
+    hl._invalidate_icon_cache()
     assert len(hl._icon_sequences_cache) == 0
 
 def test_JsonTagHighlighter_set_glossary_manager(highlighter):
@@ -58,6 +62,21 @@ def test_JsonTagHighlighter_set_glossary_manager(highlighter):
     assert hl._glossary_manager == gm
     hl.rehighlight.assert_called_once()
 
+def test_JsonTagHighlighter_set_glossary_manager_skips_same_revision(highlighter):
+    hl, doc = highlighter
+    hl.rehighlight = MagicMock()
+    gm = GlossaryManager()
+    gm.load_from_text(plugin_name=None, glossary_path=None, raw_text="Master Sword\tМайстер Меч\n")
+
+    hl.set_glossary_manager(gm)
+    hl.set_glossary_manager(gm)
+    assert hl.rehighlight.call_count == 1
+    assert hl._glossary_span_lines >= 1
+
+    gm.add_entry("Minish", "Мініш", "")
+    hl.set_glossary_manager(gm)
+    assert hl.rehighlight.call_count == 2
+
 def test_JsonTagHighlighter_set_spellchecker_enabled(highlighter):
     hl, doc = highlighter
     hl.rehighlight = MagicMock()
@@ -117,10 +136,27 @@ def test_JsonTagHighlighter_icon_cache(highlighter):
     hl.currentBlock = MagicMock()
     hl.currentBlock().blockNumber.return_value = 0
     
+    hl.currentBlock().text.return_value = "Hello [Icon1] World"
+    
     matches = hl._get_icon_matches_for_block(["[Icon1]"])
     assert len(matches) == 1
     assert matches[0] == (6, 7) # index 6, length 7
 
+def test_JsonTagHighlighter_icon_cache_by_block_text(highlighter):
+    hl, doc = highlighter
+    hl._should_highlight_icons = MagicMock(return_value=True)
+    hl.currentBlock = MagicMock()
+    hl.currentBlock().text.return_value = "[Icon1][Icon2]"
+
+    with patch('utils.syntax_highlighter.find_icon_sequences', return_value=[(0, 7), (7, 7)]) as find:
+        assert hl._get_icon_matches_for_block(["[Icon1]", "[Icon2]"]) == [(0, 7), (7, 7)]
+        # Another block with the same text reuses the result
+        hl._get_icon_matches_for_block(["[Icon1]", "[Icon2]"])
+        assert find.call_count == 1
+        # A new icon list drops the cache
+        hl._get_icon_matches_for_block(["[Icon1]"])
+        assert find.call_count == 2
+
 def test_JsonTagHighlighter_glossary_cache(highlighter, mock_mw):
     hl, doc = highlighter
     doc.setPlainText("GlossaryTerm")
@@ -148,13 +184,68 @@ def test_JsonTagHighlighter_spellcheck(highlighter, mock_mw):
     hl, doc = highlighter
     hl.set_spellchecker_enabled(True)
     
-    mock_mw.spellchecker_manager.is_misspelled.return_value = True
+    mock_mw.spellchecker_manager.cached_misspelling.return_value = True
     
     text = "MisspelledWord"
     hl.highlightBlock(text)
     
     # Set format should be called once for the whole word plus the basic format at the start
     assert hl.setFormat.call_count >= 2
+    mock_mw.spellchecker_manager.is_misspelled.assert_not_called()
+
+def test_JsonTagHighlighter_spellcheck_cache_miss_is_queued(highlighter, mock_mw):
+    hl, doc = highlighter
+    hl.set_spellchecker_enabled(True)
+    sm = mock_mw.spellchecker_manager
+    sm.cached_misspelling.return_value = None
+
+    hl.highlightBlock("Unknownword")
+
+    sm.is_misspelled.assert_not_called()
+    sm.enqueue_word.assert_called_once()
+    assert sm.enqueue_word.call_args[0][0] == "Unknownword"
+    assert hl._spell_pending == {"unknownword"}
+
+def test_JsonTagHighlighter_spellcheck_results_rehighlight_waiting_blocks(qapp, mock_mw):
+    doc = QTextDocument()
+    doc.setPlainText("first line\nsecond line\nthird line")
+    editor_mock = MagicMock()
+    editor_mock.objectName.return_value = 'edited_text_edit'
+    hl = JsonTagHighlighter(doc, main_window_ref=mock_mw, editor_widget_ref=editor_mock)
+    hl.set_spellchecker_enabled(True)
+    hl._spell_pending = {"second", "third", "other"}
+    hl.rehighlightBlock = MagicMock()
+
+    hl.on_spellcheck_results({"second", "third"}, misspelled={"second"})
+
+    # Only the block containing a misspelled word is re-formatted
+    hl.rehighlightBlock.assert_called_once()
+    assert hl.rehighlightBlock.call_args[0][0].blockNumber() == 1
+    assert hl._spell_pending == {"other"}
+
+def test_JsonTagHighlighter_spellcheck_results_follow_moved_lines(qapp, mock_mw):
+    doc = QTextDocument()
+    doc.setPlainText("first line\nsecnd line")
+    editor_mock = MagicMock()
+    editor_mock.objectName.return_value = 'edited_text_edit'
+    hl = JsonTagHighlighter(doc, main_window_ref=mock_mw, editor_widget_ref=editor_mock)
+    hl.set_spellchecker_enabled(True)
+    hl._spell_pending = {"secnd"}
+
+    # A new line above moves the waiting word from block 1 to block 2 before the worker answers
+    cursor = QTextCursor(doc)
+    cursor.insertText("new line\n")
+    hl.rehighlightBlock = MagicMock()
+    hl.on_spellcheck_results({"secnd"}, misspelled={"secnd"})
+    assert [call[0][0].blockNumber() for call in hl.rehighlightBlock.call_args_list] == [2]
+
+def test_JsonTagHighlighter_document_reset_drops_pending_lookups(qapp, mock_mw):
+    doc = QTextDocument()
+    doc.setPlainText("secnd line")
+    hl = JsonTagHighlighter(doc, main_window_ref=mock_mw)
+    hl._spell_pending = {"secnd"}
+    doc.setPlainText("another text")
+    assert hl._spell_pending == set()
 
 def test_JsonTagHighlighter_theme_dark(qapp):
     doc = QTextDocument()
@@ -183,3 +274,90 @@ def test_should_highlight_icons_for_preview(highlighter, mock_mw):
     
     parent_mock.objectName.return_value = 'edited_text_edit'
     assert hl._should_highlight_icons() is True
+
+def test_JsonTagHighlighter_translation_bridge_uses_cached_matchers(highlighter):
+    from core.glossary_manager import GlossaryManager
+    hl, doc = highlighter
+    gm = GlossaryManager()
+    gm.load_from_text(plugin_name=None, glossary_path=None, raw_text="Sword\tМеч\nShield\tЩит\n")
+    source = QTextDocument()
+    source.setPlainText("A sword and a shield")
+    doc.setPlainText("Перший рядок\nмечем бий")
+    hl._glossary_manager = gm
+    hl._is_translation_mode = True
+    hl._source_editor_ref = source
+
+    hl._rebuild_translation_glossary_cache()
+    assert {b: [(s, l, m.entry.original) for s, l, m in v] for b, v in hl._translation_matches_cache.items()} == {
+        1: [(0, 5, "Sword")]
+    }
+    assert set(gm._translation_matchers) == {"Меч"}
+
+def test_JsonTagHighlighter_glossary_matches_cached_per_block(highlighter):
+    from core.glossary_manager import GlossaryManager
+    hl, doc = highlighter
+    gm = GlossaryManager()
+    gm.load_from_text(plugin_name=None, glossary_path=None, raw_text="Sword\tМеч\nMagic Potion\tЗілля\n")
+    doc.setPlainText("A sword here\nDrink the magic\npotion now\nplain line")
+    hl.set_glossary_manager(gm)
+    assert hl._glossary_span_lines == 2
+
+    def spans(block_number):
+        pieces = hl._get_glossary_matches_for_block(doc.findBlockByNumber(block_number))
+        return [(start, length, match.entry.original) for start, length, match in pieces]
+
+    assert spans(0) == [(2, 5, "Sword")]
+    # The two-line term is split across both blocks
+    assert spans(1) == [(10, 5, "Magic Potion")]
+    assert spans(2) == [(0, 6, "Magic Potion")]
+    assert spans(3) == []
+
+    # Editing one line only matches that line and the runs touching it
+    with patch.object(gm, "find_matches", wraps=gm.find_matches) as find:
+        spans(0)
+        assert find.call_count == 0
+        cursor = doc.find("plain")
+        cursor.insertText("sword")
+        assert spans(3) == [(0, 5, "Sword")]
+    searched = [c.args[0] for c in find.call_args_list]
+    assert all("Drink" not in text for text in searched)
+
+
+def test_JsonTagHighlighter_refreshes_neighbour_when_span_changes(highlighter, qtbot):
+    from core.glossary_manager import GlossaryManager
+    hl, doc = highlighter
+    gm = GlossaryManager()
+    gm.load_from_text(plugin_name=None, glossary_path=None, raw_text="Magic Potion\tЗілля\n")
+    doc.documentLayout()  # contentsChange is only emitted once the document has a layout
+    doc.setPlainText("Drink the magic\nwater now")
+    hl.set_glossary_manager(gm)
+    hl.rehighlightBlock = MagicMock()
+
+    cursor = doc.find("water")
+    cursor.insertText("potion")
+    qtbot.waitUntil(lambda: hl._glossary_dirty_range is None, timeout=2000)
+    hl.rehighlightBlock.assert_called_once()
+    assert hl.rehighlightBlock.call_args.args[0].blockNumber() == 0
+
+def test_JsonTagHighlighter_viewport_highlighting_defers_offscreen_blocks(qapp, mock_mw):
+    from PyQt5.QtWidgets import QPlainTextEdit
+    editor = QPlainTextEdit()
+    editor.resize(300, 200)
+    editor.show()
+    hl = JsonTagHighlighter(editor.document(), main_window_ref=mock_mw, editor_widget_ref=editor)
+    hl.set_viewport_editor(editor)
+
+    editor.setPlainText("[Red]start\n" + "\n".join(f"line {i}" for i in range(2000)))
+    hl.rehighlight()
+    doc = editor.document()
+    last = doc.lastBlock()
+    assert not isinstance(doc.firstBlock().userData(), JsonTagHighlighter.DeferredBlockData)
+    assert isinstance(last.userData(), JsonTagHighlighter.DeferredBlockData)
+    # Colour state still flows through the skipped blocks
+    assert last.userState() == JsonTagHighlighter.STATE_RED
+
+    editor.verticalScrollBar().setValue(editor.verticalScrollBar().maximum())
+    qapp.processEvents()
+    assert not isinstance(last.userData(), JsonTagHighlighter.DeferredBlockData)
+    assert isinstance(doc.findBlockByNumber(1000).userData(), JsonTagHighlighter.DeferredBlockData)
+    editor.close()
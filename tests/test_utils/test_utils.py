@@ -8,6 +8,10 @@ import pytest
 from utils.utils import (
     calculate_string_width,
     calculate_strict_string_width,
+    calculate_width_profile,
+    find_width_fit,
+    find_icon_sequences,
+    get_icon_trie,
     remove_all_tags,
     is_fuzzy_match,
     convert_spaces_to_dots_for_display,
@@ -15,6 +19,7 @@ from utils.utils import (
     remove_curly_tags,
     convert_raw_to_display_text,
     prepare_text_for_tagless_search,
+    build_tagless_search_text,
     SPACE_DOT_SYMBOL,
 )
 
@@ -115,6 +120,47 @@ class TestCalculateStrictStringWidth:
         assert calculate_strict_string_width("[Tag]a", sample_font_map) == 6
 
 
+class TestCalculateWidthProfile:
+    def test_profile_matches_prefix_widths(self, sample_font_map):
+        text = "ab c"
+        profile = calculate_width_profile(text, sample_font_map)
+        assert profile == [calculate_string_width(text[:i], sample_font_map) for i in range(len(text) + 1)]
+
+    def test_tags_and_icons_are_atomic(self, sample_font_map):
+        """Offsets inside a tag or icon keep the width before it."""
+        profile = calculate_width_profile("a{Color:Red}b[L]c", sample_font_map)
+        assert len(profile) == len("a{Color:Red}b[L]c") + 1
+        assert profile[1:13] == [6] * 12
+        assert profile[13:17] == [12, 12, 12, 20]
+        assert profile[-1] == calculate_string_width("a{Color:Red}b[L]c", sample_font_map)
+
+    def test_empty_string(self, sample_font_map):
+        assert calculate_width_profile("", sample_font_map) == [0]
+
+    def test_find_width_fit(self, sample_font_map):
+        profile = calculate_width_profile("ab c", sample_font_map)  # [0, 6, 12, 16, 21]
+        assert find_width_fit(profile, 16) == 3
+        assert find_width_fit(profile, 15) == 2
+        assert find_width_fit(profile, 100) == 4
+        assert find_width_fit(profile, -1) == 0
+
+class TestFindIconSequences:
+    def test_longest_match_wins(self):
+        trie = get_icon_trie(['[L]', '[L-Stick]'])
+        assert find_icon_sequences("a[L-Stick]b[L]", trie) == [(1, 9), (11, 3)]
+
+    def test_matches_do_not_overlap(self):
+        trie = get_icon_trie(['ab', 'bc'])
+        assert find_icon_sequences("abc", trie) == [(0, 2)]
+
+    def test_partial_sequence_is_skipped(self):
+        trie = get_icon_trie(['[L-Stick]'])
+        assert find_icon_sequences("[L-St [L-Stick]", trie) == [(6, 9)]
+
+    def test_trie_is_shared_per_sequence_list(self):
+        assert get_icon_trie(['[L]']) is get_icon_trie(['[L]'])
+        assert find_icon_sequences("[L]", get_icon_trie([])) == []
+
 # ── remove_all_tags ─────────────────────────────────────────────────
 
 class TestRemoveAllTags:
@@ -276,3 +322,27 @@ class TestPrepareTextForTaglessSearch:
 
     def test_none(self):
         assert prepare_text_for_tagless_search(None) == ""
+
+
+# ── build_tagless_search_text ───────────────────────────────────────
+
+class TestBuildTaglessSearchText:
+    @pytest.mark.parametrize("raw", [
+        "{PLAYER} hello [A]", "line1\nline2", "a   b", "  hello  ",
+        "Go+to" + SPACE_DOT_SYMBOL + "the [Red]\n  shop{X}.", "",
+    ])
+    def test_text_matches_prepare_text_for_tagless_search(self, raw):
+        text, offsets = build_tagless_search_text(raw)
+        assert text == prepare_text_for_tagless_search(raw)
+        assert len(offsets) == len(text)
+
+    def test_offsets_point_to_raw_chars(self):
+        raw = "{PLAYER} hi [A]\nthere"
+        text, offsets = build_tagless_search_text(raw)
+        assert text == "hi there"
+        assert list(offsets) == [9, 10, 11] + list(range(raw.index("there"), len(raw)))
+
+    def test_none(self):
+        text, offsets = build_tagless_search_text(None)
+        assert text == ""
+        assert len(offsets) == 0
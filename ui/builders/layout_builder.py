@@ -122,6 +122,8 @@ class LayoutBuilder:
         self.mw.preview_text_edit.setObjectName("preview_text_edit")
         self.mw.preview_text_edit.setReadOnly(True)
         self.mw.preview_text_edit.setTextInteractionFlags(Qt.TextSelectableByMouse | Qt.TextSelectableByKeyboard)
+        # A block can hold thousands of strings; only rows near the viewport get syntax-highlighted
+        self.mw.preview_text_edit.enable_viewport_highlighting()
         top_right_layout.addWidget(self.mw.preview_text_edit)
         self.mw.right_splitter.addWidget(top_right_panel)
 
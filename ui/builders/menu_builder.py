@@ -134,6 +134,10 @@ class MenuBuilder:
         tools_menu.setObjectName('&Tools')
         self.mw.tools_menu = tools_menu
 
+        self.mw.latency_stats_action = QAction('Keystroke &Latency...', self.mw)
+        self.mw.latency_stats_action.setToolTip("Timings of each edit pipeline stage (p50/p95/p99)")
+        tools_menu.addAction(self.mw.latency_stats_action)
+
     def _build_navigation_menu(self, menubar):
         self.mw.navigation_menu = menubar.addMenu('&Navigation')
         
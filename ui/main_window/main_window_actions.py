@@ -80,6 +80,8 @@ class MainWindowActions:
                     self.mw.data_store.edited_data.clear()
                     self.mw.data_store.unsaved_changes = False
                     self.mw.helper.rebuild_unsaved_block_indices()
+                    if hasattr(self.mw, 'search_handler'):
+                        self.mw.search_handler.rebuild_index()
                     if hasattr(self.mw, 'ui_updater'):
                         self.mw.ui_updater.update_title()
                         self.mw.ui_updater.populate_blocks()
@@ -158,6 +160,8 @@ class MainWindowActions:
 
         self.helper.rebuild_unsaved_block_indices() 
         self.mw.data_store.unsaved_changes = bool(self.mw.data_store.edited_data) 
+        if hasattr(self.mw, 'search_handler'):
+            self.mw.search_handler.refresh_index_block(block_to_refresh_ui_for)
         
         if hasattr(self.mw, 'title_status_bar_updater'):
             self.mw.title_status_bar_updater.update_title()
@@ -250,3 +254,13 @@ class MainWindowActions:
     def show_shortcuts_help(self):
         from components.help_dialog import show_shortcuts_dialog
         show_shortcuts_dialog(self.mw)
+
+    def show_latency_stats(self):
+        from components.latency_stats_dialog import LatencyStatsDialog
+        dialog = getattr(self, '_latency_dialog', None)
+        if dialog is None:
+            dialog = LatencyStatsDialog(self.mw)
+            self._latency_dialog = dialog
+        dialog.show()
+        dialog.raise_()
+        dialog.activateWindow()
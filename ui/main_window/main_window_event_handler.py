@@ -91,6 +91,8 @@ class MainWindowEventHandler:
         if hasattr(self.mw, 'rescan_all_tags_action'): self.mw.rescan_all_tags_action.triggered.connect(self.mw.app_action_handler.rescan_all_tags)
         if hasattr(self.mw, 'reload_tag_mappings_action'):
             self.mw.reload_tag_mappings_action.triggered.connect(self.mw.actions.trigger_reload_tag_mappings)
+        if hasattr(self.mw, 'latency_stats_action'):
+            self.mw.latency_stats_action.triggered.connect(self.mw.actions.show_latency_stats)
         if hasattr(self.mw, 'find_action'):
             self.mw.find_action.triggered.connect(self.mw.helper.toggle_search_panel)
         if hasattr(self.mw, 'open_ai_chat_action'):
@@ -99,6 +101,10 @@ class MainWindowEventHandler:
             self.mw.search_panel_widget.close_requested.connect(self.mw.helper.hide_search_panel)
             self.mw.search_panel_widget.find_next_requested.connect(self.mw.helper.handle_panel_find_next)
             self.mw.search_panel_widget.find_previous_requested.connect(self.mw.helper.handle_panel_find_previous)
+            self.mw.search_panel_widget.find_all_requested.connect(self.mw.helper.handle_panel_find_all)
+            self.mw.search_panel_widget.replace_all_requested.connect(self.mw.helper.handle_panel_replace_all)
+            self.mw.search_panel_widget.find_all_cancel_requested.connect(self.mw.search_handler.cancel_find_all)
+            self.mw.search_panel_widget.result_activated.connect(self.mw.search_handler.navigate_to_result)
         
         if hasattr(self.mw, 'ai_translate_button') and self.mw.ai_translate_button:
             self.mw.ai_translate_button.clicked.connect(self.mw.translation_handler.translate_current_string)
@@ -45,21 +45,22 @@ class MainWindowHelper:
         search_in_original_to_use = False
         ignore_tags_to_use = True
         is_fuzzy_to_use = False
+        is_regex_to_use = False
 
         if self.mw.search_panel_widget.isVisible():
-            query_to_use, case_sensitive_to_use, search_in_original_to_use, ignore_tags_to_use, is_fuzzy_to_use = self.mw.search_panel_widget.get_search_parameters()
+            query_to_use, case_sensitive_to_use, search_in_original_to_use, ignore_tags_to_use, is_fuzzy_to_use, is_regex_to_use = self.mw.search_panel_widget.get_search_parameters()
             if not query_to_use:
                 self.mw.search_panel_widget.set_status_message("Enter query for F3", is_error=True)
                 self.mw.search_panel_widget.focus_search_input()
                 return
         else:
-            query_to_use, case_sensitive_to_use, search_in_original_to_use, ignore_tags_to_use, is_fuzzy_to_use = self.mw.search_handler.get_current_search_params()
+            query_to_use, case_sensitive_to_use, search_in_original_to_use, ignore_tags_to_use, is_fuzzy_to_use, is_regex_to_use = self.mw.search_handler.get_current_search_params()
             if not query_to_use:
                 self.toggle_search_panel()
                 self.mw.search_panel_widget.set_status_message("Enter query", is_error=True)
                 return
 
-        found = self.mw.search_handler.find_next(query_to_use, case_sensitive_to_use, search_in_original_to_use, ignore_tags_to_use, is_fuzzy_to_use)
+        found = self.mw.search_handler.find_next(query_to_use, case_sensitive_to_use, search_in_original_to_use, ignore_tags_to_use, is_fuzzy_to_use, is_regex_to_use)
         if not found and not self.mw.search_panel_widget.isVisible():
             from PyQt5.QtWidgets import QMessageBox
             QMessageBox.information(self.mw, "Find", f"Not found: \"{query_to_use}\"")
@@ -70,30 +71,37 @@ class MainWindowHelper:
         search_in_original_to_use = False
         ignore_tags_to_use = True
         is_fuzzy_to_use = False
+        is_regex_to_use = False
 
         if self.mw.search_panel_widget.isVisible():
-            query_to_use, case_sensitive_to_use, search_in_original_to_use, ignore_tags_to_use, is_fuzzy_to_use = self.mw.search_panel_widget.get_search_parameters()
+            query_to_use, case_sensitive_to_use, search_in_original_to_use, ignore_tags_to_use, is_fuzzy_to_use, is_regex_to_use = self.mw.search_panel_widget.get_search_parameters()
             if not query_to_use:
                 self.mw.search_panel_widget.set_status_message("Enter query for Shift+F3", is_error=True)
                 self.mw.search_panel_widget.focus_search_input()
                 return
         else:
-            query_to_use, case_sensitive_to_use, search_in_original_to_use, ignore_tags_to_use, is_fuzzy_to_use = self.mw.search_handler.get_current_search_params()
+            query_to_use, case_sensitive_to_use, search_in_original_to_use, ignore_tags_to_use, is_fuzzy_to_use, is_regex_to_use = self.mw.search_handler.get_current_search_params()
             if not query_to_use:
                 self.toggle_search_panel()
                 self.mw.search_panel_widget.set_status_message("Enter query", is_error=True)
                 return
 
-        found = self.mw.search_handler.find_previous(query_to_use, case_sensitive_to_use, search_in_original_to_use, ignore_tags_to_use, is_fuzzy_to_use)
+        found = self.mw.search_handler.find_previous(query_to_use, case_sensitive_to_use, search_in_original_to_use, ignore_tags_to_use, is_fuzzy_to_use, is_regex_to_use)
         if not found and not self.mw.search_panel_widget.isVisible():
             from PyQt5.QtWidgets import QMessageBox
             QMessageBox.information(self.mw, "Find", f"Not found: \"{query_to_use}\"")
 
-    def handle_panel_find_next(self, query, case_sensitive, search_in_original, ignore_tags, is_fuzzy):
-        self.mw.search_handler.find_next(query, case_sensitive, search_in_original, ignore_tags, is_fuzzy)
+    def handle_panel_find_next(self, query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex=False):
+        self.mw.search_handler.find_next(query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex)
 
-    def handle_panel_find_previous(self, query, case_sensitive, search_in_original, ignore_tags, is_fuzzy):
-        self.mw.search_handler.find_previous(query, case_sensitive, search_in_original, ignore_tags, is_fuzzy)
+    def handle_panel_find_previous(self, query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex=False):
+        self.mw.search_handler.find_previous(query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex)
+
+    def handle_panel_find_all(self, query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex=False):
+        self.mw.search_handler.find_all(query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex)
+
+    def handle_panel_replace_all(self, query, replacement, case_sensitive, is_regex):
+        self.mw.search_handler.replace_all(query, replacement, case_sensitive, is_regex)
 
     def toggle_search_panel(self):
         if self.mw.search_panel_widget.isVisible():
@@ -101,10 +109,10 @@ class MainWindowHelper:
         else:
             self.mw.search_panel_widget.setVisible(True)
             # Fix: added is_fuzzy to unpacking
-            last_query, case_sensitive, search_in_original, ignore_tags, is_fuzzy = self.mw.search_handler.get_current_search_params()
+            last_query, case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex = self.mw.search_handler.get_current_search_params()
 
             self.mw.search_panel_widget.set_query(last_query if last_query else "")
-            self.mw.search_panel_widget.set_search_options(case_sensitive, search_in_original, ignore_tags, is_fuzzy)
+            self.mw.search_panel_widget.set_search_options(case_sensitive, search_in_original, ignore_tags, is_fuzzy, is_regex)
 
             if hasattr(self.mw, 'search_history_to_save'):
                  self.mw.search_panel_widget.load_history(self.mw.search_history_to_save)
@@ -113,6 +121,8 @@ class MainWindowHelper:
             self.mw.search_panel_widget.focus_search_input()
 
     def hide_search_panel(self):
+        self.mw.search_handler.cancel_find_all()
+        self.mw.search_panel_widget.clear_results()
         self.mw.search_panel_widget.setVisible(False)
         self.mw.search_handler.clear_all_search_highlights()
 
@@ -174,6 +184,10 @@ class MainWindowHelper:
 
         if self.mw.search_panel_widget:
             self.mw.search_history_to_save = self.mw.search_panel_widget.get_history()
+
+        translation_handler = getattr(self.mw, 'translation_handler', None)
+        if translation_handler and hasattr(translation_handler, 'glossary_handler'):
+            translation_handler.glossary_handler.flush_glossary_writes()
         
         # Save UI Session State for the current file/project
         current_path = None
@@ -248,9 +262,9 @@ class MainWindowHelper:
             if self.mw.search_history_to_save:
                 last_query = self.mw.search_history_to_save[0]
                 self.mw.search_handler.current_query = last_query
-                # Fix: unpacking 5 values
-                _, cs, so, it, is_fuzzy = self.mw.search_panel_widget.get_search_parameters()
+                _, cs, so, it, is_fuzzy, is_regex = self.mw.search_panel_widget.get_search_parameters()
                 self.mw.search_handler.is_case_sensitive = cs
                 self.mw.search_handler.search_in_original = so
                 self.mw.search_handler.ignore_tags_newlines = it
-                self.mw.search_handler.is_fuzzy = is_fuzzy
\ No newline at end of file
+                self.mw.search_handler.is_fuzzy = is_fuzzy
+                self.mw.search_handler.is_regex = is_regex
\ No newline at end of file
@@ -54,9 +54,14 @@ class MainWindowUIHandler:
                 self.mw.search_panel_widget.search_query_edit,
                 self.mw.search_panel_widget.find_next_button,
                 self.mw.search_panel_widget.find_previous_button,
+                self.mw.search_panel_widget.find_all_button,
+                self.mw.search_panel_widget.results_list,
                 self.mw.search_panel_widget.case_sensitive_checkbox,
                 self.mw.search_panel_widget.search_in_original_checkbox,
                 self.mw.search_panel_widget.ignore_tags_newlines_checkbox,
+                self.mw.search_panel_widget.regex_checkbox,
+                self.mw.search_panel_widget.replace_query_edit,
+                self.mw.search_panel_widget.replace_all_button,
                 self.mw.search_panel_widget.status_label,
                 self.mw.search_panel_widget.close_search_panel_button
             ])
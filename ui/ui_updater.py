@@ -53,6 +53,12 @@ class UIUpdater:
     def update_block_item_text_with_problem_count(self, block_idx: int):
         self.block_list_updater.update_block_item_text_with_problem_count(block_idx)
 
+    def schedule_block_badge_update(self, block_idx: int):
+        self.block_list_updater.schedule_block_badge_update(block_idx)
+
+    def flush_block_badge_updates(self):
+        self.block_list_updater.flush_block_badge_updates()
+
     def update_status_bar(self):
         self.title_status_bar_updater.update_status_bar()
 
@@ -87,6 +93,9 @@ class UIUpdater:
     def _apply_highlights_for_block(self, block_idx: int):
         self.preview_updater._apply_highlights_for_block(block_idx)
 
+    def _apply_highlights_for_rows(self, block_idx: int, rows):
+        self.preview_updater._apply_highlights_for_rows(block_idx, rows)
+
     def _apply_highlights_to_editor(self, editor, block_idx: int, string_idx: int):
         self.preview_updater._apply_highlights_to_editor(editor, block_idx, string_idx)
 
@@ -3,9 +3,22 @@ from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QTreeWidgetItem, QTreeWidgetItemIterator, QStyle
 from utils.logging_utils import log_info, log_warning
 from pathlib import Path
+from core.data_store import ProblemStore
 from .base_ui_updater import BaseUIUpdater
 
+# Stable row identity (folder_<id>, block_<idx>, cat_<idx>_<name>, dir_<path>) across populate_blocks calls
+TREE_KEY_ROLE = Qt.UserRole + 20
+# Dirty tree badges are flushed together at most once per frame (60 Hz)
+BADGE_FLUSH_INTERVAL_MS = 16
+
 class BlockListUpdater(BaseUIUpdater):
+    _reusable_items = None
+
+    def __init__(self, main_window, data_processor):
+        super().__init__(main_window, data_processor)
+        self._dirty_badge_blocks = set()
+        self._badge_timer = None
+
     def get_tree_state(self) -> dict:
         """Returns the current expansion and selection state of the block tree."""
         if not self.mw.block_list_widget:
@@ -147,9 +160,15 @@ class BlockListUpdater(BaseUIUpdater):
             block_counts = pre_aggregated_counts.get(block_idx, {})
             return {pid: block_counts.get(pid, 0) for pid in problem_definitions.keys()}
         
+        problems_store = self.mw.data_store.problems_per_subline
+        detection_config = getattr(self.mw, 'detection_enabled', {})
+        if isinstance(problems_store, ProblemStore) and category_name is None:
+            # Incremental index: per-block counters, cached until the block's problems change
+            block_counts = problems_store.block_problem_counts(block_idx)
+            return {pid: block_counts.get(pid, 0) if detection_config.get(pid, True) else 0 for pid in problem_definitions.keys()}
+        
         # Slow path/Category path
         problem_counts = {pid: 0 for pid in problem_definitions.keys()}
-        detection_config = getattr(self.mw, 'detection_enabled', {})
         
         # Determine which strings to check
         target_indices = None
@@ -164,7 +183,11 @@ class BlockListUpdater(BaseUIUpdater):
                     if category:
                         target_indices = set(category.line_indices)
 
-        for (b_idx, s_idx, subline_idx), problems in self.mw.data_store.problems_per_subline.items():
+        if isinstance(problems_store, ProblemStore):
+            block_items = ((key, problems_store[key]) for key in problems_store.keys_for_block(block_idx))
+        else:
+            block_items = problems_store.items()
+        for (b_idx, s_idx, subline_idx), problems in block_items:
             if b_idx == block_idx:
                 if target_indices is not None and s_idx not in target_indices:
                     continue
@@ -200,25 +223,121 @@ class BlockListUpdater(BaseUIUpdater):
         if issue_texts:
             display_name_with_issues = f"{base_display_name} ({', '.join(issue_texts)})"
             
-        item.setText(0, display_name_with_issues)
+        self._set_item_text(item, display_name_with_issues)
         
-        if tooltip_lines:
-            item.setToolTip(0, "<br><br>".join(tooltip_lines))
-        else:
-            item.setToolTip(0, "")
+        tooltip = "<br><br>".join(tooltip_lines)
+        if item.toolTip(0) != tooltip:
+            item.setToolTip(0, tooltip)
+
+    # --- Incremental tree sync ---
+    # populate_blocks reuses the rows of the previous pass (matched by TREE_KEY_ROLE)
+    # and only writes values that changed, so the tree model emits dataChanged/
+    # rowsInserted/rowsRemoved for the affected rows instead of a full reset, and
+    # expansion, scroll and selection survive.
+
+    @staticmethod
+    def _set_item_text(item: QTreeWidgetItem, text: str):
+        # EditRole and DisplayRole share storage in QTreeWidgetItem; the editor reads UserRole + 4
+        if item.text(0) != text:
+            item.setText(0, text)
+
+    @staticmethod
+    def _set_item_data(item: QTreeWidgetItem, role: int, value):
+        if item.data(0, role) != value:
+            item.setData(0, role, value)
+
+    def _collect_tree_items(self) -> dict:
+        items = {}
+        iterator = QTreeWidgetItemIterator(self.mw.block_list_widget)
+        while iterator.value():
+            item = iterator.value()
+            key = item.data(0, TREE_KEY_ROLE)
+            if key is not None:
+                items[key] = item
+            iterator += 1
+        return items
+
+    def _take_reusable_item(self, key: str):
+        if self._reusable_items is None:
+            return None
+        return self._reusable_items.pop(key, None)
+
+    @staticmethod
+    def _insert_tree_item(parent_item: QTreeWidgetItem, row: int, item: QTreeWidgetItem) -> QTreeWidgetItem:
+        """Puts item at parent_item's row, moving it only if it is somewhere else."""
+        tree = item.treeWidget()
+        current_parent = item.parent() or (tree.invisibleRootItem() if tree else None)
+        if current_parent is parent_item and parent_item.indexOfChild(item) == row:
+            return item
+
+        # Moving a row drops the view's expansion state for the whole subtree
+        expanded_items = []
+        if current_parent is not None:
+            stack = [item]
+            while stack:
+                current = stack.pop()
+                if current.isExpanded():
+                    expanded_items.append(current)
+                stack.extend(current.child(i) for i in range(current.childCount()))
+            current_parent.takeChild(current_parent.indexOfChild(item))
+
+        parent_item.insertChild(min(row, parent_item.childCount()), item)
+        for expanded_item in expanded_items:
+            expanded_item.setExpanded(True)
+        return item
+
+    def _place_tree_item(self, parent_item: QTreeWidgetItem, row: int, key: str, factory):
+        """Returns (item, created): the row keyed `key` from the previous pass, or factory()'s new one."""
+        item = self._take_reusable_item(key)
+        created = item is None
+        if created:
+            item = factory()
+            item.setData(0, TREE_KEY_ROLE, key)
+        return self._insert_tree_item(parent_item, row, item), created
+
+    @staticmethod
+    def _trim_children(parent_item: QTreeWidgetItem, keep: int):
+        # Synced children occupy rows [0, keep); anything after them is stale
+        while parent_item.childCount() > keep:
+            parent_item.takeChild(keep)
+
+    def _new_folder_item(self) -> QTreeWidgetItem:
+        folder_item = QTreeWidgetItem([""])
+        folder_item.setFlags(folder_item.flags() | Qt.ItemIsEditable)
+        folder_item.setIcon(0, self.mw.style().standardIcon(QStyle.SP_DirIcon))
+        return folder_item
+
+    def _new_category_item(self) -> QTreeWidgetItem:
+        cat_item = QTreeWidgetItem([""])
+        cat_item.setFlags(cat_item.flags() | Qt.ItemIsEditable)
+        cat_item.setIcon(0, self.mw.style().standardIcon(QStyle.SP_FileDialogDetailedView))
+        return cat_item
+
+    @staticmethod
+    def _new_dir_item() -> QTreeWidgetItem:
+        dir_item = QTreeWidgetItem([""])
+        dir_item.setIcon(0, QIcon.fromTheme('folder'))
+        return dir_item
 
     def _create_block_tree_item(self, block_idx: int, problem_definitions: dict, pre_aggregated_counts: dict = None) -> QTreeWidgetItem:
         """Helper to create a single block tree item with issue counts and tooltips."""
         base_display_name = self.mw.data_store.block_names.get(str(block_idx), f"Block {block_idx}")
+        item = self.mw.block_list_widget.create_item(base_display_name, block_idx, Qt.UserRole)
+        item.setData(0, TREE_KEY_ROLE, f"block_{block_idx}")
+        self._sync_block_tree_item(item, block_idx, problem_definitions, pre_aggregated_counts)
+        return item
+
+    def _sync_block_tree_item(self, item: QTreeWidgetItem, block_idx: int, problem_definitions: dict, pre_aggregated_counts: dict = None):
+        """Brings a block row and its category rows up to date, writing only what changed."""
+        base_display_name = self.mw.data_store.block_names.get(str(block_idx), f"Block {block_idx}")
         block_problem_counts = self._get_aggregated_problems_for_block(block_idx, pre_aggregated_counts)
         
-        item = self.mw.block_list_widget.create_item(base_display_name, block_idx, Qt.UserRole)
         self._apply_issues_and_tooltip(item, base_display_name, block_problem_counts, problem_definitions)
-        
-        item.setData(0, Qt.UserRole + 4, base_display_name)
-        item.setData(0, Qt.EditRole, base_display_name)
+        self._set_item_data(item, Qt.UserRole, block_idx)
+        self._set_item_data(item, Qt.UserRole + 4, base_display_name)
         
         # Add categories as children
+        category_rows = 0
         if hasattr(self.mw, 'project_manager') and self.mw.project_manager and self.mw.project_manager.project:
             pm = self.mw.project_manager
             block_map = getattr(self.mw, 'block_to_project_file_map', {})
@@ -226,22 +345,31 @@ class BlockListUpdater(BaseUIUpdater):
             if proj_b_idx < len(pm.project.blocks):
                 block = pm.project.blocks[proj_b_idx]
                 for cat in block.categories:
-                    cat_item = QTreeWidgetItem([cat.name])
-                    cat_item.setFlags(cat_item.flags() | Qt.ItemIsEditable)
-                    cat_item.setData(0, Qt.UserRole, block_idx)
-                    cat_item.setData(0, Qt.UserRole + 10, cat.name)
-                    cat_item.setData(0, Qt.UserRole + 4, cat.name)
-                    cat_item.setData(0, Qt.EditRole, cat.name)
-                    cat_item.setIcon(0, self.mw.style().standardIcon(QStyle.SP_FileDialogDetailedView))
+                    cat_item, _ = self._place_tree_item(item, category_rows, f"cat_{block_idx}_{cat.name}", self._new_category_item)
+                    category_rows += 1
+                    self._set_item_data(cat_item, Qt.UserRole, block_idx)
+                    self._set_item_data(cat_item, Qt.UserRole + 10, cat.name)
+                    self._set_item_data(cat_item, Qt.UserRole + 4, cat.name)
                     
                     cat_problem_counts = self._get_aggregated_problems_for_block(block_idx, pre_aggregated_counts=None, category_name=cat.name)
                     self._apply_issues_and_tooltip(cat_item, cat.name, cat_problem_counts, problem_definitions)
-                    
-                    item.addChild(cat_item)
-            
+        self._trim_children(item, category_rows)
+
+    def _place_block_item(self, parent_item: QTreeWidgetItem, row: int, block_idx: int, problem_definitions: dict, pre_aggregated_counts: dict = None) -> QTreeWidgetItem:
+        item = self._take_reusable_item(f"block_{block_idx}")
+        if item is None:
+            return self._insert_tree_item(parent_item, row, self._create_block_tree_item(block_idx, problem_definitions, pre_aggregated_counts))
+        self._insert_tree_item(parent_item, row, item)
+        self._sync_block_tree_item(item, block_idx, problem_definitions, pre_aggregated_counts)
         return item
 
-    def _add_virtual_folder_to_tree(self, parent_item, folder, problem_definitions, current_selection_block_idx, pre_aggregated_counts: dict = None, folder_id_to_select=None):
+    def _select_block_item(self, block_item: QTreeWidgetItem):
+        self.mw.block_list_widget.setCurrentItem(block_item)
+        block_item.setSelected(True)
+        if block_item.childCount() > 0:
+            block_item.setExpanded(True)
+
+    def _add_virtual_folder_to_tree(self, parent_item, folder, problem_definitions, current_selection_block_idx, pre_aggregated_counts: dict = None, folder_id_to_select=None, row: int = None):
         """Recursively add virtual folders and their blocks to the tree with folder compaction (GitHub style)."""
         project = self.mw.project_manager.project
         if not project: return
@@ -279,22 +407,19 @@ class BlockListUpdater(BaseUIUpdater):
         # Rule: Hide counter if the folder contains exactly ONE single child (folder or block)
         child_count = len(curr_for_children.children) + len(curr_for_children.block_ids)
         
-        # Save name BEFORE adding counters for editing
-        clean_display_name = display_name
-        
         if compaction_type == 0 and child_count > 1:
             display_name += f" [{len(curr_for_children.children)} | {len(curr_for_children.block_ids)}]"
 
-        # Create folder item
-        folder_item = QTreeWidgetItem([display_name])
-        folder_item.setFlags(folder_item.flags() | Qt.ItemIsEditable)
-        folder_item.setIcon(0, self.mw.style().standardIcon(QStyle.SP_DirIcon))
+        # Reuse the folder's row from the previous pass; keyed by the top folder so compaction changes keep it
+        if row is None:
+            row = parent_item.childCount()
+        folder_item, _ = self._place_tree_item(parent_item, row, f"folder_{folder.id}", self._new_folder_item)
+        self._set_item_text(folder_item, display_name)
         
-        folder_item.setData(0, Qt.UserRole + 1, curr_for_children.id)
-        folder_item.setData(0, Qt.UserRole + 2, merged_folder_ids)
-        folder_item.setData(0, Qt.UserRole + 3, compaction_type)
-        folder_item.setData(0, Qt.UserRole + 4, display_name)
-        folder_item.setData(0, Qt.EditRole, display_name)
+        self._set_item_data(folder_item, Qt.UserRole + 1, curr_for_children.id)
+        self._set_item_data(folder_item, Qt.UserRole + 2, merged_folder_ids)
+        self._set_item_data(folder_item, Qt.UserRole + 3, compaction_type)
+        self._set_item_data(folder_item, Qt.UserRole + 4, display_name)
         
         # Store RAW folder names for robust synchronization (avoids parsing display_name with counters)
         raw_names = []
@@ -304,31 +429,29 @@ class BlockListUpdater(BaseUIUpdater):
              while len(temp_f.children) == 1 and len(temp_f.block_ids) == 0:
                  temp_f = temp_f.children[0]
                  raw_names.append(temp_f.name)
-        folder_item.setData(0, Qt.UserRole + 5, raw_names)
+        self._set_item_data(folder_item, Qt.UserRole + 5, raw_names)
         
-        if block_idx_for_icon is not None:
-            folder_item.setData(0, Qt.UserRole, block_idx_for_icon) # For indicator strips
-            
-        parent_item.addChild(folder_item)
+        self._set_item_data(folder_item, Qt.UserRole, block_idx_for_icon) # For indicator strips
         
         # Standard recursive children population
+        child_row = 0
         for child in curr_for_children.children:
-            self._add_virtual_folder_to_tree(folder_item, child, problem_definitions, current_selection_block_idx, pre_aggregated_counts, folder_id_to_select=folder_id_to_select)
+            self._add_virtual_folder_to_tree(folder_item, child, problem_definitions, current_selection_block_idx, pre_aggregated_counts, folder_id_to_select=folder_id_to_select, row=child_row)
+            child_row += 1
             
         id_to_idx = {b.id: idx for idx, b in enumerate(project.blocks)}
         for b_id in curr_for_children.block_ids:
             idx = id_to_idx.get(b_id)
             if idx is not None:
-                block_item = self._create_block_tree_item(idx, problem_definitions, pre_aggregated_counts)
-                folder_item.addChild(block_item)
+                block_item = self._place_block_item(folder_item, child_row, idx, problem_definitions, pre_aggregated_counts)
+                child_row += 1
                 if idx == current_selection_block_idx:
-                    self.mw.block_list_widget.setCurrentItem(block_item)
-                    block_item.setSelected(True)
-                    if block_item.childCount() > 0:
-                        block_item.setExpanded(True)
+                    self._select_block_item(block_item)
+        self._trim_children(folder_item, child_row)
 
         # Apply expansion state AFTER children are added so Qt knows it's NOT a leaf
-        folder_item.setExpanded(is_expanded)
+        if folder_item.isExpanded() != is_expanded:
+            folder_item.setExpanded(is_expanded)
 
         # Restore folder selection
         if folder_id_to_select:
@@ -352,16 +475,19 @@ class BlockListUpdater(BaseUIUpdater):
         # Save scroll position
         v_scroll = self.mw.block_list_widget.verticalScrollBar().value()
         
-        # Don't let signals trigger more refreshes while we are rebuilding
+        # Don't let signals trigger more refreshes while we are syncing
         self.mw.block_list_widget.blockSignals(True)
         self.mw.block_list_widget._is_programmatic_expansion = True
         self.mw.block_list_widget.setUpdatesEnabled(False)
         
         try:
-            self.mw.block_list_widget.clear()
             if not self.mw.data_store.data: 
+                self.mw.block_list_widget.clear()
                 return
             
+            # Rows of the previous pass by key; whatever is not claimed again gets trimmed
+            self._reusable_items = self._collect_tree_items()
+            
             problem_definitions = {}
             if self.mw.current_game_rules:
                 problem_definitions = self.mw.current_game_rules.get_problem_definitions()
@@ -391,13 +517,15 @@ class BlockListUpdater(BaseUIUpdater):
                 for p_id in filtered_problems:
                     pre_aggregated_counts[b_idx][p_id] = pre_aggregated_counts[b_idx].get(p_id, 0) + 1
 
+            root_item = self.mw.block_list_widget.invisibleRootItem()
             if has_virtual_structure:
                 project = self.mw.project_manager.project
-                root_item = self.mw.block_list_widget.invisibleRootItem()
+                root_row = 0
                 
                 # 1. Add virtual folders recursively
                 for folder in project.virtual_folders:
-                    self._add_virtual_folder_to_tree(root_item, folder, problem_definitions, current_selection_block_idx, pre_aggregated_counts, folder_id_to_select=current_selection_folder_id)
+                    self._add_virtual_folder_to_tree(root_item, folder, problem_definitions, current_selection_block_idx, pre_aggregated_counts, folder_id_to_select=current_selection_folder_id, row=root_row)
+                    root_row += 1
                     
                 # 2. Add root blocks
                 root_block_ids = project.metadata.get('root_block_ids', [])
@@ -406,20 +534,17 @@ class BlockListUpdater(BaseUIUpdater):
                 for b_id in root_block_ids:
                     idx = id_to_idx.get(b_id)
                     if idx is not None:
-                        block_item = self._create_block_tree_item(idx, problem_definitions, pre_aggregated_counts)
-                        root_item.addChild(block_item)
+                        block_item = self._place_block_item(root_item, root_row, idx, problem_definitions, pre_aggregated_counts)
+                        root_row += 1
                         if idx == current_selection_block_idx:
-                            self.mw.block_list_widget.setCurrentItem(block_item)
-                            block_item.setSelected(True)
-                            if block_item.childCount() > 0:
-                                block_item.setExpanded(True)
+                            self._select_block_item(block_item)
+                self._trim_children(root_item, root_row)
             else:
                 # Legacy / Physical structure fallback
-                dir_nodes = {"": self.mw.block_list_widget.invisibleRootItem()}
+                dir_nodes = {"": root_item}
+                dir_rows = {"": 0}
 
                 for i in range(len(self.mw.data_store.data)):
-                    block_item = self._create_block_tree_item(i, problem_definitions, pre_aggregated_counts)
-                    
                     if hasattr(self.mw, 'project_manager') and self.mw.project_manager and self.mw.project_manager.project and i < len(self.mw.project_manager.project.blocks):
                         block = self.mw.project_manager.project.blocks[i]
                         rel_path = block.source_file
@@ -437,21 +562,25 @@ class BlockListUpdater(BaseUIUpdater):
                         current_path = current_path + "/" + part if current_path else part
                         
                         if current_path not in dir_nodes:
-                            dir_item = QTreeWidgetItem([part])
-                            dir_item.setIcon(0, QIcon.fromTheme('folder'))
-                            dir_nodes[parent_path].addChild(dir_item)
-                            dir_item.setExpanded(True)
+                            dir_item, created = self._place_tree_item(dir_nodes[parent_path], dir_rows[parent_path], f"dir_{current_path}", self._new_dir_item)
+                            dir_rows[parent_path] += 1
+                            self._set_item_text(dir_item, part)
+                            if created:
+                                dir_item.setExpanded(True)
                             dir_nodes[current_path] = dir_item
+                            dir_rows[current_path] = 0
 
-                    parent_item = dir_nodes.get(dir_path, dir_nodes[""])
-                    parent_item.addChild(block_item)
+                    parent_path = dir_path if dir_path in dir_nodes else ""
+                    block_item = self._place_block_item(dir_nodes[parent_path], dir_rows[parent_path], i, problem_definitions, pre_aggregated_counts)
+                    dir_rows[parent_path] += 1
 
                     if i == current_selection_block_idx:
-                        self.mw.block_list_widget.setCurrentItem(block_item)
-                        block_item.setSelected(True)
-                        if block_item.childCount() > 0:
-                            block_item.setExpanded(True)
+                        self._select_block_item(block_item)
+
+                for path, row_count in dir_rows.items():
+                    self._trim_children(dir_nodes[path], row_count)
         finally:
+            self._reusable_items = None
             self.mw.block_list_widget._is_programmatic_expansion = False
             self.mw.block_list_widget.blockSignals(False)
             self.mw.block_list_widget.setUpdatesEnabled(True)
@@ -460,15 +589,37 @@ class BlockListUpdater(BaseUIUpdater):
         self.mw.block_list_widget.viewport().update()
 
     def update_block_item_text_with_problem_count(self, block_idx: int):
+        self._dirty_badge_blocks.discard(block_idx)
+        self._update_block_badges({block_idx})
+
+    def schedule_block_badge_update(self, block_idx: int):
+        """Marks the block's tree badge dirty; dirty badges are applied together at most once per frame."""
+        self._dirty_badge_blocks.add(block_idx)
+        if self._badge_timer is None:
+            self._badge_timer = QTimer()
+            self._badge_timer.setSingleShot(True)
+            self._badge_timer.setInterval(BADGE_FLUSH_INTERVAL_MS)
+            self._badge_timer.timeout.connect(self.flush_block_badge_updates)
+        if not self._badge_timer.isActive():
+            self._badge_timer.start()
+
+    def flush_block_badge_updates(self):
+        if self._badge_timer is not None:
+            self._badge_timer.stop()
+        dirty_blocks, self._dirty_badge_blocks = self._dirty_badge_blocks, set()
+        if dirty_blocks:
+            self._update_block_badges(dirty_blocks)
+
+    def _update_block_badges(self, block_ids: set):
         if not hasattr(self.mw, 'block_list_widget'):
             return
         
-        # Find ALL tree items representing this block (could be multiple if categories are listed as sub-items)
+        # Find ALL tree items representing these blocks (could be multiple if categories are listed as sub-items)
         items_to_update = []
         iterator = QTreeWidgetItemIterator(self.mw.block_list_widget)
         while iterator.value():
             tree_item = iterator.value()
-            if tree_item.data(0, Qt.UserRole) == block_idx:
+            if tree_item.data(0, Qt.UserRole) in block_ids:
                 items_to_update.append(tree_item)
             iterator += 1
 
@@ -479,6 +630,7 @@ class BlockListUpdater(BaseUIUpdater):
         self.mw.block_list_widget.blockSignals(True)
         try:
             for item in items_to_update:
+                block_idx = item.data(0, Qt.UserRole)
                 category_name = item.data(0, Qt.UserRole + 10)
                 
                 # Try to use stored base name to preserve folder path in compacted view
@@ -505,8 +657,7 @@ class BlockListUpdater(BaseUIUpdater):
                 if issue_texts:
                     display_name_with_issues = f"{base_display_name} ({', '.join(issue_texts)})"
                 
-                if item.text(0) != display_name_with_issues:
-                    item.setText(0, display_name_with_issues)
+                self._set_item_text(item, display_name_with_issues)
         finally:
             self.mw.block_list_widget.blockSignals(False)
             
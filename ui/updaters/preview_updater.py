@@ -1,6 +1,9 @@
+import re
+from bisect import bisect_right
+from typing import Dict
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QColor, QTextCursor
-from utils.utils import convert_spaces_to_dots_for_display, convert_dots_to_spaces_from_editor, remove_curly_tags, calculate_string_width, remove_all_tags, calculate_strict_string_width
+from utils.utils import convert_spaces_to_dots_for_display, convert_dots_to_spaces_from_editor, remove_curly_tags, calculate_string_width, remove_all_tags, calculate_strict_string_width, calculate_width_profile, find_width_fit
 from core.glossary_manager import GlossaryOccurrence
 from .base_ui_updater import BaseUIUpdater
 
@@ -73,6 +76,16 @@ class PreviewUpdater(BaseUIUpdater):
         else:
             preview_edit.highlightManager.clearCategorizedLineHighlights()
 
+    def _apply_highlights_for_rows(self, block_idx: int, rows: Dict[int, int]):
+        """Problem highlights of a few preview rows ({preview_idx: string_idx}) after an in-place edit."""
+        preview_edit = getattr(self.mw, 'preview_text_edit', None)
+        if not preview_edit or not hasattr(preview_edit, 'highlightManager') or not self.mw.current_game_rules:
+            return
+        for preview_idx, real_idx in rows.items():
+            preview_edit.removeProblemLineHighlight(preview_idx)
+            if self.mw.list_selection_handler._data_string_has_any_problem(block_idx, real_idx):
+                preview_edit.addProblemLineHighlight(preview_idx)
+
     def _apply_highlights_to_editor(self, editor, block_idx: int, string_idx: int):
         if not editor or not hasattr(editor, 'highlightManager'):
             return
@@ -122,25 +135,16 @@ class PreviewUpdater(BaseUIUpdater):
                 line_text_no_tags_for_width_calc = remove_all_tags(line_text_with_spaces_and_tags).rstrip()
                 
                 if line_text_no_tags_for_width_calc:
-                    import re
                     font_map_for_line = self.mw.helper.get_font_map_for_string(block_idx, string_idx)
-                    visual_line_width_game_px = calculate_string_width(line_text_no_tags_for_width_calc, font_map_for_line)
+                    width_profile = calculate_width_profile(line_text_no_tags_for_width_calc, font_map_for_line)
+                    visual_line_width_game_px = width_profile[-1]
                     
                     if visual_line_width_game_px > current_threshold_game_px:
-                        words_in_no_tag_segment = [{'text': match.group(0), 'start_idx_in_segment': match.start()} for match in re.finditer(r'\S+', line_text_no_tags_for_width_calc)]
-                        
-                        target_char_index_in_no_tag_segment = 0
-                        if words_in_no_tag_segment:
-                            found_target_word = False
-                            for word_info in reversed(words_in_no_tag_segment):
-                                text_before_word_no_tags = line_text_no_tags_for_width_calc[:word_info['start_idx_in_segment']]
-                                width_before_word_game_px = calculate_string_width(text_before_word_no_tags, font_map_for_line)
-                                if width_before_word_game_px <= current_threshold_game_px:
-                                    target_char_index_in_no_tag_segment = word_info['start_idx_in_segment']
-                                    found_target_word = True
-                                    break
-                            if not found_target_word:
-                                target_char_index_in_no_tag_segment = 0
+                        # Last word that still starts within the threshold
+                        fit_end = find_width_fit(width_profile, current_threshold_game_px)
+                        word_starts = [match.start() for match in re.finditer(r'\S+', line_text_no_tags_for_width_calc)]
+                        word_pos = bisect_right(word_starts, fit_end) - 1
+                        target_char_index_in_no_tag_segment = word_starts[word_pos] if word_pos >= 0 else 0
                                 
                         # Use same logic to map back to raw text index
                         if hasattr(editor, 'paint_helpers'):
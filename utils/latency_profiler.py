@@ -0,0 +1,119 @@
+# --- START OF FILE utils/latency_profiler.py ---
+"""
+Named timing spans for the edit pipeline. Each span keeps a rolling window of
+durations so stages can be compared by p50/p95/p99 while the app runs.
+"""
+from __future__ import annotations
+
+import json
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Union
+
+# Keystroke stages, in pipeline order; the dialog lists known spans first
+KEYSTROKE = "keystroke"
+KEYSTROKE_STAGES = (
+    KEYSTROKE,
+    "problem_scan",
+    "update_edited_data",
+    "tree_badges",
+    "status_bar",
+    "editor_highlights",
+    "update_text_views",
+    "highlight_block",
+    "preview_update",
+)
+
+
+@dataclass(frozen=True)
+class SpanStats:
+    """Percentiles in milliseconds over the rolling window of one span."""
+
+    name: str
+    count: int
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest rank: small windows report a sample that actually happened
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LatencyProfiler:
+    """Collects durations per span name; cheap enough to stay on in normal use."""
+
+    def __init__(self, window: int = 500, enabled: bool = True) -> None:
+        self.window = max(1, window)
+        self.enabled = enabled
+        self._samples: Dict[str, Deque[float]] = {}
+        self._totals: Dict[str, int] = {}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000.0)
+
+    def record(self, name: str, duration_ms: float) -> None:
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self.window)
+            self._totals[name] = 0
+        samples.append(duration_ms)
+        self._totals[name] += 1
+
+    def stats(self, name: str) -> Optional[SpanStats]:
+        samples = self._samples.get(name)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return SpanStats(
+            name=name,
+            count=self._totals[name],
+            p50=_percentile(ordered, 0.50),
+            p95=_percentile(ordered, 0.95),
+            p99=_percentile(ordered, 0.99),
+            max=ordered[-1],
+        )
+
+    def all_stats(self) -> List[SpanStats]:
+        """Keystroke stages in pipeline order, then any other spans by name."""
+        names = [name for name in KEYSTROKE_STAGES if name in self._samples]
+        names.extend(sorted(name for name in self._samples if name not in KEYSTROKE_STAGES))
+        return [stats for stats in (self.stats(name) for name in names) if stats is not None]
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self._totals.clear()
+
+    def to_dict(self) -> dict:
+        return {
+            "window": self.window,
+            "spans": {stats.name: asdict(stats) for stats in self.all_stats()},
+            "samples": {name: list(samples) for name, samples in self._samples.items()},
+        }
+
+    def export_json(self, path: Union[str, Path]) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+latency_profiler = LatencyProfiler()
+
+
+def latency_span(name: str):
+    """Shorthand for latency_profiler.span(name)."""
+    return latency_profiler.span(name)
@@ -1,8 +1,9 @@
 # --- START OF FILE utils/syntax_highlighter.py ---
 import sys
 import re
-from typing import Dict, Iterable, List, Optional, Tuple
-from PyQt5.QtCore import QRegExp, Qt
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from PyQt5.QtCore import QPoint, QRegExp, Qt, QTimer
 from PyQt5.QtGui import (
     QSyntaxHighlighter,
     QTextBlockUserData,
@@ -15,9 +16,10 @@ from PyQt5.QtGui import (
 from PyQt5.QtWidgets import QWidget, QMainWindow
 
 from .logging_utils import log_debug
-from .utils import SPACE_DOT_SYMBOL
+from .latency_profiler import latency_span
+from .utils import SPACE_DOT_SYMBOL, find_icon_sequences, get_icon_trie
 from plugins.common.markers import P_NEWLINE_MARKER, L_NEWLINE_MARKER, P_VISUAL_EDITOR_MARKER, L_VISUAL_EDITOR_MARKER
-from core.glossary_manager import GlossaryManager, GlossaryMatch
+from core.glossary_manager import GlossaryManager, GlossaryMatch, GlossarySnapshot
 
 _COLOR_TAG_PATTERN = re.compile(
     r"(\[(Red|Green|Blue|Yellow|l_Blue|Purple|Silver|Orange|White)\])|"
@@ -30,9 +32,21 @@ _WORD_PATTERN = re.compile(r"[a-zA-Zа-яА-ЯіїІїЄєґҐ']+")
 
 class JsonTagHighlighter(QSyntaxHighlighter):
     class GlossaryBlockData(QTextBlockUserData):
-        def __init__(self, matches: List[GlossaryMatch]) -> None:
+        def __init__(self, matches: List[GlossaryMatch], glossary_spans: Tuple = ()) -> None:
             super().__init__()
             self.matches = matches
+            # (start, length, original) of the source-glossary pieces this block was painted with
+            self.glossary_spans = glossary_spans
+
+    class DeferredBlockData(QTextBlockUserData):
+        """Marks a block that was left unformatted because it was off screen."""
+
+    # Glossary matches are cached by block text; the caches are simply dropped when full
+    GLOSSARY_CACHE_LIMIT = 4096
+    # Same for icon sequence matches
+    ICON_CACHE_LIMIT = 4096
+    # Terms are matched across at most this many consecutive lines
+    MAX_GLOSSARY_SPAN_LINES = 3
 
     STATE_DEFAULT = 0
     STATE_RED = 1
@@ -50,19 +64,33 @@ class JsonTagHighlighter(QSyntaxHighlighter):
         self.mw = main_window_ref
         self._editor_widget_ref = editor_widget_ref  # Store reference to the editor widget
         self._glossary_manager: Optional[GlossaryManager] = None
+        self._glossary_snapshot: Optional[GlossarySnapshot] = None
         self._glossary_enabled = False
         self._glossary_format = QTextCharFormat()
-        self._glossary_matches_cache: Dict[int, List[Tuple[int, int, GlossaryMatch]]] = {}
-        self._glossary_cache_revision: Optional[int] = None
+        # block text -> matches inside that block
+        self._glossary_block_cache: Dict[str, List[GlossaryMatch]] = {}
+        # texts of a run of blocks -> matches starting in the first block and ending past it
+        self._glossary_span_cache: Dict[Tuple[str, ...], List[GlossaryMatch]] = {}
+        self._glossary_span_lines = 1
+        self._glossary_dirty_range: Optional[Tuple[int, int]] = None
+        self._glossary_seen_revision: Optional[int] = None
         self._translation_matches_cache: Dict[int, List[Tuple[int, int, GlossaryMatch]]] = {}
         self._translation_cache_revision: Optional[int] = None
-        self._icon_sequences_cache: Dict[int, List[Tuple[int, int]]] = {}
-        self._icon_cache_revision: Optional[int] = None
+        # block text -> (start, length) of its icon sequences; edits only miss on the changed lines
+        self._icon_sequences_cache: Dict[str, List[Tuple[int, int]]] = {}
         self._icon_sequences_snapshot: Tuple[str, ...] = ()
+        # Viewport highlighting: bulk passes format only the rows around the viewport
+        self._viewport_editor = None
+        self._defer_offscreen = False
+        self._has_deferred_blocks = False
 
         # Spellchecker support
         self._spellchecker_format = QTextCharFormat()
         self._spellchecker_enabled = False
+        # Lowercase words waiting on a background lookup. Blocks aren't recorded:
+        # line edits renumber them, so results find the blocks by their text.
+        self._spell_pending: Set[str] = set()
+        self._spell_priority_range: Optional[Tuple[int, int]] = None
 
         # Translation Glossary Bridge
         self._is_translation_mode = False
@@ -109,19 +137,105 @@ class JsonTagHighlighter(QSyntaxHighlighter):
         self.reconfigure_styles()
         
     def on_contents_change(self, position, chars_removed, chars_added):
-        self._invalidate_icon_cache()
-        self._glossary_cache_revision = None
         self._translation_cache_revision = None
         # QSyntaxHighlighter automatically handles rehighlighting the changed blocks.
         # Calling rehighlight() here can interrupt its internal state and strip colors during setPlainText.
+        doc = self.document()
+        if doc is not None and position == 0 and (chars_added == doc.characterCount() or doc.characterCount() <= 1):
+            # Document emptied or replaced whole (setPlainText): lookups queued for the old text are moot
+            self._spell_pending.clear()
+        revision = doc.revision() if doc else None
+        text_changed = revision != self._glossary_seen_revision  # formatting passes keep the revision
+        self._glossary_seen_revision = revision
+        if text_changed and self._glossary_enabled and self._glossary_span_lines > 1:
+            # Neighbouring lines may gain or lose a term that crosses into the edited one
+            start, end = position, position + chars_added
+            if self._glossary_dirty_range is None:
+                QTimer.singleShot(0, self._refresh_glossary_neighbours)
+            else:
+                start = min(start, self._glossary_dirty_range[0])
+                end = max(end, self._glossary_dirty_range[1])
+            self._glossary_dirty_range = (start, end)
 
     def set_glossary_manager(self, manager: Optional[GlossaryManager]) -> None:
+        snapshot = GlossarySnapshot.of(manager)
+        previous = self._glossary_snapshot
+        if (
+            manager is self._glossary_manager
+            and snapshot is not None and previous is not None
+            and snapshot.revision is not None and snapshot.revision == previous.revision
+        ):
+            # Editors are re-pointed at the same glossary after every prompt load
+            return
         self._glossary_manager = manager
-        self._glossary_enabled = bool(manager and manager.get_entries())
-        self._glossary_matches_cache.clear()
-        self._glossary_cache_revision = None
+        self._glossary_snapshot = snapshot
+        self._glossary_enabled = bool(snapshot and snapshot.entries)
+        self._glossary_span_lines = self._compute_glossary_span_lines(snapshot) if self._glossary_enabled else 1
+        self._clear_glossary_caches()
         self.rehighlight()
 
+    def set_viewport_editor(self, editor) -> None:
+        """
+        Bulk changes (setPlainText, rehighlight) then format only the blocks
+        around the editor's viewport; the rest keep just their colour state
+        and are formatted when they scroll into view.
+        """
+        if self._viewport_editor is not None:
+            try:
+                self._viewport_editor.updateRequest.disconnect(self._on_viewport_update)
+            except TypeError:
+                pass
+        self._viewport_editor = editor
+        if editor is not None:
+            editor.updateRequest.connect(self._on_viewport_update)
+
+    @contextmanager
+    def deferred_offscreen(self):
+        if self._viewport_editor is None or self._defer_offscreen:
+            yield
+            return
+        self._defer_offscreen = True
+        try:
+            yield
+        finally:
+            self._defer_offscreen = False
+        self.highlight_visible_blocks()
+
+    def rehighlight(self) -> None:
+        with self.deferred_offscreen():
+            super().rehighlight()
+
+    def _visible_block_range(self) -> Tuple[int, int]:
+        editor = self._viewport_editor
+        first = editor.cursorForPosition(QPoint(0, 0)).blockNumber()
+        last = editor.cursorForPosition(QPoint(0, editor.viewport().height())).blockNumber()
+        # One page either side, so ordinary scrolling never shows an unformatted row
+        page = max(1, last - first + 1)
+        return max(0, first - page), last + page
+
+    def highlight_visible_blocks(self) -> None:
+        doc = self.document()
+        if doc is None or self._viewport_editor is None or not self._has_deferred_blocks:
+            return
+        first, last = self._visible_block_range()
+        block = doc.findBlockByNumber(first)
+        while block.isValid() and block.blockNumber() <= last:
+            if isinstance(block.userData(), self.DeferredBlockData):
+                self.rehighlightBlock(block)
+            block = block.next()
+
+    def _on_viewport_update(self, rect, dy) -> None:
+        if not self._defer_offscreen:
+            self.highlight_visible_blocks()
+
+    def _compute_glossary_span_lines(self, snapshot: GlossarySnapshot) -> int:
+        # A term of N words has N-1 separators, so it can cover up to N lines
+        return max(1, min(snapshot.max_term_words, self.MAX_GLOSSARY_SPAN_LINES))
+
+    def _clear_glossary_caches(self) -> None:
+        self._glossary_block_cache.clear()
+        self._glossary_span_cache.clear()
+
     def set_spellchecker_enabled(self, enabled: bool) -> None:
         """Enable or disable spellchecker highlighting."""
         editor_name = 'unknown'
@@ -132,6 +246,7 @@ class JsonTagHighlighter(QSyntaxHighlighter):
 
         if self._spellchecker_enabled != enabled:
             self._spellchecker_enabled = enabled
+            self._spell_pending.clear()
             log_debug(f"JsonTagHighlighter ({editor_name}): Spellchecker highlighting state changed to {'enabled' if enabled else 'disabled'}, triggering rehighlight")
             self.rehighlight()
         else:
@@ -282,64 +397,116 @@ class JsonTagHighlighter(QSyntaxHighlighter):
             pass
 
         self.newline_char = newline_symbol
-        self._glossary_matches_cache.clear()
-        self._glossary_cache_revision = None
+        self._clear_glossary_caches()
         if self.document():
              self.rehighlight()
 
     def _invalidate_icon_cache(self) -> None:
         self._icon_sequences_cache.clear()
-        self._icon_cache_revision = None
         self._icon_sequences_snapshot = ()
 
-    def _rebuild_glossary_cache(self) -> None:
-        doc = self.document()
-        if not doc:
-            self._glossary_matches_cache.clear()
-            self._glossary_cache_revision = None
-            return
-        revision = doc.revision()
-        if self._glossary_cache_revision == revision:
-            return
-
-        self._glossary_cache_revision = revision
-        self._glossary_matches_cache.clear()
-
-        if not (self._glossary_enabled and self._glossary_manager):
-            return
-
-        full_text = doc.toPlainText()
+    def _find_block_glossary_matches(self, text: str) -> List[GlossaryMatch]:
+        cached = self._glossary_block_cache.get(text)
+        if cached is not None:
+            return cached
         try:
-            matches = self._glossary_manager.find_matches(full_text)
+            matches = self._glossary_manager.find_matches(text) if text else []
         except Exception as exc:
             log_debug(f"Glossary highlight error: {exc}")
             matches = []
-
-        for match in matches:
-            start = match.start
-            end = match.end
-            if end <= start:
-                continue
-            block = doc.findBlock(start)
+        if len(self._glossary_block_cache) >= self.GLOSSARY_CACHE_LIMIT:
+            self._glossary_block_cache.clear()
+        self._glossary_block_cache[text] = matches
+        return matches
+
+    def _find_spanning_glossary_matches(self, texts: Tuple[str, ...]) -> List[GlossaryMatch]:
+        """Matches in the joined run of lines that start in the first line and end past it."""
+        cached = self._glossary_span_cache.get(texts)
+        if cached is not None:
+            return cached
+        first_end = len(texts[0])
+        try:
+            matches = [
+                match for match in self._glossary_manager.find_matches('\n'.join(texts))
+                if match.start < first_end < match.end
+            ]
+        except Exception as exc:
+            log_debug(f"Glossary highlight error: {exc}")
+            matches = []
+        if len(self._glossary_span_cache) >= self.GLOSSARY_CACHE_LIMIT:
+            self._glossary_span_cache.clear()
+        self._glossary_span_cache[texts] = matches
+        return matches
+
+    def _get_glossary_matches_for_block(self, block) -> List[Tuple[int, int, GlossaryMatch]]:
+        """(local_start, local_length, match) for one block; cost depends only on nearby lines."""
+        text = block.text()
+        pieces = [
+            (match.start, match.end - match.start, match)
+            for match in self._find_block_glossary_matches(text)
+            if match.end > match.start
+        ]
+        span = self._glossary_span_lines
+        if span <= 1 or not block.isValid():
+            return pieces
+
+        # Runs of `span` lines starting at this block or up to span-1 blocks above it
+        run_start = block
+        offset = 0  # position of `block` inside the joined run
+        for _ in range(span):
+            if not run_start.isValid():
+                break
+            texts: List[str] = []
+            current = run_start
+            while current.isValid() and len(texts) < span:
+                texts.append(current.text())
+                current = current.next()
+            if len(texts) > 1:
+                block_start, block_end = offset, offset + len(text)
+                for match in self._find_spanning_glossary_matches(tuple(texts)):
+                    overlap_start = max(match.start, block_start)
+                    overlap_end = min(match.end, block_end)
+                    if overlap_end > overlap_start:
+                        pieces.append((overlap_start - block_start, overlap_end - overlap_start, match))
+            run_start = run_start.previous()
+            if run_start.isValid():
+                offset += len(run_start.text()) + 1
+        pieces.sort(key=lambda piece: piece[0])
+        return pieces
+
+    def _refresh_glossary_neighbours(self) -> None:
+        dirty_range, self._glossary_dirty_range = self._glossary_dirty_range, None
+        doc = self.document()
+        if not dirty_range or not doc or not (self._glossary_enabled and self._glossary_manager):
+            return
+        last_pos = max(0, doc.characterCount() - 1)
+        first = doc.findBlock(min(dirty_range[0], last_pos))
+        last = doc.findBlock(min(dirty_range[1], last_pos))
+        if not first.isValid() or not last.isValid():
+            return
+        reach = self._glossary_span_lines - 1
+        neighbours = []
+        block = first.previous()
+        for _ in range(reach):
             if not block.isValid():
-                continue
-            while block.isValid() and start < end:
-                block_start = block.position()
-                block_length = block.length()
-                block_end = block_start + block_length
-                overlap_start = max(start, block_start)
-                overlap_end = min(end, block_end)
-                if overlap_end > overlap_start:
-                    local_start = overlap_start - block_start
-                    local_length = overlap_end - overlap_start
-                    self._glossary_matches_cache.setdefault(block.blockNumber(), []).append(
-                        (local_start, local_length, match)
-                    )
-                if block_end >= end:
-                    break
-                block = block.next()
-                if not block.isValid():
-                    break
+                break
+            neighbours.append(block)
+            block = block.previous()
+        block = last.next()
+        for _ in range(reach):
+            if not block.isValid():
+                break
+            neighbours.append(block)
+            block = block.next()
+        for block in neighbours:
+            data = block.userData()
+            painted = data.glossary_spans if isinstance(data, self.GlossaryBlockData) else ()
+            if self._glossary_spans_key(self._get_glossary_matches_for_block(block)) != painted:
+                self.rehighlightBlock(block)
+
+    @staticmethod
+    def _glossary_spans_key(pieces: List[Tuple[int, int, GlossaryMatch]]) -> Tuple:
+        return tuple((start, length, match.entry.original) for start, length, match in pieces)
 
     def _rebuild_translation_glossary_cache(self) -> None:
         """Rebuilds the bridge translation glossary cache for the whole document."""
@@ -363,107 +530,48 @@ class JsonTagHighlighter(QSyntaxHighlighter):
             return
 
         full_text = doc.toPlainText()
-        for entry in source_matches:
-            # Build and search for translation regex
-            # Note: build_translation_regex handles multi-line/fuzzy Slavic terms
-            regex = self._glossary_manager.build_translation_regex(entry.translation)
-            if not regex:
-                continue
-            
-            for match in regex.finditer(full_text):
-                start, end = match.start(), match.end()
-                if end <= start:
-                    continue
-                
-                block = doc.findBlock(start)
-                if not block.isValid():
-                    continue
-                
-                while block.isValid() and start < end:
-                    block_start = block.position()
-                    block_length = block.length()
-                    block_end = block_start + block_length
-                    overlap_start = max(start, block_start)
-                    overlap_end = min(end, block_end)
-                    if overlap_end > overlap_start:
-                        local_start = overlap_start - block_start
-                        local_length = overlap_end - overlap_start
-                        self._translation_matches_cache.setdefault(block.blockNumber(), []).append(
-                            (local_start, local_length, GlossaryMatch(entry=entry, start=start, end=end))
-                        )
-                    if block_end >= end:
-                        break
-                    block = block.next()
-                    if not block.isValid():
-                        break
-
-    def _ensure_icon_cache(self, sequences: List[str]) -> None:
-        if not self._should_highlight_icons():
-            self._icon_sequences_cache.clear()
-            self._icon_cache_revision = None
-            self._icon_sequences_snapshot = ()
-            return
-
-        doc = self.document()
-        if not doc:
-            self._icon_sequences_cache.clear()
-            self._icon_cache_revision = None
-            self._icon_sequences_snapshot = ()
-            return
-
-        revision = doc.revision()
-        snapshot = tuple(sequences)
-        if (self._icon_cache_revision == revision
-                and self._icon_sequences_snapshot == snapshot):
-            return
-
-        self._icon_cache_revision = revision
-        self._icon_sequences_snapshot = snapshot
-        self._icon_sequences_cache.clear()
-
-        if not sequences:
-            return
-
-        first_char_map: Dict[str, List[str]] = {}
-        for token in sequences:
-            if not token:
+        # Compiled matchers are cached by the manager and prefiltered by stem,
+        # so only entries whose stems occur in the text run their regex
+        for t_match in self._glossary_manager.find_translation_matches(full_text, source_matches):
+            start, end = t_match.start, t_match.end
+            block = doc.findBlock(start)
+            if not block.isValid():
                 continue
-            first_char_map.setdefault(token[0], []).append(token)
-        for token_list in first_char_map.values():
-            token_list.sort(key=len, reverse=True)
 
-        block = doc.firstBlock()
-        while block.isValid():
-            block_text = block.text()
-            matches: List[Tuple[int, int]] = []
-            index = 0
-            text_length = len(block_text)
-            while index < text_length:
-                char = block_text[index]
-                candidates = first_char_map.get(char)
-                matched = False
-                if candidates:
-                    for token in candidates:
-                        token_len = len(token)
-                        if token_len <= 0 or index + token_len > text_length:
-                            continue
-                        if block_text.startswith(token, index):
-                            matches.append((index, token_len))
-                            index += token_len
-                            matched = True
-                            break
-                if not matched:
-                    index += 1
-            if matches:
-                self._icon_sequences_cache[block.blockNumber()] = matches
-            block = block.next()
+            while block.isValid() and start < end:
+                block_start = block.position()
+                block_length = block.length()
+                block_end = block_start + block_length
+                overlap_start = max(start, block_start)
+                overlap_end = min(end, block_end)
+                if overlap_end > overlap_start:
+                    local_start = overlap_start - block_start
+                    local_length = overlap_end - overlap_start
+                    self._translation_matches_cache.setdefault(block.blockNumber(), []).append(
+                        (local_start, local_length, t_match)
+                    )
+                if block_end >= end:
+                    break
+                block = block.next()
+                if not block.isValid():
+                    break
 
     def _get_icon_matches_for_block(self, sequences: List[str]) -> List[Tuple[int, int]]:
-        if not sequences:
+        if not sequences or not self._should_highlight_icons():
             return []
-        self._ensure_icon_cache(sequences)
-        block_number = self.currentBlock().blockNumber()
-        return self._icon_sequences_cache.get(block_number, [])
+        snapshot = tuple(sequences)
+        if snapshot != self._icon_sequences_snapshot:
+            self._icon_sequences_cache.clear()
+            self._icon_sequences_snapshot = snapshot
+        text = self.currentBlock().text()
+        cached = self._icon_sequences_cache.get(text)
+        if cached is not None:
+            return cached
+        matches = find_icon_sequences(text, get_icon_trie(sequences))
+        if len(self._icon_sequences_cache) >= self.ICON_CACHE_LIMIT:
+            self._icon_sequences_cache.clear()
+        self._icon_sequences_cache[text] = matches
+        return matches
 
 
     def _get_icon_sequences(self) -> List[str]:
@@ -495,6 +603,56 @@ class JsonTagHighlighter(QSyntaxHighlighter):
 
         return False
 
+    def _queue_spell_lookup(self, spellchecker_manager, word: str) -> None:
+        block_number = self.currentBlock().blockNumber()
+        self._spell_pending.add(self._spell_key(word))
+        first, last = self._get_spell_priority_range()
+        spellchecker_manager.enqueue_word(word, priority=first <= block_number <= last)
+
+    def _get_spell_priority_range(self) -> Tuple[int, int]:
+        """Blocks on screen, computed once per highlighting pass."""
+        if self._spell_priority_range is None:
+            first, last = 0, -1
+            editor = self._editor_widget_ref
+            try:
+                top = editor.cursorForPosition(QPoint(0, 0)).blockNumber()
+                bottom = editor.cursorForPosition(QPoint(0, editor.viewport().height())).blockNumber()
+                if isinstance(top, int) and isinstance(bottom, int):
+                    first, last = top, bottom
+            except (AttributeError, RuntimeError, TypeError):
+                pass
+            self._spell_priority_range = (first, last)
+            QTimer.singleShot(0, self._reset_spell_priority_range)
+        return self._spell_priority_range
+
+    def _reset_spell_priority_range(self) -> None:
+        self._spell_priority_range = None
+
+    @staticmethod
+    def _spell_key(word: str) -> str:
+        return word.strip("'·").lower()
+
+    def on_spellcheck_results(self, words: Set[str], misspelled: Set[str]) -> None:
+        """Called by SpellcheckerManager when the worker has looked up a batch of words."""
+        # Correct words need no underline, so their blocks are already right
+        found = {word for word in words if word in self._spell_pending and word in misspelled}
+        self._spell_pending.difference_update(words)
+        doc = self.document()
+        if not found or doc is None or not self._spellchecker_enabled:
+            return
+        first, last = self._get_spell_priority_range()
+        on_screen, off_screen = [], []
+        block = doc.begin()
+        while block.isValid():
+            lowered = block.text().lower()
+            if any(word in lowered for word in found) and any(
+                self._spell_key(word) in found for _start, _end, word in self._extract_words_from_text(block.text())
+            ):
+                (on_screen if first <= block.blockNumber() <= last else off_screen).append(block)
+            block = block.next()
+        for block in on_screen + off_screen:
+            self.rehighlightBlock(block)
+
     def _extract_words_from_text(self, text: str) -> List[Tuple[int, int, str]]:
         """Extract words from text, returning (start, end, word) tuples."""
         # Replace middle dots with spaces for word detection
@@ -506,10 +664,50 @@ class JsonTagHighlighter(QSyntaxHighlighter):
         return words
 
 
+    def _color_state_after(self, match, state: int) -> int:
+        ww_color_name = match.group(2)
+        ww_closing_tag = match.group(3)
+        mc_color_name = match.group(5)
+
+        if ww_color_name:
+            color = ww_color_name.lower()
+            if color == 'red': return self.STATE_RED
+            elif color == 'green': return self.STATE_GREEN
+            elif color == 'blue': return self.STATE_BLUE
+            elif color == 'yellow': return self.STATE_YELLOW
+            elif color == 'l_blue': return self.STATE_LBLUE
+            elif color == 'purple': return self.STATE_PURPLE
+            elif color == 'silver': return self.STATE_SILVER
+            elif color == 'orange': return self.STATE_ORANGE
+            return self.STATE_DEFAULT # White
+        elif ww_closing_tag:
+            return self.STATE_DEFAULT
+        elif mc_color_name:
+            color = mc_color_name.lower()
+            if color == 'red': return self.STATE_RED
+            elif color == 'green': return self.STATE_GREEN
+            elif color == 'blue': return self.STATE_BLUE
+            return self.STATE_DEFAULT # White
+        return state
+
     def highlightBlock(self, text):
+        with latency_span("highlight_block"):
+            self._highlight_block(text)
+
+    def _highlight_block(self, text):
         previous_color_state = self.previousBlockState()
         if previous_color_state == -1: previous_color_state = self.STATE_DEFAULT
 
+        if self._defer_offscreen:
+            # Off-screen during a bulk pass: only carry the colour state forward
+            state = previous_color_state
+            for match in _COLOR_TAG_PATTERN.finditer(text):
+                state = self._color_state_after(match, state)
+            self.setCurrentBlockState(state)
+            self.setCurrentBlockUserData(self.DeferredBlockData())
+            self._has_deferred_blocks = True
+            return
+
         format_map = {
             self.STATE_DEFAULT: self.color_default_format,
             self.STATE_RED: self.red_text_format,
@@ -532,30 +730,7 @@ class JsonTagHighlighter(QSyntaxHighlighter):
             if start > last_pos:
                 self.setFormat(last_pos, start - last_pos, format_to_apply)
             
-            ww_color_name = match.group(2)
-            ww_closing_tag = match.group(3)
-            mc_color_name = match.group(5)
-
-            if ww_color_name:
-                color = ww_color_name.lower()
-                if color == 'red': current_block_color_state = self.STATE_RED
-                elif color == 'green': current_block_color_state = self.STATE_GREEN
-                elif color == 'blue': current_block_color_state = self.STATE_BLUE
-                elif color == 'yellow': current_block_color_state = self.STATE_YELLOW
-                elif color == 'l_blue': current_block_color_state = self.STATE_LBLUE
-                elif color == 'purple': current_block_color_state = self.STATE_PURPLE
-                elif color == 'silver': current_block_color_state = self.STATE_SILVER
-                elif color == 'orange': current_block_color_state = self.STATE_ORANGE
-                else: current_block_color_state = self.STATE_DEFAULT # White
-            elif ww_closing_tag:
-                current_block_color_state = self.STATE_DEFAULT
-            elif mc_color_name:
-                color = mc_color_name.lower()
-                if color == 'red': current_block_color_state = self.STATE_RED
-                elif color == 'green': current_block_color_state = self.STATE_GREEN
-                elif color == 'blue': current_block_color_state = self.STATE_BLUE
-                else: current_block_color_state = self.STATE_DEFAULT # White
-            
+            current_block_color_state = self._color_state_after(match, current_block_color_state)
             last_pos = end
         
         if last_pos < len(text):
@@ -598,10 +773,7 @@ class JsonTagHighlighter(QSyntaxHighlighter):
 
         glossary_matches_for_block: List[Tuple[int, int, GlossaryMatch]] = []
         if self._glossary_enabled and self._glossary_manager:
-            self._rebuild_glossary_cache()
-            glossary_matches_for_block = self._glossary_matches_cache.get(
-                self.currentBlock().blockNumber(), []
-            )
+            glossary_matches_for_block = self._get_glossary_matches_for_block(self.currentBlock())
             underline_style = self._glossary_format.underlineStyle()
             underline_color = self._glossary_format.underlineColor()
             has_custom_color = underline_color.isValid()
@@ -670,7 +842,9 @@ class JsonTagHighlighter(QSyntaxHighlighter):
         all_matches.extend(translation_matches)
 
         if all_matches:
-            self.setCurrentBlockUserData(self.GlossaryBlockData(all_matches))
+            self.setCurrentBlockUserData(
+                self.GlossaryBlockData(all_matches, self._glossary_spans_key(glossary_matches_for_block))
+            )
         else:
             self.setCurrentBlockUserData(None)
 
@@ -680,7 +854,13 @@ class JsonTagHighlighter(QSyntaxHighlighter):
             if spellchecker_manager and spellchecker_manager.enabled:
                 words = self._extract_words_from_text(text)
                 for start, end, word in words:
-                    if spellchecker_manager.is_misspelled(word):
+                    # Cache only: a miss is looked up on the worker thread and this
+                    # block is re-formatted when the answer arrives
+                    misspelled = spellchecker_manager.cached_misspelling(word)
+                    if misspelled is None:
+                        self._queue_spell_lookup(spellchecker_manager, word)
+                        continue
+                    if misspelled:
                         word_length = end - start
                         existing_format = self.format(start)
                         existing_format.setFontUnderline(True)
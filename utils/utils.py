@@ -2,7 +2,9 @@
 import datetime
 import re
 import difflib # Додано
-from typing import Optional, List
+from array import array
+from bisect import bisect_right
+from typing import Optional, List, Tuple
 from plugins.common.markers import P_VISUAL_EDITOR_MARKER, L_VISUAL_EDITOR_MARKER
 from .logging_utils import log_debug
 
@@ -23,6 +25,54 @@ class TrieNode:
         self.length: int = 0
 
 _WIDTH_CACHE = {}
+_ICON_TRIE_CACHE = {}
+
+def _insert_trie_sequence(root: TrieNode, seq: str) -> TrieNode:
+    node = root
+    for ch in seq:
+        if ch not in node.children:
+            node.children[ch] = TrieNode()
+        node = node.children[ch]
+    node.length = len(seq)
+    return node
+
+def get_icon_trie(icon_sequences: Optional[List[str]]) -> TrieNode:
+    """Width-less trie of the icon sequences, shared by every caller with the same list."""
+    cache_key = tuple(icon_sequences) if icon_sequences else ()
+    root = _ICON_TRIE_CACHE.get(cache_key)
+    if root is None:
+        root = TrieNode()
+        for seq in cache_key:
+            if seq:
+                _insert_trie_sequence(root, seq)
+        _ICON_TRIE_CACHE[cache_key] = root
+    return root
+
+def find_icon_sequences(text: str, trie: TrieNode) -> List[Tuple[int, int]]:
+    """(start, length) of each icon sequence, longest match first, scanning left to right."""
+    matches: List[Tuple[int, int]] = []
+    children = trie.children
+    if not text or not children:
+        return matches
+    i = 0
+    text_len = len(text)
+    while i < text_len:
+        node = children.get(text[i])
+        best_len = 0
+        j = i + 1
+        while node is not None:
+            if node.length > 0:
+                best_len = node.length
+            if j >= text_len:
+                break
+            node = node.children.get(text[j])
+            j += 1
+        if best_len:
+            matches.append((i, best_len))
+            i += best_len
+        else:
+            i += 1
+    return matches
 
 def _get_trie_and_flat_map(font_map: dict, default_char_width: int, icon_sequences: Optional[List[str]], strict: bool = False):
     cache_key = (id(font_map), default_char_width, tuple(icon_sequences) if icon_sequences else None, strict)
@@ -40,11 +90,7 @@ def _get_trie_and_flat_map(font_map: dict, default_char_width: int, icon_sequenc
     for seq in seqs_to_use:
         if not seq:
             continue
-        node = root
-        for ch in seq:
-            if ch not in node.children:
-                node.children[ch] = TrieNode()
-            node = node.children[ch]
+        node = _insert_trie_sequence(root, seq)
             
         info = font_map.get(seq)
         if strict:
@@ -57,7 +103,6 @@ def _get_trie_and_flat_map(font_map: dict, default_char_width: int, icon_sequenc
             width = info_dict.get('width', default_char_width * len(seq))
             
         node.width = width
-        node.length = len(seq)
         
     flat_widths = {}
     for k, v in font_map.items():
@@ -185,6 +230,66 @@ def calculate_strict_string_width(text: str, font_map: dict, icon_sequences: Opt
         
     return total_width
 
+def calculate_width_profile(text: str, font_map: dict, default_char_width: int = 8, icon_sequences: Optional[List[str]] = None) -> List[int]:
+    """
+    Cumulative widths with the same tag and icon rules as calculate_string_width:
+    profile[i] is the width of text[:i], so profile[-1] is the width of the whole
+    text. Offsets inside a tag or icon sequence keep the width before it.
+    """
+    profile = [0]
+    if not text:
+        return profile
+
+    trie, char_widths = _get_trie_and_flat_map(font_map, default_char_width, icon_sequences, strict=False)
+
+    total_width = 0
+    i = 0
+    text_len = len(text)
+
+    while i < text_len:
+        ch = text[i]
+
+        node = trie.children.get(ch)
+        if node is not None:
+            best_width = None
+            best_len = 0
+            is_match = False
+            j = i + 1
+            while node is not None and j <= text_len:
+                if node.length > 0:
+                    best_width = node.width
+                    best_len = node.length
+                    is_match = True
+                if j < text_len:
+                    node = node.children.get(text[j])
+                else:
+                    break
+                j += 1
+
+            if is_match:
+                profile.extend([total_width] * (best_len - 1))
+                total_width += best_width
+                profile.append(total_width)
+                i += best_len
+                continue
+
+        if ch == '[' or ch == '{':
+            end_index = text.find(']' if ch == '[' else '}', i)
+            if end_index != -1:
+                profile.extend([total_width] * (end_index + 1 - i))
+                i = end_index + 1
+                continue
+
+        total_width += char_widths.get(ch, default_char_width)
+        profile.append(total_width)
+        i += 1
+
+    return profile
+
+def find_width_fit(profile: List[int], max_width: int) -> int:
+    """Length of the longest prefix whose width fits max_width (0 if none); binary search over a width profile."""
+    return max(0, bisect_right(profile, max_width) - 1)
+
 def is_fuzzy_match(word1: str, word2: str, threshold: float = 0.8) -> bool:
     """
     Checks if two words are similar enough using SequenceMatcher.
@@ -266,4 +371,34 @@ def prepare_text_for_tagless_search(text: str, keep_original_case: bool = False)
     normalized_spaces_text = re.sub(r' {2,}', ' ', text_with_spaces_instead_of_newlines)
     
     stripped_text = normalized_spaces_text.strip()
-    return stripped_text
\ No newline at end of file
+    return stripped_text
+
+def build_tagless_search_text(text: str) -> Tuple[str, 'array']:
+    """
+    Same normalization as prepare_text_for_tagless_search, but also returns an
+    offset map: offsets[i] is the index in the raw text of the i-th tagless char.
+    """
+    if text is None:
+        return "", array('I')
+
+    chars: List[str] = []
+    offsets = array('I')
+    last_end = 0
+    segments = [(m.start(), m.end()) for m in ALL_TAGS_PATTERN.finditer(text)]
+    segments.append((len(text), len(text)))
+    for tag_start, tag_end in segments:
+        for raw_idx in range(last_end, tag_start):
+            char = text[raw_idx]
+            if char in '+\n' or char == SPACE_DOT_SYMBOL:
+                char = ' '
+            if char == ' ' and chars and chars[-1] == ' ':
+                continue
+            chars.append(char)
+            offsets.append(raw_idx)
+        last_end = tag_end
+
+    start = 0
+    end = len(chars)
+    while start < end and chars[start].isspace(): start += 1
+    while end > start and chars[end - 1].isspace(): end -= 1
+    return "".join(chars[start:end]), offsets[start:end]
\ No newline at end of file